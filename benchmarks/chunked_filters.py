@@ -0,0 +1,28 @@
+# Micro-benchmark of planning the chunks of a list call with a 5000 id `in_list` filter, which is far too long for one
+# URL, split into query strings of at most `MAX_QUERY_LENGTH` characters.
+#
+# Run from the repository root with: python -m benchmarks.chunked_filters
+
+import timeit
+
+from freshbooks import FilterBuilder
+from freshbooks.api.pagination import MAX_QUERY_LENGTH, chunk_builders
+
+IDS = list(range(100000, 105000))
+CALLS = 100
+
+
+def plan() -> list:
+    filter = FilterBuilder().in_list("clientids", IDS).equals("vis_state", 0)
+    return chunk_builders([filter], "AccountingResource")
+
+
+def main() -> None:
+    chunks = plan()
+    print(f"{len(chunks)} chunks of at most {MAX_QUERY_LENGTH} characters for {len(IDS)} ids")
+    seconds = min(timeit.repeat(plan, number=CALLS, repeat=5))
+    print(f"chunk_builders: {seconds / CALLS * 1e3:.2f}ms per list call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+# Micro-benchmark of building a pandas DataFrame from a 10,000 invoice `ListResult`.
+#
+# "attributes" builds the DataFrame from each `Result`'s attributes, one resource at a time. "to_pandas" builds the
+# columns directly from the response and converts the dates a column at a time.
+#
+# Requires pandas. Run from the repository root with: python -m benchmarks.columnar_export
+
+import timeit
+
+import pandas
+
+from benchmarks.result_fields import INVOICES, build
+
+FIELDS = ["id", "create_date", "updated"]
+
+invoices = build()
+
+
+def attributes() -> pandas.DataFrame:
+    rows = []
+    for invoice in invoices:
+        rows.append({
+            "id": invoice.id,
+            "create_date": invoice.create_date,
+            "updated": invoice.updated,
+            "amount": invoice.amount.amount,
+            "amount_code": invoice.amount.code,
+        })
+    return pandas.DataFrame(rows)
+
+
+def to_pandas() -> pandas.DataFrame:
+    return invoices.to_pandas(FIELDS + ["amount"])
+
+
+if __name__ == "__main__":
+    for name, func in (("attributes", attributes), ("to_pandas", to_pandas)):
+        seconds = min(timeit.repeat(func, number=1, repeat=5))
+        print(f"{name:>10}: {seconds / INVOICES * 1e6:8.2f} µs per invoice")
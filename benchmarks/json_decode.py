@@ -0,0 +1,45 @@
+# Benchmark of decoding a large list of invoices response with each `freshbooks.decoders` decoder.
+#
+# The payload is a page of 10,000 invoices shaped like FreshBooks' invoice responses (about 6 MB).
+#
+# Requires orjson. Run from the repository root with: python -m benchmarks.json_decode
+
+import gc
+import json
+import time
+from typing import Any, Dict
+
+from benchmarks.result_fields import INVOICES, invoice
+from freshbooks.decoders import JSONDecoder, OrjsonDecoder
+
+REPEAT = 7
+
+
+def recorded_invoice(index: int) -> Dict[str, Any]:
+    data = invoice(index)
+    data.update({
+        "accounting_systemid": "ACM123", "currency_code": "CAD", "customerid": 12345, "fname": "Gordon",
+        "lname": "Shumway", "organization": "American Cyanamid", "notes": "Thanks for your business",
+        "terms": None, "po_number": None, "status": 2, "v3_status": "sent", "payment_status": "unpaid",
+        "discount_value": "0", "template": "clean-grouped", "street": "123 Huron St", "city": "Toronto",
+        "province": "ON", "code": "M5T 2B3", "country": "Canada", "vis_state": 0, "deposit_percentage": 12.5,
+    })
+    return data
+
+
+def payload() -> bytes:
+    result = {"invoices": [recorded_invoice(index) for index in range(INVOICES)],
+              "page": 1, "pages": 1, "per_page": INVOICES, "total": INVOICES}
+    return json.dumps({"response": {"result": result}}).encode("utf-8")
+
+
+if __name__ == "__main__":
+    content = payload()
+    for name, decoder in (("json", JSONDecoder()), ("orjson", OrjsonDecoder())):
+        best = float("inf")
+        for _ in range(REPEAT):
+            gc.collect()
+            started = time.perf_counter()
+            decoder.decode(content)
+            best = min(best, time.perf_counter() - started)
+        print(f"{name:>7}: {best * 1000:7.1f} ms, {len(content) / best / 1e6:6.1f} MB/s")
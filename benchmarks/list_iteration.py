@@ -0,0 +1,30 @@
+# Micro-benchmark of iterating a 100,000 invoice `ListResult`.
+#
+# "wrapped" builds a `{"invoice": ...}` dictionary and a `Result` from it for every invoice, as iteration did
+# before `Result` views. "view" is the current behaviour, wrapping each list entry directly.
+#
+# Run from the repository root with: python -m benchmarks.list_iteration
+
+import timeit
+
+from freshbooks.models import ListResult, Result
+
+INVOICES = 100000
+
+invoices = ListResult("invoices", "invoice", {"invoices": [{"id": index} for index in range(INVOICES)]})
+
+
+def wrapped() -> None:
+    for data in invoices.data["invoices"]:
+        Result("invoice", {"invoice": data})
+
+
+def view() -> None:
+    for _ in invoices:
+        pass
+
+
+if __name__ == "__main__":
+    for name, func in (("wrapped", wrapped), ("view", view)):
+        seconds = min(timeit.repeat(func, number=1, repeat=5))
+        print(f"{name:>10}: {seconds / INVOICES * 1e9:8.1f} ns per invoice")
@@ -0,0 +1,58 @@
+# Benchmark of reading a large list of invoices response buffered (as `list` does) and streamed
+# (as `iter_all(..., stream=True)` does), in 64 KB chunks as they would arrive from the socket.
+#
+# The payload is a page of 10,000 invoices shaped like FreshBooks' invoice responses (about 6 MB). Reports the time
+# to the first invoice, the time to read every invoice, and the peak memory allocated while reading.
+#
+# Run from the repository root with: python -m benchmarks.list_streaming
+
+import gc
+import time
+import tracemalloc
+from typing import Callable, Iterator, List
+
+from benchmarks.json_decode import payload
+from freshbooks.decoders import JSONDecoder
+from freshbooks.models import ListResult
+from freshbooks.streaming import CHUNK_SIZE, ListStreamParser
+
+PATH = ("response", "result", "invoices")
+
+
+def chunks(content: bytes) -> List[bytes]:
+    return [content[start:start + CHUNK_SIZE] for start in range(0, len(content), CHUNK_SIZE)]
+
+
+def buffered(parts: List[bytes]) -> Iterator[int]:
+    data = JSONDecoder().decode(b"".join(parts))["response"]["result"]
+    for invoice in ListResult("invoices", "invoice", data):
+        yield invoice.id
+
+
+def streamed(parts: List[bytes]) -> Iterator[int]:
+    parser = ListStreamParser(PATH)
+    for part in parts:
+        for invoice in parser.feed(part):
+            yield invoice["id"]
+    parser.close()
+
+
+def measure(read: Callable[[List[bytes]], Iterator[int]], parts: List[bytes]) -> None:
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    invoices = read(parts)
+    next(invoices)
+    first = time.perf_counter() - started
+    for _ in invoices:
+        pass
+    total = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{read.__name__:>9}: first {first * 1000:7.1f} ms, all {total * 1000:7.1f} ms, peak {peak / 1e6:6.1f} MB")
+
+
+if __name__ == "__main__":
+    parts = chunks(payload())
+    measure(buffered, parts)
+    measure(streamed, parts)
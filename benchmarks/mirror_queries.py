@@ -0,0 +1,44 @@
+# Micro-benchmark of querying a `Mirror` of 50000 invoices: filtering by an indexed field, an indexed date range,
+# and a page of all of them sorted by date, as the same builders would query FreshBooks.
+#
+# Run from the repository root with: python -m benchmarks.mirror_queries
+
+import timeit
+
+from freshbooks import Client, FilterBuilder, Mirror, PaginateBuilder, SortBuilder
+from freshbooks.models import Result
+
+INVOICES = 50000
+CALLS = 100
+ACCOUNT_ID = "ACM123"
+
+QUERIES = {
+    "customerid": [FilterBuilder().equals("customerid", 1234)],
+    "create_date range": [
+        FilterBuilder().between("create_date_min", min="2020-03-01").between("create_date_max", max="2020-03-03")
+    ],
+    "sorted page": [SortBuilder().descending("create_date"), PaginateBuilder(3, 100)],
+}
+
+
+def invoice(id: int) -> Result:
+    return Result("invoice", {"invoice": {
+        "id": id, "invoiceid": id, "customerid": id % 2000, "v3_status": ("paid", "sent", "draft")[id % 3],
+        "create_date": f"2020-{id % 12 + 1:02d}-{id % 28 + 1:02d}", "updated": "2020-11-01 10:00:00",
+        "amount": {"amount": f"{id % 1000}.00", "code": "CAD"}, "vis_state": 0,
+    }})
+
+
+def main() -> None:
+    mirror = Mirror(Client(client_id="some_client", access_token="some_token"))
+    mirror._store("invoices", ACCOUNT_ID, [invoice(id) for id in range(INVOICES)])
+    mirror._analyze()
+    for name, builders in QUERIES.items():
+        count = len(mirror.invoices.list(ACCOUNT_ID, builders=builders))
+        calls = timeit.repeat(lambda: mirror.invoices.list(ACCOUNT_ID, builders=builders), number=CALLS, repeat=5)
+        seconds = min(calls)
+        print(f"{name}: {seconds / CALLS * 1e3:.2f}ms per list of {count} of {INVOICES} invoices")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# Micro-benchmark of building the query string of a list call with a 500 id `in_list` filter and an include.
+#
+# "quadratic" is the previous build, concatenating the query string one filter at a time. "rebuilt" builds new
+# builders with a single join on every call, "unchanged" reuses builders that remember their query string, and
+# "frozen" uses frozen copies of them.
+#
+# Run from the repository root with: python -m benchmarks.query_builders
+
+import timeit
+
+from freshbooks import Client, FilterBuilder, IncludesBuilder
+
+IDS = list(range(100000, 100500))
+CALLS = 1000
+
+clients = Client(client_id="some_client", access_token="some_token").clients
+builders = [FilterBuilder().in_list("userids", IDS).equals("vis_state", 0), IncludesBuilder().include("lines")]
+frozen = [builder.freeze() for builder in builders]
+
+
+def quadratic() -> str:
+    query_string = ""
+    for userid in IDS:
+        query_string = f"{query_string}&search[userids][]={userid}"
+    query_string = f"{query_string}&search[vis_state]=0&include[]=lines"
+    return "?" + query_string[1:]
+
+
+def unchanged() -> str:
+    return clients._build_query_string(builders)
+
+
+def rebuilt() -> str:
+    return clients._build_query_string(
+        [FilterBuilder().in_list("userids", IDS).equals("vis_state", 0), IncludesBuilder().include("lines")]
+    )
+
+
+def frozen_builders() -> str:
+    return clients._build_query_string(frozen)
+
+
+if __name__ == "__main__":
+    assert quadratic() == unchanged() == rebuilt() == frozen_builders()
+    for name, func in (
+        ("quadratic", quadratic), ("rebuilt", rebuilt), ("unchanged", unchanged), ("frozen", frozen_builders)
+    ):
+        seconds = min(timeit.repeat(func, number=CALLS, repeat=5))
+        print(f"{name:>10}: {seconds / CALLS * 1e6:8.2f} µs per call")
@@ -0,0 +1,32 @@
+# Micro-benchmark of the per-call overhead of accessing a resource on the client, eg. `freshBooksClient.invoices`.
+#
+# "uncached" rebuilds the resource (with its own session and retry adapter) on every access, as the client did
+# before resources were cached. "cached" is the current behaviour.
+#
+# Run from the repository root with: python -m benchmarks.resource_access
+
+import timeit
+from types import SimpleNamespace
+
+from freshbooks import Client as FreshBooksClient
+from freshbooks.api.accounting import AccountingResource
+
+NUMBER = 10000
+
+freshBooksClient = FreshBooksClient(client_id="some_client", access_token="some_token")
+
+
+def uncached() -> AccountingResource:
+    config = SimpleNamespace(**vars(freshBooksClient._client_resource_config()))
+    config.session = None
+    return AccountingResource(config, "invoices/invoices", "invoice", "invoices", delete_via_update=False)
+
+
+def cached() -> AccountingResource:
+    return freshBooksClient.invoices
+
+
+if __name__ == "__main__":
+    for name, func in (("uncached", uncached), ("cached", cached)):
+        seconds = min(timeit.repeat(func, number=NUMBER, repeat=5))
+        print(f"{name:>10}: {seconds / NUMBER * 1e6:8.2f} µs per access")
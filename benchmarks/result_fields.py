@@ -0,0 +1,51 @@
+# Micro-benchmark of reading converted fields (datetimes, nested results) from a 10,000 invoice `ListResult`.
+#
+# "first read" converts every field of every invoice, as every read did before converted values were remembered.
+# "repeated read" reads them again, which is now answered from each `Result`'s memoized values.
+#
+# Run from the repository root with: python -m benchmarks.result_fields
+
+import time
+from typing import Any, Dict, List
+
+from freshbooks.models import ListResult, Result
+
+INVOICES = 10000
+
+
+def invoice(index: int) -> Dict[str, Any]:
+    return {
+        "id": index,
+        "invoiceid": index,
+        "create_date": "2021-06-28",
+        "updated": "2021-06-28 14:05:15",
+        "amount": {"amount": "100.00", "code": "CAD"},
+        "outstanding": {"amount": "50.00", "code": "CAD"},
+        "lines": [{"lineid": 1, "amount": {"amount": "100.00", "code": "CAD"}}],
+    }
+
+
+def build() -> ListResult:
+    data = {
+        "invoices": [invoice(index) for index in range(INVOICES)],
+        "page": 1, "pages": 1, "per_page": INVOICES, "total": INVOICES,
+    }
+    return ListResult("invoices", "invoice", data)
+
+
+def read(invoices: List[Result]) -> None:
+    for result in invoices:
+        result.create_date
+        result.updated
+        result.amount.amount
+        result.outstanding.code
+        result.lines
+
+
+if __name__ == "__main__":
+    invoices = list(build())
+    for name in ("first read", "repeated read"):
+        started = time.perf_counter()
+        read(invoices)
+        seconds = time.perf_counter() - started
+        print(f"{name:>14}: {seconds / INVOICES * 1e6:8.2f} µs per invoice")
@@ -0,0 +1,35 @@
+# Micro-benchmark of `Result` against the typed `Invoice` model over 10,000 invoices.
+#
+# Reports the memory allocated per record after reading its fields, and the time to read the fields for the
+# first time (converting them) and again (memoized).
+#
+# Run from the repository root with: python -m benchmarks.typed_models
+
+import time
+import tracemalloc
+from typing import Any, Callable, List
+
+from benchmarks.result_fields import INVOICES, invoice, read
+from freshbooks.models import Result
+from freshbooks.typed_models import Invoice
+
+
+def measure(name: str, wrap: Callable[[dict], Any]) -> None:
+    data = [invoice(index) for index in range(INVOICES)]
+    tracemalloc.start()
+    records: List[Any] = [wrap(item) for item in data]
+    started = time.perf_counter()
+    read(records)
+    first = time.perf_counter() - started
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    started = time.perf_counter()
+    read(records)
+    repeated = time.perf_counter() - started
+    print(f"{name:>7}: {allocated / INVOICES:8.0f} bytes, {first / INVOICES * 1e6:6.2f} µs first read, "
+          f"{repeated / INVOICES * 1e6:6.2f} µs repeated read per invoice")
+
+
+if __name__ == "__main__":
+    measure("Result", lambda item: Result("invoice", {"invoice": item}))
+    measure("Invoice", Invoice)
@@ -2,15 +2,36 @@
 The FreshBooks Python SDK allows you to more easily utilize the [FreshBooks API](https://www.freshbooks.com/api).
 
 - See `freshbooks.client.Client` for instantiating a Client, auth, and resource calls
+- See `freshbooks.async_client.AsyncClient` for making resource calls with asyncio
 - See `freshbooks.api.accounting` and `freshbooks.api.projects` for resource methods (`get`, `list`, `create`, etc.)
 - See `freshbooks.builders` for list filters, pagination, includes, etc.
 - See `freshbooks.models` for Result objects, lists, identities, and vis state objects.
+- See `freshbooks.typed_models` for the opt-in typed models of resources.
+- See `freshbooks.columnar` for exporting lists of resources to pandas, Arrow, and NumPy.
+- See `freshbooks.streaming` for parsing large list responses incrementally.
+- See `freshbooks.cache`, `freshbooks.http_cache`, and `freshbooks.singleflight` for caching and coalescing
+  responses.
+- See `freshbooks.ratelimit` and `freshbooks.concurrency` for client-side rate and concurrency limiting of calls.
+- See `freshbooks.retry` for configuring how failed calls are retried.
+- See `freshbooks.idempotency` for safely retrying creates and updates with idempotency keys.
+- See `freshbooks.sync` for incrementally syncing the resources changed since the last run.
+- See `freshbooks.mirror` for querying a local SQLite copy of an account's resources.
 """
 
+from freshbooks.async_client import AsyncClient  # noqa
 from freshbooks.builders.filter import FilterBuilder  # noqa
 from freshbooks.builders.includes import IncludesBuilder  # noqa
 from freshbooks.builders.paginator import PaginateBuilder  # noqa
 from freshbooks.builders.sort import SortBuilder  # noqa
+from freshbooks.cache import ResponseCache  # noqa
 from freshbooks.client import Client  # noqa
+from freshbooks.concurrency import AdaptiveConcurrencyLimiter  # noqa
 from freshbooks.errors import FreshBooksError  # noqa
+from freshbooks.http_cache import HTTPCache  # noqa
+from freshbooks.idempotency import IdempotencyJournal  # noqa
+from freshbooks.mirror import Mirror  # noqa
 from freshbooks.models import VisState  # noqa
+from freshbooks.ratelimit import RateLimiter  # noqa
+from freshbooks.retry import RetryPolicy  # noqa
+from freshbooks.singleflight import SingleFlight  # noqa
+from freshbooks.sync import SyncEngine  # noqa
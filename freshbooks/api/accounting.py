@@ -1,12 +1,13 @@
-from decimal import Decimal
 from types import SimpleNamespace
-from typing import Any, List, Optional, Tuple
+from typing import Any, Callable, Iterator, List, Optional, Tuple
 
-from freshbooks.api.resource import HttpVerbs, Resource
+from freshbooks.api.pagination import DEFAULT_MAX_WORKERS, fan_out_chunks, iter_pages, stream_chunks
+from freshbooks.api.resource import HttpVerbs, Resource, _resend
 from freshbooks.builders import Builder
 from freshbooks.builders.includes import IncludesBuilder
 from freshbooks.errors import FreshBooksError, FreshBooksNotImplementedError
 from freshbooks.models import ListResult, Result, VisState
+from freshbooks.streaming import ListStream
 
 
 class AccountingResource(Resource):
@@ -37,16 +38,14 @@ class AccountingResource(Resource):
         else:
             return errors["message"], int(errors["errno"]), None  # pragma: no cover
 
-    def _request(self, url: str, method: str, data: Optional[dict] = None) -> Any:
-        response = self._send_request(url, method, data)
-
+    def _handle_response(self, response: Any, method: str) -> Any:
         status = response.status_code
         if status == 200 and method == HttpVerbs.HEAD:  # pragma: no cover
             # no content returned from a HEAD
             return
 
         try:
-            response_data = response.json(parse_float=Decimal)
+            response_data = self._decode(response)
         except ValueError:
             raise FreshBooksError(status, "Failed to parse response", raw_response=response.text)
 
@@ -73,7 +72,8 @@ class AccountingResource(Resource):
             resource_id: Id of the resource to return
             includes: (Optional) IncludesBuilder object for including additional data, sub-resources, etc.
         Returns:
-            Result: Result object with the resource's response data.
+            Result: Result object with the resource's response data,
+                or its `freshbooks.typed_models` model if the client was created with `typed_models=True`.
 
         Raises:
             FreshBooksError: If the call is not successful.
@@ -84,7 +84,7 @@ class AccountingResource(Resource):
         if includes:
             query_string = self._build_query_string([includes])
         data = self._request(f"{resource_url}{query_string}", HttpVerbs.GET)
-        return Result(self.single_name, data)
+        return self._result(self.single_name, data)
 
     def list(self, account_id: str, builders: Optional[List[Builder]] = None) -> ListResult:
         """Get a list of resources.
@@ -95,6 +95,7 @@ class AccountingResource(Resource):
 
         Returns:
             ListResult: ListResult object with the resources response data.
+                Its resources are `freshbooks.typed_models` models if the client was created with `typed_models=True`.
 
         Raises:
             FreshBooksError: If the call is not successful.
@@ -103,53 +104,216 @@ class AccountingResource(Resource):
         resource_url = self._get_url(account_id)
         query_string = self._build_query_string(builders)
         data = self._request(f"{resource_url}{query_string}", HttpVerbs.GET)
-        return ListResult(self.list_name, self.single_name, data)
+        return self._list_result(self.list_name, self.single_name, data)
+
+    def _stream_list_page(self, account_id: str, builders: Optional[List[Builder]] = None) -> ListStream:
+        url = self._get_url(account_id)
+        query_string = self._build_query_string(builders)
+        path = ("response", "result", self.list_name)
+        return self._stream_list(f"{url}{query_string}", self.list_name, self.single_name, path)
+
+    def iter_all(
+        self, account_id: str, builders: Optional[List[Builder]] = None, prefetch: int = 0, stream: bool = False
+    ) -> Iterator[Result]:
+        """Iterate through every resource of a list call, across all pages.
+
+        Pages are fetched lazily as the iterator is consumed, 100 resources at a time
+        (or the `per_page` of a provided `PaginateBuilder`), so only one page is held in memory at once.
+
+        With `prefetch`, up to that many of the following pages are fetched on background threads while
+        the current page is being processed, hiding the network latency behind the caller's work at the cost
+        of holding `prefetch` more pages in memory.
+
+        With `stream`, each page's resources are instead parsed out of the response as it arrives and
+        yielded as soon as each one is received, so that a large page (eg. invoices with their lines) is never
+        held in memory in full. See `freshbooks.streaming`. Streamed pages are fetched one at a time.
+
+        Filters too long for one call's query string (over `MAX_QUERY_LENGTH`, eg. an `in_list` of thousands of
+        ids) are split into several calls, each for a chunk of the values, which are made in turn when streaming,
+        and otherwise on up to `prefetch` (at least one) background threads. See `freshbooks.api.pagination`.
+
+        ```python
+        for invoice in freshBooksClient.invoices.iter_all(account_id, builders=[filter]):
+            print(invoice.invoice_number)
+        ```
+
+        Args:
+            account_id: The alpha-numeric account id
+            builders: (Optional) List of builder objects for filters, pagination, etc.
+            prefetch: (Optional) The number of pages to fetch ahead of the page being consumed. Default 0.
+            stream: (Optional) Parse each page's resources as the response arrives. Default False.
+
+        Returns:
+            Iterator of Result objects for each resource.
+
+        Raises:
+            FreshBooksError: If any of the calls are not successful.
+            ValueError: If both `prefetch` and `stream` are requested.
+        """
+        self._reject_missing("list")
+        if stream and prefetch > 0:
+            raise ValueError("Streamed pages can't be prefetched")
+        chunks = self._query_chunks(builders)
+        if stream:
+            yield from stream_chunks(self._stream_list_page, account_id, chunks)
+            return
+        if len(chunks) > 1:
+            yield from fan_out_chunks(self.list, account_id, chunks, max(1, prefetch))
+            return
+        for results in iter_pages(self.list, account_id, builders, prefetch):
+            yield from results
+
+    def list_all(
+        self, account_id: str, builders: Optional[List[Builder]] = None, max_workers: int = DEFAULT_MAX_WORKERS,
+        ordered: bool = True
+    ) -> Iterator[Result]:
+        """Iterate through every resource of a list call, fetching the pages concurrently.
+
+        The first page is fetched to find the total number of pages, then the remaining pages are fetched
+        on a pool of up to `max_workers` threads sharing the client's connection pool. Results are yielded in
+        page order, or with `ordered=False` a page's results are yielded as soon as that page arrives.
 
-    def create(self, account_id: str, data: dict, includes: Optional[IncludesBuilder] = None) -> Result:
+        Filters too long for one call's query string (over `MAX_QUERY_LENGTH`, eg. an `in_list` of thousands of
+        ids) are split into several calls, each for a chunk of the values. The first page of every chunk is
+        fetched concurrently, then the remaining pages, and each resource is yielded once.
+
+        ```python
+        for invoice in freshBooksClient.invoices.list_all(account_id, max_workers=8):
+            print(invoice.invoice_number)
+        ```
+
+        Args:
+            account_id: The alpha-numeric account id
+            builders: (Optional) List of builder objects for filters, pagination, etc.
+            max_workers: (Optional) The maximum number of pages to fetch at once. Should not exceed the
+                client's `pool_maxsize`.
+            ordered: (Optional) Yield results in page order (default) or in the order the pages are received.
+
+        Returns:
+            Iterator of Result objects for each resource.
+
+        Raises:
+            FreshBooksError: If any of the calls are not successful.
+        """
+        self._reject_missing("list")
+        yield from fan_out_chunks(self.list, account_id, self._query_chunks(builders), max_workers, ordered)
+
+    def list_partitions(
+        self, account_id: str, partitions: List[Builder], builders: Optional[List[Builder]] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS, ordered: bool = True
+    ) -> Iterator[Result]:
+        """Iterate through every resource of several list calls, one for each of the `partitions` of a scan (eg.
+        the sub-ranges of a date range from `FilterBuilder.partition`), fetching their pages concurrently.
+
+        Each partition is an independent, shorter scan, so a large range is read without paging deep into one
+        long list, where pages get slower and resources changed during the scan can shift between pages. The first
+        page of every partition is fetched, then their remaining pages, on up to `max_workers` threads. Each
+        resource is yielded once, even if more than one partition finds it.
+
+        ```python
+        filter = FilterBuilder().equals("vis_state", 0)
+        partitions = filter.partition("date", date(2020, 1, 1), date(2024, 12, 31), parts=8)
+        for invoice in freshBooksClient.invoices.list_partitions(account_id, partitions, max_workers=8):
+            print(invoice.invoice_number)
+        ```
+
+        Args:
+            account_id: The alpha-numeric account id
+            partitions: The filters of each partition
+            builders: (Optional) List of builder objects added to every partition's list call (eg. includes).
+            max_workers: (Optional) The maximum number of pages to fetch at once. Should not exceed the
+                client's `pool_maxsize`.
+            ordered: (Optional) Yield results in partition and page order (default) or in the order the pages are
+                received.
+
+        Returns:
+            Iterator of Result objects for each resource.
+
+        Raises:
+            FreshBooksError: If any of the calls are not successful.
+            ValueError: If there are no `partitions`.
+        """
+        self._reject_missing("list")
+        chunks = self._partition_chunks(partitions, builders)
+        yield from fan_out_chunks(self.list, account_id, chunks, max_workers, ordered)
+
+    def _created_lookup(
+        self, account_id: str, key: Optional[str], lookup: Optional[List[Builder]]
+    ) -> Optional[Callable[[], Optional[dict]]]:
+        if lookup is None or key is None:
+            return None
+        return lambda: self._found_write(key, self.list(account_id, builders=lookup))
+
+    def create(
+        self, account_id: str, data: dict, includes: Optional[IncludesBuilder] = None,
+        idempotency_key: Optional[str] = None, lookup: Optional[List[Builder]] = None
+    ) -> Result:
         """Create a resource.
 
+        With an `idempotency_key`, the call is recorded in the client's `freshbooks.idempotency.IdempotencyJournal`
+        so that it is made at most once, and can be safely retried. If it fails in a way that leaves it unknown
+        whether the resource was created, it is only retried after a list call with the `lookup` filters finds
+        no such resource. The filters should match only the resource being created (eg. by a unique
+        `invoice_number`). Without a `lookup`, such failures are raised and not retried.
+
         Args:
             account_id: The alpha-numeric account id
             data: Dictionary of data to populate the resource
             builders: (Optional) IncludesBuilder object for including additional data, sub-resources, etc.
+            idempotency_key: (Optional) A client-generated key identifying this particular create call
+            lookup: (Optional) Builders for a list call finding the resource if it was created
 
         Returns:
             Result: Result object with the new resource's response data.
 
         Raises:
             FreshBooksError: If the call is not successful.
+            FreshBooksIdempotencyError: If the key was used for a different call, or the call may have been made
+                and can't be looked up.
         """
         self._reject_missing("create")
         resource_url = self._get_url(account_id)
         query_string = ""
         if includes:
             query_string = self._build_query_string([includes])
-        response = self._request(f"{resource_url}{query_string}", HttpVerbs.POST, data={self.single_name: data})
+        response = self._write(
+            f"{resource_url}{query_string}", HttpVerbs.POST, {self.single_name: data}, idempotency_key,
+            self._created_lookup(account_id, idempotency_key, lookup)
+        )
         return Result(self.single_name, response)
 
     def update(
-        self, account_id: str, resource_id: int, data: dict, includes: Optional[IncludesBuilder] = None
+        self, account_id: str, resource_id: int, data: dict, includes: Optional[IncludesBuilder] = None,
+        idempotency_key: Optional[str] = None
     ) -> Result:
         """Update a resource.
 
+        With an `idempotency_key`, the call is recorded in the client's `freshbooks.idempotency.IdempotencyJournal`
+        so that a completed update is not made again. Updates can be safely repeated, so they are retried
+        without a lookup.
+
         Args:
             account_id: The alpha-numeric account id
             resource_id: Id of the resource to update
             data: Dictionary of data to update the resource to
             builders: (Optional) IncludesBuilder object for including additional data, sub-resources, etc.
+            idempotency_key: (Optional) A client-generated key identifying this particular update call
 
         Returns:
             Result: Result object with the updated resource's response data.
 
         Raises:
             FreshBooksError: If the call is not successful.
+            FreshBooksIdempotencyError: If the key was used for a different call.
         """
         self._reject_missing("update")
         resource_url = self._get_url(account_id, resource_id)
         query_string = ""
         if includes:
             query_string = self._build_query_string([includes])
-        response = self._request(f"{resource_url}{query_string}", HttpVerbs.PUT, data={self.single_name: data})
+        response = self._write(
+            f"{resource_url}{query_string}", HttpVerbs.PUT, {self.single_name: data}, idempotency_key, _resend
+        )
         return Result(self.single_name, response)
 
     def delete(self, account_id: str, resource_id: int) -> Result:
@@ -1,4 +1,3 @@
-from decimal import Decimal
 from types import SimpleNamespace
 from typing import Any, List, Optional, Tuple
 
@@ -36,9 +35,7 @@ class AccountingBusinessResource(Resource):
                 details.append(detail["metadata"])
         return message, details
 
-    def _request(self, url: str, method: str, data: Optional[dict] = None) -> Any:
-        response = self._send_request(url, method, data)
-
+    def _handle_response(self, response: Any, method: str) -> Any:
         status = response.status_code
         if status == 200 and method == HttpVerbs.HEAD:  # pragma: no cover
             # no content returned from a HEAD
@@ -47,7 +44,7 @@ class AccountingBusinessResource(Resource):
             return {"data": {}}
 
         try:
-            response_data = response.json(parse_float=Decimal)
+            response_data = self._decode(response)
         except ValueError:
             raise FreshBooksError(status, "Failed to parse response", raw_response=response.text)
 
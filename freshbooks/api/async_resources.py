@@ -0,0 +1,632 @@
+"""Asynchronous versions of the FreshBooks resources, used by `freshbooks.async_client.AsyncClient`.
+
+Each resource here mirrors the methods of its synchronous counterpart as coroutines, sending requests
+over a pooled `httpx.AsyncClient`. URL building and the per-API response and error handling are shared
+with the synchronous resources, so the two behave identically.
+"""
+import asyncio
+import json
+import time
+from io import BufferedReader
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from freshbooks.api.accounting import AccountingResource
+from freshbooks.api.accounting_business import AccountingBusinessResource
+from freshbooks.api.auth import AuthResource
+from freshbooks.api.comments import CommentsResource, CommentsSubResource
+from freshbooks.api.events import EventsResource
+from freshbooks.api.pagination import DEFAULT_MAX_WORKERS, afan_out_chunks, aiter_pages, astream_chunks
+from freshbooks.api.payments import PaymentsResource
+from freshbooks.api.projects import ProjectsResource
+from freshbooks.api.resource import HttpVerbs, Resource
+from freshbooks.api.timetracking import TimetrackingResource
+from freshbooks.api.uploads import UploadsResource
+from freshbooks.builders import Builder
+from freshbooks.builders.includes import IncludesBuilder
+from freshbooks.errors import FreshBooksIdempotencyError
+from freshbooks.idempotency import is_unknown_outcome
+from freshbooks.models import Identity, ListResult, Result, VisState
+from freshbooks.ratelimit import rate_limit_key
+from freshbooks.streaming import CHUNK_SIZE, AsyncListStream
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None  # type: ignore
+
+
+async def _resend_async() -> Optional[dict]:
+    """The lookup of a keyed write that can be safely repeated. See `freshbooks.api.resource._resend`."""
+    return None
+
+
+class AsyncResource(Resource):
+    """Base for resources making non-blocking calls with `httpx`."""
+
+    @classmethod
+    def _config_session(cls, pool_connections: int = Resource.POOL_CONNECTIONS,  # type: ignore
+                        pool_maxsize: int = Resource.POOL_MAXSIZE) -> "httpx.AsyncClient":
+        """Create an `httpx.AsyncClient` with a pool of up to `pool_maxsize` connections.
+
+        `pool_connections` is accepted for parity with `freshbooks.api.resource.Resource`, but httpx
+        does not limit the number of hosts that are pooled.
+        """
+        limits = httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize)
+        return httpx.AsyncClient(transport=httpx.AsyncHTTPTransport(limits=limits))
+
+    def _builder_resource_name(self) -> str:
+        # Query strings are built the same as for the synchronous resource this mirrors
+        return next(cls.__name__ for cls in type(self).__mro__ if not issubclass(cls, AsyncResource))
+
+    async def _send_request_async(
+        self, uri: str, method: str, data: Optional[dict] = None, files: Optional[dict] = None, stream: bool = False,
+        retry: bool = True
+    ) -> Any:
+        """Send a request, retrying it if needed. See `freshbooks.api.resource.Resource._send_request`."""
+        payload = None
+        has_data = data is not None
+        if has_data and method in (HttpVerbs.POST, HttpVerbs.PUT, HttpVerbs.PATCH):
+            payload = json.dumps(data)
+
+        headers = self.headers(method, has_data)
+        lookup = None if stream else self._http_cache_lookup(uri, method)
+        if lookup is not None:
+            if lookup.fresh:
+                return lookup.response
+            headers.update(lookup.conditional_headers())
+
+        response = await self._send_async(uri, method, payload, files, headers, stream, retry)
+        return self._http_cache_update(uri, method, lookup, response)
+
+    async def _send_async(
+        self, uri: str, method: str, payload: Optional[str], files: Optional[dict], headers: Dict[str, str],
+        stream: bool, retry_failures: bool = True
+    ) -> "httpx.Response":
+        """Send a request, retrying it according to the resource's `freshbooks.retry.RetryPolicy`."""
+        if not retry_failures:
+            return await self._send_once_async(uri, method, payload, files, headers, stream)
+        started = time.monotonic()
+        retry = 0
+        while True:
+            retry += 1
+            try:
+                response = await self._send_once_async(uri, method, payload, files, headers, stream)
+            except (httpx.NetworkError, httpx.ConnectTimeout):
+                delay = self._retry_delay(method, None, None, retry, started)
+                if delay is None:
+                    raise
+            else:
+                delay = self._retry_delay(method, response.status_code, response.headers, retry, started)
+                if delay is None:
+                    return response
+                await response.aclose()
+            await asyncio.sleep(delay)
+
+    async def _send_once_async(
+        self, uri: str, method: str, payload: Optional[str], files: Optional[dict], headers: Dict[str, str],
+        stream: bool
+    ) -> "httpx.Response":
+        """Send a request once the client's rate and concurrency limiters, if any, allow it."""
+        session: Any = self.session
+        limit_key = rate_limit_key(uri)
+        if self.rate_limiter:
+            await asyncio.sleep(self.rate_limiter.reserve(limit_key))
+        if self.concurrency_limiter:
+            await self.concurrency_limiter.acquire_async()
+        started = time.monotonic()
+        status_code = None
+        try:
+            request = session.build_request(
+                method, uri, content=payload, files=files, headers=headers, timeout=self.timeout
+            )
+            response: httpx.Response = await session.send(request, stream=stream)
+            status_code = response.status_code
+        finally:
+            if self.concurrency_limiter:
+                self.concurrency_limiter.release(status_code, time.monotonic() - started)
+        if self.rate_limiter:
+            self.rate_limiter.update(limit_key, response.status_code, response.headers)
+        return response
+
+    async def _send_and_cache_async(self, url: str, method: str, data: Optional[dict] = None) -> Any:
+        response = await self._send_request_async(url, method, data)
+        self._update_cache(url, method, response)
+        return response
+
+    async def _request_async(self, url: str, method: str, data: Optional[dict] = None) -> Any:
+        response: Any = self._cached_response(url, method)
+        if response is None:
+            if self.single_flight is not None and method is HttpVerbs.GET:
+                response = await self.single_flight.do_async(
+                    self._request_key(url), lambda: self._send_and_cache_async(url, method)
+                )
+            else:
+                response = await self._send_and_cache_async(url, method, data)
+        return self._handle_response(response, method)
+
+    async def _write_async(
+        self, url: str, method: str, data: dict, key: Optional[str],
+        lookup: Optional[Callable[[], Awaitable[Optional[dict]]]]
+    ) -> Any:
+        """Make a `POST` or `PUT` call, keyed by `key` if there is one. See `_idempotent_request_async`."""
+        if key is None:
+            return await self._request_async(url, method, data=data)
+        return await self._idempotent_request_async(url, method, data, key, lookup)
+
+    async def _idempotent_request_async(
+        self, url: str, method: str, data: dict, key: str, lookup: Optional[Callable[[], Awaitable[Optional[dict]]]]
+    ) -> Any:
+        """Make an idempotency-keyed write. See `freshbooks.api.resource.Resource._idempotent_request`."""
+        with self._journal_write(key, method, url, data) as write:
+            if write.response is not None:
+                return write.response
+            unknown = write.resumed
+            started = time.monotonic()
+            retry = 0
+            while True:
+                if unknown:
+                    if lookup is None:
+                        raise FreshBooksIdempotencyError(
+                            f"The write with the idempotency key '{key}' may have been made, and can't be looked up"
+                        )
+                    self._invalidate_caches(url)
+                    found = await lookup()
+                    if found is not None:
+                        write.complete(found)
+                        return found
+                retry += 1
+                error: Optional[Exception] = None
+                response: Any = None
+                try:
+                    response = await self._send_request_async(url, method, data, retry=False)
+                    status_code, headers = response.status_code, response.headers
+                except (httpx.NetworkError, httpx.TimeoutException) as e:
+                    error, status_code, headers = e, None, None
+                if status_code is not None and status_code < 400:
+                    self._update_cache(url, method, response)
+                    result = self._handle_response(response, method)
+                    write.complete(result)
+                    return result
+                unknown = is_unknown_outcome(status_code)
+                delay = self._write_retry_delay(method, status_code, headers, retry, started, lookup is not None)
+                if delay is None:
+                    if error is not None:
+                        raise error
+                    if not unknown:
+                        write.discard()
+                    return self._handle_response(response, method)
+                await asyncio.sleep(delay)
+
+    async def _stream_list(  # type: ignore[override]
+        self, url: str, list_name: str, single_name: str, path: Tuple[str, ...]
+    ) -> AsyncListStream:
+        """Make a list call, returning a `freshbooks.streaming.AsyncListStream` of its resources.
+        See `freshbooks.api.resource.Resource._stream_list`.
+        """
+        response = await self._send_request_async(url, HttpVerbs.GET, stream=True)
+        if response.status_code >= 400:
+            try:
+                await response.aread()
+                self._handle_response(response, HttpVerbs.GET)
+            finally:
+                await response.aclose()
+        results = self._list_result(list_name, single_name, {list_name: []})
+        return AsyncListStream(
+            results, path, response.aiter_bytes(CHUNK_SIZE), response.aclose, response.status_code
+        )
+
+
+class AsyncAccountingResource(AsyncResource, AccountingResource):
+    """Asynchronous `freshbooks.api.accounting.AccountingResource`."""
+
+    async def get(  # type: ignore[override]
+        self, account_id: str, resource_id: int, includes: Optional[IncludesBuilder] = None
+    ) -> Result:
+        """Get a single resource with the corresponding id. See `AccountingResource.get`."""
+        self._reject_missing("get")
+        resource_url = self._get_url(account_id, resource_id)
+        query_string = ""
+        if includes:
+            query_string = self._build_query_string([includes])
+        data = await self._request_async(f"{resource_url}{query_string}", HttpVerbs.GET)
+        return self._result(self.single_name, data)
+
+    async def list(  # type: ignore[override]
+        self, account_id: str, builders: Optional[List[Builder]] = None
+    ) -> ListResult:
+        """Get a list of resources. See `AccountingResource.list`."""
+        self._reject_missing("list")
+        resource_url = self._get_url(account_id)
+        query_string = self._build_query_string(builders)
+        data = await self._request_async(f"{resource_url}{query_string}", HttpVerbs.GET)
+        return self._list_result(self.list_name, self.single_name, data)
+
+    async def iter_all(  # type: ignore[override]
+        self, account_id: str, builders: Optional[List[Builder]] = None, prefetch: int = 0, stream: bool = False
+    ) -> AsyncIterator[Result]:
+        """Asynchronously iterate through every resource of a list call, across all pages.
+        See `AccountingResource.iter_all`.
+
+        ```python
+        async for invoice in freshBooksClient.invoices.iter_all(account_id):
+            print(invoice.invoice_number)
+        ```
+        """
+        self._reject_missing("list")
+        if stream and prefetch > 0:
+            raise ValueError("Streamed pages can't be prefetched")
+        chunks = self._query_chunks(builders)
+        if stream:
+            async for result in astream_chunks(self._stream_list_page, account_id, chunks):  # type: ignore[arg-type]
+                yield result
+            return
+        if len(chunks) > 1:
+            async for result in afan_out_chunks(self.list, account_id, chunks, max(1, prefetch)):
+                yield result
+            return
+        async for results in aiter_pages(self.list, account_id, builders, prefetch):
+            for result in results:
+                yield result
+
+    async def list_all(  # type: ignore[override]
+        self, account_id: str, builders: Optional[List[Builder]] = None, max_workers: int = DEFAULT_MAX_WORKERS,
+        ordered: bool = True
+    ) -> AsyncIterator[Result]:
+        """Asynchronously iterate through every resource of a list call, fetching up to `max_workers` pages
+        at once. See `AccountingResource.list_all`.
+        """
+        self._reject_missing("list")
+        chunks = self._query_chunks(builders)
+        async for result in afan_out_chunks(self.list, account_id, chunks, max_workers, ordered):
+            yield result
+
+    async def list_partitions(  # type: ignore[override]
+        self, account_id: str, partitions: List[Builder], builders: Optional[List[Builder]] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS, ordered: bool = True
+    ) -> AsyncIterator[Result]:
+        """Asynchronously iterate through every resource of several list calls, one for each of the `partitions`
+        of a scan, fetching up to `max_workers` pages at once. See `AccountingResource.list_partitions`.
+        """
+        self._reject_missing("list")
+        chunks = self._partition_chunks(partitions, builders)
+        async for result in afan_out_chunks(self.list, account_id, chunks, max_workers, ordered):
+            yield result
+
+    def _created_lookup(  # type: ignore[override]
+        self, account_id: str, key: Optional[str], lookup: Optional[List[Builder]]
+    ) -> Optional[Callable[[], Awaitable[Optional[dict]]]]:
+        if lookup is None or key is None:
+            return None
+
+        async def find() -> Optional[dict]:
+            return self._found_write(key, await self.list(account_id, builders=lookup))
+        return find
+
+    async def create(  # type: ignore[override]
+        self, account_id: str, data: dict, includes: Optional[IncludesBuilder] = None,
+        idempotency_key: Optional[str] = None, lookup: Optional[List[Builder]] = None
+    ) -> Result:
+        """Create a resource. See `AccountingResource.create`."""
+        self._reject_missing("create")
+        resource_url = self._get_url(account_id)
+        query_string = ""
+        if includes:
+            query_string = self._build_query_string([includes])
+        response = await self._write_async(
+            f"{resource_url}{query_string}", HttpVerbs.POST, {self.single_name: data}, idempotency_key,
+            self._created_lookup(account_id, idempotency_key, lookup)
+        )
+        return Result(self.single_name, response)
+
+    async def update(  # type: ignore[override]
+        self, account_id: str, resource_id: int, data: dict, includes: Optional[IncludesBuilder] = None,
+        idempotency_key: Optional[str] = None
+    ) -> Result:
+        """Update a resource. See `AccountingResource.update`."""
+        self._reject_missing("update")
+        resource_url = self._get_url(account_id, resource_id)
+        query_string = ""
+        if includes:
+            query_string = self._build_query_string([includes])
+        response = await self._write_async(
+            f"{resource_url}{query_string}", HttpVerbs.PUT, {self.single_name: data}, idempotency_key, _resend_async
+        )
+        return Result(self.single_name, response)
+
+    async def delete(self, account_id: str, resource_id: int) -> Result:  # type: ignore[override]
+        """Delete a resource. See `AccountingResource.delete`."""
+        self._reject_missing("delete")
+        if self.delete_via_update:
+            response = await self._request_async(
+                self._get_url(account_id, resource_id),
+                HttpVerbs.PUT,
+                data={self.single_name: {"vis_state": VisState.DELETED}}
+            )
+        else:
+            response = await self._request_async(self._get_url(account_id, resource_id), HttpVerbs.DELETE)
+        return Result(self.single_name, response)
+
+
+class AsyncEventsResource(AsyncAccountingResource, EventsResource):
+    """Asynchronous `freshbooks.api.events.EventsResource`."""
+
+    async def verify(self, account_id: str, resource_id: int, verifier: str) -> Result:  # type: ignore[override]
+        """Verify webhook callback by making a put request. See `EventsResource.verify`."""
+        response = await self._request_async(
+            self._get_url(account_id, resource_id), HttpVerbs.PUT, data={self.single_name: {"verifier": verifier}}
+        )
+        return Result(self.single_name, response)
+
+    async def resend_verification(self, account_id: str, resource_id: int) -> Result:  # type: ignore[override]
+        """Tell FreshBooks to resend the verification webhook for the callback.
+        See `EventsResource.resend_verification`.
+        """
+        response = await self._request_async(
+            self._get_url(account_id, resource_id), HttpVerbs.PUT, data={self.single_name: {"resend": True}}
+        )
+        return Result(self.single_name, response)
+
+
+class AsyncAccountingBusinessResource(AsyncResource, AccountingBusinessResource):
+    """Asynchronous `freshbooks.api.accounting_business.AccountingBusinessResource`."""
+
+    async def get(self, business_uuid: str, resource_uuid: str) -> Result:  # type: ignore[override]
+        """Get a single resource with the corresponding id. See `AccountingBusinessResource.get`."""
+        self._reject_missing("get")
+        data = await self._request_async(self._get_url(business_uuid, resource_uuid), HttpVerbs.GET)
+        return Result(self.resource_name, {self.resource_name: data["data"]})
+
+    async def list(self, business_uuid: str) -> ListResult:  # type: ignore[override]
+        """Get a list of resources. See `AccountingBusinessResource.list`."""
+        self._reject_missing("list")
+        data = await self._request_async(self._get_url(business_uuid), HttpVerbs.GET)
+        return ListResult(self.resource_name, self.resource_name, {self.resource_name: data["data"]})
+
+    async def create(self, business_uuid: str, data: dict) -> Result:  # type: ignore[override]
+        """Create a resource. See `AccountingBusinessResource.create`."""
+        self._reject_missing("create")
+        response = await self._request_async(self._get_url(business_uuid), HttpVerbs.POST, data=data)
+        return Result(self.resource_name, {self.resource_name: response["data"]})
+
+    async def update(  # type: ignore[override]
+        self, business_uuid: str, resource_uuid: str, data: dict
+    ) -> Result:
+        """Update a resource. See `AccountingBusinessResource.update`."""
+        self._reject_missing("update")
+        response = await self._request_async(self._get_url(business_uuid, resource_uuid), HttpVerbs.PUT, data=data)
+        return Result(self.resource_name, {self.resource_name: response["data"]})
+
+    async def delete(self, business_uuid: str, resource_uuid: str) -> Result:  # type: ignore[override]
+        """Delete a resource. See `AccountingBusinessResource.delete`."""
+        self._reject_missing("delete")
+        response = await self._request_async(self._get_url(business_uuid, resource_uuid), HttpVerbs.DELETE)
+        return Result(self.resource_name, {self.resource_name: response["data"]})
+
+
+class AsyncProjectsResource(AsyncResource, ProjectsResource):
+    """Asynchronous `freshbooks.api.projects.ProjectsResource`."""
+
+    async def get(  # type: ignore[override]
+        self, business_id: int, resource_id: int, includes: Optional[IncludesBuilder] = None
+    ) -> Result:
+        """Get a single resource with the corresponding id. See `ProjectsResource.get`."""
+        self._reject_missing("get")
+        resource_url = self._get_url(business_id, resource_id)
+        query_string = ""
+        if includes:
+            query_string = self._build_query_string([includes])
+        data = await self._request_async(f"{resource_url}{query_string}", HttpVerbs.GET)
+        return self._result(self.single_name, data)
+
+    async def list(  # type: ignore[override]
+        self, business_id: int, builders: Optional[List[Builder]] = None
+    ) -> ListResult:
+        """Get a list of resources. See `ProjectsResource.list`."""
+        self._reject_missing("list")
+        resource_url = self._get_url(business_id, is_list=True)
+        query_string = self._build_query_string(builders)
+        data = await self._request_async(f"{resource_url}{query_string}", HttpVerbs.GET)
+        return self._list_result(self.list_name, self.single_name, data)  # type: ignore
+
+    async def iter_all(  # type: ignore[override]
+        self, business_id: int, builders: Optional[List[Builder]] = None, prefetch: int = 0, stream: bool = False
+    ) -> AsyncIterator[Result]:
+        """Asynchronously iterate through every resource of a list call, across all pages.
+        See `ProjectsResource.iter_all`.
+
+        ```python
+        async for project in freshBooksClient.projects.iter_all(business_id):
+            print(project.title)
+        ```
+        """
+        self._reject_missing("list")
+        if stream and prefetch > 0:
+            raise ValueError("Streamed pages can't be prefetched")
+        chunks = self._query_chunks(builders)
+        if stream:
+            async for result in astream_chunks(self._stream_list_page, business_id, chunks):  # type: ignore[arg-type]
+                yield result
+            return
+        if len(chunks) > 1:
+            async for result in afan_out_chunks(self.list, business_id, chunks, max(1, prefetch)):
+                yield result
+            return
+        async for results in aiter_pages(self.list, business_id, builders, prefetch):
+            for result in results:
+                yield result
+
+    async def list_all(  # type: ignore[override]
+        self, business_id: int, builders: Optional[List[Builder]] = None, max_workers: int = DEFAULT_MAX_WORKERS,
+        ordered: bool = True
+    ) -> AsyncIterator[Result]:
+        """Asynchronously iterate through every resource of a list call, fetching up to `max_workers` pages
+        at once. See `ProjectsResource.list_all`.
+        """
+        self._reject_missing("list")
+        chunks = self._query_chunks(builders)
+        async for result in afan_out_chunks(self.list, business_id, chunks, max_workers, ordered):
+            yield result
+
+    async def list_partitions(  # type: ignore[override]
+        self, business_id: int, partitions: List[Builder], builders: Optional[List[Builder]] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS, ordered: bool = True
+    ) -> AsyncIterator[Result]:
+        """Asynchronously iterate through every resource of several list calls, one for each of the `partitions`
+        of a scan, fetching up to `max_workers` pages at once. See `ProjectsResource.list_partitions`.
+        """
+        self._reject_missing("list")
+        chunks = self._partition_chunks(partitions, builders)
+        async for result in afan_out_chunks(self.list, business_id, chunks, max_workers, ordered):
+            yield result
+
+    def _created_lookup(  # type: ignore[override]
+        self, business_id: int, key: Optional[str], lookup: Optional[List[Builder]]
+    ) -> Optional[Callable[[], Awaitable[Optional[dict]]]]:
+        if lookup is None or key is None:
+            return None
+
+        async def find() -> Optional[dict]:
+            return self._found_write(key, await self.list(business_id, builders=lookup))
+        return find
+
+    async def create(  # type: ignore[override]
+        self, business_id: int, data: dict, idempotency_key: Optional[str] = None,
+        lookup: Optional[List[Builder]] = None
+    ) -> Result:
+        """Create a resource. See `ProjectsResource.create`."""
+        self._reject_missing("create")
+        response = await self._write_async(
+            self._get_url(business_id), HttpVerbs.POST, {self.single_name: data}, idempotency_key,
+            self._created_lookup(business_id, idempotency_key, lookup)
+        )
+        return Result(self.single_name, response)
+
+    async def update(  # type: ignore[override]
+        self, business_id: int, resource_id: int, data: dict, idempotency_key: Optional[str] = None
+    ) -> Result:
+        """Update a resource. See `ProjectsResource.update`."""
+        self._reject_missing("update")
+        response = await self._write_async(
+            self._get_url(business_id, resource_id), HttpVerbs.PUT, {self.single_name: data}, idempotency_key,
+            _resend_async
+        )
+        return Result(self.single_name, response)
+
+    async def delete(self, business_id: int, resource_id: int) -> Result:  # type: ignore[override]
+        """Delete a resource. See `ProjectsResource.delete`."""
+        self._reject_missing("delete")
+        response = await self._request_async(self._get_url(business_id, resource_id), HttpVerbs.DELETE)
+        return Result(self.single_name, response)
+
+
+class AsyncTimetrackingResource(AsyncProjectsResource, TimetrackingResource):
+    """Asynchronous `freshbooks.api.timetracking.TimetrackingResource`."""
+    pass
+
+
+class AsyncCommentsResource(AsyncProjectsResource, CommentsResource):
+    """Asynchronous `freshbooks.api.comments.CommentsResource`."""
+    pass
+
+
+class AsyncCommentsSubResource(AsyncResource, CommentsSubResource):
+    """Asynchronous `freshbooks.api.comments.CommentsSubResource`."""
+
+    async def get(self, business_id: int, resource_id: int) -> Result:  # type: ignore[override]
+        """Get a single resource with the corresponding id. See `CommentsSubResource.get`."""
+        self._reject_missing("get")
+        data = await self._request_async(self._get_url(business_id, resource_id), HttpVerbs.GET)
+        return self._result(self.single_name, data)
+
+    async def list(  # type: ignore[override]
+        self, business_id: int, builders: Optional[List[Builder]] = None
+    ) -> ListResult:
+        """Get a list of resources. See `CommentsSubResource.list`."""
+        self._reject_missing("list")
+        resource_url = self._get_url(business_id, is_list=True)
+        query_string = self._build_query_string(builders)
+        data = await self._request_async(f"{resource_url}{query_string}", HttpVerbs.GET)
+        return self._list_result(self.list_name, self.single_name, data)  # type: ignore
+
+    async def create(  # type: ignore[override]
+        self, business_id: int, resource_id: int, data: dict
+    ) -> Result:
+        """Create a resource. See `CommentsSubResource.create`."""
+        self._reject_missing("create")
+        response = await self._request_async(
+            self._get_url(business_id, resource_id), HttpVerbs.POST, data={self.single_name: data}
+        )
+        return Result(self.single_name, response)
+
+    async def update(self, business_id: int, resource_id: int, data: dict) -> Result:  # type: ignore[override]
+        """Update a resource. See `CommentsSubResource.update`."""
+        self._reject_missing("update")
+        response = await self._request_async(
+            self._get_url(business_id, resource_id), HttpVerbs.PUT, data={self.single_name: data}
+        )
+        return Result(self.single_name, response)
+
+    async def delete(self, business_id: int, resource_id: int) -> Result:  # type: ignore[override] # pragma: no cover
+        """Delete a resource. See `CommentsSubResource.delete`."""
+        self._reject_missing("delete")
+        response = await self._request_async(self._get_url(business_id, resource_id), HttpVerbs.DELETE)
+        return Result(self.single_name, response)
+
+
+class AsyncPaymentsResource(AsyncResource, PaymentsResource):
+    """Asynchronous `freshbooks.api.payments.PaymentsResource`."""
+
+    async def defaults(self, account_id: str) -> Result:  # type: ignore[override]
+        """Get the default settings for an account resource. See `PaymentsResource.defaults`."""
+        self._reject_missing("defaults")
+        data = await self._request_async(self._get_url(account_id), HttpVerbs.GET)
+        return Result(self.single_name, data)
+
+    async def get(self, account_id: str, resource_id: int) -> Result:  # type: ignore[override]
+        """Get a single resource with the corresponding id. See `PaymentsResource.get`."""
+        self._reject_missing("get")
+        data = await self._request_async(self._get_url(account_id, resource_id), HttpVerbs.GET)
+        return Result(self.single_name, data)
+
+    async def create(  # type: ignore[override]
+        self, account_id: str, resource_id: int, data: dict, idempotency_key: Optional[str] = None
+    ) -> Result:
+        """Create a resource. See `PaymentsResource.create`."""
+        self._reject_missing("create")
+        response = await self._write_async(
+            self._get_url(account_id, resource_id), HttpVerbs.POST, data, idempotency_key, _resend_async
+        )
+        return Result(self.single_name, response)
+
+
+class AsyncUploadsResource(AsyncResource, UploadsResource):
+    """Asynchronous `freshbooks.api.uploads.UploadsResource`."""
+
+    async def get(self, jwt: str) -> "httpx.Response":  # type: ignore[override]
+        """Get an uploaded file. This returns the `httpx.Response` object to provide flexibility
+        in handling the data. See `UploadsResource.get`.
+        """
+        response: httpx.Response = await self._send_request_async(self._get_url(jwt=jwt), HttpVerbs.GET)
+        self._handle_get_response(response)
+        return response
+
+    async def upload(  # type: ignore[override]
+        self, account_id: str, file_stream: Optional[BufferedReader] = None, file_path: Optional[str] = None
+    ) -> Result:
+        """Upload a file to FreshBooks' file storage. See `UploadsResource.upload`."""
+        file_content = file_stream
+        if file_path and not file_stream:  # pragma: no cover
+            file_content = open(file_path, "rb")
+        response = await self._send_request_async(
+            self._get_url(account_id=account_id), HttpVerbs.POST, files={"content": file_content}
+        )
+        return self._handle_upload_response(response)
+
+
+class AsyncAuthResource(AsyncResource, AuthResource):
+    """Asynchronous `freshbooks.api.auth.AuthResource`."""
+
+    async def me_endpoint(self) -> Identity:  # type: ignore[override]
+        """Get the identity details of the currently authenticated user. See `AuthResource.me_endpoint`."""
+        data = await self._request_async(self._get_url("users/me"), HttpVerbs.GET)
+        return Identity(data)
@@ -1,5 +1,4 @@
-from decimal import Decimal
-from typing import Any, Optional
+from typing import Any
 
 from freshbooks.api.resource import HttpVerbs, Resource
 from freshbooks.errors import FreshBooksError
@@ -12,12 +11,10 @@ class AuthResource(Resource):
     def _get_url(self, endpoint: str) -> str:
         return "{}/auth/api/v1/{}".format(self.base_url, endpoint)
 
-    def _request(self, url: str, method: str, data: Optional[dict] = None) -> Any:
-        response = self._send_request(url, method, data)
-
+    def _handle_response(self, response: Any, method: str) -> Any:
         status = response.status_code
         try:
-            content = response.json(parse_float=Decimal)
+            content = self._decode(response)
         except ValueError:
             raise FreshBooksError(status, "Failed to parse response", raw_response=response.text)
 
@@ -65,7 +65,7 @@ class CommentsSubResource(ProjectsBaseResource):
         """
         self._reject_missing("get")
         data = self._request(self._get_url(business_id, resource_id), HttpVerbs.GET)
-        return Result(self.single_name, data)
+        return self._result(self.single_name, data)
 
     def list(self, business_id: int, builders: Optional[List[Builder]] = None) -> ListResult:
         """Get a list of resources.
@@ -84,7 +84,7 @@ class CommentsSubResource(ProjectsBaseResource):
         resource_url = self._get_url(business_id, is_list=True)
         query_string = self._build_query_string(builders)
         data = self._request(f"{resource_url}{query_string}", HttpVerbs.GET)
-        return ListResult(self.list_name, self.single_name, data)  # type: ignore
+        return self._list_result(self.list_name, self.single_name, data)  # type: ignore
 
     def create(self, business_id: int, resource_id: int, data: dict) -> Result:
         """Create a resource.
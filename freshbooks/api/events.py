@@ -1,4 +1,3 @@
-from decimal import Decimal
 from typing import Any, Optional
 
 from freshbooks.api.accounting import AccountingResource
@@ -20,9 +19,7 @@ class EventsResource(AccountingResource):
                 self.base_url, account_id, self.accounting_path, resource_id)
         return "{}/events/account/{}/{}".format(self.base_url, account_id, self.accounting_path)
 
-    def _request(self, url: str, method: str, data: Optional[dict] = None) -> Any:
-        response = self._send_request(url, method, data)
-
+    def _handle_response(self, response: Any, method: str) -> Any:
         status = response.status_code
         if status == 200 and method == HttpVerbs.HEAD:  # pragma: no cover
             # no content returned from a HEAD
@@ -31,7 +28,7 @@ class EventsResource(AccountingResource):
             return {}
 
         try:
-            content = response.json(parse_float=Decimal)
+            content = self._decode(response)
         except ValueError:
             raise FreshBooksError(status, "Failed to parse response", raw_response=response.text)
 
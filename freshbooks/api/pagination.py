@@ -0,0 +1,415 @@
+"""Helpers for walking through every page of a resource's list call.
+
+List calls whose filters would make the URL too long (eg. an `in_list` filter of thousands of client ids) are split
+by `iter_all` and `list_all` into several calls, each for a chunk of the values. The chunks are fetched concurrently
+and their resources are returned as one stream, each resource only once. See `chunk_builders`.
+"""
+import asyncio
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Deque, Hashable, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar,
+    Union
+)
+
+from freshbooks.builders import Builder, _sent_length
+from freshbooks.builders.filter import FilterBuilder
+from freshbooks.builders.frozen import FrozenBuilder
+from freshbooks.builders.paginator import PaginateBuilder
+from freshbooks.models import ListResult, Result
+from freshbooks.streaming import AsyncListStream, ListStream
+
+ListCall = Callable[..., ListResult]
+AsyncListCall = Callable[..., Awaitable[ListResult]]
+StreamCall = Callable[..., ListStream]
+AsyncStreamCall = Callable[..., Awaitable[AsyncListStream]]
+
+DEFAULT_MAX_WORKERS = 4
+MAX_QUERY_LENGTH = 4000
+"""Default maximum sent length of a list call's query string, keeping its URL within common server and proxy limits"""
+PAGE_QUERY_LENGTH = len("&page=100000&per_page=100")
+"""Room kept in a query string for the `PaginateBuilder` of each page"""
+
+T = TypeVar("T")
+
+
+def _page_settings(builders: Optional[List[Builder]]) -> Tuple[int, int]:
+    """The first page and page size to fetch, taken from any `PaginateBuilder` in `builders`."""
+    page, per_page = PaginateBuilder.MIN_PAGE, PaginateBuilder.MAX_PER_PAGE
+    for builder in builders or []:
+        if isinstance(builder, PaginateBuilder):
+            page = builder.page() or page  # type: ignore
+            per_page = builder.per_page() or per_page  # type: ignore
+    return page, per_page
+
+
+def _with_page(builders: Optional[List[Builder]], page: int, per_page: int) -> List[Builder]:
+    """A copy of `builders` with any `PaginateBuilder` replaced by one for the requested page.
+
+    The caller's builders are not modified, so they can be safely reused.
+    """
+    builders = [builder for builder in builders or [] if not isinstance(builder, PaginateBuilder)]
+    builders.append(PaginateBuilder(page, per_page))
+    return builders
+
+
+def _is_last_page(results: Union[ListResult, ListStream, AsyncListStream]) -> bool:
+    pages = getattr(results, "pages", None)
+    return not pages or not len(results) or pages.page >= pages.pages
+
+
+def iter_pages(
+    list_call: ListCall, resource_id: Any, builders: Optional[List[Builder]] = None, prefetch: int = 0
+) -> Iterator[ListResult]:
+    """Lazily fetch each page of a list call in turn, starting at the page in any provided `PaginateBuilder`
+    (or the first page), until the last page is reached.
+
+    With `prefetch`, up to that many of the following pages are fetched in the background while the
+    current page is being consumed.
+
+    Args:
+        list_call: The resource's `list` method
+        resource_id: The account_id or business_id to pass to `list_call`
+        builders: (Optional) List of builder objects for filters, pagination, etc.
+        prefetch: (Optional) The number of pages to fetch ahead of the page being consumed
+
+    Returns:
+        An iterator of the `ListResult` of each page
+    """
+    if prefetch > 0:
+        yield from fan_out_pages(list_call, resource_id, builders, max_workers=prefetch)
+        return
+    page, per_page = _page_settings(builders)
+    while True:
+        results = list_call(resource_id, builders=_with_page(builders, page, per_page))
+        yield results
+        if _is_last_page(results):
+            return
+        page = results.pages.page + 1
+
+
+async def aiter_pages(
+    list_call: AsyncListCall, resource_id: Any, builders: Optional[List[Builder]] = None, prefetch: int = 0
+) -> AsyncIterator[ListResult]:
+    """Asynchronous version of `iter_pages` for the `freshbooks.async_client.AsyncClient` resources."""
+    if prefetch > 0:
+        async for results in afan_out_pages(list_call, resource_id, builders, max_workers=prefetch):
+            yield results
+        return
+    page, per_page = _page_settings(builders)
+    while True:
+        results = await list_call(resource_id, builders=_with_page(builders, page, per_page))
+        yield results
+        if _is_last_page(results):
+            return
+        page = results.pages.page + 1
+
+
+def stream_pages(
+    stream_call: StreamCall, resource_id: Any, builders: Optional[List[Builder]] = None
+) -> Iterator[Result]:
+    """Stream each page of a list call in turn, like `iter_pages`, yielding each resource as it is parsed out
+    of the response. See `freshbooks.streaming`.
+
+    Args:
+        stream_call: The resource's method making a streamed list call
+        resource_id: The account_id or business_id to pass to `stream_call`
+        builders: (Optional) List of builder objects for filters, pagination, etc.
+
+    Returns:
+        An iterator of every resource
+    """
+    page, per_page = _page_settings(builders)
+    while True:
+        stream = stream_call(resource_id, builders=_with_page(builders, page, per_page))
+        yield from stream
+        if _is_last_page(stream):
+            return
+        page = stream.pages.page + 1
+
+
+async def astream_pages(
+    stream_call: AsyncStreamCall, resource_id: Any, builders: Optional[List[Builder]] = None
+) -> AsyncIterator[Result]:
+    """Asynchronous version of `stream_pages` for the `freshbooks.async_client.AsyncClient` resources."""
+    page, per_page = _page_settings(builders)
+    while True:
+        stream = await stream_call(resource_id, builders=_with_page(builders, page, per_page))
+        async for result in stream:
+            yield result
+        if _is_last_page(stream):
+            return
+        page = stream.pages.page + 1
+
+
+def _remaining_pages(results: ListResult) -> range:
+    """The page numbers after `results`, as reported by its `pages`."""
+    if _is_last_page(results):
+        return range(0)
+    return range(results.pages.page + 1, results.pages.pages + 1)
+
+
+def _fetch_concurrently(
+    fetch: Callable[[Any], T], pages: Iterable[Any], max_workers: int, ordered: bool
+) -> Iterator[T]:
+    """Fetch `pages` on a pool of `max_workers` threads, keeping at most `max_workers` pages in flight.
+
+    Pages are yielded in page order if `ordered`, otherwise as soon as each completes. Any pages still pending
+    when the iterator is closed (or a fetch raises) are cancelled.
+    """
+    pages = iter(pages)
+    in_flight: Deque[Future] = deque()
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="freshbooks-page") as executor:
+        try:
+            for page in pages:
+                in_flight.append(executor.submit(fetch, page))
+                if len(in_flight) >= max_workers:
+                    break
+            while in_flight:
+                if ordered:
+                    done: Set[Future] = {in_flight.popleft()}
+                else:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        in_flight.remove(future)
+                for future in done:
+                    results = future.result()
+                    next_page = next(pages, None)
+                    if next_page is not None:
+                        in_flight.append(executor.submit(fetch, next_page))
+                    yield results
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+
+def fan_out_pages(
+    list_call: ListCall, resource_id: Any, builders: Optional[List[Builder]] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS, ordered: bool = True
+) -> Iterator[ListResult]:
+    """Fetch the first page of a list call, then fetch all of the remaining pages concurrently.
+
+    Args:
+        list_call: The resource's `list` method
+        resource_id: The account_id or business_id to pass to `list_call`
+        builders: (Optional) List of builder objects for filters, pagination, etc.
+        max_workers: (Optional) The maximum number of pages to fetch at once
+        ordered: (Optional) Yield the pages in page order (the default), or as soon as each is fetched
+
+    Returns:
+        An iterator of the `ListResult` of each page
+    """
+    page, per_page = _page_settings(builders)
+    results = list_call(resource_id, builders=_with_page(builders, page, per_page))
+    yield results
+
+    def fetch(page: int) -> ListResult:
+        return list_call(resource_id, builders=_with_page(builders, page, per_page))
+
+    yield from _fetch_concurrently(fetch, _remaining_pages(results), max(1, max_workers), ordered)
+
+
+async def afan_out_pages(
+    list_call: AsyncListCall, resource_id: Any, builders: Optional[List[Builder]] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS, ordered: bool = True
+) -> AsyncIterator[ListResult]:
+    """Asynchronous version of `fan_out_pages` for the `freshbooks.async_client.AsyncClient` resources,
+    running up to `max_workers` page requests at once as asyncio tasks.
+    """
+    page, per_page = _page_settings(builders)
+    results = await list_call(resource_id, builders=_with_page(builders, page, per_page))
+    yield results
+
+    def fetch(page: int) -> Awaitable[ListResult]:
+        return list_call(resource_id, builders=_with_page(builders, page, per_page))
+
+    async for results in _afetch_concurrently(fetch, _remaining_pages(results), max(1, max_workers), ordered):
+        yield results
+
+
+async def _afetch_concurrently(
+    fetch: Callable[[Any], Awaitable[T]], pages: Iterable[Any], max_workers: int, ordered: bool
+) -> AsyncIterator[T]:
+    """Asynchronous version of `_fetch_concurrently`, running up to `max_workers` fetches at once as asyncio tasks."""
+    pages = iter(pages)
+    in_flight: Deque[asyncio.Task] = deque()
+
+    def submit(page: Any) -> None:
+        in_flight.append(asyncio.ensure_future(fetch(page)))
+
+    try:
+        for page in pages:
+            submit(page)
+            if len(in_flight) >= max_workers:
+                break
+        while in_flight:
+            if ordered:
+                done: Set[asyncio.Task] = {in_flight[0]}
+            else:
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                # Left in flight until awaited, so the fetches that completed with it are waited for on an error
+                in_flight.remove(task)
+                results = await task
+                next_page = next(pages, None)
+                if next_page is not None:
+                    submit(next_page)
+                yield results
+    finally:
+        for task in in_flight:
+            task.cancel()
+        # Wait for the cancelled fetches to stop, so none are left running (or holding a limiter's slot)
+        await asyncio.gather(*in_flight, return_exceptions=True)
+
+
+def chunk_builders(
+    builders: Optional[List[Builder]], resource_name: str, max_length: int = MAX_QUERY_LENGTH
+) -> List[Optional[List[Builder]]]:
+    """Split the builders of a list call whose query string would be longer than `max_length` into several sets of
+    builders, each with a chunk of the values of the longest `FilterBuilder`'s `in_list` filters.
+
+    See `freshbooks.builders.filter.FilterBuilder.split`.
+
+    Args:
+        builders: List of builder objects for filters, pagination, etc.
+        resource_name: The type of resource to generate the query strings for. Eg. AccountingResource
+        max_length: (Optional) The maximum length of each query string
+
+    Returns:
+        The builders of each call to make, which are just `builders` if they are short enough.
+
+    Raises:
+        ValueError: If the filters can't be split into short enough query strings.
+    """
+    if not builders:
+        return [builders]
+    lengths = [
+        0 if isinstance(builder, PaginateBuilder) else _sent_length(builder.build(resource_name))
+        for builder in builders
+    ]
+    max_length -= PAGE_QUERY_LENGTH
+    filters = [index for index, builder in enumerate(builders) if isinstance(_unfrozen(builder), FilterBuilder)]
+    if sum(lengths) <= max_length or not filters:
+        return [builders]
+    index = max(filters, key=lambda index: lengths[index])
+    filter: FilterBuilder = _unfrozen(builders[index])  # type: ignore[assignment]
+    pieces = filter.split(max_length - (sum(lengths) - lengths[index]), resource_name)
+    return [builders[:index] + [piece] + builders[index + 1:] for piece in pieces]
+
+
+def _unfrozen(builder: Builder) -> Builder:
+    return builder._builder if isinstance(builder, FrozenBuilder) else builder
+
+
+def _key(result: Any) -> Optional[Hashable]:
+    key: Optional[Hashable] = result.data.get("id")
+    return key
+
+
+def _unique(results: Iterable[Result], seen: Set[Hashable]) -> Iterator[Result]:
+    """The resources not already `seen`, by id. Resources without an id are always returned."""
+    for result in results:
+        key = _key(result)
+        if key is None:
+            yield result
+        elif key not in seen:
+            seen.add(key)
+            yield result
+
+
+def fan_out_chunks(
+    list_call: ListCall, resource_id: Any, chunks: List[Optional[List[Builder]]],
+    max_workers: int = DEFAULT_MAX_WORKERS, ordered: bool = True
+) -> Iterator[Result]:
+    """Fetch every page of a list call for each set of builders in `chunks` (from `chunk_builders`), concurrently.
+
+    The first page of every chunk is fetched, and then the remaining pages of all of them. Each resource is
+    returned once, even if it was found by more than one chunk.
+
+    Args:
+        list_call: The resource's `list` method
+        resource_id: The account_id or business_id to pass to `list_call`
+        chunks: The builders of each chunk
+        max_workers: (Optional) The maximum number of pages to fetch at once
+        ordered: (Optional) Yield the pages in chunk and page order (the default), or as soon as each is fetched
+
+    Returns:
+        An iterator of every resource
+    """
+    if len(chunks) == 1:
+        for results in fan_out_pages(list_call, resource_id, chunks[0], max_workers, ordered):
+            yield from results
+        return
+    page, per_page = _page_settings(chunks[0])
+    max_workers = max(1, max_workers)
+    remaining: List[Tuple[int, int]] = []
+    seen: Set[Hashable] = set()
+
+    def fetch(chunk_page: Tuple[int, int]) -> Tuple[int, ListResult]:
+        chunk, page = chunk_page
+        return chunk, list_call(resource_id, builders=_with_page(chunks[chunk], page, per_page))
+
+    first_pages = [(chunk, page) for chunk in range(len(chunks))]
+    for chunk, results in _fetch_concurrently(fetch, first_pages, max_workers, ordered):
+        remaining.extend((chunk, page) for page in _remaining_pages(results))
+        yield from _unique(results, seen)
+    for _, results in _fetch_concurrently(fetch, remaining, max_workers, ordered):
+        yield from _unique(results, seen)
+
+
+async def afan_out_chunks(
+    list_call: AsyncListCall, resource_id: Any, chunks: List[Optional[List[Builder]]],
+    max_workers: int = DEFAULT_MAX_WORKERS, ordered: bool = True
+) -> AsyncIterator[Result]:
+    """Asynchronous version of `fan_out_chunks` for the `freshbooks.async_client.AsyncClient` resources."""
+    if len(chunks) == 1:
+        async for results in afan_out_pages(list_call, resource_id, chunks[0], max_workers, ordered):
+            for result in results:
+                yield result
+        return
+    page, per_page = _page_settings(chunks[0])
+    max_workers = max(1, max_workers)
+    remaining: List[Tuple[int, int]] = []
+    seen: Set[Hashable] = set()
+
+    async def fetch(chunk_page: Tuple[int, int]) -> Tuple[int, ListResult]:
+        chunk, page = chunk_page
+        return chunk, await list_call(resource_id, builders=_with_page(chunks[chunk], page, per_page))
+
+    first_pages = [(chunk, page) for chunk in range(len(chunks))]
+    async for chunk, results in _afetch_concurrently(fetch, first_pages, max_workers, ordered):
+        remaining.extend((chunk, page) for page in _remaining_pages(results))
+        for result in _unique(results, seen):
+            yield result
+    async for _, results in _afetch_concurrently(fetch, remaining, max_workers, ordered):
+        for result in _unique(results, seen):
+            yield result
+
+
+def stream_chunks(
+    stream_call: StreamCall, resource_id: Any, chunks: List[Optional[List[Builder]]]
+) -> Iterator[Result]:
+    """Stream every page of a list call for each set of builders in `chunks` in turn, returning each resource once.
+    See `stream_pages`.
+    """
+    if len(chunks) == 1:
+        yield from stream_pages(stream_call, resource_id, chunks[0])
+        return
+    seen: Set[Hashable] = set()
+    for builders in chunks:
+        yield from _unique(stream_pages(stream_call, resource_id, builders), seen)
+
+
+async def astream_chunks(
+    stream_call: AsyncStreamCall, resource_id: Any, chunks: List[Optional[List[Builder]]]
+) -> AsyncIterator[Result]:
+    """Asynchronous version of `stream_chunks` for the `freshbooks.async_client.AsyncClient` resources."""
+    if len(chunks) == 1:
+        async for result in astream_pages(stream_call, resource_id, chunks[0]):
+            yield result
+        return
+    seen: Set[Hashable] = set()
+    for builders in chunks:
+        async for result in astream_pages(stream_call, resource_id, builders):
+            for unique in _unique([result], seen):
+                yield unique
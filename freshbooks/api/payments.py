@@ -1,8 +1,7 @@
-from decimal import Decimal
 from types import SimpleNamespace
 from typing import Any, List, Optional
 
-from freshbooks.api.resource import HttpVerbs, Resource
+from freshbooks.api.resource import HttpVerbs, Resource, _resend
 from freshbooks.errors import FreshBooksError, FreshBooksNotImplementedError
 from freshbooks.models import Result
 
@@ -43,16 +42,14 @@ class PaymentsResource(Resource):
                 return f"{error_details['field']}: {error_details['message']}"  # type: ignore
         return errors["message"]  # type: ignore
 
-    def _request(self, url: str, method: str, data: Optional[dict] = None) -> Any:
-        response = self._send_request(url, method, data)
-
+    def _handle_response(self, response: Any, method: str) -> Any:
         status = response.status_code
         if status == 200 and method == HttpVerbs.HEAD:  # pragma: no cover
             # no content returned from a HEAD
             return
 
         try:
-            content = response.json(parse_float=Decimal)
+            content = self._decode(response)
         except ValueError:
             raise FreshBooksError(status, "Failed to parse response", raw_response=response.text)
 
@@ -98,21 +95,26 @@ class PaymentsResource(Resource):
         data = self._request(resource_url, HttpVerbs.GET)
         return Result(self.single_name, data)
 
-    def create(self, account_id: str, resource_id: int, data: dict) -> Result:
+    def create(self, account_id: str, resource_id: int, data: dict, idempotency_key: Optional[str] = None) -> Result:
         """Create a resource.
 
+        With an `idempotency_key`, a completed call is not made again. Setting a resource's payment details
+        can be safely repeated, so keyed calls are retried without a lookup. See `freshbooks.idempotency`.
+
         Args:
             account_id: The alpha-numeric account id
             resource_id: Id of the resource to create payment details for
             data: Dictionary of data to populate the resource
+            idempotency_key: (Optional) A client-generated key identifying this particular call
 
         Returns:
             Result: Result object with the new resource's response data.
 
         Raises:
             FreshBooksError: If the call is not successful.
+            FreshBooksIdempotencyError: If the key was used for a different call.
         """
         self._reject_missing("create")
         resource_url = self._get_url(account_id, resource_id)
-        response = self._request(resource_url, HttpVerbs.POST, data=data)
+        response = self._write(resource_url, HttpVerbs.POST, data, idempotency_key, _resend)
         return Result(self.single_name, response)
@@ -1,12 +1,13 @@
-from decimal import Decimal
 from types import SimpleNamespace
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
-from freshbooks.api.resource import HttpVerbs, Resource
+from freshbooks.api.pagination import DEFAULT_MAX_WORKERS, fan_out_chunks, iter_pages, stream_chunks
+from freshbooks.api.resource import HttpVerbs, Resource, _resend
 from freshbooks.builders import Builder
 from freshbooks.builders.includes import IncludesBuilder
 from freshbooks.errors import FreshBooksError, FreshBooksNotImplementedError
 from freshbooks.models import ListResult, Result
+from freshbooks.streaming import ListStream
 
 
 class ProjectsBaseResource(Resource):
@@ -43,9 +44,7 @@ class ProjectsBaseResource(Resource):
             message = error_response["error"]
         return message, code, details
 
-    def _request(self, url: str, method: str, data: Optional[dict] = None) -> Any:
-        response = self._send_request(url, method, data)
-
+    def _handle_response(self, response: Any, method: str) -> Any:
         status = response.status_code
         if status == 200 and method == HttpVerbs.HEAD:  # pragma: no cover
             # no content returned from a HEAD
@@ -54,7 +53,7 @@ class ProjectsBaseResource(Resource):
             return {}
 
         try:
-            content = response.json(parse_float=Decimal)
+            content = self._decode(response)
         except ValueError:
             raise FreshBooksError(status, "Failed to parse response", raw_response=response.text)
 
@@ -87,7 +86,8 @@ class ProjectsResource(ProjectsBaseResource):
             resource_id: Id of the resource to return
             includes: (Optional) IncludesBuilder object for including additional data, sub-resources, etc.
         Returns:
-            Result: Result object with the resource's response data.
+            Result: Result object with the resource's response data,
+                or its `freshbooks.typed_models` model if the client was created with `typed_models=True`.
 
         Raises:
             FreshBooksError: If the call is not successful.
@@ -98,7 +98,7 @@ class ProjectsResource(ProjectsBaseResource):
         if includes:
             query_string = self._build_query_string([includes])
         data = self._request(f"{resource_url}{query_string}", HttpVerbs.GET)
-        return Result(self.single_name, data)
+        return self._result(self.single_name, data)
 
     def list(self, business_id: int, builders: Optional[List[Builder]] = None) -> ListResult:
         """Get a list of resources.
@@ -109,6 +109,7 @@ class ProjectsResource(ProjectsBaseResource):
 
         Returns:
             ListResult: ListResult object with the resources response data.
+                Its resources are `freshbooks.typed_models` models if the client was created with `typed_models=True`.
 
         Raises:
             FreshBooksError: If the call is not successful.
@@ -117,42 +118,201 @@ class ProjectsResource(ProjectsBaseResource):
         resource_url = self._get_url(business_id, is_list=True)
         query_string = self._build_query_string(builders)
         data = self._request(f"{resource_url}{query_string}", HttpVerbs.GET)
-        return ListResult(self.list_name, self.single_name, data)  # type: ignore
+        return self._list_result(self.list_name, self.single_name, data)  # type: ignore
+
+    def _stream_list_page(self, business_id: int, builders: Optional[List[Builder]] = None) -> ListStream:
+        url = self._get_url(business_id, is_list=True)
+        query_string = self._build_query_string(builders)
+        path = (self.list_name,)
+        return self._stream_list(f"{url}{query_string}", self.list_name, self.single_name, path)  # type: ignore
+
+    def iter_all(
+        self, business_id: int, builders: Optional[List[Builder]] = None, prefetch: int = 0, stream: bool = False
+    ) -> Iterator[Result]:
+        """Iterate through every resource of a list call, across all pages.
+
+        Pages are fetched lazily as the iterator is consumed, 100 resources at a time
+        (or the `per_page` of a provided `PaginateBuilder`), so only one page is held in memory at once.
+
+        With `prefetch`, up to that many of the following pages are fetched on background threads while
+        the current page is being processed, hiding the network latency behind the caller's work at the cost
+        of holding `prefetch` more pages in memory.
+
+        With `stream`, each page's resources are instead parsed out of the response as it arrives and
+        yielded as soon as each one is received, so that a large page (eg. invoices with their lines) is never
+        held in memory in full. See `freshbooks.streaming`. Streamed pages are fetched one at a time.
+
+        Filters too long for one call's query string (over `MAX_QUERY_LENGTH`, eg. an `in_list` of thousands of
+        ids) are split into several calls, each for a chunk of the values, which are made in turn when streaming,
+        and otherwise on up to `prefetch` (at least one) background threads. See `freshbooks.api.pagination`.
+
+        ```python
+        for project in freshBooksClient.projects.iter_all(business_id, builders=[filter]):
+            print(project.title)
+        ```
+
+        Args:
+            business_id: The business id
+            builders: (Optional) List of builder objects for filters, pagination, etc.
+            prefetch: (Optional) The number of pages to fetch ahead of the page being consumed. Default 0.
+            stream: (Optional) Parse each page's resources as the response arrives. Default False.
+
+        Returns:
+            Iterator of Result objects for each resource.
+
+        Raises:
+            FreshBooksError: If any of the calls are not successful.
+            ValueError: If both `prefetch` and `stream` are requested.
+        """
+        self._reject_missing("list")
+        if stream and prefetch > 0:
+            raise ValueError("Streamed pages can't be prefetched")
+        chunks = self._query_chunks(builders)
+        if stream:
+            yield from stream_chunks(self._stream_list_page, business_id, chunks)
+            return
+        if len(chunks) > 1:
+            yield from fan_out_chunks(self.list, business_id, chunks, max(1, prefetch))
+            return
+        for results in iter_pages(self.list, business_id, builders, prefetch):
+            yield from results
+
+    def list_all(
+        self, business_id: int, builders: Optional[List[Builder]] = None, max_workers: int = DEFAULT_MAX_WORKERS,
+        ordered: bool = True
+    ) -> Iterator[Result]:
+        """Iterate through every resource of a list call, fetching the pages concurrently.
+
+        The first page is fetched to find the total number of pages, then the remaining pages are fetched
+        on a pool of up to `max_workers` threads sharing the client's connection pool. Results are yielded in
+        page order, or with `ordered=False` a page's results are yielded as soon as that page arrives.
+
+        Filters too long for one call's query string (over `MAX_QUERY_LENGTH`, eg. an `in_list` of thousands of
+        ids) are split into several calls, each for a chunk of the values. The first page of every chunk is
+        fetched concurrently, then the remaining pages, and each resource is yielded once.
 
-    def create(self, business_id: int, data: dict) -> Result:
+        ```python
+        for project in freshBooksClient.projects.list_all(business_id, max_workers=8):
+            print(project.title)
+        ```
+
+        Args:
+            business_id: The business id
+            builders: (Optional) List of builder objects for filters, pagination, etc.
+            max_workers: (Optional) The maximum number of pages to fetch at once. Should not exceed the
+                client's `pool_maxsize`.
+            ordered: (Optional) Yield results in page order (default) or in the order the pages are received.
+
+        Returns:
+            Iterator of Result objects for each resource.
+
+        Raises:
+            FreshBooksError: If any of the calls are not successful.
+        """
+        self._reject_missing("list")
+        yield from fan_out_chunks(self.list, business_id, self._query_chunks(builders), max_workers, ordered)
+
+    def list_partitions(
+        self, business_id: int, partitions: List[Builder], builders: Optional[List[Builder]] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS, ordered: bool = True
+    ) -> Iterator[Result]:
+        """Iterate through every resource of several list calls, one for each of the `partitions` of a scan (eg.
+        the sub-ranges of a date range from `FilterBuilder.partition`), fetching their pages concurrently.
+
+        Each partition is an independent, shorter scan, so a large range is read without paging deep into one
+        long list, where pages get slower and resources changed during the scan can shift between pages. The first
+        page of every partition is fetched, then their remaining pages, on up to `max_workers` threads. Each
+        resource is yielded once, even if more than one partition finds it.
+
+        ```python
+        partitions = FilterBuilder().partition(
+            "started_from", "2020-01-01T00:00:00", "2024-12-31T23:59:59", parts=8, until_field="started_to"
+        )
+        for time_entry in freshBooksClient.time_entries.list_partitions(business_id, partitions, max_workers=8):
+            print(time_entry.duration)
+        ```
+
+        Args:
+            business_id: The business id
+            partitions: The filters of each partition
+            builders: (Optional) List of builder objects added to every partition's list call (eg. includes).
+            max_workers: (Optional) The maximum number of pages to fetch at once. Should not exceed the
+                client's `pool_maxsize`.
+            ordered: (Optional) Yield results in partition and page order (default) or in the order the pages are
+                received.
+
+        Returns:
+            Iterator of Result objects for each resource.
+
+        Raises:
+            FreshBooksError: If any of the calls are not successful.
+            ValueError: If there are no `partitions`.
+        """
+        self._reject_missing("list")
+        chunks = self._partition_chunks(partitions, builders)
+        yield from fan_out_chunks(self.list, business_id, chunks, max_workers, ordered)
+
+    def _created_lookup(
+        self, business_id: int, key: Optional[str], lookup: Optional[List[Builder]]
+    ) -> Optional[Callable[[], Optional[dict]]]:
+        if lookup is None or key is None:
+            return None
+        return lambda: self._found_write(key, self.list(business_id, builders=lookup))
+
+    def create(
+        self, business_id: int, data: dict, idempotency_key: Optional[str] = None,
+        lookup: Optional[List[Builder]] = None
+    ) -> Result:
         """Create a resource.
 
+        With an `idempotency_key`, the call is made at most once, and can be safely retried, by looking it up
+        with a list call with the `lookup` filters. See `AccountingResource.create` and `freshbooks.idempotency`.
+
         Args:
             business_id: The business id
             data: Dictionary of data to populate the resource
+            idempotency_key: (Optional) A client-generated key identifying this particular create call
+            lookup: (Optional) Builders for a list call finding the resource if it was created
 
         Returns:
             Result: Result object with the new resource's response data.
 
         Raises:
             FreshBooksError: If the call is not successful.
+            FreshBooksIdempotencyError: If the key was used for a different call, or the call may have been made
+                and can't be looked up.
         """
         self._reject_missing("create")
-        response = self._request(self._get_url(business_id), HttpVerbs.POST, data={self.single_name: data})
+        response = self._write(
+            self._get_url(business_id), HttpVerbs.POST, {self.single_name: data}, idempotency_key,
+            self._created_lookup(business_id, idempotency_key, lookup)
+        )
         return Result(self.single_name, response)
 
-    def update(self, business_id: int, resource_id: int, data: dict) -> Result:
+    def update(
+        self, business_id: int, resource_id: int, data: dict, idempotency_key: Optional[str] = None
+    ) -> Result:
         """Update a resource.
 
+        With an `idempotency_key`, a completed update is not made again. See `AccountingResource.update`.
+
         Args:
             business_id: The business id
             resource_id: Id of the resource to update
             data: Dictionary of data to update the resource to
+            idempotency_key: (Optional) A client-generated key identifying this particular update call
 
         Returns:
             Result: Result object with the updated resource's response data.
 
         Raises:
             FreshBooksError: If the call is not successful.
+            FreshBooksIdempotencyError: If the key was used for a different call.
         """
         self._reject_missing("update")
-        response = self._request(
-            self._get_url(business_id, resource_id), HttpVerbs.PUT, data={self.single_name: data}
+        response = self._write(
+            self._get_url(business_id, resource_id), HttpVerbs.PUT, {self.single_name: data}, idempotency_key,
+            _resend
         )
         return Result(self.single_name, response)
 
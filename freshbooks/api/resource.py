@@ -1,10 +1,30 @@
+import functools
 import json
+import time
 from types import SimpleNamespace
-from typing import Any, Dict, Optional
+from typing import Any, Callable, cast, ContextManager, Dict, List, Optional, Tuple
 
 import requests
 from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+
+from freshbooks.api.pagination import MAX_QUERY_LENGTH, chunk_builders
+from freshbooks.builders import Builder
+from freshbooks.cache import CacheKey, CachedResponse, ResponseCache
+from freshbooks.decoders import JSONDecoder
+from freshbooks.errors import FreshBooksClientConfigError, FreshBooksIdempotencyError
+from freshbooks.http_cache import CacheLookup, HTTPCache
+from freshbooks.idempotency import IdempotencyJournal, JournalWrite, is_unknown_outcome
+from freshbooks.models import ListResult, Result
+from freshbooks.ratelimit import rate_limit_key
+from freshbooks.retry import RetryPolicy
+from freshbooks.singleflight import SingleFlight
+from freshbooks.streaming import CHUNK_SIZE, ListStream
+from freshbooks.typed_models import MODELS
+
+
+def _resend() -> Optional[dict]:
+    """The lookup of a keyed write that can be safely repeated, which is always sent again."""
+    return None
 
 
 class HttpVerbs(object):
@@ -17,8 +37,14 @@ class HttpVerbs(object):
 
 
 class Resource:
-    API_RETRIES = 3
-    """Default number of retries"""
+    POOL_CONNECTIONS = 10
+    """Default number of host connection pools to cache"""
+    POOL_MAXSIZE = 10
+    """Default maximum number of connections to keep in each host pool"""
+    MAX_QUERY_LENGTH = MAX_QUERY_LENGTH
+    """Longest query string of the list calls made by `iter_all` and `list_all`, which split longer filters"""
+    _http_cacheable = True
+    """If `GET` responses can be stored in a `freshbooks.http_cache.HTTPCache`"""
 
     def __init__(self, client_config: SimpleNamespace):
         self.base_url = client_config.base_url
@@ -26,21 +52,36 @@ class Resource:
         self.user_agent = client_config.user_agent
         self.api_version = client_config.api_version
         self.timeout = client_config.timeout
-        self.session = self._config_session(client_config.auto_retry)
+        self.auto_retry = client_config.auto_retry
+        self.session = getattr(client_config, "session", None) or self._config_session()
+        self.retry_policy: Optional[RetryPolicy] = None
+        """How failed calls are retried, or `None` if they are not"""
+        if self.auto_retry:
+            self.retry_policy = getattr(client_config, "retry_policy", None) or RetryPolicy()
+        self.rate_limiter = getattr(client_config, "rate_limiter", None)
+        self.concurrency_limiter = getattr(client_config, "concurrency_limiter", None)
+        self.response_cache: Optional[ResponseCache] = getattr(client_config, "response_cache", None)
+        self.cache_name = getattr(client_config, "name", None)
+        """The name of the client attribute the resource was accessed by (eg. `invoices`), used for caching"""
+        self.single_flight: Optional[SingleFlight] = getattr(client_config, "single_flight", None)
+        self.http_cache: Optional[HTTPCache] = getattr(client_config, "http_cache", None)
+        self.typed_models: bool = getattr(client_config, "typed_models", False)
+        self.json_decoder: JSONDecoder = getattr(client_config, "json_decoder", None) or JSONDecoder()
+        self.idempotency_journal: Optional[IdempotencyJournal] = getattr(client_config, "idempotency_journal", None)
 
-    def _config_session(self, auto_retry: bool) -> requests.Session:
-        session = requests.Session()
+    @classmethod
+    def _config_session(cls, pool_connections: int = POOL_CONNECTIONS,
+                        pool_maxsize: int = POOL_MAXSIZE) -> requests.Session:
+        """Create a session with a pooled adapter.
 
-        if auto_retry:
-            retry = Retry(  # type: ignore
-                total=self.API_RETRIES,
-                backoff_factor=0.3,
-                allowed_methods=["HEAD", "GET", "PUT", "DELETE", "OPTIONS", "TRACE"],
-                status_forcelist=[400, 408, 429, 500, 502, 503, 504],
-            )
-            adapter = HTTPAdapter(max_retries=retry)
-            session.mount("http://", adapter)
-            session.mount("https://", adapter)
+        The `freshbooks.client.Client` creates one of these and shares it between all of its resources
+        so that connections are kept alive and reused across calls. The adapter doesn't retry calls itself,
+        failed calls are retried by the resource according to its `freshbooks.retry.RetryPolicy`.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
 
         return session
 
@@ -58,11 +99,20 @@ class Resource:
         return headers
 
     def _send_request(
-        self, uri: str, method: str, data: Optional[dict] = None, files: Optional[dict] = None
-    ) -> requests.Response:
+        self, uri: str, method: str, data: Optional[dict] = None, files: Optional[dict] = None, stream: bool = False,
+        retry: bool = True
+    ) -> Any:
+        """Send a request, through the client's HTTP cache if it has one.
+
+        With `stream`, the body of a `GET` response is read as it is iterated through rather than up front,
+        and the HTTP cache is not used. With `retry=False` the request is sent once, whatever the retry policy.
+        """
         payload = None
         has_data = data is not None
-        if method is HttpVerbs.GET:
+        session: Callable[..., requests.Response]
+        if method is HttpVerbs.GET and stream:
+            session = functools.partial(self.session.get, stream=True)
+        elif method is HttpVerbs.GET:
             session = self.session.get
         elif method is HttpVerbs.POST:
             session = self.session.post  # type: ignore
@@ -77,21 +127,281 @@ class Resource:
         if has_data and method in (HttpVerbs.POST, HttpVerbs.PUT, HttpVerbs.PATCH):
             payload = json.dumps(data)
 
-        try:
-            res = session(uri, data=payload, files=files, headers=self.headers(method, has_data), timeout=self.timeout)
-        except requests.exceptions.RetryError:
-            adapter = HTTPAdapter()
-            self.session.mount("http://", adapter)
-            self.session.mount("https://", adapter)
-            res = session(uri, data=payload, files=files, headers=self.headers(method, has_data), timeout=self.timeout)
+        headers = self.headers(method, has_data)
+        lookup = None if stream else self._http_cache_lookup(uri, method)
+        if lookup is not None:
+            if lookup.fresh:
+                return lookup.response
+            headers.update(lookup.conditional_headers())
+
+        res = self._send(session, uri, method, payload, files, headers, retry)
+        return self._http_cache_update(uri, method, lookup, res)
 
+    def _send(
+        self, session: Callable[..., requests.Response], uri: str, method: str, payload: Optional[str],
+        files: Optional[dict], headers: Dict[str, str], retry_failures: bool = True
+    ) -> requests.Response:
+        """Send a request, retrying it according to the resource's `freshbooks.retry.RetryPolicy`."""
+        if not retry_failures:
+            return self._send_once(session, uri, method, payload, files, headers)
+        started = time.monotonic()
+        retry = 0
+        while True:
+            retry += 1
+            try:
+                res = self._send_once(session, uri, method, payload, files, headers)
+            except requests.exceptions.ConnectionError:
+                delay = self._retry_delay(method, None, None, retry, started)
+                if delay is None:
+                    raise
+            else:
+                delay = self._retry_delay(method, res.status_code, res.headers, retry, started)
+                if delay is None:
+                    return res
+                res.close()
+            time.sleep(delay)
+
+    def _send_once(
+        self, session: Callable[..., requests.Response], uri: str, method: str, payload: Optional[str],
+        files: Optional[dict], headers: Dict[str, str]
+    ) -> requests.Response:
+        """Send a request once the client's rate and concurrency limiters, if any, allow it."""
+        limit_key = rate_limit_key(uri)
+        if self.rate_limiter:
+            self.rate_limiter.acquire(limit_key)
+        if self.concurrency_limiter:
+            self.concurrency_limiter.acquire()
+        started = time.monotonic()
+        status_code = None
+        try:
+            res = session(uri, data=payload, files=files, headers=headers, timeout=self.timeout)
+            status_code = res.status_code
+        finally:
+            if self.concurrency_limiter:
+                self.concurrency_limiter.release(status_code, time.monotonic() - started)
+        if self.rate_limiter:
+            self.rate_limiter.update(limit_key, res.status_code, res.headers)
         return res
 
+    def _retry_delay(
+        self, method: str, status_code: Optional[int], headers: Any, retry: int, started: float,
+        idempotent: bool = False
+    ) -> Optional[float]:
+        """Seconds to wait before retrying a call first sent at `started`, or `None` if it should not be retried."""
+        if self.retry_policy is None:
+            return None
+        return self.retry_policy.delay(method, status_code, headers, retry, time.monotonic() - started, idempotent)
+
+    def _journal_write(self, key: str, method: str, url: str, data: Optional[dict]) -> ContextManager[JournalWrite]:
+        """Start an idempotency-keyed write in the client's `freshbooks.idempotency.IdempotencyJournal`."""
+        if self.idempotency_journal is None:
+            raise FreshBooksClientConfigError("An idempotency_journal is required to make idempotency-keyed writes")
+        return self.idempotency_journal.write(key, method, url, data)
+
+    def _write_retry_delay(
+        self, method: str, status_code: Optional[int], headers: Any, retry: int, started: float, can_look_up: bool
+    ) -> Optional[float]:
+        """Seconds to wait before retrying a keyed write, or `None` if it should not be retried.
+
+        A write that may have been made is only retried if it can be looked up first.
+        """
+        if is_unknown_outcome(status_code) and not can_look_up:
+            return None
+        return self._retry_delay(method, status_code, headers, retry, started, idempotent=True)
+
+    def _invalidate_caches(self, url: str) -> None:
+        """Discard the resource's cached responses, so a lookup sees the result of a write."""
+        if self.cache_name is None:
+            return
+        if self.response_cache is not None:
+            self.response_cache.invalidate(self.cache_name, rate_limit_key(url))
+        if self.http_cache is not None:
+            self.http_cache.invalidate(self.cache_name, rate_limit_key(url))
+
+    @staticmethod
+    def _found_write(key: str, results: ListResult) -> Optional[dict]:
+        """The response of a create call found by a lookup, or `None` if the resource was not created."""
+        records = results.data.get(results._name) or []
+        if len(records) > 1:
+            raise FreshBooksIdempotencyError(
+                f"The lookup for the idempotency key '{key}' matched {len(records)} resources"
+            )
+        return {results._single_name: records[0]} if records else None
+
+    def _write(
+        self, url: str, method: str, data: dict, key: Optional[str], lookup: Optional[Callable[[], Optional[dict]]]
+    ) -> Any:
+        """Make a `POST` or `PUT` call, keyed by `key` if there is one. See `_idempotent_request`."""
+        if key is None:
+            return self._request(url, method, data=data)
+        return self._idempotent_request(url, method, data, key, lookup)
+
+    def _idempotent_request(
+        self, url: str, method: str, data: dict, key: str, lookup: Optional[Callable[[], Optional[dict]]]
+    ) -> Any:
+        """Make an idempotency-keyed write, retrying it only when it is known not to have been made.
+
+        When a write fails in a way that leaves it unknown whether it was made, `lookup` is called before it is
+        sent again, returning the response of the write if it was made or `None` if it was not. Without a
+        `lookup`, the failure is raised and the key is left pending. See `freshbooks.idempotency`.
+        """
+        with self._journal_write(key, method, url, data) as write:
+            if write.response is not None:
+                return write.response
+            unknown = write.resumed
+            started = time.monotonic()
+            retry = 0
+            while True:
+                if unknown:
+                    if lookup is None:
+                        raise FreshBooksIdempotencyError(
+                            f"The write with the idempotency key '{key}' may have been made, and can't be looked up"
+                        )
+                    self._invalidate_caches(url)
+                    found = lookup()
+                    if found is not None:
+                        write.complete(found)
+                        return found
+                retry += 1
+                error: Optional[Exception] = None
+                response: Any = None
+                try:
+                    response = self._send_request(url, method, data, retry=False)
+                    status_code, headers = response.status_code, response.headers
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                    error, status_code, headers = e, None, None
+                if status_code is not None and status_code < 400:
+                    self._update_cache(url, method, response)
+                    result = self._handle_response(response, method)
+                    write.complete(result)
+                    return result
+                unknown = is_unknown_outcome(status_code)
+                delay = self._write_retry_delay(method, status_code, headers, retry, started, lookup is not None)
+                if delay is None:
+                    if error is not None:
+                        raise error
+                    if not unknown:
+                        write.discard()
+                    return self._handle_response(response, method)
+                time.sleep(delay)
+
+    def _http_cache_lookup(self, uri: str, method: str) -> Optional[CacheLookup]:
+        """Look up a `GET` call in the client's persistent HTTP cache, if it has one."""
+        if self.http_cache is None or self.cache_name is None or not self._http_cacheable:
+            return None
+        if method is not HttpVerbs.GET:
+            return None
+        return self.http_cache.lookup(self._request_key(uri))
+
+    def _http_cache_update(self, uri: str, method: str, lookup: Optional[CacheLookup], response: Any) -> Any:
+        """Store the response of a `GET` call in the persistent HTTP cache, returning the stored response if it
+        was revalidated. Other calls discard the resource's stored responses.
+        """
+        if self.http_cache is None or self.cache_name is None:
+            return response
+        if lookup is not None:
+            return self.http_cache.update(lookup, response, self.cache_name, rate_limit_key(uri))
+        if method is not HttpVerbs.GET:
+            self.http_cache.invalidate(self.cache_name, rate_limit_key(uri))
+        return response
+
+    def _handle_response(self, response: Any, method: str) -> Any:  # pragma: no cover
+        """Parse the response of a call, raising a `FreshBooksError` if it was not successful.
+
+        Each API family (accounting, projects, etc.) structures their responses and errors differently,
+        so this is implemented per resource type. It is shared by the synchronous and asynchronous clients,
+        so `response` may be either a `requests.Response` or an `httpx.Response`.
+        """
+        raise NotImplementedError
+
+    def _decode(self, response: Any) -> Any:
+        """Decode the json body of a response with the client's `freshbooks.decoders.JSONDecoder`.
+
+        Raises:
+            ValueError: If the body is not valid JSON.
+        """
+        return self.json_decoder.decode(response.content)
+
+    def _request_key(self, url: str) -> CacheKey:
+        """Identifies identical calls, for caching and coalescing"""
+        return ResponseCache.key(url, self.access_token, self.api_version)
+
+    def _cached_response(self, url: str, method: str) -> Optional[CachedResponse]:
+        """The cached response of a `GET` call, if the client has a response cache and it has one."""
+        if self.response_cache is None or self.cache_name is None or method is not HttpVerbs.GET:
+            return None
+        return self.response_cache.get(self._request_key(url))
+
+    def _update_cache(self, url: str, method: str, response: Any) -> None:
+        """Cache the response of a `GET` call, or discard the resource's cached responses on any other call."""
+        if self.response_cache is None or self.cache_name is None:
+            return
+        if method is HttpVerbs.GET:
+            self.response_cache.set(self._request_key(url), response, self.cache_name, rate_limit_key(url))
+        else:
+            self.response_cache.invalidate(self.cache_name, rate_limit_key(url))
+
+    def _send_and_cache(self, url: str, method: str, data: Optional[dict] = None) -> Any:
+        response = self._send_request(url, method, data)
+        self._update_cache(url, method, response)
+        return response
+
+    def _request(self, url: str, method: str, data: Optional[dict] = None) -> Any:
+        response: Any = self._cached_response(url, method)
+        if response is None:
+            if self.single_flight is not None and method is HttpVerbs.GET:
+                response = self.single_flight.do(self._request_key(url), lambda: self._send_and_cache(url, method))
+            else:
+                response = self._send_and_cache(url, method, data)
+        return self._handle_response(response, method)
+
+    def _stream_list(self, url: str, list_name: str, single_name: str, path: Tuple[str, ...]) -> ListStream:
+        """Make a list call, returning a `freshbooks.streaming.ListStream` of its resources.
+
+        The response bypasses the client's response cache and call coalescing, but not its rate and concurrency
+        limiters. Unsuccessful responses are read in full and raised by `_handle_response`, as for any call.
+        """
+        response = self._send_request(url, HttpVerbs.GET, stream=True)
+        if response.status_code >= 400:
+            with response:
+                self._handle_response(response, HttpVerbs.GET)
+        results = self._list_result(list_name, single_name, {list_name: []})
+        return ListStream(results, path, response.iter_content(CHUNK_SIZE), response.close, response.status_code)
+
+    def _result(self, name: Optional[str], data: dict) -> Result:
+        """A `Result` of a single resource, or its `freshbooks.typed_models` model if the client uses them."""
+        model = MODELS.get(name) if self.typed_models and name else None
+        if model is not None:
+            # Typed models stand in for `Result`, with the same `data` and attribute access
+            return cast(Result, model(data.get(name, {})))
+        return Result(name, data)
+
+    def _list_result(self, list_name: str, single_name: str, data: dict) -> ListResult:
+        """A `ListResult` of resources, returning their `freshbooks.typed_models` model if the client uses them."""
+        model = MODELS.get(single_name) if self.typed_models else None
+        return ListResult(list_name, single_name, data, model=model)
+
+    def _builder_resource_name(self) -> str:
+        """The resource type that builders generate query strings for. Eg. AccountingResource, ProjectsResource"""
+        return self.__class__.__name__
+
+    def _query_chunks(self, builders: Optional[List[Builder]]) -> List[Optional[List[Builder]]]:
+        """The builders of each list call needed to keep their query strings within `MAX_QUERY_LENGTH`."""
+        return chunk_builders(builders, self._builder_resource_name(), self.MAX_QUERY_LENGTH)
+
+    def _partition_chunks(
+        self, partitions: List[Builder], builders: Optional[List[Builder]]
+    ) -> List[Optional[List[Builder]]]:
+        """The builders of each list call of `list_partitions`, with each partition added to `builders`."""
+        if not partitions:
+            raise ValueError("At least one partition is required")
+        return [chunk for partition in partitions for chunk in self._query_chunks([partition, *(builders or [])])]
+
     def _build_query_string(self, builders: Any) -> str:
-        query_string = ""
-        if builders:
-            for builder in builders:
-                query_string += builder.build(self.__class__.__name__)
+        if not builders:
+            return ""
+        resource_name = self._builder_resource_name()
+        query_string = "".join([builder.build(resource_name) for builder in builders])
         if query_string:
             query_string = "?" + query_string[1:]
         return query_string
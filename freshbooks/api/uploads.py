@@ -1,6 +1,6 @@
 from io import BufferedReader
 from types import SimpleNamespace
-from typing import Optional
+from typing import Any, Optional
 
 import requests
 from freshbooks.api.resource import HttpVerbs, Resource
@@ -11,6 +11,9 @@ from freshbooks.models import Result
 class UploadsResource(Resource):
     """Handles resources under the `/uploads` endpoints."""
 
+    # Files are returned to the caller as the raw response, so are not stored in an HTTPCache
+    _http_cacheable = False
+
     def __init__(self, client_config: SimpleNamespace, upload_path: str, single_name: str):
         super().__init__(client_config)
         self.upload_path = upload_path
@@ -21,6 +24,33 @@ class UploadsResource(Resource):
             return "{}/uploads/account/{}/{}".format(self.base_url, account_id, self.upload_path)
         return "{}/uploads/{}/{}".format(self.base_url, self.upload_path, jwt)
 
+    def _handle_get_response(self, response: Any) -> None:
+        status = response.status_code
+        if status >= 400:
+            try:
+                content = response.json()
+            except ValueError:
+                raise FreshBooksError(status, "Failed to parse response", raw_response=response.text)
+            raise FreshBooksError(status, content["error"], raw_response=response.text)
+
+    def _handle_upload_response(self, response: Any) -> Result:
+        status = response.status_code
+        try:
+            content = response.json()
+        except ValueError:
+            raise FreshBooksError(status, "Failed to parse response", raw_response=response.text)
+
+        if status >= 400:
+            raise FreshBooksError(status, content["error"], raw_response=response.text)
+
+        if self.single_name not in content:  # pragma: no cover
+            raise FreshBooksError(status, "Returned an unexpected response", raw_response=response.text)
+
+        if content.get("link"):
+            content[self.single_name]["link"] = content["link"]
+
+        return Result(self.single_name, content)
+
     def get(self, jwt: str) -> requests.Response:
         """Get an uploaded file. This returns a requests.Response object to provide flexibility
         in handling the data.
@@ -36,16 +66,8 @@ class UploadsResource(Resource):
         """
         url = self._get_url(jwt=jwt)
 
-        response = self._send_request(url, HttpVerbs.GET)
-
-        status = response.status_code
-        if status >= 400:
-            try:
-                content = response.json()
-            except ValueError:
-                raise FreshBooksError(status, "Failed to parse response", raw_response=response.text)
-            raise FreshBooksError(status, content["error"], raw_response=response.text)
-
+        response: requests.Response = self._send_request(url, HttpVerbs.GET)
+        self._handle_get_response(response)
         return response
 
     def upload(
@@ -86,20 +108,4 @@ class UploadsResource(Resource):
         files = {"content": file_content}
 
         response = self._send_request(url, HttpVerbs.POST, files=files)
-
-        status = response.status_code
-        try:
-            content = response.json()
-        except ValueError:
-            raise FreshBooksError(status, "Failed to parse response", raw_response=response.text)
-
-        if status >= 400:
-            raise FreshBooksError(status, content["error"], raw_response=response.text)
-
-        if self.single_name not in content:  # pragma: no cover
-            raise FreshBooksError(status, "Returned an unexpected response", raw_response=response.text)
-
-        if content.get("link"):
-            content[self.single_name]["link"] = content["link"]
-
-        return Result(self.single_name, content)
+        return self._handle_upload_response(response)
@@ -0,0 +1,107 @@
+from typing import Any, Dict, cast
+
+from freshbooks.api.accounting import AccountingResource
+from freshbooks.api.accounting_business import AccountingBusinessResource
+from freshbooks.api.async_resources import (
+    AsyncAccountingBusinessResource, AsyncAccountingResource, AsyncAuthResource, AsyncCommentsResource,
+    AsyncCommentsSubResource, AsyncEventsResource, AsyncPaymentsResource, AsyncProjectsResource, AsyncResource,
+    AsyncTimetrackingResource, AsyncUploadsResource, httpx
+)
+from freshbooks.api.auth import AuthResource
+from freshbooks.api.comments import CommentsResource, CommentsSubResource
+from freshbooks.api.events import EventsResource
+from freshbooks.api.payments import PaymentsResource
+from freshbooks.api.projects import ProjectsResource
+from freshbooks.api.timetracking import TimetrackingResource
+from freshbooks.api.uploads import UploadsResource
+from freshbooks.client import Client
+from freshbooks.errors import FreshBooksClientConfigError
+from freshbooks.models import Identity
+
+
+class AsyncClient(Client):
+    """An asyncio API client, offering the same resources as `freshbooks.client.Client` but with
+    `get`, `list`, `create`, `update`, `delete` (etc.) calls as coroutines.
+
+    Requires [httpx](https://www.python-httpx.org/), which can be installed with the `async` extra:
+    `pip install freshbooks-sdk[async]`.
+
+    ```python
+    from freshbooks import AsyncClient
+
+    async with AsyncClient(client_id=<your application id>, access_token=<a valid token>) as freshBooksClient:
+        invoice = await freshBooksClient.invoices.get(account_id, invoice_id)
+        projects = await freshBooksClient.projects.list(business_id)
+    ```
+
+    All resources of the client share one pooled `httpx.AsyncClient`, sized by `pool_maxsize`. The client should
+    be closed with `await freshBooksClient.aclose()` or used as an async context manager.
+
+    The authorization calls (`get_access_token`, `refresh_access_token`) are inherited from `Client` and are not
+    asynchronous.
+    """
+
+    _resource_classes: Dict[type, type] = {
+        AccountingResource: AsyncAccountingResource,
+        AccountingBusinessResource: AsyncAccountingBusinessResource,
+        AuthResource: AsyncAuthResource,
+        CommentsResource: AsyncCommentsResource,
+        CommentsSubResource: AsyncCommentsSubResource,
+        EventsResource: AsyncEventsResource,
+        PaymentsResource: AsyncPaymentsResource,
+        ProjectsResource: AsyncProjectsResource,
+        TimetrackingResource: AsyncTimetrackingResource,
+        UploadsResource: AsyncUploadsResource,
+    }
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        """Create a new asyncio API client instance. Takes the same arguments as `freshbooks.client.Client`.
+
+        Raises:
+            FreshBooksClientConfigError: If httpx is not installed.
+        """
+        if httpx is None:  # pragma: no cover
+            raise FreshBooksClientConfigError("httpx must be installed to use the AsyncClient")
+        super().__init__(*args, **kwargs)
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"FreshBooks AsyncClient: {self.client_id}"
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"FreshBooks AsyncClient: {self.client_id}"
+
+    async def __aenter__(self) -> "AsyncClient":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+    def close(self) -> None:
+        """Not supported on the `AsyncClient`, use `aclose()`."""
+        raise RuntimeError("AsyncClient must be closed with `await aclose()`")
+
+    async def aclose(self) -> None:
+        """Close the client's HTTP session and release any pooled connections.
+
+        The client can still be used afterwards, a new session will be created on the next call.
+        """
+        session, self._session = self._session, None
+        if session:
+            await session.aclose()  # type: ignore
+
+    def _get_session(self) -> Any:
+        """The pooled `httpx.AsyncClient` shared by all of the client's resources. Created on first use."""
+        if not self._session:
+            with self._session_lock:
+                if not self._session:  # pragma: no branch
+                    self._session = AsyncResource._config_session(  # type: ignore[assignment]
+                        pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize
+                    )
+        return self._session
+
+    async def current_user(self) -> Identity:  # type: ignore[override]
+        """The identity details of the currently authenticated user.
+
+        See [FreshBooks API - Business, Roles, and Identity](https://www.freshbooks.com/api/me_endpoint)
+        """
+        return await cast(AsyncAuthResource, self._get_resource("auth", AuthResource)).me_endpoint()
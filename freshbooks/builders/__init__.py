@@ -1,4 +1,36 @@
+import re
+from typing import Any
+from urllib.parse import quote
+
+QUERY_SAFE = ":@/,"
+"""Characters besides letters, digits, and `-._~` that are left unescaped in query string values"""
+
+_UNESCAPED = re.compile(r"[A-Za-z0-9\-._~:@/,]*\Z")
+
+
+def _quote(value: Any) -> str:
+    """URL-encode a query string value, so that eg. `&`, `=`, `+`, and `#` in it are sent as part of the value."""
+    if type(value) is int:
+        return str(value)
+    text = str(value)
+    if _UNESCAPED.match(text):
+        return text  # Most values (ids, dates, names) need no escaping, which is much faster to check than to do
+    return quote(text, safe=QUERY_SAFE)
+
+
+def _sent_length(query_string: str) -> int:
+    """The length of a built query string once sent, as its brackets are percent-encoded (eg. `%5B`) on the way."""
+    return len(query_string) + 2 * (query_string.count("[") + query_string.count("]"))
+
+
+def _is_accounting_like(resource_name: Any) -> bool:
+    """If the query string is for a resource with accounting-style parameters (the default)."""
+    return not resource_name or resource_name in ("AccountingResource", "EventsResource")
+
+
 class Builder:
+    # Lets subclasses such as `freshbooks.builders.frozen.FrozenBuilder` use `__slots__`
+    __slots__ = ()
 
     def build(self, resource_name: str) -> str:  # pragma: no cover
         """Builds the query string parameters from the Builder.
@@ -11,3 +43,15 @@ class Builder:
             The built query string
         """
         raise NotImplementedError
+
+    def freeze(self) -> "Builder":
+        """An immutable copy of the builder, whose query string is built only once per type of resource.
+
+        A frozen builder can be shared between threads and reused for any number of calls (eg. as a module-level
+        constant), and later changes to the original builder don't affect it. See `freshbooks.builders.frozen`.
+
+        Returns:
+            The `freshbooks.builders.frozen.FrozenBuilder`
+        """
+        from freshbooks.builders.frozen import FrozenBuilder
+        return FrozenBuilder(self)
@@ -1,7 +1,7 @@
-from datetime import date, datetime
-from typing import Any, Optional, Union, List, Tuple
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional, Union, List, Tuple
 
-from freshbooks.builders import Builder
+from freshbooks.builders import Builder, _is_accounting_like, _quote, _sent_length
 
 
 class FilterBuilder(Builder):
@@ -33,11 +33,23 @@ class FilterBuilder(Builder):
     >>> f = FilterBuilder()
     >>> f.between("start_date", date.today())
     FilterBuilder(&search[start_date]=2020-11-21)
+
+    >>> f = FilterBuilder()
+    >>> f.equals("invoice_number", "A&B #1")
+    FilterBuilder(&search[invoice_number]=A%26B%20%231)
     ```
+
+    Values are URL-encoded. The built query string is remembered until another filter is added, so a builder
+    reused for many calls is only built once (see also `freshbooks.builders.frozen`).
     """
 
     def __init__(self) -> None:
         self._filters: List[Tuple[str, str, Any]] = []
+        self._query_strings: Dict[bool, str] = {}
+
+    def _add(self, filter_type: str, field: str, value: Any) -> None:
+        self._filters.append((filter_type, field, value))
+        self._query_strings.clear()
 
     def __str__(self) -> str:
         query_string = self.build()
@@ -60,7 +72,7 @@ class FilterBuilder(Builder):
         Returns:
             The FilterBuilder instance
         """
-        self._filters.append(("bool", field, value))
+        self._add("bool", field, value)
         return self
 
     def equals(self, field: str, value: Any) -> Builder:
@@ -76,7 +88,7 @@ class FilterBuilder(Builder):
         Returns:
             The FilterBuilder instance
         """
-        self._filters.append(("equals", field, value))
+        self._add("equals", field, value)
         return self
 
     def in_list(self, field: str, values: list) -> Builder:
@@ -101,7 +113,7 @@ class FilterBuilder(Builder):
         """
         if field[-1] != "s":
             field = f"{field}s"
-        self._filters.append(("in", field, values))
+        self._add("in", field, list(values))
         return self
 
     def like(self, field: str, value: Any) -> Builder:
@@ -116,7 +128,7 @@ class FilterBuilder(Builder):
         Returns:
             The FilterBuilder instance
         """
-        self._filters.append(("like", field, value))
+        self._add("like", field, value)
         return self
 
     def date_time(self, field: str, value: Union[str, datetime]) -> Builder:
@@ -139,7 +151,7 @@ class FilterBuilder(Builder):
         """
         if isinstance(value, datetime):
             value = value.isoformat()
-        self._filters.append(("date_time", field, value))
+        self._add("date_time", field, value)
         return self
 
     def between(self, field: str, min: Optional[Any] = None, max: Optional[Any] = None) -> Builder:
@@ -171,11 +183,11 @@ class FilterBuilder(Builder):
         if min:
             min_field = self._convert_between_field_name(field, "_min")
             min_value = self._convert_between_value(min)
-            self._filters.append(("between", min_field, min_value))
+            self._add("between", min_field, min_value)
         if max:
             max_field = self._convert_between_field_name(field, "_max")
             max_value = self._convert_between_value(max)
-            self._filters.append(("between", max_field, max_value))
+            self._add("between", max_field, max_value)
         return self
 
     def _convert_between_field_name(self, field: str, min_max: str) -> str:
@@ -200,16 +212,188 @@ class FilterBuilder(Builder):
         Returns:
             The built query string
         """
-        is_accounting_like = False
-        if not resource_name or resource_name in ("AccountingResource", "EventsResource"):
-            is_accounting_like = True
-        query_string = ""
-        for filter_type, field, value in self._filters:
-            if filter_type in ("like", "between") or (is_accounting_like and filter_type == "equals"):
-                query_string = f"{query_string}&search[{field}]={value}"
-            if filter_type == "in":
-                for val in value:
-                    query_string = f"{query_string}&search[{field}][]={val}"
-            if filter_type in ("bool", "date_time") or (not is_accounting_like and filter_type == "equals"):
-                query_string = f"{query_string}&{field}={value}"
+        is_accounting_like = _is_accounting_like(resource_name)
+        query_string = self._query_strings.get(is_accounting_like)
+        if query_string is None:
+            query_string = self._query_strings[is_accounting_like] = self._build(is_accounting_like)
         return query_string
+
+    def _build(self, is_accounting_like: bool) -> str:
+        return "".join(part for filter in self._filters for part in self._filter_parts(filter, is_accounting_like))
+
+    def _filter_parts(self, filter: Tuple[str, str, Any], is_accounting_like: bool) -> List[str]:
+        """The query string parameters of a filter, one per value for an `in` filter."""
+        filter_type, field, value = filter
+        if filter_type in ("like", "between") or (is_accounting_like and filter_type == "equals"):
+            return [f"&search[{field}]={_quote(value)}"]
+        if filter_type == "in":
+            return [f"&search[{field}][]={_quote(val)}" for val in value]
+        return [f"&{field}={_quote(value)}"]
+
+    def split(self, max_length: int, resource_name: Optional[str] = None) -> List["FilterBuilder"]:
+        """Split the values of `in_list` filters between several builders, so that each builds a query string
+        of at most `max_length` characters once sent (with its brackets percent-encoded).
+
+        Every resource matching this builder's filters matches exactly one of the returned builders, so a
+        list call made with each of them finds the same resources as one with this builder (as long as the
+        filtered field has a single value). Each builder has the other filters of this builder.
+
+        ```python
+        >>> f = FilterBuilder().in_list("clientids", [1001, 1002, 1003])
+        >>> f.split(80)
+        [FilterBuilder(&search[clientids][]=1001&search[clientids][]=1002), FilterBuilder(&search[clientids][]=1003)]
+        ```
+
+        Args:
+            max_length: The maximum length of each builder's query string
+            resource_name: (Optional) The type of resource to generate the query strings for.
+
+        Returns:
+            This builder alone if its query string is short enough, otherwise the builders splitting its values.
+
+        Raises:
+            ValueError: If the filters can't be split into short enough query strings.
+        """
+        if _sent_length(self.build(resource_name)) <= max_length:
+            return [self]
+        is_accounting_like = _is_accounting_like(resource_name)
+        parts = [self._filter_parts(filter, is_accounting_like) for filter in self._filters]
+        lengths = [sum(_sent_length(part) for part in filter_parts) for filter_parts in parts]
+        lists = sorted(
+            (index for index, (filter_type, _, values) in enumerate(self._filters)
+             if filter_type == "in" and len(values) > 1),
+            key=lambda index: -lengths[index]
+        )
+        if not lists:
+            raise ValueError(f"The filters can't be split into query strings of at most {max_length} characters")
+        for index in lists:
+            budget = max_length - (sum(lengths) - lengths[index])
+            if budget >= max(_sent_length(part) for part in parts[index]):
+                chunks = _pack(self._filters[index][2], parts[index], budget)
+                return [self._with_values(index, chunk) for chunk in chunks]
+        # No list can be split on its own while the others are as long as they are, so halve the longest
+        values = self._filters[lists[0]][2]
+        half = len(values) // 2
+        return [
+            builder for chunk in (values[:half], values[half:])
+            for builder in self._with_values(lists[0], chunk).split(max_length, resource_name)
+        ]
+
+    def partition(
+        self, field: str, start: Union[str, date], end: Union[str, date], parts: int, until_field: Optional[str] = None
+    ) -> List["FilterBuilder"]:
+        """Split a date range into `parts` consecutive sub-ranges, returning a copy of this builder filtered to each.
+
+        List calls made with each of the builders, eg. with `list_partitions`, find the resources of the whole range
+        as several shorter scans that can run concurrently, instead of one long scan through deep pages.
+
+        By default each sub-range is a `between` filter of whole days, which don't overlap:
+
+        ```python
+        >>> f = FilterBuilder().equals("vis_state", 0)
+        >>> f.partition("date", "2020-01-01", "2020-12-31", 4)
+        [FilterBuilder(&search[vis_state]=0&search[date_min]=2020-01-01&search[date_max]=2020-03-31), ...]
+        ```
+
+        With an `until_field`, each sub-range is instead a pair of `date_time` filters, from `field` to
+        `until_field`, splitting the range into whole seconds. Adjacent sub-ranges share their bounds, so a
+        resource exactly on one may be found by both (`list_partitions` only returns it once).
+
+        ```python
+        >>> f = FilterBuilder()
+        >>> f.partition("started_from", "2020-01-01T00:00:00", "2020-01-02T00:00:00", 2, until_field="started_to")
+        [FilterBuilder(&started_from=2020-01-01T00:00:00&started_to=2020-01-01T12:00:00), ...]
+        ```
+
+        Args:
+            field: The API response field to filter on. Eg. `date` (as `date_min` and `date_max`), `updated_since`
+            start: The start of the range, as a `date` or `datetime`, or an ISO 8601 string
+            end: The end of the range (included for dates)
+            parts: The number of sub-ranges. Fewer are returned if the range has fewer days (or seconds).
+            until_field: (Optional) The field for the end of each sub-range, for `date_time` filters.
+
+        Returns:
+            A copy of this builder for each sub-range, in order.
+
+        Raises:
+            ValueError: If the range is empty, or `parts` is less than 1.
+        """
+        if parts < 1:
+            raise ValueError("A range must be split into at least one part")
+        builders = []
+        if until_field is None:
+            for min, max in _date_ranges(_to_date(start), _to_date(end), parts):
+                builder = self._copy()
+                builder.between(field, min, max)
+                builders.append(builder)
+        else:
+            for since, until in _time_ranges(_to_datetime(start), _to_datetime(end), parts):
+                builder = self._copy()
+                builder.date_time(field, since)
+                builder.date_time(until_field, until)
+                builders.append(builder)
+        return builders
+
+    def _copy(self) -> "FilterBuilder":
+        builder = FilterBuilder()
+        builder._filters = list(self._filters)
+        return builder
+
+    def _with_values(self, index: int, values: list) -> "FilterBuilder":
+        """A copy of the builder with the values of its `index`th filter replaced."""
+        builder = self._copy()
+        filter_type, field, _ = self._filters[index]
+        builder._filters[index] = (filter_type, field, values)
+        return builder
+
+
+def _pack(values: list, parts: List[str], budget: int) -> List[list]:
+    """Split `values` into consecutive chunks, the total sent length of whose `parts` is at most `budget`."""
+    chunks: List[list] = []
+    chunk: list = []
+    length = 0
+    for value, part in zip(values, parts):
+        part_length = _sent_length(part)
+        if chunk and length + part_length > budget:
+            chunks.append(chunk)
+            chunk, length = [], 0
+        chunk.append(value)
+        length += part_length
+    chunks.append(chunk)
+    return chunks
+
+
+def _to_date(value: Union[str, date]) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(value[:10])
+
+
+def _to_datetime(value: Union[str, date]) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    return datetime.fromisoformat(value)
+
+
+def _date_ranges(start: date, end: date, parts: int) -> List[Tuple[date, date]]:
+    """Split the days from `start` to `end` (inclusive) into up to `parts` consecutive, non-overlapping ranges."""
+    days = (end - start).days + 1
+    if days < 1:
+        raise ValueError(f"The range from {start} to {end} is empty")
+    parts = min(parts, days)
+    bounds = [start + timedelta(days=days * part // parts) for part in range(parts + 1)]
+    return [(bounds[part], bounds[part + 1] - timedelta(days=1)) for part in range(parts)]
+
+
+def _time_ranges(start: datetime, end: datetime, parts: int) -> List[Tuple[datetime, datetime]]:
+    """Split the whole seconds from `start` to `end` into up to `parts` consecutive ranges sharing their bounds."""
+    seconds = int((end - start).total_seconds())
+    if seconds < 1:
+        raise ValueError(f"The range from {start} to {end} is empty")
+    parts = min(parts, seconds)
+    bounds = [start + timedelta(seconds=seconds * part // parts) for part in range(parts)] + [end]
+    return [(bounds[part], bounds[part + 1]) for part in range(parts)]
@@ -0,0 +1,68 @@
+"""Frozen builders, whose query strings are built once and reused.
+
+Builders are usually rebuilt into a query string on every call they are passed to. Builders that are reused for
+many calls can instead be frozen, which takes an immutable copy and builds it only once for each type of resource:
+
+```python
+>>> from freshbooks import FilterBuilder, IncludesBuilder
+
+>>> ACTIVE_CLIENTS = FilterBuilder().equals("vis_state", 0).in_list("userids", user_ids).freeze()
+>>> WITH_LINES = IncludesBuilder().include("lines").freeze()
+
+>>> for account_id in account_ids:
+...     clients = freshBooksClient.clients.list(account_id, builders=[ACTIVE_CLIENTS])
+```
+
+The built-in builders also remember their last built query string until they are changed, so reusing an unfrozen
+builder is nearly as cheap, but a frozen builder can't be changed by accident once it is shared.
+"""
+import copy
+from typing import Dict, Optional
+
+from freshbooks.builders import Builder
+from freshbooks.builders.paginator import PaginateBuilder
+
+
+class FrozenBuilder(Builder):
+    """An immutable copy of a builder, caching its query string for each type of resource."""
+
+    __slots__ = ("_builder", "_query_strings")
+
+    def __init__(self, builder: Builder):
+        """Freeze a builder. Usually created with `Builder.freeze()`.
+
+        Args:
+            builder: The builder to take a copy of
+
+        Raises:
+            ValueError: For a `PaginateBuilder`, which `iter_all` and `list_all` need to replace for each page.
+        """
+        if isinstance(builder, PaginateBuilder):
+            raise ValueError("A PaginateBuilder can't be frozen")
+        self._builder = copy.deepcopy(builder)
+        self._query_strings: Dict[Optional[str], str] = {}
+
+    def __str__(self) -> str:
+        return f"FrozenBuilder({self._builder})"
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"FrozenBuilder({self._builder})"
+
+    def freeze(self) -> Builder:
+        return self
+
+    def build(self, resource_name: Optional[str] = None) -> str:
+        """Builds the query string parameters of the frozen builder, or returns them if already built.
+
+        Args:
+            resource_name:
+                The type of resource to generate the query string for. Eg. AccountingResource, ProjectsResource
+
+        Returns:
+            The built query string
+        """
+        query_string = self._query_strings.get(resource_name)
+        if query_string is None:
+            query_string = self._builder.build(resource_name)  # type: ignore[arg-type]
+            self._query_strings[resource_name] = query_string
+        return query_string
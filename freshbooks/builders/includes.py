@@ -1,6 +1,6 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-from freshbooks.builders import Builder
+from freshbooks.builders import Builder, _is_accounting_like, _quote
 
 
 class IncludesBuilder(Builder):
@@ -17,6 +17,7 @@ class IncludesBuilder(Builder):
 
     def __init__(self) -> None:
         self._includes: List[str] = []
+        self._query_strings: Dict[bool, str] = {}
 
     def __str__(self) -> str:
         query_string = self.build()
@@ -39,6 +40,7 @@ class IncludesBuilder(Builder):
             The IncludesBuilder instance
         """
         self._includes.append(key)
+        self._query_strings.clear()
         return self
 
     def build(self, resource_name: Optional[str] = None) -> str:
@@ -51,10 +53,12 @@ class IncludesBuilder(Builder):
         Returns:
             The built query string
         """
-        query_string = ""
-        for key in self._includes:
-            if not resource_name or resource_name in ("AccountingResource", "EventsResource"):
-                query_string = f"{query_string}&include[]={key}"
+        is_accounting_like = _is_accounting_like(resource_name)
+        query_string = self._query_strings.get(is_accounting_like)
+        if query_string is None:
+            if is_accounting_like:
+                query_string = "".join(f"&include[]={_quote(key)}" for key in self._includes)
             else:
-                query_string = f"{query_string}&{key}=true"
+                query_string = "".join(f"&{_quote(key)}=true" for key in self._includes)
+            self._query_strings[is_accounting_like] = query_string
         return query_string
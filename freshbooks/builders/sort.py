@@ -1,6 +1,6 @@
 from typing import Optional
 
-from freshbooks.builders import Builder
+from freshbooks.builders import Builder, _is_accounting_like, _quote
 
 
 class SortBuilder(Builder):
@@ -68,6 +68,7 @@ class SortBuilder(Builder):
         if not self._sort:
             return ""
 
-        if not resource_name or resource_name in ("AccountingResource", "EventsResource"):
-            return f"&sort={self._sort}_asc" if self._ascending else f"&sort={self._sort}_desc"
-        return f"&sort={self._sort}" if self._ascending else f"&sort=-{self._sort}"
+        sort = _quote(self._sort)
+        if _is_accounting_like(resource_name):
+            return f"&sort={sort}_asc" if self._ascending else f"&sort={sort}_desc"
+        return f"&sort={sort}" if self._ascending else f"&sort=-{sort}"
@@ -0,0 +1,222 @@
+"""In-memory caching of API responses.
+
+A `ResponseCache` can be passed to a `freshbooks.client.Client` (or `freshbooks.async_client.AsyncClient`)
+to cache the responses of `get` and `list` calls.
+
+```python
+from freshbooks import Client, ResponseCache
+
+cache = ResponseCache(ttl=60, ttls={"taxes": 3600, "items": 600})
+freshBooksClient = Client(client_id=<your application id>, access_token=<a valid token>, response_cache=cache)
+```
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Mapping, NamedTuple, Optional, Set, Tuple
+
+CacheKey = Tuple[str, Optional[str], str]
+CacheTag = Tuple[str, str]
+
+
+class CachedResponse:
+    """A stored copy of a successful HTTP response.
+
+    Offers the parts of the `requests.Response` (and `httpx.Response`) interface that the resources use
+    to parse responses, so each cache hit is parsed afresh and callers can't modify the cached data.
+    """
+
+    __slots__ = ("status_code", "content", "headers")
+
+    def __init__(self, status_code: int, content: bytes, headers: Optional[Mapping[str, str]] = None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = dict(headers or {})
+
+    @classmethod
+    def from_response(cls, response: Any) -> "CachedResponse":
+        """Copy a `requests.Response` or `httpx.Response`."""
+        return cls(response.status_code, response.content, response.headers)
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8")
+
+    def json(self, **kwargs: Any) -> Any:
+        return json.loads(self.content, **kwargs)
+
+
+class CacheStats(NamedTuple):
+    """Counts of a `ResponseCache`'s activity and size."""
+
+    hits: int
+    """Calls answered from the cache."""
+    misses: int
+    """Calls that were not in the cache (or had expired), and were sent to FreshBooks."""
+    evictions: int
+    """Responses removed to keep the cache within `max_entries` and `max_bytes`."""
+    invalidations: int
+    """Responses removed because the resource was created, updated, or deleted."""
+    entries: int
+    """Responses currently cached."""
+    bytes: int
+    """Total size of the response content currently cached."""
+
+
+class _Entry:
+    __slots__ = ("response", "expires_at", "tag")
+
+    def __init__(self, response: CachedResponse, expires_at: float, tag: CacheTag):
+        self.response = response
+        self.expires_at = expires_at
+        self.tag = tag
+
+
+class ResponseCache:
+    """A thread-safe, least-recently-used cache of `GET` responses with per-resource expiry.
+
+    Responses are cached by their full URL (including the query string of filters, includes, pagination, etc.),
+    the access token, and the API version, so clients with different tokens never share responses.
+
+    Time-to-live can be set per resource with `ttls`, by the name of the client attribute the resource is
+    accessed with (eg. `"taxes"` for `freshBooksClient.taxes`), with all other resources using `ttl`.
+    A TTL of 0 disables caching for that resource.
+
+    When a resource is created, updated, or deleted through the SDK, all cached responses of that resource
+    for the same account or business are discarded. Changes made outside the SDK, or that affect other
+    resources (eg. a payment changing an invoice's outstanding amount), are not detected until the
+    cached responses expire.
+    """
+
+    DEFAULT_TTL = 60.0
+    """Default seconds to cache responses for"""
+    DEFAULT_MAX_ENTRIES = 1024
+    DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+    def __init__(self, ttl: float = DEFAULT_TTL, ttls: Optional[Dict[str, float]] = None,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES,
+                 clock: Callable[[], float] = time.monotonic):
+        """Create a response cache.
+
+        Args:
+            ttl: (Optional) Seconds to cache responses for. Defaults to 60.
+            ttls: (Optional) Seconds to cache responses for by resource name, eg. `{"taxes": 3600}`
+            max_entries: (Optional) Maximum number of responses to cache. Defaults to 1024.
+            max_bytes: (Optional) Maximum total size of cached response content. Defaults to 32 MiB.
+            clock: (Optional) Monotonic clock, in seconds. For testing.
+        """
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._entries: "OrderedDict[CacheKey, _Entry]" = OrderedDict()
+        self._tags: Dict[CacheTag, Set[CacheKey]] = {}
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url: str, access_token: Optional[str], api_version: Optional[str] = None) -> CacheKey:
+        """The cache key of a call. The access token is hashed rather than kept in memory."""
+        token_id = hashlib.sha256((access_token or "").encode("utf-8")).hexdigest()
+        return (token_id, api_version, url)
+
+    def ttl_for(self, name: str) -> float:
+        """Seconds to cache responses of the named resource for."""
+        return self.ttls.get(name, self.ttl)
+
+    def get(self, key: CacheKey) -> Optional[CachedResponse]:
+        """The cached response for `key`, or `None` if it is not cached or has expired.
+
+        Args:
+            key: Cache key from `ResponseCache.key`
+
+        Returns:
+            The cached response, if any
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= self._clock():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return entry.response
+
+    def set(self, key: CacheKey, response: Any, name: str, account: str) -> None:
+        """Cache a response, if it was successful and the resource is cached.
+
+        Args:
+            key: Cache key from `ResponseCache.key`
+            response: The `requests.Response` (or `httpx.Response`) of the call
+            name: The name of the resource, as used in `ttls`
+            account: The account or business id the call was for
+        """
+        ttl = self.ttl_for(name)
+        if response.status_code != 200 or ttl <= 0:
+            return
+        cached = CachedResponse.from_response(response)
+        if len(cached.content) > self.max_bytes:
+            return
+        tag = (account, name)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(cached, self._clock() + ttl, tag)
+            self._tags.setdefault(tag, set()).add(key)
+            self._bytes += len(cached.content)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def invalidate(self, name: str, account: str) -> None:
+        """Discard all cached responses of a resource for an account or business.
+
+        Args:
+            name: The name of the resource, eg. `"invoices"`
+            account: The account or business id
+        """
+        with self._lock:
+            for key in self._tags.get((account, name), set()).copy():
+                self._remove(key)
+                self._invalidations += 1
+
+    def clear(self) -> None:
+        """Discard all cached responses."""
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self._bytes = 0
+
+    def stats(self) -> CacheStats:
+        """Counts of hits, misses, etc. and the current size of the cache.
+
+        Returns:
+            `CacheStats` snapshot
+        """
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                invalidations=self._invalidations,
+                entries=len(self._entries),
+                bytes=self._bytes,
+            )
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= len(entry.response.content)
+        keys = self._tags[entry.tag]
+        keys.discard(key)
+        if not keys:
+            del self._tags[entry.tag]
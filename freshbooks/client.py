@@ -1,8 +1,9 @@
 import os
 from datetime import datetime, timedelta, timezone
 import logging
+import threading
 from types import SimpleNamespace
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Tuple, Type, TypeVar
 
 import requests
 from requests.models import urlencode  # type: ignore
@@ -14,10 +15,19 @@ from freshbooks.api.comments import CommentsResource, CommentsSubResource
 from freshbooks.api.events import EventsResource
 from freshbooks.api.payments import PaymentsResource
 from freshbooks.api.projects import ProjectsResource
+from freshbooks.api.resource import Resource
 from freshbooks.api.timetracking import TimetrackingResource
 from freshbooks.api.uploads import UploadsResource
+from freshbooks.cache import ResponseCache
+from freshbooks.concurrency import AdaptiveConcurrencyLimiter
+from freshbooks.decoders import JSONDecoder
 from freshbooks.errors import FreshBooksError, FreshBooksClientConfigError
+from freshbooks.http_cache import HTTPCache
+from freshbooks.idempotency import IdempotencyJournal
 from freshbooks.models import Identity
+from freshbooks.ratelimit import RateLimiter
+from freshbooks.retry import RetryPolicy
+from freshbooks.singleflight import SingleFlight
 
 API_BASE_URL = "https://api.freshbooks.com"
 API_TOKEN_URL = "auth/oauth/token"
@@ -26,6 +36,8 @@ AUTH_URL = "oauth/authorize"
 DEFAULT_TIMEOUT = 30
 """Default request timeout to FreshBooks"""
 
+ResourceType = TypeVar("ResourceType", bound=Resource)
+
 logging.getLogger("freshbooks").addHandler(logging.NullHandler())
 
 with open(os.path.join(os.path.dirname(__file__), "VERSION")) as f:
@@ -33,10 +45,19 @@ with open(os.path.join(os.path.dirname(__file__), "VERSION")) as f:
 
 
 class Client:
+    _resource_classes: Dict[type, type] = {}
+
     def __init__(self, client_id: str, client_secret: Optional[str] = None, redirect_uri: Optional[str] = None,
                  access_token: Optional[str] = None, refresh_token: Optional[str] = None,
                  user_agent: Optional[str] = None, api_version: Optional[str] = None,
-                 timeout: Optional[int] = DEFAULT_TIMEOUT, auto_retry: bool = True):
+                 timeout: Optional[int] = DEFAULT_TIMEOUT, auto_retry: bool = True,
+                 pool_connections: int = Resource.POOL_CONNECTIONS, pool_maxsize: int = Resource.POOL_MAXSIZE,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+                 response_cache: Optional[ResponseCache] = None, single_flight: Optional[SingleFlight] = None,
+                 http_cache: Optional[HTTPCache] = None, typed_models: bool = False,
+                 json_decoder: Optional[JSONDecoder] = None, retry_policy: Optional[RetryPolicy] = None,
+                 idempotency_journal: Optional[IdempotencyJournal] = None):
         """
         Create a new API client instance for the given `client_id` and `client_secret`.
         This will allow you to follow the authentication flow to get an `access_token`.
@@ -44,6 +65,10 @@ class Client:
         Alternatively, you can provide an `access_token` directly, in which case then you don't need
         to specify a `client_secret` (though the token cannot be refreshed in this case).
 
+        All resources of the client share a single pooled HTTP session, so connections to FreshBooks
+        are kept alive and reused between calls. The client can be used as a context manager, or
+        `close()` can be called, to release those connections.
+
         Args:
             client_id: The FreshBooks application client id
             client_secret: (Optional) The FreshBooks application client secret
@@ -53,7 +78,28 @@ class Client:
             user_agent: (Optional) A user-agent string to override the default
             api_version: (Optional) Version of the API to use eg.'2023-02-20'
             timeout: (Optional) Set the timeout for API calls. Defaults to 30
-            auto_retry: If the SDK should retry failed call up to 3 times. Defaults to True.
+            auto_retry: If the SDK should retry failed calls, according to `retry_policy`. Defaults to True.
+            pool_connections: (Optional) Number of host connection pools to cache. Defaults to 10
+            pool_maxsize: (Optional) Maximum number of connections to keep open per host. Defaults to 10.
+                Set this to at least the number of threads making concurrent calls with the client.
+            rate_limiter: (Optional) A `freshbooks.ratelimit.RateLimiter` to pace calls by account or business.
+                It may be shared between clients using the same API quota.
+            concurrency_limiter: (Optional) A `freshbooks.concurrency.AdaptiveConcurrencyLimiter` to adaptively
+                limit the number of calls in flight at once, eg. for `list_all` or other parallel bulk operations.
+            response_cache: (Optional) A `freshbooks.cache.ResponseCache` to cache the responses of `get` and
+                `list` calls in memory.
+            single_flight: (Optional) A `freshbooks.singleflight.SingleFlight` to share one request between
+                identical `GET` calls made concurrently.
+            http_cache: (Optional) A `freshbooks.http_cache.HTTPCache` to persist the responses of `GET` calls
+                on disk, revalidating them with conditional requests.
+            typed_models: (Optional) Return the `freshbooks.typed_models` models of resources from `get` and
+                `list` calls, rather than `freshbooks.models.Result` objects. Defaults to False.
+            json_decoder: (Optional) A `freshbooks.decoders.JSONDecoder` to decode responses with, eg. the faster
+                `freshbooks.decoders.OrjsonDecoder`. Defaults to the standard library's `json`.
+            retry_policy: (Optional) A `freshbooks.retry.RetryPolicy` for retrying failed calls. Defaults to
+                retrying idempotent calls up to 3 times, with exponential backoff and jitter.
+            idempotency_journal: (Optional) A `freshbooks.idempotency.IdempotencyJournal` recording writes made
+                with an `idempotency_key`, so that they can be safely retried.
 
         Returns:
             The Client instance
@@ -67,6 +113,20 @@ class Client:
         self.api_version = api_version
         self.timeout = timeout
         self.auto_retry = auto_retry
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.rate_limiter = rate_limiter
+        self.concurrency_limiter = concurrency_limiter
+        self.response_cache = response_cache
+        self.single_flight = single_flight
+        self.http_cache = http_cache
+        self.typed_models = typed_models
+        self.json_decoder = json_decoder
+        self.retry_policy = retry_policy
+        self.idempotency_journal = idempotency_journal
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+        self._resources: Tuple[tuple, Dict[str, Resource]] = ((), {})
 
         self.base_url = os.getenv("FRESHBOOKS_API_URL", API_BASE_URL)
         self.authorization_url = "{}/{}".format(os.getenv("FRESHBOOKS_AUTH_URL", AUTH_BASE_URL), AUTH_URL)
@@ -83,6 +143,32 @@ class Client:
     def __repr__(self) -> str:  # pragma: no cover
         return f"FreshBooks Client: {self.client_id}"
 
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the client's HTTP session and release any pooled connections.
+
+        The client can still be used afterwards, a new session will be created on the next call.
+        """
+        with self._session_lock:
+            if self._session:
+                self._session.close()
+                self._session = None
+
+    def _get_session(self) -> requests.Session:
+        """The pooled HTTP session shared by all of the client's resources. Created on first use."""
+        if not self._session:
+            with self._session_lock:
+                if not self._session:  # pragma: no branch
+                    self._session = Resource._config_session(
+                        pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize
+                    )
+        return self._session
+
     def _client_resource_config(self) -> SimpleNamespace:
         return SimpleNamespace(
             access_token=self.access_token,
@@ -90,9 +176,48 @@ class Client:
             user_agent=self.user_agent,
             auto_retry=self.auto_retry,
             timeout=self.timeout,
-            api_version=self.api_version
+            api_version=self.api_version,
+            session=self._get_session(),
+            rate_limiter=self.rate_limiter,
+            concurrency_limiter=self.concurrency_limiter,
+            response_cache=self.response_cache,
+            single_flight=self.single_flight,
+            http_cache=self.http_cache,
+            typed_models=self.typed_models,
+            json_decoder=self.json_decoder,
+            retry_policy=self.retry_policy,
+            idempotency_journal=self.idempotency_journal
+        )
+
+    def _resource_config_key(self) -> tuple:
+        return (
+            self.access_token, self.base_url, self.user_agent, self.auto_retry, self.timeout, self.api_version,
+            self._session, self.rate_limiter, self.concurrency_limiter, self.response_cache, self.single_flight,
+            self.http_cache, self.typed_models, self.json_decoder, self.retry_policy, self.idempotency_journal
         )
 
+    def _get_resource(
+        self, name: str, resource_class: Type[ResourceType], *args: Any, **kwargs: Any
+    ) -> ResourceType:
+        """Get the named resource, creating it on first access.
+
+        Resources are cached on the client and rebuilt if any of the configuration they were created
+        with (eg. `access_token`, `timeout`, `api_version`) changes.
+        """
+        self._get_session()
+        resource_class = self._resource_classes.get(resource_class, resource_class)
+        config_key, resources = self._resources
+        if config_key != self._resource_config_key():
+            config_key, resources = self._resource_config_key(), {}
+            self._resources = (config_key, resources)
+        resource = resources.get(name)
+        if resource is None:
+            config = self._client_resource_config()
+            config.name = name
+            resource = resource_class(config, *args, **kwargs)  # type: ignore
+            resources[name] = resource
+        return resource  # type: ignore
+
     def get_auth_request_url(self, scopes: Optional[List[str]] = None) -> str:
         """Returns the url that a client needs to request an oauth grant from the server.
 
@@ -225,115 +350,114 @@ class Client:
 
         See [FreshBooks API - Business, Roles, and Identity](https://www.freshbooks.com/api/me_endpoint)
         """
-        return AuthResource(self._client_resource_config()).me_endpoint()
+        return self._get_resource("auth", AuthResource).me_endpoint()
 
     # Accounting Resources
 
     @property
     def bills(self) -> AccountingResource:
         """FreshBooks bills resource with calls to get, list, create, update, delete"""
-        return AccountingResource(
-            self._client_resource_config(), "bills/bills", "bill", "bills"
-        )
+        return self._get_resource("bills", AccountingResource, "bills/bills", "bill", "bills")
 
     @property
     def bill_payments(self) -> AccountingResource:
         """FreshBooks bill_payments resource with calls to get, list, create, update, delete"""
-        return AccountingResource(
-            self._client_resource_config(), "bill_payments/bill_payments", "bill_payment", "bill_payments"
+        return self._get_resource(
+            "bill_payments", AccountingResource, "bill_payments/bill_payments", "bill_payment", "bill_payments"
         )
 
     @property
     def bill_vendors(self) -> AccountingResource:
         """FreshBooks bill_vendors resource with calls to get, list, create, update, delete"""
-        return AccountingResource(
-            self._client_resource_config(), "bill_vendors/bill_vendors", "bill_vendor", "bill_vendors"
+        return self._get_resource(
+            "bill_vendors", AccountingResource, "bill_vendors/bill_vendors", "bill_vendor", "bill_vendors"
         )
 
     @property
     def clients(self) -> AccountingResource:
         """FreshBooks clients resource with calls to get, list, create, update, delete"""
-        return AccountingResource(self._client_resource_config(), "users/clients", "client", "clients")
+        return self._get_resource("clients", AccountingResource, "users/clients", "client", "clients")
 
     @property
     def credit_notes(self) -> AccountingResource:
         """FreshBooks credit_notes resource with calls to get, list, create, update, delete"""
-        return AccountingResource(
-            self._client_resource_config(), "credit_notes/credit_notes", "credit_note", "credit_notes"
+        return self._get_resource(
+            "credit_notes", AccountingResource, "credit_notes/credit_notes", "credit_note", "credit_notes"
         )
 
     @property
     def estimates(self) -> AccountingResource:
         """FreshBooks estimates resource with calls to get, list, create, update, delete"""
-        return AccountingResource(
-            self._client_resource_config(), "estimates/estimates", "estimate", "estimates", delete_via_update=False
+        return self._get_resource(
+            "estimates", AccountingResource, "estimates/estimates", "estimate", "estimates", delete_via_update=False
         )
 
     @property
     def expenses(self) -> AccountingResource:
         """FreshBooks expenses resource with calls to get, list, create, update, delete"""
-        return AccountingResource(self._client_resource_config(), "expenses/expenses", "expense", "expenses")
+        return self._get_resource("expenses", AccountingResource, "expenses/expenses", "expense", "expenses")
 
     @property
     def expenses_categories(self) -> AccountingResource:
         """FreshBooks expenses categories resource with calls to get and list"""
-        return AccountingResource(
-            self._client_resource_config(), "expenses/categories", "category", "categories",
+        return self._get_resource(
+            "expenses_categories", AccountingResource, "expenses/categories", "category", "categories",
             missing_endpoints=["create", "update", "delete"]
         )
 
     @property
     def gateways(self) -> AccountingResource:
         """FreshBooks gateways resource with calls to list, delete"""
-        return AccountingResource(
-            self._client_resource_config(), "systems/gateways", "gateway", "gateways", delete_via_update=False,
+        return self._get_resource(
+            "gateways", AccountingResource, "systems/gateways", "gateway", "gateways", delete_via_update=False,
             missing_endpoints=["create", "update", "get"]
         )
 
     @property
     def invoices(self) -> AccountingResource:
         """FreshBooks invoices resource with calls to get, list, create, update, delete"""
-        return AccountingResource(
-            self._client_resource_config(), "invoices/invoices", "invoice", "invoices", delete_via_update=False
+        return self._get_resource(
+            "invoices", AccountingResource, "invoices/invoices", "invoice", "invoices", delete_via_update=False
         )
 
     @property
     def invoice_profiles(self) -> AccountingResource:
         """FreshBooks invoice_profiles resource with calls to get, list, create, update, delete"""
-        return AccountingResource(
-            self._client_resource_config(), "invoice_profiles/invoice_profiles", "invoice_profile", "invoice_profiles"
+        return self._get_resource(
+            "invoice_profiles", AccountingResource, "invoice_profiles/invoice_profiles", "invoice_profile",
+            "invoice_profiles"
         )
 
     @property
     def items(self) -> AccountingResource:
         """FreshBooks items resource with calls to get, list, create, update, delete"""
-        return AccountingResource(self._client_resource_config(), "items/items", "item", "items")
+        return self._get_resource("items", AccountingResource, "items/items", "item", "items")
 
     @property
     def other_income(self) -> AccountingResource:
         """FreshBooks other_incomes resource with calls to get, list, create, update, delete"""
-        return AccountingResource(
-            self._client_resource_config(), "other_incomes/other_incomes", "other_income", "other_income",
+        return self._get_resource(
+            "other_income", AccountingResource, "other_incomes/other_incomes", "other_income", "other_income",
             delete_via_update=False
         )
 
     @property
     def payments(self) -> AccountingResource:
         """FreshBooks payments resource with calls to get, list, create, update, delete"""
-        return AccountingResource(self._client_resource_config(), "payments/payments", "payment", "payments")
+        return self._get_resource("payments", AccountingResource, "payments/payments", "payment", "payments")
 
     @property
     def staff(self) -> AccountingResource:
         """FreshBooks staff resource with calls to get, list, update, delete"""
-        return AccountingResource(
-            self._client_resource_config(), "users/staffs", "staff", "staffs", missing_endpoints=["create"]
+        return self._get_resource(
+            "staff", AccountingResource, "users/staffs", "staff", "staffs", missing_endpoints=["create"]
         )
 
     @property
     def systems(self) -> AccountingResource:
         """FreshBooks systems resource with calls to get only"""
-        return AccountingResource(
-            self._client_resource_config(), "systems/systems", "system", "systems",
+        return self._get_resource(
+            "systems", AccountingResource, "systems/systems", "system", "systems",
             missing_endpoints=["create", "update", "delete", "list"]
         )
 
@@ -346,13 +470,13 @@ class Client:
 
         Creating a task should create the corresponding service and vice versa.
         """
-        return AccountingResource(self._client_resource_config(), "projects/tasks", "task", "tasks")
+        return self._get_resource("tasks", AccountingResource, "projects/tasks", "task", "tasks")
 
     @property
     def taxes(self) -> AccountingResource:
         """FreshBooks taxes resource with calls to get, list, create, update, delete"""
-        return AccountingResource(
-            self._client_resource_config(), "taxes/taxes", "tax", "taxes", delete_via_update=False
+        return self._get_resource(
+            "taxes", AccountingResource, "taxes/taxes", "tax", "taxes", delete_via_update=False
         )
 
     # Accounting Business Resources
@@ -360,8 +484,8 @@ class Client:
     @property
     def ledger_accounts(self) -> AccountingBusinessResource:
         """FreshBooks accounts resource with calls to get, list"""
-        return AccountingBusinessResource(
-            self._client_resource_config(), "ledger_accounts/accounts", "accounts",
+        return self._get_resource(
+            "ledger_accounts", AccountingBusinessResource, "ledger_accounts/accounts", "accounts",
             missing_endpoints=["delete"]
         )
 
@@ -372,8 +496,8 @@ class Client:
         """FreshBooks callbacks (webhook callbacks) resource with calls to
         get, list, create, update, delete, resend_verification, verify
         """
-        return EventsResource(
-            self._client_resource_config(), "events/callbacks", "callback", "callbacks", delete_via_update=False
+        return self._get_resource(
+            "callbacks", EventsResource, "events/callbacks", "callback", "callbacks", delete_via_update=False
         )
 
     # Project Resources
@@ -381,15 +505,15 @@ class Client:
     @property
     def projects(self) -> ProjectsResource:
         """FreshBooks projects resource with calls to get, list, create, update, delete"""
-        return ProjectsResource(self._client_resource_config(), "projects", "project")
+        return self._get_resource("projects", ProjectsResource, "projects", "project")
 
     # Time tracking Resources
 
     @property
     def time_entries(self) -> TimetrackingResource:
         """FreshBooks time_entries resource with calls to get, list, create, update, delete"""
-        return TimetrackingResource(
-            self._client_resource_config(), "time_entries", "time_entries", single_name="time_entry"
+        return self._get_resource(
+            "time_entries", TimetrackingResource, "time_entries", "time_entries", single_name="time_entry"
         )
 
     # Comments Resources
@@ -397,36 +521,36 @@ class Client:
     @property
     def services(self) -> CommentsResource:
         """FreshBooks services resource with calls to get, list, create, update, delete"""
-        return CommentsResource(self._client_resource_config(), "services", "service")
+        return self._get_resource("services", CommentsResource, "services", "service")
 
     @property
     def service_rates(self) -> CommentsSubResource:
         """FreshBooks service_rates resource with calls to get, list, create, update"""
-        return CommentsSubResource(self._client_resource_config(), "service_rates", "service",
-                                   single_resource_sub_path="rate",
-                                   list_name="service_rates",
-                                   single_name="service_rate",
-                                   missing_endpoints=["delete"])
+        return self._get_resource("service_rates", CommentsSubResource, "service_rates", "service",
+                                  single_resource_sub_path="rate",
+                                  list_name="service_rates",
+                                  single_name="service_rate",
+                                  missing_endpoints=["delete"])
 
     # Payments Resources
 
     @property
     def invoice_payment_options(self) -> PaymentsResource:
         """FreshBooks default payment options resource with calls to defaults, get, create"""
-        return PaymentsResource(self._client_resource_config(), "invoice", "payment_options",
-                                sub_path="payment_options",
-                                defaults_path="payment_options",
-                                static_params="entity_type=invoice",
-                                missing_endpoints=["list", "update", "delete"])
+        return self._get_resource("invoice_payment_options", PaymentsResource, "invoice", "payment_options",
+                                  sub_path="payment_options",
+                                  defaults_path="payment_options",
+                                  static_params="entity_type=invoice",
+                                  missing_endpoints=["list", "update", "delete"])
 
     # Upload Resources
 
     @property
     def attachments(self) -> UploadsResource:
         """FreshBooks attachment upload resource with call to upload, get"""
-        return UploadsResource(self._client_resource_config(), "attachments", "attachment")
+        return self._get_resource("attachments", UploadsResource, "attachments", "attachment")
 
     @property
     def images(self) -> UploadsResource:
         """FreshBooks image upload resource with call to upload, get"""
-        return UploadsResource(self._client_resource_config(), "images", "image")
+        return self._get_resource("images", UploadsResource, "images", "image")
@@ -0,0 +1,222 @@
+"""Columnar export of `freshbooks.models.ListResult` objects to pandas, Apache Arrow, and NumPy.
+
+The columns are built directly from the json-parsed resources, rather than through a `freshbooks.models.Result`
+for each one, and dates and times are converted a column at a time by pandas or Arrow.
+
+```python
+invoices = freshBooksClient.invoices.list(account_id)
+data_frame = invoices.to_pandas()
+table = invoices.to_arrow(fields=["invoiceid", "create_date", "amount"])
+```
+
+Conversions follow the same rules as `freshbooks.models.Result`:
+
+- `yyyy-MM-dd` strings become dates.
+- ISO 8601 datetimes (with a `T`) are in UTC.
+- Accounting `yyyy-MM-dd HH:mm:ss` datetimes are in US/Eastern, except for the fields in
+  `freshbooks.models.ACCOUNTING_UTC_DATE_FIELDS` which are in UTC. All datetimes are returned in UTC.
+- Money objects (`{"amount": "100.00", "code": "CAD"}`) are flattened into a `Decimal` column of the field's
+  name and a currency column suffixed with `_code`, eg. `amount` and `amount_code`.
+
+A column is only converted if all its values are dates, or all are datetimes, so eg. a notes field that holds a
+date in some resources stays a column of strings. Dates that don't parse (eg. `"0000-00-00"`) become nulls. Other
+values, including nested resources and lists, are passed through as they are.
+
+pandas and NumPy can be installed with the `pandas` extra, and pyarrow with the `arrow` extra:
+
+```shell
+pip install freshbooks-sdk[pandas,arrow]
+```
+"""
+import re
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from freshbooks.errors import FreshBooksClientConfigError
+from freshbooks.models import _is_accounting_utc_date_field
+
+if TYPE_CHECKING:  # pragma: no cover
+    from freshbooks.models import ListResult
+
+try:
+    import numpy
+    import pandas  # type: ignore[import-untyped]
+except ImportError:  # pragma: no cover
+    numpy = None  # type: ignore
+    pandas = None  # type: ignore
+
+try:
+    import pyarrow  # type: ignore[import-untyped]
+    import pyarrow.compute  # type: ignore[import-untyped]
+except ImportError:  # pragma: no cover
+    pyarrow = None  # type: ignore
+
+DATE = "date"
+UTC_DATETIME = "utc_datetime"
+EASTERN_DATETIME = "eastern_datetime"
+MONEY_CODE_SUFFIX = "_code"
+
+DATE_FORMAT = "%Y-%m-%d"
+ACCOUNTING_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}$")
+_DATETIME_RE = re.compile(r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}")
+
+
+def _is_money(value: Any) -> bool:
+    return isinstance(value, dict) and "amount" in value and "code" in value
+
+
+def _to_decimal(value: Any) -> Optional[Decimal]:
+    if value is None or isinstance(value, Decimal):
+        return value
+    try:
+        return Decimal(str(value))
+    except ArithmeticError:
+        return None
+
+
+def _column_kind(single_name: str, field: str, values: List[Any]) -> Optional[str]:
+    """The kind of conversion a column needs, if all its non-null values are dates, or all are datetimes."""
+    present = [value for value in values if value is not None]
+    if not present or not all(isinstance(value, str) for value in present):
+        return None
+    if all(_DATE_RE.match(value) for value in present):
+        return DATE
+    if all(_DATETIME_RE.match(value) for value in present):
+        if "T" in present[0] or _is_accounting_utc_date_field(single_name, field):
+            return UTC_DATETIME
+        return EASTERN_DATETIME
+    return None
+
+
+def columns(results: "ListResult", fields: Optional[List[str]] = None) -> Tuple[Dict[str, List[Any]], Dict[str, str]]:
+    """Build the unconverted columns of a `ListResult`, with money objects flattened.
+
+    Args:
+        results: The ListResult to export
+        fields: (Optional) The fields to include, in order. Defaults to every field of the resources,
+            in the order they first appear.
+
+    Returns:
+        A dictionary of column name to values, and the kind of date conversion each date or datetime column needs.
+    """
+    records = results.data.get(results._name, [])
+    if fields is None:
+        seen: Dict[str, None] = {}
+        for record in records:
+            seen.update(dict.fromkeys(record))
+        fields = list(seen)
+
+    data: Dict[str, List[Any]] = {}
+    kinds: Dict[str, str] = {}
+    for field in fields:
+        values = [record.get(field) for record in records]
+        if any(_is_money(value) for value in values):
+            data[field] = [_to_decimal(value.get("amount")) if _is_money(value) else None for value in values]
+            data[field + MONEY_CODE_SUFFIX] = [value.get("code") if _is_money(value) else None for value in values]
+            continue
+        data[field] = values
+        kind = _column_kind(results._single_name, field, values)
+        if kind:
+            kinds[field] = kind
+    return data, kinds
+
+
+def to_pandas(results: "ListResult", fields: Optional[List[str]] = None) -> "pandas.DataFrame":
+    """Export a `ListResult` to a pandas DataFrame, one row per resource.
+
+    Dates become `datetime64` columns (pandas has no date type), and datetimes UTC `datetime64` columns.
+
+    Args:
+        results: The ListResult to export
+        fields: (Optional) The fields to include, in order. Defaults to every field.
+
+    Returns:
+        The DataFrame
+
+    Raises:
+        FreshBooksClientConfigError: If pandas is not installed.
+    """
+    if pandas is None:  # pragma: no cover
+        raise FreshBooksClientConfigError("pandas must be installed to export to pandas")
+    data, kinds = columns(results, fields)
+    frame = pandas.DataFrame(data)
+    for name, kind in kinds.items():
+        frame[name] = _pandas_datetimes(frame[name], kind)
+    return frame
+
+
+def _pandas_datetimes(values: "pandas.Series", kind: str) -> "pandas.Series":
+    if kind == DATE:
+        return pandas.to_datetime(values, format=DATE_FORMAT, errors="coerce")
+    # Parse to the second, ignoring any fractional seconds and a trailing "Z" (the zone is known from the kind)
+    values = values.str.slice(0, 19).str.replace("T", " ", regex=False)
+    parsed = pandas.to_datetime(values, format=ACCOUNTING_DATETIME_FORMAT, errors="coerce")
+    if kind == UTC_DATETIME:
+        return parsed.dt.tz_localize("UTC")
+    # Like `Result`, ambiguous times (when clocks go back) are taken as daylight time, and nonexistent times (when
+    # they go forward) keep standard time's offset, which is the same as moving them forward by the hour skipped
+    localized = parsed.dt.tz_localize(
+        "US/Eastern", ambiguous=numpy.ones(len(parsed), dtype=bool), nonexistent=pandas.Timedelta(hours=1)
+    )
+    return localized.dt.tz_convert("UTC")
+
+
+def to_records(results: "ListResult", fields: Optional[List[str]] = None) -> "numpy.recarray":
+    """Export a `ListResult` to a NumPy record array, one record per resource.
+
+    Args:
+        results: The ListResult to export
+        fields: (Optional) The fields to include, in order. Defaults to every field.
+
+    Returns:
+        The record array, converted as by `to_pandas`
+
+    Raises:
+        FreshBooksClientConfigError: If pandas is not installed.
+    """
+    records: "numpy.recarray" = to_pandas(results, fields).to_records(index=False)
+    return records
+
+
+def to_arrow(results: "ListResult", fields: Optional[List[str]] = None) -> "pyarrow.Table":
+    """Export a `ListResult` to an Apache Arrow table, one row per resource.
+
+    Dates become `date32` columns, datetimes `timestamp[s, tz=UTC]` columns, and money amounts `decimal128`
+    columns.
+
+    Args:
+        results: The ListResult to export
+        fields: (Optional) The fields to include, in order. Defaults to every field.
+
+    Returns:
+        The table
+
+    Raises:
+        FreshBooksClientConfigError: If pyarrow is not installed.
+    """
+    if pyarrow is None:  # pragma: no cover
+        raise FreshBooksClientConfigError("pyarrow must be installed to export to Arrow")
+    data, kinds = columns(results, fields)
+    arrays = {}
+    for name, values in data.items():
+        kind = kinds.get(name)
+        arrays[name] = _arrow_datetimes(pyarrow.array(values), kind) if kind else pyarrow.array(values)
+    return pyarrow.table(arrays)
+
+
+def _arrow_datetimes(values: "pyarrow.Array", kind: str) -> "pyarrow.Array":
+    compute = pyarrow.compute
+    if kind == DATE:
+        parsed = compute.strptime(values, format=DATE_FORMAT, unit="s", error_is_null=True)
+        return parsed.cast(pyarrow.date32())
+    values = compute.replace_substring(compute.utf8_slice_codeunits(values, 0, 19), "T", " ")
+    parsed = compute.strptime(values, format=ACCOUNTING_DATETIME_FORMAT, unit="s", error_is_null=True)
+    if kind == UTC_DATETIME:
+        return parsed.cast(pyarrow.timestamp("s", tz="UTC"))
+    # Each time takes the UTC offset in effect at or just before it, as `Result` does: daylight time for ambiguous
+    # times, and standard time for nonexistent ones (which `assume_timezone` can only move to the transition)
+    earliest = compute.assume_timezone(parsed, "US/Eastern", ambiguous="earliest", nonexistent="earliest")
+    offset = compute.subtract(earliest.cast(pyarrow.timestamp("s")), compute.local_timestamp(earliest))
+    return compute.assume_timezone(compute.add(parsed, offset), "UTC")
@@ -0,0 +1,209 @@
+"""Adaptive limiting of the number of concurrent API calls.
+
+An `AdaptiveConcurrencyLimiter` can be passed to a `freshbooks.client.Client` (or
+`freshbooks.async_client.AsyncClient`) to cap how many calls are in flight at once, with the cap adjusting itself to
+how FreshBooks is responding rather than being tuned by hand.
+
+```python
+from freshbooks import AdaptiveConcurrencyLimiter, Client
+
+limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=32)
+freshBooksClient = Client(client_id=<your application id>, access_token=<a valid token>, concurrency_limiter=limiter)
+invoices = list(freshBooksClient.invoices.list_all(account_id, max_workers=32))
+```
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, NamedTuple, Optional, Tuple
+
+
+class ConcurrencyMetrics(NamedTuple):
+    """A snapshot of the state of an `AdaptiveConcurrencyLimiter`."""
+
+    limit: float
+    """The current limit of concurrent calls. Calls are allowed while fewer than `int(limit)` are in flight."""
+    in_flight: int
+    """Number of calls currently in flight."""
+    increases: int
+    """Number of times the limit has been raised."""
+    decreases: int
+    """Number of times the limit has been cut."""
+    min_latency: Optional[float]
+    """The lowest recent call latency, in seconds, used as the baseline for a healthy latency."""
+
+
+class AdaptiveConcurrencyLimiter:
+    """Additive-increase/multiplicative-decrease (AIMD) limit on concurrent calls.
+
+    Each successful call with a healthy latency (no more than `latency_tolerance` times the lowest recent latency)
+    raises the limit by `1/limit`, so the limit grows by about one for each full round of calls. The lowest latency
+    is taken over the last one to two `latency_window` periods, so a single fast call (eg. a `304` revalidation)
+    doesn't set the baseline for good. A `429` or `5xx`
+    response, or a call that fails to connect, multiplies the limit by `backoff_ratio` (halving it by default).
+    Calls that fail together only cut the limit once: it is not cut again until calls sent after the last cut
+    have completed.
+
+    The limiter is thread-safe, so it can be shared by the threads of a parallel bulk operation and by multiple
+    clients using the same API quota. Asynchronous callers waiting for a slot are woken in the order they started
+    waiting.
+    """
+
+    def __init__(self, initial_limit: int = 4, min_limit: int = 1, max_limit: int = 64,
+                 backoff_ratio: float = 0.5, latency_tolerance: float = 2.0, latency_window: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """Create an adaptive concurrency limiter.
+
+        Args:
+            initial_limit: (Optional) Number of concurrent calls to start with. Defaults to 4.
+            min_limit: (Optional) Lowest the limit can be cut to. Defaults to 1.
+            max_limit: (Optional) Highest the limit can be raised to. Defaults to 64.
+                The client's `pool_maxsize` should be at least this.
+            backoff_ratio: (Optional) Multiplier applied to the limit on a throttled or failed call. Defaults to 0.5.
+            latency_tolerance: (Optional) Multiple of the lowest latency seen above which calls are considered
+                slow, and the limit is not raised. Defaults to 2.
+            latency_window: (Optional) Seconds over which the lowest latency is tracked. Defaults to 60.
+            clock: (Optional) Monotonic clock, in seconds. For testing.
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self.latency_window = latency_window
+        self._clock = clock
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._increases = 0
+        self._decreases = 0
+        # The lowest latencies of the current and the previous window
+        self._window_start = clock()
+        self._window_min: Optional[float] = None
+        self._previous_min: Optional[float] = None
+        self._last_decrease = clock()
+        self._condition = threading.Condition()
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, "asyncio.Future[None]"]] = deque()
+
+    @property
+    def limit(self) -> int:
+        """The number of calls currently allowed in flight at once."""
+        return int(self._limit)
+
+    def try_acquire(self) -> bool:
+        """Take a slot for a call if one is free, without waiting.
+
+        Returns:
+            If a slot was taken, in which case `release` must be called when the call completes
+        """
+        with self._condition:
+            if self._in_flight >= int(self._limit) or self._waiters:
+                return False
+            self._in_flight += 1
+            return True
+
+    def acquire(self) -> None:
+        """Take a slot for a call, waiting until one is free.
+
+        `release` must be called when the call completes.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._in_flight < int(self._limit))
+            self._in_flight += 1
+
+    async def acquire_async(self) -> None:
+        """Take a slot for a call, waiting without blocking the event loop until one is free.
+
+        `release` must be called when the call completes.
+        """
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[None]" = loop.create_future()
+        with self._condition:
+            if self._in_flight < int(self._limit) and not self._waiters:
+                self._in_flight += 1
+                return
+            waiter = (loop, future)
+            self._waiters.append(waiter)
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._condition:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                elif not future.cancelled():
+                    # Given a slot just as it was cancelled
+                    self._in_flight -= 1
+                    self._grant()
+                    self._condition.notify_all()
+            raise
+
+    def _grant(self) -> None:
+        """Hand free slots to asynchronous waiters, in order. Called holding the lock."""
+        while self._waiters and self._in_flight < int(self._limit):
+            loop, future = self._waiters.popleft()
+            self._in_flight += 1
+            loop.call_soon_threadsafe(self._wake, future)
+
+    def _wake(self, future: "asyncio.Future[None]") -> None:
+        if future.cancelled():
+            # The waiter was cancelled after being given a slot, so pass it on
+            with self._condition:
+                self._in_flight -= 1
+                self._grant()
+                self._condition.notify_all()
+        else:
+            future.set_result(None)
+
+    def _min_latency(self, now: float) -> Optional[float]:
+        """The lowest latency of the current and previous windows. Called holding the lock."""
+        if now - self._window_start >= self.latency_window:
+            recent = now - self._window_start < 2 * self.latency_window
+            self._previous_min = self._window_min if recent else None
+            self._window_min = None
+            self._window_start = now
+        latencies = [latency for latency in (self._window_min, self._previous_min) if latency is not None]
+        return min(latencies, default=None)
+
+    def release(self, status_code: Optional[int], latency: float, started: Optional[float] = None) -> None:
+        """Release a call's slot, adjusting the limit by how the call went.
+
+        Args:
+            status_code: HTTP status code of the response, or `None` if no response was received
+            latency: Seconds the call took
+            started: (Optional) Clock time the call was sent. Defaults to `latency` seconds ago.
+        """
+        with self._condition:
+            now = self._clock()
+            started = now - latency if started is None else started
+            self._in_flight -= 1
+            if status_code is None or status_code == 429 or status_code >= 500:
+                # Only cut once for calls that were in flight together
+                if started >= self._last_decrease:
+                    self._limit = max(float(self.min_limit), self._limit * self.backoff_ratio)
+                    self._last_decrease = now
+                    self._decreases += 1
+            elif status_code < 400:
+                min_latency = self._min_latency(now)
+                if self._window_min is None or latency < self._window_min:
+                    self._window_min = latency
+                baseline = latency if min_latency is None else min(latency, min_latency)
+                healthy = latency <= baseline * self.latency_tolerance
+                if healthy and self._limit < self.max_limit:
+                    self._limit = min(float(self.max_limit), self._limit + 1 / self._limit)
+                    self._increases += 1
+            self._grant()
+            self._condition.notify_all()
+
+    def metrics(self) -> ConcurrencyMetrics:
+        """The current limit and counts of adjustments.
+
+        Returns:
+            `ConcurrencyMetrics` snapshot
+        """
+        with self._condition:
+            return ConcurrencyMetrics(
+                limit=self._limit,
+                in_flight=self._in_flight,
+                increases=self._increases,
+                decreases=self._decreases,
+                min_latency=self._min_latency(self._clock()),
+            )
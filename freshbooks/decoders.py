@@ -0,0 +1,76 @@
+"""Decoding of JSON responses.
+
+By default responses are decoded with the standard library's `json`, with every number with a fraction parsed to a
+`decimal.Decimal` so no precision is lost. An `OrjsonDecoder` can be passed to a `freshbooks.client.Client`
+(or `freshbooks.async_client.AsyncClient`) to decode large responses faster with
+[orjson](https://github.com/ijl/orjson).
+
+```python
+from freshbooks import Client
+from freshbooks.decoders import OrjsonDecoder
+
+freshBooksClient = Client(client_id=<your application id>, access_token=<a valid token>, json_decoder=OrjsonDecoder())
+```
+"""
+import json
+from decimal import Decimal
+from typing import Any
+
+from freshbooks.errors import FreshBooksClientConfigError
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+class JSONDecoder:
+    """Decodes responses with the standard library's `json`, parsing numbers with a fraction to `Decimal`.
+
+    Subclasses can override `decode` to use another parser.
+    """
+
+    def decode(self, content: bytes) -> Any:
+        """Decode the body of a response.
+
+        Args:
+            content: The raw response body
+
+        Returns:
+            The json-parsed response
+
+        Raises:
+            ValueError: If the content is not valid JSON.
+        """
+        return json.loads(content, parse_float=Decimal)
+
+
+class OrjsonDecoder(JSONDecoder):
+    """Decodes responses with orjson, which is considerably faster on large responses.
+
+    FreshBooks sends monetary amounts as strings (eg. `{"amount": "100.00", "code": "CAD"}`), which are kept exactly,
+    and converted to `Decimal` when read through `freshbooks.models.Result` or `freshbooks.typed_models` attributes.
+
+    orjson can't parse numbers to `Decimal`, so numbers with a fraction are left as `float` in `data`, and converted
+    to `Decimal` from their shortest representation when read as attributes. This recovers the number as it was sent
+    for up to 15 significant digits, but not any trailing zeros (eg. `1.50` is read as `Decimal("1.5")`). Use the
+    default `JSONDecoder` where the exact text of such numbers matters.
+
+    Requires orjson, which can be installed with the `orjson` extra:
+
+    ```shell
+    pip install freshbooks-sdk[orjson]
+    ```
+    """
+
+    def __init__(self) -> None:
+        """Create an orjson decoder.
+
+        Raises:
+            FreshBooksClientConfigError: If orjson is not installed.
+        """
+        if orjson is None:  # pragma: no cover
+            raise FreshBooksClientConfigError("orjson must be installed to use the OrjsonDecoder")
+
+    def decode(self, content: bytes) -> Any:
+        return orjson.loads(content)
@@ -0,0 +1,76 @@
+"""Encoding of json-parsed responses and resources, for storing them.
+
+Responses are decoded with numbers with a fraction parsed to `decimal.Decimal` (see `freshbooks.decoders`), which
+the standard library's `json` can't write. `dumps` writes each `Decimal` as a number with its exact digits, so
+stored data read back with `json.loads(..., parse_float=Decimal)` is the same as it was decoded, including the
+trailing zeros and the digits of large amounts:
+
+```python
+>>> from decimal import Decimal
+>>> from freshbooks.encoders import dumps
+
+>>> dumps({"amount": Decimal("100.00"), "total": Decimal("12345678901234567.89")})
+'{"amount": 100.00, "total": 12345678901234567.89}'
+```
+"""
+import json
+from decimal import Decimal
+from typing import Any, Callable, Optional
+
+_NATIVE = (str, int, float, bool, type(None), dict, list, tuple)
+
+
+class _HasDecimal(Exception):
+    pass
+
+
+def dumps(value: Any, default: Optional[Callable[[Any], Any]] = None, sort_keys: bool = False) -> str:
+    """Serialize `value` to a JSON string, writing `Decimal` values as exact numbers.
+
+    Args:
+        value: The value to serialize
+        default: (Optional) Function returning a serializable version of any other value that can't be serialized,
+            as for `json.dumps`
+        sort_keys: (Optional) Write the keys of dictionaries in sorted order
+
+    Returns:
+        The JSON string, formatted as by `json.dumps`
+
+    Raises:
+        TypeError: If a value can't be serialized.
+        ValueError: For a `Decimal` that isn't finite (eg. `NaN`), which JSON has no number for.
+    """
+    def fallback(other: Any) -> Any:
+        if isinstance(other, Decimal):
+            raise _HasDecimal
+        if default is None:
+            raise TypeError(f"Object of type {type(other).__name__} is not JSON serializable")
+        return default(other)
+
+    try:
+        # Most data has no Decimal, and is written as fast as `json.dumps` can
+        return json.dumps(value, default=fallback, sort_keys=sort_keys)
+    except _HasDecimal:
+        return _encode(value, fallback, sort_keys)
+
+
+def _encode(value: Any, fallback: Callable[[Any], Any], sort_keys: bool) -> str:
+    if isinstance(value, Decimal):
+        if not value.is_finite():
+            raise ValueError(f"{value} can't be written as a JSON number")
+        return str(value)
+    if isinstance(value, dict):
+        items = sorted(value.items()) if sort_keys else value.items()
+        return "{" + ", ".join(
+            f"{_key(key)}: {_encode(item, fallback, sort_keys)}" for key, item in items
+        ) + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(_encode(item, fallback, sort_keys) for item in value) + "]"
+    if isinstance(value, _NATIVE):
+        return json.dumps(value)
+    return _encode(fallback(value), fallback, sort_keys)
+
+
+def _key(key: Any) -> str:
+    """A dictionary key, converted to a string as `json.dumps` does."""
+    return json.dumps(key if isinstance(key, str) else json.dumps(key))
@@ -49,3 +49,13 @@ class FreshBooksNotImplementedError(Exception):
 class FreshBooksClientConfigError(Exception):
     """Exception thrown when optional client parameters are not set, but and required."""
     pass
+
+
+class FreshBooksIdempotencyError(Exception):
+    """Exception thrown when an idempotency-keyed write can't be made safely.
+
+    Eg. when the key was already used for a different write, is in use by another call, or an earlier attempt
+    with the key failed without a response and there is no `lookup` to check if it was made.
+    See `freshbooks.idempotency`.
+    """
+    pass
@@ -0,0 +1,214 @@
+"""Persistent caching of API responses in SQLite, with conditional revalidation.
+
+An `HTTPCache` can be passed to a `freshbooks.client.Client` (or `freshbooks.async_client.AsyncClient`) to keep
+the responses of `GET` calls on disk, so they can be reused across process restarts (eg. by short-lived workers
+that fetch the same reference data on every run).
+
+```python
+from freshbooks import Client, HTTPCache
+
+http_cache = HTTPCache("/var/cache/freshbooks.sqlite", ttl=3600)
+freshBooksClient = Client(client_id=<your application id>, access_token=<a valid token>, http_cache=http_cache)
+```
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+from freshbooks.cache import CacheKey, CachedResponse
+
+
+class HTTPCacheStats(NamedTuple):
+    """Counts of an `HTTPCache`'s activity."""
+
+    hits: int
+    """Calls answered from the cache without a request."""
+    revalidated: int
+    """Calls answered from the cache after FreshBooks confirmed the response was unchanged (`304 Not Modified`)."""
+    misses: int
+    """Calls that were not in the cache (or had changed), and were downloaded."""
+    entries: int
+    """Responses currently stored."""
+
+
+class CacheLookup:
+    """The result of looking up a call in an `HTTPCache`."""
+
+    __slots__ = ("key", "response", "etag", "last_modified", "fresh")
+
+    def __init__(self, key: str, response: Optional[CachedResponse] = None, etag: Optional[str] = None,
+                 last_modified: Optional[str] = None, fresh: bool = False):
+        self.key = key
+        self.response = response
+        """The stored response, if any"""
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fresh = fresh
+        """If the stored response can be used without revalidating it"""
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers to make the request conditional on the stored response having changed."""
+        headers = {}
+        if self.response is not None and self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.response is not None and self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HTTPCache:
+    """A persistent cache of `GET` responses, stored in a SQLite database.
+
+    When FreshBooks sends an `ETag` or `Last-Modified` header with a response, later calls revalidate it
+    with a conditional request (`If-None-Match`/`If-Modified-Since`), and if FreshBooks responds `304 Not Modified`
+    the stored response is used rather than downloading it again. By default such responses are revalidated on
+    every call, this can be relaxed with `validated_ttl`.
+
+    Responses without either header are reused for `ttl` seconds without any request.
+
+    Like `freshbooks.cache.ResponseCache`, responses are stored by URL, access token, and API version, and
+    creating, updating, or deleting a resource through the SDK discards that resource's stored responses for
+    the account or business.
+
+    The cache is thread-safe and the database can be shared between processes. Calls to the database are
+    blocking, including from the `freshbooks.async_client.AsyncClient`.
+    """
+
+    DEFAULT_TTL = 300.0
+    """Default seconds to reuse responses without validators for"""
+
+    def __init__(self, path: str, ttl: float = DEFAULT_TTL, validated_ttl: float = 0,
+                 clock: Callable[[], float] = time.time):
+        """Open (or create) a persistent HTTP cache.
+
+        Args:
+            path: Path of the SQLite database file. `":memory:"` can be used for a non-persistent cache.
+            ttl: (Optional) Seconds to reuse responses without an `ETag` or `Last-Modified` for. Defaults to 300.
+                Set to 0 to only cache responses that can be revalidated.
+            validated_ttl: (Optional) Seconds to reuse responses with an `ETag` or `Last-Modified` for before
+                revalidating them. Defaults to 0, revalidating on every call.
+            clock: (Optional) Wall clock, in seconds since the epoch. For testing.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.validated_ttl = validated_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._revalidated = 0
+        self._misses = 0
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, account TEXT, name TEXT, status_code INTEGER, headers TEXT, content BLOB, "
+            "etag TEXT, last_modified TEXT, expires_at REAL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS responses_resource ON responses (account, name)")
+
+    @staticmethod
+    def key(request_key: CacheKey) -> str:
+        """The database key for a call, from its `freshbooks.cache.ResponseCache.key`."""
+        return hashlib.sha256(json.dumps(request_key).encode("utf-8")).hexdigest()
+
+    def lookup(self, request_key: CacheKey) -> CacheLookup:
+        """Look up the stored response of a call.
+
+        Args:
+            request_key: Cache key from `freshbooks.cache.ResponseCache.key`
+
+        Returns:
+            `CacheLookup` with the stored response, if there is one. If it is `fresh` it can be used directly,
+            and counts as a hit.
+        """
+        key = self.key(request_key)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT status_code, headers, content, etag, last_modified, expires_at FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return CacheLookup(key)
+            status_code, headers, content, etag, last_modified, expires_at = row
+            fresh = self._clock() < expires_at
+            if fresh:
+                self._hits += 1
+            return CacheLookup(
+                key, CachedResponse(status_code, content, json.loads(headers)), etag, last_modified, fresh
+            )
+
+    def update(self, lookup: CacheLookup, response: Any, name: str, account: str) -> Any:
+        """Store the response of a call that was sent after a `lookup`.
+
+        Args:
+            lookup: The `CacheLookup` made before sending the call
+            response: The `requests.Response` (or `httpx.Response`) of the call
+            name: The name of the resource, eg. `"taxes"`
+            account: The account or business id the call was for
+
+        Returns:
+            The response to use: the stored response if FreshBooks responded `304 Not Modified`,
+            otherwise `response`.
+        """
+        if response.status_code == 304 and lookup.response is not None:
+            with self._lock:
+                self._revalidated += 1
+            self._store(lookup.key, lookup.response, name, account,
+                        response.headers.get("ETag") or lookup.etag,
+                        response.headers.get("Last-Modified") or lookup.last_modified)
+            return lookup.response
+
+        with self._lock:
+            self._misses += 1
+        if response.status_code == 200:
+            self._store(lookup.key, CachedResponse.from_response(response), name, account,
+                        response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return response
+
+    def _store(self, key: str, response: CachedResponse, name: str, account: str,
+               etag: Optional[str], last_modified: Optional[str]) -> None:
+        ttl = self.validated_ttl if etag or last_modified else self.ttl
+        if not (etag or last_modified) and ttl <= 0:
+            return
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, account, name, status_code, headers, content, etag, last_modified, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, account, name, response.status_code, json.dumps(response.headers), response.content,
+                 etag, last_modified, self._clock() + ttl)
+            )
+
+    def invalidate(self, name: str, account: str) -> None:
+        """Discard all stored responses of a resource for an account or business.
+
+        Args:
+            name: The name of the resource, eg. `"invoices"`
+            account: The account or business id
+        """
+        with self._lock:
+            self._connection.execute("DELETE FROM responses WHERE account = ? AND name = ?", (account, name))
+
+    def clear(self) -> None:
+        """Discard all stored responses."""
+        with self._lock:
+            self._connection.execute("DELETE FROM responses")
+
+    def stats(self) -> HTTPCacheStats:
+        """Counts of hits, revalidations, and misses by this process, and the number of stored responses.
+
+        Returns:
+            `HTTPCacheStats` snapshot
+        """
+        with self._lock:
+            (entries,) = self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()
+            return HTTPCacheStats(
+                hits=self._hits, revalidated=self._revalidated, misses=self._misses, entries=entries
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,229 @@
+"""Idempotency-keyed writes, so that creates and updates can be safely retried.
+
+`POST` calls are not retried by default, since a call that times out may still have been made, and retrying it
+could create a duplicate (eg. a second invoice). With an `IdempotencyJournal` passed to the
+`freshbooks.client.Client` (or `freshbooks.async_client.AsyncClient`), writes can be given a client-generated
+idempotency key. The journal records each keyed write before it is sent and its result once it is made, and:
+
+- A write whose key has already completed returns the recorded result without another call.
+- After a failure that leaves it unknown whether the write was made (a connection error, timeout, or `5xx`
+  response), the write is only retried once a `lookup` shows it was not. For `create` calls, the `lookup` is a list
+  of filters that find the resource if it was created. Updates and payment options can be repeated safely, so they
+  are retried without one.
+- Failures that FreshBooks did not process are retried without a lookup if they are transient (a `408` or `429`),
+  and raised otherwise (eg. a `400` or other `4xx` validation error).
+
+The key stays in the journal if the write ultimately fails with an unknown result, so a later call with the same key,
+even from another process using the same journal file, checks with the `lookup` before sending it again.
+
+While a write is being made, its key is claimed in the journal, so a call with the same key from another thread or
+process raises a `freshbooks.errors.FreshBooksIdempotencyError` rather than sending it again. The claim is released
+when the call returns, and expires after the journal's `lease` in case the process stops while it is making the
+write.
+
+```python
+from freshbooks import Client, FilterBuilder, IdempotencyJournal
+
+freshBooksClient = Client(client_id=<your application id>, access_token=<a valid token>,
+                          idempotency_journal=IdempotencyJournal("/var/lib/freshbooks/journal.sqlite"))
+
+invoice = freshBooksClient.invoices.create(
+    account_id, {"customerid": 123, "invoice_number": "ORD-1001", ...},
+    idempotency_key="order-1001", lookup=[FilterBuilder().equals("invoice_number", "ORD-1001")]
+)
+```
+
+Retries of keyed writes follow the client's `freshbooks.retry.RetryPolicy`, whatever their method.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import Any, Callable, Iterator, List, Optional
+
+from freshbooks.encoders import dumps
+from freshbooks.errors import FreshBooksIdempotencyError
+
+PENDING = "pending"
+COMPLETED = "completed"
+
+
+def _encode(value: Any) -> Any:
+    # Only for digests, where equal amounts (eg. 1.5 and 1.50) are the same write
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def is_unknown_outcome(status_code: Optional[int]) -> bool:
+    """If a write that failed with `status_code` (`None` for no response) may still have been made."""
+    return status_code is None or status_code == 408 or status_code >= 500
+
+
+class JournalWrite:
+    """A keyed write in progress, from `IdempotencyJournal.write`."""
+
+    __slots__ = ("key", "response", "resumed", "_journal")
+
+    def __init__(self, journal: "IdempotencyJournal", key: str, response: Any = None, resumed: bool = False):
+        self.key = key
+        self.response = response
+        """The recorded result of the write, if it has already been made"""
+        self.resumed = resumed
+        """If an earlier attempt of the write failed, and it is unknown whether it was made"""
+        self._journal = journal
+
+    def complete(self, response: Any) -> None:
+        """Record that the write was made, with its result."""
+        self.response = response
+        self._journal._complete(self.key, response)
+
+    def discard(self) -> None:
+        """Remove the key from the journal, once the write is known to have not been made."""
+        self._journal.discard(self.key)
+
+
+class IdempotencyJournal:
+    """A journal of idempotency-keyed writes, stored in a SQLite database.
+
+    The journal is thread-safe and the database can be shared between processes. Calls to the database are
+    blocking, including from the `freshbooks.async_client.AsyncClient`.
+    """
+
+    DEFAULT_LEASE = 600.0
+
+    def __init__(self, path: str = ":memory:", lease: float = DEFAULT_LEASE, clock: Callable[[], float] = time.time):
+        """Open (or create) a journal.
+
+        Args:
+            path: (Optional) Path of the SQLite database file. Defaults to `":memory:"`, a journal that only
+                lasts as long as the process.
+            lease: (Optional) Seconds a call claims the key of the write it is making for, after which a call from
+                another process may resume the write. Should be longer than a write takes, with its retries.
+                Defaults to 600.
+            clock: (Optional) Wall clock, in seconds since the epoch. For testing.
+        """
+        self.path = path
+        self.lease = lease
+        self._clock = clock
+        self._owner = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS writes ("
+            "key TEXT PRIMARY KEY, digest TEXT, state TEXT, response TEXT, created_at REAL, updated_at REAL, "
+            "owner TEXT, lease_until REAL)"
+        )
+
+    @staticmethod
+    def digest(method: str, url: str, data: Any) -> str:
+        """Identifies the write a key is used for, so a key can't be reused for a different write."""
+        content = json.dumps([method, url, data], sort_keys=True, default=_encode)
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    @contextmanager
+    def write(self, key: str, method: str, url: str, data: Any) -> Iterator[JournalWrite]:
+        """Start a keyed write, recording it as pending unless it is already in the journal.
+
+        Args:
+            key: The client-generated idempotency key of the write
+            method: The HTTP method of the call
+            url: The URL of the call
+            data: The data sent in the call
+
+        Yields:
+            The `JournalWrite`, with the recorded response if the write was already made
+
+        Raises:
+            FreshBooksIdempotencyError: If the key was used for a different write, or is in use by another call.
+        """
+        digest = self.digest(method, url, data)
+        with self._lock:
+            # Claimed in one transaction, holding the database's write lock, so only one call of any process can
+            # claim the key
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                write = self._claim(key, digest)
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+        try:
+            yield write
+        finally:
+            with self._lock:
+                self._connection.execute(
+                    "UPDATE writes SET owner = NULL, lease_until = NULL WHERE key = ? AND owner = ?",
+                    (key, self._owner)
+                )
+
+    def _claim(self, key: str, digest: str) -> JournalWrite:
+        now = self._clock()
+        inserted = self._connection.execute(
+            "INSERT OR IGNORE INTO writes (key, digest, state, created_at, updated_at, owner, lease_until) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, digest, PENDING, now, now, self._owner, now + self.lease)
+        )
+        if inserted.rowcount:
+            return JournalWrite(self, key)
+        row = self._connection.execute(
+            "SELECT digest, state, response, lease_until FROM writes WHERE key = ?", (key,)
+        ).fetchone()
+        if row[0] != digest:
+            raise FreshBooksIdempotencyError(f"The idempotency key '{key}' was used for a different write")
+        if row[1] == COMPLETED:
+            return JournalWrite(self, key, response=json.loads(row[2], parse_float=Decimal))
+        if row[3] is not None and row[3] > now:
+            raise FreshBooksIdempotencyError(f"The idempotency key '{key}' is in use by another call")
+        self._connection.execute(
+            "UPDATE writes SET owner = ?, lease_until = ? WHERE key = ?", (self._owner, now + self.lease, key)
+        )
+        return JournalWrite(self, key, resumed=True)
+
+    def _complete(self, key: str, response: Any) -> None:
+        with self._lock:
+            self._connection.execute(
+                "UPDATE writes SET state = ?, response = ?, updated_at = ? WHERE key = ?",
+                (COMPLETED, dumps(response), self._clock(), key)
+            )
+
+    def discard(self, key: str) -> None:
+        """Remove a key from the journal, so it can be used again.
+
+        Args:
+            key: The idempotency key
+        """
+        with self._lock:
+            self._connection.execute("DELETE FROM writes WHERE key = ?", (key,))
+
+    def pending(self) -> List[str]:
+        """The keys of writes that were started but are not known to have completed, oldest first.
+
+        These failed with an unknown result (or the process stopped while they were being made), and can be
+        resumed by making the same write with the same key.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT key FROM writes WHERE state = ? ORDER BY created_at", (PENDING,)
+            ).fetchall()
+        return [key for (key,) in rows]
+
+    def prune(self, older_than: float) -> None:
+        """Remove completed writes recorded more than `older_than` seconds ago.
+
+        Args:
+            older_than: Age in seconds
+        """
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM writes WHERE state = ? AND updated_at < ?", (COMPLETED, self._clock() - older_than)
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
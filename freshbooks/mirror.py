@@ -0,0 +1,387 @@
+"""A local SQLite mirror of an account's resources, for querying them offline.
+
+A `Mirror` copies the resources of a `freshbooks.client.Client` (or `freshbooks.async_client.AsyncClient`) into a
+SQLite database, and answers `get` and `list` calls from it. Each `refresh` of a resource only lists the resources
+changed since the previous one (see `freshbooks.sync`), and the database can be queried any number of times in
+between, without any calls to FreshBooks.
+
+Queries are made with the same builders as remote `list` calls, and the mirror has the same resources as the
+client, so code can switch between the two:
+
+```python
+from freshbooks import Client, FilterBuilder, Mirror, PaginateBuilder, SortBuilder
+
+freshBooksClient = Client(client_id=<your application id>, access_token=<a valid token>)
+mirror = Mirror(freshBooksClient, "/var/lib/freshbooks/mirror.sqlite")
+for name in ("clients", "invoices", "payments", "expenses"):
+    mirror.refresh(name, account_id)
+mirror.refresh("time_entries", business_id)
+
+source = mirror if offline else freshBooksClient
+filter = FilterBuilder().in_list("customerids", [1001, 1002]).equals("v3_status", "paid")
+paginator = PaginateBuilder(1, 50)
+invoices = source.invoices.list(account_id, builders=[filter, paginator, SortBuilder().descending("create_date")])
+```
+
+Filters match the fields of the stored resources, by name:
+
+- `equals` and `boolean` match a field's value. As in the query string of a remote call, numbers and strings of
+  digits match each other (eg. `equals("customerid", "1001")` matches a `customerid` of `1001`).
+- `in_list` matches one of the values of the field, as `equals` does. The field is the one of the stored resources
+  without the `s` (or `es`) that `in_list` adds, if they have it (eg. `clientids` matches `clientid`, and
+  `statuses` matches `status`).
+- `like` matches part of a field, ignoring case (eg. `email_like` or `email`).
+- `between` matches `<field>_min` and `<field>_max` bounds (inclusive), comparing money by amount, and any other
+  field by value. Fields ending in `_date` get no bound suffix, so bound them explicitly, as in
+  `between("create_date_min", min="2024-01-01")`.
+- `date_time` matches `<field>_since` from that time on (comparing `<field>_at` or `<field>`), and any other field
+  by value. Datetimes are compared to the second, ignoring time zones, so ISO 8601 values (eg. from a `datetime`)
+  compare with accounting `yyyy-MM-dd HH:mm:ss` ones.
+
+Some remote filters are named differently from the fields they filter (eg. `search[date_min]` filters invoices by
+`create_date`), so locally the name of the field itself is used. Sorting is by a field of the resources, and
+includes are ignored: a resource is stored with the includes of the builders passed to `refresh`. Without a
+`PaginateBuilder`, `list` returns every matching resource.
+
+Lookups by id, client, status, vis_state, and the main dates are indexed. Only the resources FreshBooks lists are
+mirrored, so deleted resources are kept as they were unless the builders passed to `refresh` ask for them too.
+"""
+import json
+import re
+import sqlite3
+import threading
+from datetime import date
+from decimal import Decimal
+from typing import Any, Collection, List, Optional, Tuple
+
+from freshbooks.api.pagination import DEFAULT_MAX_WORKERS
+from freshbooks.builders import Builder
+from freshbooks.builders.filter import FilterBuilder
+from freshbooks.builders.frozen import FrozenBuilder
+from freshbooks.builders.includes import IncludesBuilder
+from freshbooks.builders.paginator import PaginateBuilder
+from freshbooks.builders.sort import SortBuilder
+from freshbooks.encoders import dumps
+from freshbooks.errors import FreshBooksError
+from freshbooks.models import ListResult, Result
+from freshbooks.sync import SQLiteWatermarkStore, SyncEngine, SyncRun, WatermarkStore, _listable
+
+INDEXED_FIELDS = (
+    "customerid", "clientid", "client_id", "userid", "project_id", "status", "v3_status", "payment_status",
+    "vis_state", "create_date", "date", "due_date", "started_at", "updated", "updated_at",
+)
+"""Fields of the stored resources with an index, for fast lookups"""
+
+_FIELD = re.compile(r"[A-Za-z0-9_]+\Z")
+
+
+def _value(field: str) -> str:
+    """The SQL expression of a field of the stored resources."""
+    if not _FIELD.match(field):
+        raise ValueError(f"'{field}' is not a field name")
+    return f"json_extract(data, '$.{field}')"
+
+
+def _encode(value: Any) -> Any:
+    """Stores dates and times in the ISO 8601 format of FreshBooks' own."""
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+_NUMBER = re.compile(r"-?\d+(\.\d+)?\Z")
+
+
+def _parameter(value: Any) -> Any:
+    """A filter value as a SQLite parameter."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def _alternatives(value: Any) -> List[Any]:
+    """The values a filter value matches, as ids are sent as strings but may be stored as numbers, and vice versa."""
+    value = _parameter(value)
+    if isinstance(value, bool):
+        return [int(value)]
+    if isinstance(value, (int, float)):
+        return [value, str(value)]
+    if isinstance(value, str) and _NUMBER.match(value):
+        return [value, float(value) if "." in value else int(value)]
+    return [value]
+
+
+def _datetime(expression: str) -> str:
+    """A datetime to the second, with the ISO `T` separator, a time zone, and fractions of seconds left out, so
+    that ISO 8601 and accounting `yyyy-MM-dd HH:mm:ss` datetimes compare as the same."""
+    return f"replace(substr({expression}, 1, 19), 'T', ' ')"
+
+
+def _in_field(field: str, stored_fields: Collection[str]) -> str:
+    """The field an `in_list` filter is for, as it adds an `s` to a field name (eg. `userids` for `userid`)."""
+    singulars = [field[:-1], field[:-2]] if field.endswith("es") else [field[:-1]]
+    return next((singular for singular in singulars if singular in stored_fields), field)
+
+
+def _condition(filter_type: str, field: str, value: Any, stored_fields: Collection[str]) -> Tuple[str, List[Any]]:
+    """The SQL condition of a `FilterBuilder` filter, and its parameters.
+
+    `stored_fields` are the names of the fields of the stored resources of the type being queried.
+    """
+    if filter_type == "in":
+        values = [alternative for item in value for alternative in _alternatives(item)]
+        field = _in_field(field, stored_fields)
+        return f"{_value(field)} IN (SELECT value FROM json_each(?))", [json.dumps(values)]
+    if filter_type == "like":
+        field = field[:-5] if field.endswith("_like") else field
+        pattern = re.sub(r"([\\%_])", r"\\\1", str(value))
+        return f"{_value(field)} LIKE ? ESCAPE '\\'", [f"%{pattern}%"]
+    if filter_type == "between" and field[-4:] in ("_min", "_max"):
+        operator = ">=" if field.endswith("_min") else "<="
+        field = field[:-4]
+        if isinstance(value, (int, float, Decimal)):
+            # Money is an object, eg. {"amount": "100.00", "code": "CAD"}, compared by its amount
+            amount = f"CAST(COALESCE(json_extract(data, '$.{field}.amount'), {_value(field)}) AS REAL)"
+            return f"{amount} {operator} ?", [_parameter(value)]
+        return f"{_value(field)} {operator} ?", [_parameter(value)]
+    if filter_type == "date_time":
+        value = str(value)[:19].replace("T", " ")
+        if field.endswith("_since"):
+            field = field[:-6]
+            since = _datetime(f"COALESCE({_value(field + '_at')}, {_value(field)})")
+            return f"{since} >= ?", [value]
+        return f"{_datetime(_value(field))} = ?", [value]
+    values = _alternatives(value)
+    return f"{_value(field)} IN ({', '.join('?' * len(values))})", values
+
+
+class MirrorResource:
+    """The resources of one type in a `Mirror`, with the same `get` and `list` calls as the client's resource."""
+
+    def __init__(self, mirror: "Mirror", name: str):
+        self.mirror = mirror
+        self.name = name
+
+    def get(self, resource_id: Any, id: Any, includes: Optional[IncludesBuilder] = None) -> Result:
+        """Get a single resource with the corresponding id. See `Mirror.get`."""
+        return self.mirror.get(self.name, resource_id, id)
+
+    def list(self, resource_id: Any, builders: Optional[List[Builder]] = None) -> ListResult:
+        """Get a list of resources. See `Mirror.list`."""
+        return self.mirror.list(self.name, resource_id, builders)
+
+
+class Mirror:
+    """A mirror of a client's resources, stored in a SQLite database.
+
+    The mirror is thread-safe and the database can be shared between processes. Calls to the database are
+    blocking, including from the `freshbooks.async_client.AsyncClient`.
+    """
+
+    def __init__(
+        self, client: Any, path: str = ":memory:", store: Optional[WatermarkStore] = None,
+        batch_size: int = SyncEngine.DEFAULT_BATCH_SIZE
+    ):
+        """Open (or create) a mirror.
+
+        Args:
+            client: The `freshbooks.client.Client` or `freshbooks.async_client.AsyncClient` to refresh it with
+            path: (Optional) Path of the SQLite database file. Defaults to `":memory:"`, a mirror that only
+                lasts as long as the process.
+            store: (Optional) Where to keep the watermarks of the mirrored resources. Defaults to a
+                `freshbooks.sync.SQLiteWatermarkStore` in the same database file.
+            batch_size: (Optional) The number of resources stored at once when refreshing. Defaults to 100.
+        """
+        self.client = client
+        self.path = path
+        store = store if store is not None else SQLiteWatermarkStore(path)
+        self.engine = SyncEngine(client, store, batch_size=batch_size)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        # Sample the indexes when analyzing them, so it takes milliseconds however many resources are stored
+        self._connection.execute("PRAGMA analysis_limit = 1000")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS resources "
+            "(name TEXT, owner TEXT, id TEXT, data TEXT, PRIMARY KEY (name, owner, id))"
+        )
+        # The names of the fields of each type of resource, for filters that need to tell which field they are for
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS fields (name TEXT, owner TEXT, field TEXT, PRIMARY KEY (name, owner, field))"
+        )
+        for field in INDEXED_FIELDS:
+            self._connection.execute(
+                f"CREATE INDEX IF NOT EXISTS resources_{field} ON resources (name, owner, {_value(field)})"
+            )
+
+    def __getattr__(self, name: str) -> MirrorResource:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            _listable(self.client, name)
+        except ValueError:
+            raise AttributeError(f"'Mirror' object has no attribute '{name}'") from None
+        return MirrorResource(self, name)
+
+    def refresh(
+        self, name: str, resource_id: Any, builders: Optional[List[Builder]] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS
+    ) -> SyncRun:
+        """Store the resources changed since the last refresh (or all of them on the first).
+
+        Args:
+            name: The name of the resource on the client. Eg. `invoices`, `time_entries`
+            resource_id: The account_id or business_id
+            builders: (Optional) List of builder objects for filters, includes, etc. for every refresh
+            max_workers: (Optional) The maximum number of pages to fetch at once. See `list_all`.
+
+        Returns:
+            The `freshbooks.sync.SyncRun`
+
+        Raises:
+            FreshBooksError: If any of the calls are not successful.
+            ValueError: If `name` is not a resource of the client with a `list_all`, or its resources have no `id`.
+        """
+        run = self.engine.sync(
+            name, resource_id, lambda batch: self._store(name, resource_id, batch), builders, max_workers=max_workers
+        )
+        self._analyze()
+        return run
+
+    async def refresh_async(
+        self, name: str, resource_id: Any, builders: Optional[List[Builder]] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS
+    ) -> SyncRun:
+        """Asynchronous version of `refresh`, for an `freshbooks.async_client.AsyncClient`."""
+        run = await self.engine.sync_async(
+            name, resource_id, lambda batch: self._store(name, resource_id, batch), builders, max_workers=max_workers
+        )
+        self._analyze()
+        return run
+
+    def _analyze(self) -> None:
+        # SQLite only uses the indexes of the fields once it has statistics of how selective they are
+        with self._lock:
+            self._connection.execute("ANALYZE resources")
+
+    def _store(self, name: str, resource_id: Any, batch: List[Result]) -> None:
+        rows, fields = [], set()
+        for result in batch:
+            if result.data.get("id") is None:
+                raise ValueError(f"The {name} resources have no id to be mirrored by")
+            rows.append((name, str(resource_id), str(result.data["id"]), dumps(result.data, default=_encode)))
+            fields.update(result.data)
+        with self._lock:
+            self._connection.execute("BEGIN")
+            try:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO resources (name, owner, id, data) VALUES (?, ?, ?, ?)", rows
+                )
+                self._connection.executemany(
+                    "INSERT OR IGNORE INTO fields (name, owner, field) VALUES (?, ?, ?)",
+                    [(name, str(resource_id), field) for field in fields]
+                )
+            except BaseException:  # pragma: no cover
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+
+    def get(self, name: str, resource_id: Any, id: Any) -> Result:
+        """Get a single stored resource with the corresponding id.
+
+        Args:
+            name: The name of the resource on the client. Eg. `invoices`
+            resource_id: The account_id or business_id
+            id: Id of the resource
+
+        Returns:
+            Result: Result object with the resource's data, or its typed model if the client uses them.
+
+        Raises:
+            FreshBooksError: If the resource is not in the mirror.
+            ValueError: If `name` is not a resource of the client.
+        """
+        resource = _listable(self.client, name)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT data FROM resources WHERE name = ? AND owner = ? AND id = ?", (name, str(resource_id), str(id))
+            ).fetchone()
+        if row is None:
+            raise FreshBooksError(404, f"The {resource.single_name} {id} is not in the mirror")
+        result: Result = resource._result(
+            resource.single_name, {resource.single_name: json.loads(row[0], parse_float=Decimal)}
+        )
+        return result
+
+    def list(self, name: str, resource_id: Any, builders: Optional[List[Builder]] = None) -> ListResult:
+        """Get a list of stored resources, filtered, sorted, and paginated by `builders` as a remote `list` call.
+
+        Args:
+            name: The name of the resource on the client. Eg. `invoices`
+            resource_id: The account_id or business_id
+            builders: (Optional) List of `FilterBuilder`, `SortBuilder`, and `PaginateBuilder` objects.
+                `IncludesBuilder` objects are ignored.
+
+        Returns:
+            ListResult: ListResult object with the resources, or their typed models if the client uses them.
+
+        Raises:
+            ValueError: If `name` is not a resource of the client, or a builder can't be used locally.
+        """
+        resource = _listable(self.client, name)
+        with self._lock:
+            stored_fields = {field for (field,) in self._connection.execute(
+                "SELECT field FROM fields WHERE name = ? AND owner = ?", (name, str(resource_id))
+            )}
+        conditions, parameters = ["name = ?", "owner = ?"], [name, str(resource_id)]
+        order, page, per_page = "", 1, 0
+        for builder in builders or []:
+            builder = builder._builder if isinstance(builder, FrozenBuilder) else builder
+            if isinstance(builder, FilterBuilder):
+                for filter in builder._filters:
+                    condition, values = _condition(*filter, stored_fields)
+                    conditions.append(condition)
+                    parameters.extend(values)
+            elif isinstance(builder, SortBuilder):
+                if builder._sort:
+                    order = f"{_value(builder._sort)} {'ASC' if builder._ascending else 'DESC'}, "
+            elif isinstance(builder, PaginateBuilder):
+                page = builder.page() or page  # type: ignore
+                per_page = builder.per_page() or per_page  # type: ignore
+            elif not isinstance(builder, IncludesBuilder):
+                raise ValueError(f"{builder} can't be used to query a mirror")
+        where = " AND ".join(conditions)
+        query = f"SELECT data FROM resources WHERE {where} ORDER BY {order}CAST(id AS INTEGER), id"
+        with self._lock:
+            total = self._connection.execute(f"SELECT COUNT(*) FROM resources WHERE {where}", parameters).fetchone()[0]
+            if per_page:
+                rows = self._connection.execute(
+                    f"{query} LIMIT ? OFFSET ?", [*parameters, per_page, (page - 1) * per_page]
+                ).fetchall()
+            else:
+                rows = self._connection.execute(query, parameters).fetchall()
+        per_page = per_page or max(total, 1)
+        data = {
+            resource.list_name: [json.loads(row[0], parse_float=Decimal) for row in rows],
+            "page": page, "pages": -(-total // per_page), "per_page": per_page, "total": total,
+        }
+        results: ListResult = resource._list_result(resource.list_name, resource.single_name, data)
+        return results
+
+    def clear(self, name: str, resource_id: Any) -> None:
+        """Remove the stored resources of a type, so that the next refresh stores all of them again.
+
+        Args:
+            name: The name of the resource on the client. Eg. `invoices`
+            resource_id: The account_id or business_id
+        """
+        with self._lock:
+            self._connection.execute("DELETE FROM resources WHERE name = ? AND owner = ?", (name, str(resource_id)))
+            self._connection.execute("DELETE FROM fields WHERE name = ? AND owner = ?", (name, str(resource_id)))
+        self.engine.store.delete(resource_id, name)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
@@ -1,9 +1,10 @@
 import contextlib
 from collections import namedtuple
-from copy import deepcopy
 from datetime import date, datetime, timezone
+from decimal import Decimal
 from enum import IntEnum
-from typing import Any, cast, Optional, Union
+from functools import lru_cache
+from typing import Any, Callable, cast, Iterable, Iterator, List, Optional, Union
 
 try:
     from zoneinfo import ZoneInfo  # type: ignore
@@ -22,6 +23,11 @@ def _is_accounting_utc_date_field(model_name: Optional[str], field_name: str) ->
     return model_name in ACCOUNTING_UTC_DATE_FIELDS and field_name in ACCOUNTING_UTC_DATE_FIELDS[model_name]
 
 
+@lru_cache(maxsize=None)
+def _us_eastern() -> Any:
+    return ZoneInfo("US/Eastern")
+
+
 class VisState(IntEnum):
     """Enum of FreshBooks entity vis_status values"""
     ACTIVE = 0
@@ -48,12 +54,24 @@ class Result:
     assert client.data["organization"] == "FreshBooks"
     assert client.data["userid"] == user_id
     ```
+
+    Attribute values are converted (dates parsed, nested resources wrapped, etc.) on first access and
+    remembered, so repeated reads of the same attribute are cheap. If the value in `data` is replaced,
+    it is converted again on the next access.
     """
 
     def __init__(self, name: Optional[str], data: dict):
         self._name = name
         self.data = data.get(name, {})
 
+    @classmethod
+    def _view(cls, name: Optional[str], data: dict) -> "Result":
+        """A `Result` of an already unwrapped resource dictionary, without building a `{name: data}` wrapper."""
+        result = cls.__new__(cls)
+        result._name = name
+        result.data = data
+        return result
+
     def __str__(self) -> str:
         return "Result({})".format(self._name)
 
@@ -62,8 +80,18 @@ class Result:
 
     def __getattr__(self, field: str) -> Any:
         field_data = self.data.get(field)
+        # Set directly in __dict__ as subclasses (ie. `Identity`) don't call `Result.__init__`
+        parsed = self.__dict__.setdefault("_parsed", {})
+        cached = parsed.get(field)
+        if cached is not None and cached[0] is field_data:
+            return cached[1]
+        value = self._parse_field(field, field_data)
+        parsed[field] = (field_data, value)
+        return value
+
+    def _parse_field(self, field: str, field_data: Any) -> Any:
         if isinstance(field_data, dict):
-            return Result(field, {field: field_data})
+            return Result._view(field, field_data)
         if isinstance(field_data, list) and len(field_data) > 0 and isinstance(field_data[0], dict):
             # If a list of dictionaries, we want to return a sub-ListResult.
             # Otherwise return the list of literals.
@@ -87,9 +115,12 @@ class Result:
                 parsed_date = datetime.fromisoformat(field_data.rstrip("Z"))  # type: ignore
                 if "T" in field_data or _is_accounting_utc_date_field(self._name, field):
                     return parsed_date.replace(tzinfo=timezone.utc)
-                return parsed_date.replace(tzinfo=ZoneInfo("US/Eastern")).astimezone(timezone.utc)
+                return parsed_date.replace(tzinfo=_us_eastern()).astimezone(timezone.utc)
             except ValueError:
                 return field_data
+        if isinstance(field_data, float):
+            # Only returned by `freshbooks.decoders.OrjsonDecoder`, the default decoder parses these as `Decimal`
+            return Decimal(repr(field_data))
 
         return field_data
 
@@ -130,6 +161,9 @@ class ListResult:
         assert client.data["organization"] == "FreshBooks"
     ```
 
+    Each `Result` is a view of the resource's entry in `data`, without copying it. Each loop over the list has
+    its own iterator, so the same list can be iterated by nested loops or several threads at once.
+
     Pagination results are included in the `pages` attribute:
 
     ```python
@@ -140,12 +174,17 @@ class ListResult:
     ```
 
     For including pagination in requests, see `freshbooks.builders.paginator.PaginateBuilder`.
+
+    If the list is given a typed `model` (see `freshbooks.typed_models`), its resources are returned as
+    instances of that model rather than `Result` objects.
     """
 
-    def __init__(self, name: str, single_name: str, data: dict, include_pages: bool = True):
+    def __init__(self, name: str, single_name: str, data: dict, include_pages: bool = True,
+                 model: Optional[Callable[[dict], Any]] = None):
         self._name = name
         self._single_name = single_name
         self.data = data
+        self.model = model
         if include_pages:
             self.pages = self._constructPages(data)
 
@@ -156,39 +195,144 @@ class ListResult:
         return "ListResult({})".format(self._name)
 
     def __add__(self, other: "ListResult") -> "ListResult":
-        if not isinstance(other, ListResult) or (self._name != other._name):
-            raise TypeError("Objects not of same ListResult type")
+        self._check_same_type(other)
+        # Shallow: the new list references the resources of both lists rather than copying them
+        data = dict(self.data)
+        data[self._name] = self.data.get(self._name, []) + other.data.get(self._name, [])
+        new_result = ListResult(self._name, self._single_name, data, include_pages=False, model=self.model)
+        new_result.pages = self._latest_pages(other)
+        return new_result
 
-        data = deepcopy(self.data)
-        data.get(self._name, []).extend(other.data.get(self._name))
-        new_result = ListResult(self._name, self._single_name, data, include_pages=False)
+    def __iadd__(self, other: "ListResult") -> "ListResult":
+        self.extend(other)
+        return self
 
-        if other.pages and other.pages.page > self.pages.page:
-            new_result.pages = new_result._constructPages(other.data)
-        elif self.pages:  # pragma: no branch
-            new_result.pages = new_result._constructPages(self.data)
+    def extend(self, other: "ListResult") -> None:
+        """Append the resources of another `ListResult` (eg. the next page) to this one, in place.
+
+        The resources are not copied, and `pages` is updated to the later page of the two.
+        Accumulating pages with `extend` (or `+=`) takes time and memory linear in the number of resources,
+        whereas `clients = clients + page` copies the accumulated list on every page.
+
+        Args:
+            other: The ListResult to append, of the same resource
+
+        Raises:
+            TypeError: If `other` is not a ListResult of the same resource.
+        """
+        self._check_same_type(other)
+        self.data.setdefault(self._name, []).extend(other.data.get(self._name, []))
+        self.pages = self._latest_pages(other)
+
+    @classmethod
+    def merge(cls, results: Iterable["ListResult"]) -> "ListResult":
+        """Combine several `ListResult` objects (eg. all the pages of a `list` call) into one.
+
+        The resources are referenced rather than copied, and none of the given lists are modified.
+        `pages` is that of the latest page.
+
+        Example:
+
+        ```python
+        pages = [freshBooksClient.clients.list(account_id, builders=[PaginateBuilder(page, 100)])
+                 for page in range(1, 4)]
+        clients = ListResult.merge(pages)
+        ```
+
+        Args:
+            results: The ListResults to combine, of the same resource
+
+        Returns:
+            ListResult: A new ListResult of all the resources, in order.
+
+        Raises:
+            TypeError: If the lists are not all of the same resource.
+            ValueError: If no lists are given.
+        """
+        iterator = iter(results)
+        first = next(iterator, None)
+        if first is None:
+            raise ValueError("No ListResults to merge")
+        data = dict(first.data)
+        data[first._name] = list(first.data.get(first._name, []))
+        merged = cls(first._name, first._single_name, data, include_pages=False, model=first.model)
+        merged.pages = getattr(first, "pages", None)
+        for result in iterator:
+            merged.extend(result)
+        return merged
+
+    def to_pandas(self, fields: Optional[List[str]] = None) -> Any:
+        """Export the resources to a pandas DataFrame, one row per resource. See `freshbooks.columnar`.
+
+        Args:
+            fields: (Optional) The fields to include, in order. Defaults to every field.
+
+        Returns:
+            pandas.DataFrame: The DataFrame
+
+        Raises:
+            FreshBooksClientConfigError: If pandas is not installed.
+        """
+        from freshbooks.columnar import to_pandas  # Imported here as it depends on this module
+        return to_pandas(self, fields)
+
+    def to_records(self, fields: Optional[List[str]] = None) -> Any:
+        """Export the resources to a NumPy record array, one record per resource. See `freshbooks.columnar`.
+
+        Args:
+            fields: (Optional) The fields to include, in order. Defaults to every field.
+
+        Returns:
+            numpy.recarray: The record array
+
+        Raises:
+            FreshBooksClientConfigError: If pandas is not installed.
+        """
+        from freshbooks.columnar import to_records
+        return to_records(self, fields)
+
+    def to_arrow(self, fields: Optional[List[str]] = None) -> Any:
+        """Export the resources to an Apache Arrow table, one row per resource. See `freshbooks.columnar`.
+
+        Args:
+            fields: (Optional) The fields to include, in order. Defaults to every field.
+
+        Returns:
+            pyarrow.Table: The table
+
+        Raises:
+            FreshBooksClientConfigError: If pyarrow is not installed.
+        """
+        from freshbooks.columnar import to_arrow
+        return to_arrow(self, fields)
+
+    def _check_same_type(self, other: Any) -> None:
+        if not isinstance(other, ListResult) or (self._name != other._name):
+            raise TypeError("Objects not of same ListResult type")
 
-        return new_result
+    def _latest_pages(self, other: "ListResult") -> Any:
+        pages = getattr(self, "pages", None)
+        other_pages = getattr(other, "pages", None)
+        if other_pages and (not pages or other_pages.page > pages.page):
+            return other_pages
+        return pages
 
     def __len__(self) -> int:
         return len(self.data.get(self._name, []))
 
     def __getitem__(self, index: int) -> Result:
         results = self.data.get(self._name, [])
-        return Result(self._single_name, {self._single_name: results[index]})
+        return self._wrap(results[index])
 
-    def __iter__(self) -> Any:
-        self.n = 0
-        return self
+    def __iter__(self) -> Iterator[Result]:
+        # A generator per loop, so the list can be iterated by several loops (or threads) at once
+        for data in self.data.get(self._name, []):
+            yield self._wrap(data)
 
-    def __next__(self) -> Result:
-        results = self.data.get(self._name, [])
-        if self.n < len(results):
-            result = Result(self._single_name, {self._single_name: results[self.n]})
-            self.n += 1
-            return result
-        else:
-            raise StopIteration
+    def _wrap(self, data: dict) -> Result:
+        if self.model is not None:
+            return cast(Result, self.model(data))
+        return Result._view(self._single_name, data)
 
     def _constructPages(self, data: dict) -> Any:
         if data.get("meta"):  # Project-style endpoint
@@ -0,0 +1,218 @@
+"""Client-side rate limiting of API calls.
+
+A `RateLimiter` can be passed to a `freshbooks.client.Client` (or `freshbooks.async_client.AsyncClient`)
+to pace calls before they are sent rather than learning from a `429` response that the API quota was exceeded.
+
+```python
+from freshbooks import Client, RateLimiter
+
+rate_limiter = RateLimiter(rate=5, capacity=10)
+freshBooksClient = Client(client_id=<your application id>, access_token=<a valid token>, rate_limiter=rate_limiter)
+```
+"""
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Mapping, NamedTuple, Optional
+
+_KEY_PATTERN = re.compile(r"/(?:account|business|businesses)/([^/?]+)")
+
+
+def rate_limit_key(url: str) -> str:
+    """The account or business id a call is made against, which calls are rate limited by.
+
+    Calls that are not for a particular account or business (eg. the identity endpoint) have the key `""`.
+    """
+    match = _KEY_PATTERN.search(url)
+    return match.group(1) if match else ""
+
+
+class RateLimitMetrics(NamedTuple):
+    """A snapshot of the rate limit budget for an account or business."""
+
+    tokens: float
+    """Calls that can be sent immediately. Negative when calls are queued waiting for a token."""
+    capacity: float
+    """The maximum number of tokens, ie. the size of a burst of calls."""
+    rate: float
+    """Tokens added per second."""
+    paused_for: float
+    """Seconds until calls resume, after FreshBooks responded that the limit has been reached."""
+    requests: int
+    """Number of calls made."""
+    throttled: int
+    """Number of calls that FreshBooks rejected with a 429 response."""
+    waited: float
+    """Total seconds calls have been delayed by the rate limiter."""
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated", "paused_until", "requests", "throttled", "waited")
+
+    def __init__(self, tokens: float, now: float):
+        self.tokens = tokens
+        self.updated = now
+        self.paused_until = now
+        self.requests = 0
+        self.throttled = 0
+        self.waited = 0.0
+
+
+class RateLimiter:
+    """Token bucket rate limiter, with a separate bucket for each account or business.
+
+    Each call takes a token from the bucket of the account or business it is for, and tokens are replenished
+    at `rate` per second up to `capacity`. When the bucket is empty, callers wait until a token is available.
+    The limiter is thread-safe, so it can be shared by multiple threads and clients using the same quota.
+
+    Responses are also read to keep the limiter in step with FreshBooks. A `429` response pauses all calls
+    for that account or business for the `Retry-After` period, and `X-RateLimit-Remaining`/`X-RateLimit-Reset`
+    headers, when present, limit the budget to what the server reports.
+    """
+
+    DEFAULT_RATE = 5.0
+    """Default number of calls per second"""
+    DEFAULT_RETRY_AFTER = 1.0
+    """Seconds to pause for on a 429 response without a `Retry-After` header"""
+    REMAINING_HEADERS = ("X-RateLimit-Remaining", "RateLimit-Remaining")
+    RESET_HEADERS = ("X-RateLimit-Reset", "RateLimit-Reset")
+
+    def __init__(self, rate: float = DEFAULT_RATE, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        """Create a rate limiter.
+
+        Args:
+            rate: (Optional) Number of calls per second to allow for each account or business. Defaults to 5.
+            capacity: (Optional) Maximum number of calls that can be made in a burst. Defaults to `rate`.
+            clock: (Optional) Monotonic clock, in seconds. For testing.
+            sleep: (Optional) Function to wait a number of seconds. For testing.
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1))
+        self._clock = clock
+        self._sleep = sleep
+        self._buckets: Dict[str, _Bucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, key: str, now: float) -> _Bucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket(self.capacity, now)
+        elif now > bucket.updated:
+            bucket.tokens = min(self.capacity, bucket.tokens + (now - bucket.updated) * self.rate)
+            bucket.updated = now
+        return bucket
+
+    def reserve(self, key: str = "") -> float:
+        """Take a token for a call, returning the number of seconds to wait before making it.
+
+        Non-blocking, so that asynchronous callers can wait without blocking the event loop.
+
+        Args:
+            key: The account or business id the call is for
+
+        Returns:
+            Seconds to wait before sending the call
+        """
+        with self._lock:
+            now = self._clock()
+            bucket = self._bucket(key, now)
+            bucket.tokens -= 1
+            bucket.requests += 1
+            delay = max(0.0, bucket.paused_until - now) + max(0.0, -bucket.tokens / self.rate)
+            bucket.waited += delay
+            return delay
+
+    def acquire(self, key: str = "") -> float:
+        """Take a token for a call, waiting until the call can be sent.
+
+        Args:
+            key: The account or business id the call is for
+
+        Returns:
+            Seconds waited
+        """
+        delay = self.reserve(key)
+        if delay > 0:
+            self._sleep(delay)
+        return delay
+
+    def update(self, key: str, status_code: int, headers: Mapping[str, str]) -> None:
+        """Adjust the budget of an account or business from a call's response.
+
+        Args:
+            key: The account or business id the call was for
+            status_code: HTTP status code of the response
+            headers: Headers of the response
+        """
+        with self._lock:
+            now = self._clock()
+            bucket = self._bucket(key, now)
+            remaining = _header_number(headers, self.REMAINING_HEADERS)
+            if remaining is not None:
+                bucket.tokens = min(bucket.tokens, remaining)
+
+            pause = None
+            if status_code == 429:
+                bucket.throttled += 1
+                bucket.tokens = min(bucket.tokens, 0)
+                pause = _retry_after(headers.get("Retry-After"))
+                if pause is None:
+                    pause = self.DEFAULT_RETRY_AFTER
+            if remaining is not None and remaining <= 0:
+                reset = _header_number(headers, self.RESET_HEADERS)
+                if reset is not None:
+                    # Either seconds until the reset or a unix timestamp of the reset
+                    pause = max(pause or 0, reset - time.time() if reset > 1e9 else reset)
+            if pause is not None and now + pause > bucket.paused_until:
+                # No tokens are replenished until the pause is over
+                bucket.paused_until = bucket.updated = now + pause
+
+    def metrics(self) -> Dict[str, RateLimitMetrics]:
+        """The current budget of each account or business the limiter has seen calls for.
+
+        Returns:
+            Dictionary of `RateLimitMetrics` by account or business id
+        """
+        with self._lock:
+            now = self._clock()
+            return {
+                key: RateLimitMetrics(
+                    tokens=bucket.tokens,
+                    capacity=self.capacity,
+                    rate=self.rate,
+                    paused_for=max(0.0, bucket.paused_until - now),
+                    requests=bucket.requests,
+                    throttled=bucket.throttled,
+                    waited=bucket.waited,
+                )
+                for key, bucket in ((key, self._bucket(key, now)) for key in list(self._buckets))
+            }
+
+
+def _header_number(headers: Mapping[str, str], names: tuple) -> Optional[float]:
+    for name in names:
+        try:
+            return float(headers[name])
+        except (KeyError, TypeError, ValueError):
+            continue
+    return None
+
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a `Retry-After` header, which is either a number of seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
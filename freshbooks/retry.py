@@ -0,0 +1,136 @@
+"""Retrying of failed API calls.
+
+Calls that fail with a transient error (a connection error, or a response such as `429` or `503`) are retried
+according to the client's `RetryPolicy`. The same policy applies to every resource of both the
+`freshbooks.client.Client` and `freshbooks.async_client.AsyncClient`. By default, idempotent calls are retried up to
+3 times with exponential backoff and full jitter; a custom policy can be passed to the client:
+
+```python
+from freshbooks import Client, RetryPolicy
+
+retry_policy = RetryPolicy(attempts=5, max_time=60, status_methods={429: RetryPolicy.ALL_METHODS})
+freshBooksClient = Client(client_id=<your application id>, access_token=<a valid token>, retry_policy=retry_policy)
+```
+
+Retries can be turned off with `auto_retry=False`.
+"""
+import random
+from typing import Callable, Collection, Dict, Mapping, Optional
+
+from freshbooks.ratelimit import _retry_after
+
+
+class RetryPolicy:
+    """Decides whether, and after how long, a failed call is retried.
+
+    The wait before the nth retry is drawn uniformly between 0 and `backoff_factor * 2 ** (n - 1)` seconds
+    (capped at `max_backoff`), so that many clients failing at once don't retry in lockstep. A `Retry-After`
+    header on the response is respected instead, if present.
+
+    Each status in `statuses` is retried for calls with one of the `methods`, which by default are only the
+    idempotent methods. `status_methods` overrides the methods for individual statuses, eg. to also retry `POST`
+    calls rejected with a `429`, which FreshBooks did not process.
+
+    Policies hold no state between calls, so one policy can be shared by any number of clients and threads.
+    """
+
+    DEFAULT_ATTEMPTS = 3
+    """Default number of retries"""
+    DEFAULT_BACKOFF_FACTOR = 0.3
+    """Default seconds to back off from before the first retry, doubling for each retry after"""
+    DEFAULT_MAX_BACKOFF = 30.0
+    """Default maximum seconds to back off between two attempts"""
+    DEFAULT_METHODS = frozenset({"HEAD", "GET", "PUT", "DELETE", "OPTIONS", "TRACE"})
+    """Methods retried by default, which can be safely repeated"""
+    DEFAULT_STATUSES = frozenset({400, 408, 429, 500, 502, 503, 504})
+    """Response statuses retried by default"""
+    ALL_METHODS = frozenset({"HEAD", "GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "TRACE"})
+
+    def __init__(self, attempts: int = DEFAULT_ATTEMPTS, backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+                 max_backoff: float = DEFAULT_MAX_BACKOFF, max_time: Optional[float] = None, jitter: bool = True,
+                 methods: Collection[str] = DEFAULT_METHODS, statuses: Collection[int] = DEFAULT_STATUSES,
+                 status_methods: Optional[Mapping[int, Collection[str]]] = None, respect_retry_after: bool = True,
+                 uniform: Callable[[float, float], float] = random.uniform):
+        """Create a retry policy.
+
+        Args:
+            attempts: (Optional) Maximum number of retries of a call. Defaults to 3.
+            backoff_factor: (Optional) Seconds the backoff starts from, doubling with each retry. Defaults to 0.3.
+            max_backoff: (Optional) Maximum seconds to wait between two attempts. Defaults to 30.
+            max_time: (Optional) Maximum seconds to spend on a call, from its first attempt, including waits
+                between attempts. A call is not retried if it would exceed this. Defaults to no limit.
+            jitter: (Optional) Randomize each wait between 0 and the backoff ("full jitter"). Defaults to True.
+            methods: (Optional) Methods to retry. Defaults to the idempotent methods.
+            statuses: (Optional) Response statuses to retry. Defaults to `DEFAULT_STATUSES`.
+            status_methods: (Optional) Methods to retry for particular statuses, overriding `methods`.
+                A status in `status_methods` is retried even if it is not in `statuses`.
+            respect_retry_after: (Optional) Wait for the `Retry-After` period of a response instead of backing off.
+                Defaults to True.
+            uniform: (Optional) Function returning a random number between two bounds. For testing.
+        """
+        self.attempts = attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_time = max_time
+        self.jitter = jitter
+        self.respect_retry_after = respect_retry_after
+        self._uniform = uniform
+        self._status_methods: Dict[int, Collection[str]] = {status: frozenset(methods) for status in statuses}
+        for status, overrides in (status_methods or {}).items():
+            self._status_methods[status] = frozenset(overrides)
+        self._methods = frozenset(methods)
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return (f"RetryPolicy(attempts={self.attempts}, backoff_factor={self.backoff_factor}, "
+                f"max_backoff={self.max_backoff}, max_time={self.max_time})")
+
+    def is_retryable(self, method: str, status_code: Optional[int], idempotent: bool = False) -> bool:
+        """If a call with a response of `status_code` can be retried.
+
+        Args:
+            method: The HTTP method of the call
+            status_code: The status of the response, or `None` if the call failed to connect
+            idempotent: (Optional) The call is known to be safe to repeat whatever its method, eg. an
+                idempotency-keyed write (see `freshbooks.idempotency`). Its `4xx` responses other than `408` and
+                `429` are not retried, since the call would be rejected the same way again.
+
+        Returns:
+            True if the call can be retried
+        """
+        if status_code is None:
+            return idempotent or method in self._methods
+        if idempotent:
+            transient = status_code in (408, 429) or status_code >= 500
+            return transient and status_code in self._status_methods
+        return method in self._status_methods.get(status_code, ())
+
+    def backoff(self, retry: int) -> float:
+        """Seconds to wait before the `retry`th retry of a call (counting from 1), without a `Retry-After`."""
+        ceiling = min(self.max_backoff, self.backoff_factor * 2 ** (retry - 1))
+        return self._uniform(0, ceiling) if self.jitter else ceiling
+
+    def delay(self, method: str, status_code: Optional[int], headers: Optional[Mapping[str, str]], retry: int,
+              elapsed: float, idempotent: bool = False) -> Optional[float]:
+        """Seconds to wait before retrying a call, or `None` if it should not be retried.
+
+        Args:
+            method: The HTTP method of the call
+            status_code: The status of the response, or `None` if the call failed to connect
+            headers: The headers of the response, if any
+            retry: The number of the retry, counting from 1
+            elapsed: Seconds since the call's first attempt
+            idempotent: (Optional) The call is known to be safe to repeat whatever its method.
+
+        Returns:
+            Seconds to wait before the retry, or `None` if the call should not be retried
+        """
+        if retry > self.attempts or not self.is_retryable(method, status_code, idempotent):
+            return None
+        delay = None
+        if self.respect_retry_after and headers is not None:
+            delay = _retry_after(headers.get("Retry-After"))
+        if delay is None:
+            delay = self.backoff(retry)
+        if self.max_time is not None and elapsed + delay > self.max_time:
+            return None
+        return delay
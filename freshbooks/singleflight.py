@@ -0,0 +1,152 @@
+"""Coalescing of identical concurrent `GET` calls.
+
+A `SingleFlight` can be passed to a `freshbooks.client.Client` (or `freshbooks.async_client.AsyncClient`) so that
+when several threads (or tasks) make the same `get`, `list`, or `current_user` call at the same time, only one
+request is sent and all of the callers share its response.
+
+```python
+from freshbooks import Client, SingleFlight
+
+freshBooksClient = Client(client_id=<your application id>, access_token=<a valid token>, single_flight=SingleFlight())
+```
+"""
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+
+
+class SingleFlightStats(NamedTuple):
+    """Counts of a `SingleFlight`'s activity."""
+
+    calls: int
+    """Requests sent."""
+    coalesced: int
+    """Calls that shared the response of an identical request already in flight, rather than sending their own."""
+    in_flight: int
+    """Requests currently in flight."""
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _AsyncCall:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Future[Any]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Shares one in-flight request between all concurrent callers of the same key.
+
+    The first caller of a key (the leader) makes the request. Callers of the same key while it is in flight wait
+    for, and are given, the leader's result, or have the leader's exception raised. Once the request completes the
+    key is forgotten, so later calls make a new request. Results are not cached (see `freshbooks.cache`).
+
+    The resources use the same key as `freshbooks.cache.ResponseCache.key`: the URL, access token, and API version.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, _Call] = {}
+        self._async_calls: Dict[Tuple[int, Hashable], _AsyncCall] = {}
+        self._lock = threading.Lock()
+        self._call_count = 0
+        self._coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Call `fn`, unless a call for `key` is already in flight, in which case wait for its result.
+
+        Args:
+            key: Identifies identical calls
+            fn: Makes the call
+
+        Returns:
+            The result of `fn`, either from this call or the one already in flight
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+                self._call_count += 1
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Asynchronous version of `do`, for calls made by tasks on the same event loop.
+
+        The call runs in its own task, so cancelling one of its callers, even the first, doesn't cancel it for the
+        others. It is only cancelled once all of them have been.
+
+        Args:
+            key: Identifies identical calls
+            fn: Returns an awaitable making the call
+
+        Returns:
+            The result of `fn`, either from this call or the one already in flight
+        """
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+        with self._lock:
+            call = self._async_calls.get(loop_key)
+            if call is None:
+                # The call is made by its own task, which no caller's cancellation cancels, and is forgotten when it
+                # completes (before any of the callers resume)
+                call = self._async_calls[loop_key] = _AsyncCall(asyncio.ensure_future(fn()))
+                call.task.add_done_callback(lambda _: self._forget_async(loop_key))
+                self._call_count += 1
+            else:
+                self._coalesced += 1
+            call.waiters += 1
+
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            with self._lock:
+                call.waiters -= 1
+                abandoned = call.waiters == 0
+            if abandoned:
+                # Every caller was cancelled, so no one is left for the result
+                call.task.cancel()
+            raise
+
+    def _forget_async(self, loop_key: Tuple[int, Hashable]) -> None:
+        with self._lock:
+            del self._async_calls[loop_key]
+
+    def stats(self) -> SingleFlightStats:
+        """Counts of requests sent and calls coalesced.
+
+        Returns:
+            `SingleFlightStats` snapshot
+        """
+        with self._lock:
+            return SingleFlightStats(
+                calls=self._call_count,
+                coalesced=self._coalesced,
+                in_flight=len(self._calls) + len(self._async_calls),
+            )
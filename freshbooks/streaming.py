@@ -0,0 +1,244 @@
+"""Incremental parsing of list responses.
+
+A list call normally buffers the whole response body and parses it into one dictionary before the first resource
+is available. With `stream=True`, `iter_all` instead parses the list of resources out of the response as it arrives
+from the socket, returning each resource as soon as it has been received. Only the resource being received is held
+in memory, so memory use doesn't grow with the size of the page, and the first resource is available after the
+first few kilobytes of the response rather than the whole page.
+
+```python
+for invoice in freshBooksClient.invoices.iter_all(account_id, builders=[includes], stream=True):
+    print(invoice.invoice_number)
+```
+
+Streamed responses are always parsed with the standard library's `json`, with numbers with a fraction parsed
+to `decimal.Decimal`, and are not stored in the client's response or HTTP caches.
+"""
+import codecs
+import json
+from decimal import Decimal
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from freshbooks.errors import FreshBooksError
+from freshbooks.models import ListResult, Result
+
+CHUNK_SIZE = 64 * 1024
+"""The number of bytes to read from the socket at a time"""
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]"
+_decoder = json.JSONDecoder(parse_float=Decimal)
+
+
+class ListStreamParser:
+    """A push parser for the list of resources in a json response.
+
+    The response is fed in as it arrives, and each element of the list at `path` is returned once it has been
+    received in full. The rest of the response (eg. pagination details) is kept, and returned when the parser
+    is closed, with the list left empty.
+
+    ```python
+    parser = ListStreamParser(("response", "result", "invoices"))
+    for chunk in response.iter_content(CHUNK_SIZE):
+        for invoice in parser.feed(chunk):
+            ...
+    result = parser.close()
+    ```
+    """
+
+    def __init__(self, path: Tuple[str, ...]):
+        """Create a parser for the list found under the keys of `path`.
+
+        Args:
+            path: The keys of the objects containing the list, from the top of the response.
+        """
+        self.path = path
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._head: List[str] = []
+        self._tail: List[str] = []
+        self._buffer = ""
+        self._in_list = False
+        self._list_done = False
+        self._after_element = False
+        # Scanning state for the part of the response before the list
+        self._keys: List[Optional[str]] = []
+        self._in_string = False
+        self._escaped = False
+        self._string: List[str] = []
+        self._last_string: Optional[str] = None
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Parse the next chunk of the response.
+
+        Args:
+            chunk: The next bytes of the response body
+
+        Returns:
+            The elements of the list that were completed by this chunk, if any.
+
+        Raises:
+            ValueError: If the list is not valid JSON.
+        """
+        text = self._text.decode(chunk)
+        if self._list_done:
+            self._tail.append(text)
+            return []
+        if not self._in_list:
+            text = self._scan(text)
+            if not self._in_list:
+                return []
+        self._buffer += text
+        return self._parse_elements()
+
+    def close(self) -> Any:
+        """Finish parsing once the whole response has been fed to the parser.
+
+        Returns:
+            The json-parsed response, with an empty list in place of the streamed list. If the response has no
+            list at `path` (eg. an error response) it is returned in full.
+
+        Raises:
+            ValueError: If the response is not valid JSON.
+        """
+        self._tail.append(self._text.decode(b"", final=True))
+        if self._in_list and not self._list_done:
+            raise ValueError("Unterminated list in response")
+        return _decoder.decode("".join(self._head + self._tail))
+
+    def _scan(self, text: str) -> str:
+        """Scan the response up to the start of the list, returning the text after its opening `[`."""
+        for index, char in enumerate(text):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    self._last_string = "".join(self._string)
+                    continue
+                self._string.append(char)
+            elif char == '"':
+                self._in_string = True
+                self._string = []
+            elif char == ":" and self._keys:
+                self._keys[-1] = self._last_string
+            elif char == "{":
+                self._keys.append(None)
+            elif char == "[":
+                if tuple(self._keys) == self.path:
+                    self._in_list = True
+                    self._head.append(text[:index + 1])
+                    return text[index + 1:]
+                self._keys.append(None)
+            elif char in "}]" and self._keys:
+                self._keys.pop()
+        self._head.append(text)
+        return ""
+
+    def _parse_elements(self) -> List[Any]:
+        elements = []
+        buffer = self._buffer
+        position = 0
+        while True:
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+            if position == len(buffer):
+                break
+            if buffer[position] == "]":
+                self._list_done = True
+                self._head.append("]")
+                self._tail.append(buffer[position + 1:])
+                position = len(buffer)
+                break
+            if self._after_element:
+                if buffer[position] != ",":
+                    raise ValueError("Expecting ',' delimiter in list at {!r}".format(buffer[position:position + 20]))
+                self._after_element = False
+                position += 1
+                continue
+            try:
+                element, end = _decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                break  # The element hasn't been received in full yet, or is invalid and the list is unterminated
+            if end == len(buffer) or buffer[end] not in _DELIMITERS:
+                break  # A number may continue in the next chunk (eg. `1` of `12`) until it is delimited
+            elements.append(element)
+            self._after_element = True
+            position = end
+        self._buffer = buffer[position:]
+        return elements
+
+
+class _ListStream:
+    """Shared state of the synchronous and asynchronous list streams."""
+
+    def __init__(self, results: ListResult, path: Tuple[str, ...], status_code: int):
+        self._results = results
+        self._parser = ListStreamParser(path)
+        self._status_code = status_code
+        self._count = 0
+        self.pages: Any = None
+        """The pagination details of the list, available once it has been iterated through"""
+
+    def __len__(self) -> int:
+        """The number of resources returned so far"""
+        return self._count
+
+    def _feed(self, chunk: bytes) -> List[Result]:
+        try:
+            records = self._parser.feed(chunk)
+        except ValueError as e:
+            raise FreshBooksError(self._status_code, "Failed to parse response") from e
+        self._count += len(records)
+        return [self._results._wrap(record) for record in records]
+
+    def _finish(self) -> None:
+        try:
+            data = self._parser.close()
+        except ValueError as e:
+            raise FreshBooksError(self._status_code, "Failed to parse response") from e
+        for key in self._parser.path[:-1]:
+            data = data.get(key, {})
+        self.pages = ListResult(self._results._name, self._results._single_name, data).pages
+
+
+class ListStream(_ListStream):
+    """Iterates through the resources of a list response as they are received.
+
+    Once iterated through, the list's `pages` are available, as in a `freshbooks.models.ListResult`.
+    A stream can only be iterated once. The response is closed when the iteration ends or is abandoned.
+    """
+
+    def __init__(self, results: ListResult, path: Tuple[str, ...], chunks: Iterable[bytes],
+                 close: Callable[[], None], status_code: int):
+        super().__init__(results, path, status_code)
+        self._chunks = chunks
+        self._close = close
+
+    def __iter__(self) -> Iterator[Result]:
+        try:
+            for chunk in self._chunks:
+                yield from self._feed(chunk)
+            self._finish()
+        finally:
+            self._close()
+
+
+class AsyncListStream(_ListStream):
+    """Asynchronous `ListStream`, for the `freshbooks.async_client.AsyncClient` resources."""
+
+    def __init__(self, results: ListResult, path: Tuple[str, ...], chunks: AsyncIterable[bytes],
+                 close: Callable[[], Awaitable[None]], status_code: int):
+        super().__init__(results, path, status_code)
+        self._chunks = chunks
+        self._close = close
+
+    async def __aiter__(self) -> AsyncIterator[Result]:
+        try:
+            async for chunk in self._chunks:
+                for result in self._feed(chunk):
+                    yield result
+            self._finish()
+        finally:
+            await self._close()
@@ -0,0 +1,339 @@
+"""Incremental sync of resources, pulling only the resources changed since the last run.
+
+A `SyncEngine` keeps a high-water mark for each resource of each account or business it syncs. The first sync of a
+resource lists all of it, and every later sync only lists the resources changed since the previous one, using the
+resource's `updated_min` (accounting) or `updated_since` (projects and time tracking) filter. The resources are
+handed to a sink in batches, and the watermark is only moved forward once the sink has received all of them, so a
+sync that fails is repeated from the same point by the next run.
+
+```python
+from freshbooks import Client, SyncEngine
+from freshbooks.sync import SQLiteWatermarkStore
+
+freshBooksClient = Client(client_id=<your application id>, access_token=<a valid token>)
+engine = SyncEngine(freshBooksClient, SQLiteWatermarkStore("/var/lib/freshbooks/watermarks.sqlite"))
+
+def save(invoices):
+    for invoice in invoices:
+        database.upsert("invoices", invoice.id, invoice.data)
+
+engine.sync("invoices", account_id, save)  # eg. every 15 minutes
+```
+
+The watermark is the time each sync started, and the next sync asks for the resources changed since a little
+before it (the engine's `overlap`), to allow for clock differences. Resources may be sent to the sink again by a
+later sync, so sinks should update their records rather than append to them. Accounting filters are by day, so they
+always include the resources changed earlier the same day. Deleted and archived resources are only included if the
+builders passed to `sync` ask for them.
+"""
+import inspect
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from freshbooks.api.pagination import DEFAULT_MAX_WORKERS
+from freshbooks.builders import Builder, _is_accounting_like
+from freshbooks.builders.filter import FilterBuilder
+from freshbooks.models import Result
+
+Sink = Callable[[List[Result]], Any]
+"""Receives each batch of synced resources. Can be a coroutine function with `SyncEngine.sync_async`."""
+
+
+class WatermarkStore:
+    """Keeps the watermark of each synced resource in memory, for as long as the process runs.
+
+    Subclasses can override `get`, `set`, and `delete` to keep them elsewhere. See `FileWatermarkStore` and
+    `SQLiteWatermarkStore`.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._watermarks: Dict[Tuple[str, str], str] = {}
+
+    def get(self, resource_id: Any, name: str) -> Optional[datetime]:
+        """The watermark of a resource, if it has been synced.
+
+        Args:
+            resource_id: The account_id or business_id
+            name: The name of the resource on the client. Eg. `invoices`
+
+        Returns:
+            The time the last sync of the resource started
+        """
+        with self._lock:
+            watermark = self._watermarks.get((str(resource_id), name))
+        return None if watermark is None else datetime.fromisoformat(watermark)
+
+    def set(self, resource_id: Any, name: str, watermark: datetime) -> None:
+        """Record the watermark of a resource.
+
+        Args:
+            resource_id: The account_id or business_id
+            name: The name of the resource on the client. Eg. `invoices`
+            watermark: The time the sync of the resource started
+        """
+        with self._lock:
+            self._watermarks[(str(resource_id), name)] = watermark.isoformat()
+
+    def delete(self, resource_id: Any, name: str) -> None:
+        """Forget the watermark of a resource, so that its next sync lists all of it.
+
+        Args:
+            resource_id: The account_id or business_id
+            name: The name of the resource on the client. Eg. `invoices`
+        """
+        with self._lock:
+            self._watermarks.pop((str(resource_id), name), None)
+
+
+class FileWatermarkStore(WatermarkStore):
+    """Keeps watermarks in a JSON file, which is replaced in full (atomically) whenever a watermark changes.
+
+    Suited to a single process syncing a modest number of resources. Use `SQLiteWatermarkStore` to share
+    watermarks between processes.
+    """
+
+    def __init__(self, path: str):
+        """Open (or create) a watermark file.
+
+        Args:
+            path: Path of the JSON file
+        """
+        super().__init__()
+        self.path = path
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                for key, watermark in json.load(file).items():
+                    resource_id, _, name = key.rpartition("/")
+                    self._watermarks[(resource_id, name)] = watermark
+
+    def set(self, resource_id: Any, name: str, watermark: datetime) -> None:
+        with self._lock:
+            self._watermarks[(str(resource_id), name)] = watermark.isoformat()
+            self._save()
+
+    def delete(self, resource_id: Any, name: str) -> None:
+        with self._lock:
+            self._watermarks.pop((str(resource_id), name), None)
+            self._save()
+
+    def _save(self) -> None:
+        watermarks = {
+            f"{resource_id}/{name}": watermark for (resource_id, name), watermark in self._watermarks.items()
+        }
+        directory = os.path.dirname(os.path.abspath(self.path))
+        descriptor, temporary = tempfile.mkstemp(dir=directory, prefix=".watermarks-")
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+                json.dump(watermarks, file, indent=2, sort_keys=True)
+            os.replace(temporary, self.path)
+        except BaseException:  # pragma: no cover
+            os.unlink(temporary)
+            raise
+
+
+class SQLiteWatermarkStore(WatermarkStore):
+    """Keeps watermarks in a SQLite database, which can be shared between processes."""
+
+    def __init__(self, path: str = ":memory:"):
+        """Open (or create) a watermark database.
+
+        Args:
+            path: (Optional) Path of the SQLite database file. Defaults to `":memory:"`, watermarks that only
+                last as long as the process.
+        """
+        super().__init__()
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS watermarks ("
+            "resource_id TEXT, name TEXT, watermark TEXT, PRIMARY KEY (resource_id, name))"
+        )
+
+    def get(self, resource_id: Any, name: str) -> Optional[datetime]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT watermark FROM watermarks WHERE resource_id = ? AND name = ?", (str(resource_id), name)
+            ).fetchone()
+        return None if row is None else datetime.fromisoformat(row[0])
+
+    def set(self, resource_id: Any, name: str, watermark: datetime) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO watermarks (resource_id, name, watermark) VALUES (?, ?, ?)",
+                (str(resource_id), name, watermark.isoformat())
+            )
+
+    def delete(self, resource_id: Any, name: str) -> None:
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM watermarks WHERE resource_id = ? AND name = ?", (str(resource_id), name)
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+
+class SyncRun(NamedTuple):
+    """The outcome of a `SyncEngine.sync`."""
+
+    name: str
+    """The name of the synced resource on the client. Eg. `invoices`"""
+    resource_id: Any
+    """The account_id or business_id"""
+    since: Optional[datetime]
+    """The time changes were listed from, or `None` for a full sync"""
+    watermark: datetime
+    """The time the sync started, and the new watermark of the resource"""
+    synced: int
+    """The number of resources sent to the sink"""
+
+
+def changed_since(resource: Any, since: datetime) -> Builder:
+    """The filter of a resource's changes since a time, used by `SyncEngine` unless given another.
+
+    Accounting resources are filtered by day (`search[updated_min]`), starting a day early to allow for the
+    account's time zone. Other resources are filtered by time (`updated_since`).
+
+    Args:
+        resource: The resource of the client. Eg. `freshBooksClient.invoices`
+        since: The time to list changes from
+
+    Returns:
+        The `FilterBuilder` of the changes
+    """
+    since = since.astimezone(timezone.utc)
+    if _is_accounting_like(resource._builder_resource_name()):
+        return FilterBuilder().between("updated", min=(since - timedelta(days=1)).date())
+    return FilterBuilder().date_time("updated_since", since.strftime("%Y-%m-%dT%H:%M:%SZ"))
+
+
+def _listable(client: Any, name: str) -> Any:
+    """The resource of a client named `name`, if it can be listed."""
+    resource = getattr(client, name, None)
+    if not hasattr(resource, "list_all"):
+        raise ValueError(f"'{name}' is not a resource that can be listed")
+    return resource
+
+
+def _batches(results: Iterable[Result], size: int) -> Iterator[List[Result]]:
+    batch: List[Result] = []
+    for result in results:
+        batch.append(result)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class SyncEngine:
+    """Syncs the resources of a `freshbooks.client.Client` (or `freshbooks.async_client.AsyncClient`) incrementally,
+    keeping their watermarks in a `WatermarkStore`.
+    """
+
+    DEFAULT_OVERLAP = 300.0
+    """Default seconds before the previous sync's start to list changes from"""
+    DEFAULT_BATCH_SIZE = 100
+    """Default number of resources sent to the sink at once"""
+
+    def __init__(
+        self, client: Any, store: Optional[WatermarkStore] = None, overlap: float = DEFAULT_OVERLAP,
+        batch_size: int = DEFAULT_BATCH_SIZE, clock: Callable[[], float] = time.time
+    ):
+        """Create a sync engine.
+
+        Args:
+            client: The `freshbooks.client.Client` or `freshbooks.async_client.AsyncClient` to make calls with
+            store: (Optional) Where to keep watermarks. Defaults to an in-memory `WatermarkStore`.
+            overlap: (Optional) Seconds before the previous sync's start to list changes from. Defaults to 300.
+            batch_size: (Optional) The number of resources sent to the sink at once. Defaults to 100.
+            clock: (Optional) Wall clock, in seconds since the epoch. For testing.
+        """
+        self.client = client
+        self.store = store if store is not None else WatermarkStore()
+        self.overlap = overlap
+        self.batch_size = batch_size
+        self._clock = clock
+
+    def _plan(
+        self, name: str, resource_id: Any, builders: Optional[List[Builder]],
+        filter: Optional[Callable[[datetime], Builder]]
+    ) -> Tuple[Any, Optional[datetime], datetime, List[Builder]]:
+        """The resource, the time to list changes from, the new watermark, and the builders of a sync."""
+        resource = _listable(self.client, name)
+        started = datetime.fromtimestamp(self._clock(), timezone.utc)
+        builders = list(builders or [])
+        watermark = self.store.get(resource_id, name)
+        since = None
+        if watermark is not None:
+            since = watermark - timedelta(seconds=self.overlap)
+            builders.insert(0, filter(since) if filter is not None else changed_since(resource, since))
+        return resource, since, started, builders
+
+    def sync(
+        self, name: str, resource_id: Any, sink: Sink, builders: Optional[List[Builder]] = None,
+        filter: Optional[Callable[[datetime], Builder]] = None, max_workers: int = DEFAULT_MAX_WORKERS
+    ) -> SyncRun:
+        """List the resources changed since the last sync (or all of them on the first), and send them to `sink`.
+
+        Args:
+            name: The name of the resource on the client. Eg. `invoices`, `time_entries`
+            resource_id: The account_id or business_id
+            sink: Called with each batch of resources
+            builders: (Optional) List of builder objects for filters, includes, etc. for every sync
+            filter: (Optional) Returns the filter of the changes since a time, instead of `changed_since`.
+            max_workers: (Optional) The maximum number of pages to fetch at once. See `list_all`.
+
+        Returns:
+            The `SyncRun`
+
+        Raises:
+            FreshBooksError: If any of the calls are not successful, leaving the watermark unchanged.
+            ValueError: If `name` is not a resource of the client with a `list_all`.
+        """
+        resource, since, started, builders = self._plan(name, resource_id, builders, filter)
+        synced = 0
+        results: Iterator[Result] = resource.list_all(resource_id, builders=builders, max_workers=max_workers)
+        for batch in _batches(results, self.batch_size):
+            sink(batch)
+            synced += len(batch)
+        self.store.set(resource_id, name, started)
+        return SyncRun(name, resource_id, since, started, synced)
+
+    async def sync_async(
+        self, name: str, resource_id: Any, sink: Sink, builders: Optional[List[Builder]] = None,
+        filter: Optional[Callable[[datetime], Builder]] = None, max_workers: int = DEFAULT_MAX_WORKERS
+    ) -> SyncRun:
+        """Asynchronous version of `sync`, for an `freshbooks.async_client.AsyncClient`.
+
+        The `sink` can be a coroutine function. Calls to the `store` are blocking.
+        """
+        resource, since, started, builders = self._plan(name, resource_id, builders, filter)
+        synced = 0
+        results: AsyncIterator[Result] = resource.list_all(resource_id, builders=builders, max_workers=max_workers)
+        batch: List[Result] = []
+        async for result in results:
+            batch.append(result)
+            if len(batch) >= self.batch_size:
+                synced += await self._send_async(sink, batch)
+                batch = []
+        if batch:
+            synced += await self._send_async(sink, batch)
+        self.store.set(resource_id, name, started)
+        return SyncRun(name, resource_id, since, started, synced)
+
+    @staticmethod
+    async def _send_async(sink: Sink, batch: List[Result]) -> int:
+        sent = sink(batch)
+        if inspect.isawaitable(sent):
+            await sent
+        return len(batch)
@@ -0,0 +1,208 @@
+"""Typed, schema-driven models of FreshBooks resources.
+
+`freshbooks.models.Result` wraps any resource and guesses the type of each value from its content, eg. trying
+to parse every string as a date. The models here instead declare the type of each field once per resource, and
+store converted values in `__slots__`, so each record uses less memory and attribute reads are cheaper.
+
+They are opt-in: create the `freshbooks.client.Client` (or `freshbooks.async_client.AsyncClient`) with
+`typed_models=True`, and `get` and `list` calls of the resources below return these models instead of
+`freshbooks.models.Result` objects.
+
+```python
+freshBooksClient = Client(client_id=<your application id>, access_token=<a valid token>, typed_models=True)
+
+invoice = freshBooksClient.invoices.get(account_id, invoice_id)
+assert isinstance(invoice, Invoice)
+assert invoice.amount.amount == Decimal("100.00")
+```
+"""
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, Callable, ClassVar, Dict, Tuple, Type, Union
+
+from freshbooks.models import ACCOUNTING_UTC_DATE_FIELDS, VisState, _us_eastern
+
+Converter = Callable[[Any], Any]
+FieldType = Union[str, Converter, Type["TypedResult"], Tuple[str, Type["TypedResult"]]]
+
+DATE = "date"
+"""A `yyyy-MM-dd` date, converted to a `datetime.date`"""
+ACCOUNTING_DATETIME = "accounting_datetime"
+"""A `yyyy-MM-dd HH:mm:ss` accounting datetime, converted to a UTC `datetime.datetime`.
+
+Most are in US/Eastern, the exceptions listed in `freshbooks.models.ACCOUNTING_UTC_DATE_FIELDS` are in UTC.
+"""
+ISO_DATETIME = "iso_datetime"
+"""An ISO 8601 datetime in UTC, with or without the `Z` designator, converted to a UTC `datetime.datetime`"""
+DECIMAL = "decimal"
+"""A number, converted to a `decimal.Decimal`"""
+LIST = "list"
+"""Marks a field as a list of the given model, eg. `(LIST, InvoiceLine)`"""
+
+
+def _to_date(value: str) -> date:
+    return date.fromisoformat(value)
+
+
+def _to_eastern_datetime(value: str) -> datetime:
+    return datetime.fromisoformat(value).replace(tzinfo=_us_eastern()).astimezone(timezone.utc)
+
+
+def _to_utc_datetime(value: str) -> datetime:
+    return datetime.fromisoformat(value.rstrip("Z")).replace(tzinfo=timezone.utc)
+
+
+def _to_decimal(value: Any) -> Decimal:
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+class TypedResult:
+    """Base of the typed models.
+
+    Each field declared in the model's schema is converted on first access and stored in a slot, so later
+    reads are plain attribute reads. Fields that are not declared are returned as they are in the response.
+
+    The json-parsed dictionary of the resource is available in the `data` attribute.
+    """
+
+    __slots__ = ("data",)
+
+    _name: ClassVar[str] = ""
+    _converters: ClassVar[Dict[str, Converter]] = {}
+
+    def __init__(self, data: dict):
+        self.data = data
+
+    def __str__(self) -> str:
+        return "{}({})".format(type(self).__name__, self.data.get("id"))
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return "{}({})".format(type(self).__name__, self.data.get("id"))
+
+    def __getattr__(self, field: str) -> Any:
+        if field.startswith("__"):
+            raise AttributeError(field)
+        value = self.data.get(field)
+        converter = self._converters.get(field)
+        if converter is None:
+            return value
+        if value is not None:
+            try:
+                value = converter(value)
+            except (TypeError, ValueError, ArithmeticError):
+                pass  # Unexpected content is returned as is, as `Result` does
+        setattr(self, field, value)
+        return value
+
+    @property
+    def vis_state(self) -> Union[VisState, None]:
+        if self.data.get("vis_state") in list(VisState):
+            return VisState(self.data["vis_state"])
+        return None
+
+
+MODELS: Dict[str, Type[TypedResult]] = {}
+"""The typed model of each resource, by the resource's single name (eg. `"invoice"`)"""
+
+
+def _compile(name: str, field: str, field_type: FieldType) -> Converter:
+    if field_type == DATE:
+        return _to_date
+    if field_type == ACCOUNTING_DATETIME:
+        if field in ACCOUNTING_UTC_DATE_FIELDS.get(name, []):
+            return _to_utc_datetime
+        return _to_eastern_datetime
+    if field_type == ISO_DATETIME:
+        return _to_utc_datetime
+    if field_type == DECIMAL:
+        return _to_decimal
+    if isinstance(field_type, tuple):
+        item_model = field_type[1]
+        return lambda items: [item_model(item) for item in items]
+    return field_type  # type: ignore[return-value]
+
+
+def typed_model(
+    class_name: str, name: str, fields: Dict[str, FieldType], register: bool = True
+) -> Type[TypedResult]:
+    """Create a typed model class from a schema.
+
+    The converter of each field is resolved once, when the class is created, and the fields become the
+    class' `__slots__`.
+
+    Args:
+        class_name: Name of the class, eg. `"Invoice"`
+        name: The resource's single name in responses, eg. `"invoice"`
+        fields: The type of each field to convert: `DATE`, `ACCOUNTING_DATETIME`, `ISO_DATETIME`, `DECIMAL`,
+            another model, `(LIST, model)`, or any callable converting the raw value.
+        register: (Optional) Register the model in `MODELS` to be returned for the resource. Default True.
+
+    Returns:
+        The model class
+    """
+    model = type(class_name, (TypedResult,), {
+        "__slots__": tuple(fields),
+        "__module__": __name__,
+        "_name": name,
+        "_converters": {field: _compile(name, field, field_type) for field, field_type in fields.items()},
+    })
+    if register:
+        MODELS[name] = model
+    return model
+
+
+Money = typed_model("Money", "amount", {"amount": DECIMAL}, register=False)
+"""An amount of money, eg. `{"amount": "100.00", "code": "CAD"}`"""
+Balance = typed_model("Balance", "balance", {"amount": Money}, register=False)
+"""An outstanding or total balance of a client in one currency"""
+InvoiceLine = typed_model("InvoiceLine", "line", {
+    "amount": Money, "unit_cost": Money, "qty": DECIMAL, "updated": ACCOUNTING_DATETIME,
+}, register=False)
+"""A line of an invoice, estimate, or credit note"""
+BillLine = typed_model("BillLine", "line", {
+    "unit_cost": Money, "amount": Money, "total_amount": Money, "tax_amount1": Money, "tax_amount2": Money,
+    "quantity": DECIMAL,
+}, register=False)
+"""A line of a bill"""
+
+Bill = typed_model("Bill", "bill", {
+    "issue_date": DATE, "due_date": DATE, "created_at": ACCOUNTING_DATETIME, "updated_at": ACCOUNTING_DATETIME,
+    "amount": Money, "outstanding": Money, "paid": Money, "total_amount": Money, "lines": (LIST, BillLine),
+})
+BillPayment = typed_model("BillPayment", "bill_payment", {"paid_date": DATE, "amount": Money})
+BillVendor = typed_model("BillVendor", "bill_vendor", {
+    "created_at": ACCOUNTING_DATETIME, "updated_at": ACCOUNTING_DATETIME,
+})
+Client = typed_model("Client", "client", {
+    "signup_date": ACCOUNTING_DATETIME, "updated": ACCOUNTING_DATETIME, "last_activity": ACCOUNTING_DATETIME,
+    "last_login": ACCOUNTING_DATETIME, "outstanding_balance": (LIST, Balance),
+    "grand_total_balance": (LIST, Balance),
+})
+CreditNote = typed_model("CreditNote", "credit_note", {
+    "create_date": DATE, "amount": Money, "paid": Money, "lines": (LIST, InvoiceLine),
+})
+Estimate = typed_model("Estimate", "estimate", {
+    "create_date": DATE, "created_at": ACCOUNTING_DATETIME, "updated": ACCOUNTING_DATETIME, "amount": Money,
+    "discount_total": Money, "lines": (LIST, InvoiceLine),
+})
+Expense = typed_model("Expense", "expense", {
+    "date": DATE, "updated": ACCOUNTING_DATETIME, "amount": Money, "taxAmount1": Money, "taxAmount2": Money,
+})
+Invoice = typed_model("Invoice", "invoice", {
+    "create_date": DATE, "due_date": DATE, "date_paid": DATE, "generation_date": DATE,
+    "created_at": ACCOUNTING_DATETIME, "updated": ACCOUNTING_DATETIME, "amount": Money, "outstanding": Money,
+    "paid": Money, "discount_total": Money, "lines": (LIST, InvoiceLine),
+})
+Item = typed_model("Item", "item", {"updated": ACCOUNTING_DATETIME, "unit_cost": Money, "qty": DECIMAL})
+OtherIncome = typed_model("OtherIncome", "other_income", {
+    "date": DATE, "created_at": ACCOUNTING_DATETIME, "updated": ACCOUNTING_DATETIME, "amount": Money,
+})
+Payment = typed_model("Payment", "payment", {"date": DATE, "updated": ACCOUNTING_DATETIME, "amount": Money})
+Task = typed_model("Task", "task", {"updated": ACCOUNTING_DATETIME, "rate": Money})
+Tax = typed_model("Tax", "tax", {"updated": ACCOUNTING_DATETIME, "amount": DECIMAL})
+
+Project = typed_model("Project", "project", {
+    "due_date": DATE, "created_at": ISO_DATETIME, "updated_at": ISO_DATETIME, "budget": DECIMAL,
+    "fixed_price": DECIMAL, "rate": DECIMAL, "billed_amount": DECIMAL,
+})
+TimeEntry = typed_model("TimeEntry", "time_entry", {"started_at": ISO_DATETIME, "created_at": ISO_DATETIME})
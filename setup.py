@@ -22,6 +22,12 @@ setup(
     package_data={"freshbooks": ["py.typed"]},
     include_package_data=True,
     install_requires=open("requirements.txt").readlines(),
+    extras_require={
+        "async": ["httpx"],
+        "pandas": ["pandas", "numpy"],
+        "arrow": ["pyarrow"],
+        "orjson": ["orjson"],
+    },
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Developers",
@@ -1,10 +1,13 @@
 from datetime import datetime, timezone
 import json
 import httpretty
+import pytest
 
 from freshbooks import Client as FreshBooksClient
 from freshbooks import PaginateBuilder, FilterBuilder, IncludesBuilder, FreshBooksError, VisState
+from freshbooks import typed_models
 from freshbooks.client import API_BASE_URL, VERSION
+from freshbooks.decoders import OrjsonDecoder
 from tests import get_fixture
 
 
@@ -156,6 +159,23 @@ class TestAccountingResources:
             assert e.status_code == 500
             assert e.raw_response == "stuff"
 
+    @httpretty.activate
+    def test_get_client__orjson_decoder(self):
+        freshBooksClient = FreshBooksClient(
+            client_id="some_client", access_token="some_token", auto_retry=False, json_decoder=OrjsonDecoder()
+        )
+        url = "{}/accounting/account/{}/users/clients/12345".format(API_BASE_URL, self.account_id)
+        httpretty.register_uri(httpretty.GET, url, body=json.dumps(get_fixture("get_client_response")), status=200)
+
+        client = freshBooksClient.clients.get(self.account_id, 12345)
+
+        assert client.organization == "American Cyanamid"
+        assert client.updated == datetime(2020, 11, 1, 18, 11, 10, tzinfo=timezone.utc)
+
+        httpretty.register_uri(httpretty.GET, url.replace("12345", "12346"), body="stuff", status=500)
+        with pytest.raises(FreshBooksError, match="Failed to parse response"):
+            freshBooksClient.clients.get(self.account_id, 12346)
+
     @httpretty.activate
     def test_get_client__missing_response(self):
         client_id = 12345
@@ -201,6 +221,25 @@ class TestAccountingResources:
         assert httpretty.last_request().headers["Content-Type"] is None
         assert httpretty.last_request().headers["user-agent"] == "phone_home"
 
+    @httpretty.activate
+    def test_typed_models(self):
+        freshBooksClient = FreshBooksClient(client_id="some_client", access_token="some_token", typed_models=True)
+        url = "{}/accounting/account/{}/users/clients".format(API_BASE_URL, self.account_id)
+        httpretty.register_uri(httpretty.GET, url, body=json.dumps(get_fixture("list_clients_response")), status=200)
+        httpretty.register_uri(
+            httpretty.GET, f"{url}/12345", body=json.dumps(get_fixture("get_client_response")), status=200
+        )
+
+        client = freshBooksClient.clients.get(self.account_id, 12345)
+        clients = freshBooksClient.clients.list(self.account_id)
+
+        assert isinstance(client, typed_models.Client)
+        assert client.updated == datetime(2020, 11, 1, 18, 11, 10, tzinfo=timezone.utc)
+        assert all(isinstance(client, typed_models.Client) for client in clients)
+        assert isinstance(clients[0], typed_models.Client)
+        assert isinstance((clients + clients)[5], typed_models.Client)
+        assert str(freshBooksClient.taxes._result("tax_defaults", {"tax_defaults": {}})) == "Result(tax_defaults)"
+
     @httpretty.activate
     def test_list_clients__no_matching_clients(self):
         empty_results = {
@@ -243,6 +282,317 @@ class TestAccountingResources:
         expected_params = {"page": ["2"], "per_page": ["1"]}
         assert httpretty.last_request().querystring == expected_params
 
+    @httpretty.activate
+    def test_iter_all_clients(self):
+        url = "{}/accounting/account/{}/users/clients".format(API_BASE_URL, self.account_id)
+        page_1 = get_fixture("list_clients_response")
+        page_1["response"]["result"].update({"page": 1, "pages": 2, "per_page": 3, "total": 4})
+        page_2 = get_fixture("list_clients_response")
+        page_2["response"]["result"].update({"page": 2, "pages": 2, "per_page": 3, "total": 4})
+        page_2["response"]["result"]["clients"] = page_2["response"]["result"]["clients"][:1]
+        httpretty.register_uri(
+            httpretty.GET,
+            url,
+            responses=[
+                httpretty.Response(body=json.dumps(page_1), status=200),
+                httpretty.Response(body=json.dumps(page_2), status=200),
+            ]
+        )
+
+        filter = FilterBuilder().equals("userid", 123)
+        paginator = PaginateBuilder(1, 3)
+        clients = self.freshBooksClient.clients.iter_all(self.account_id, builders=[filter, paginator])
+
+        assert len(httpretty.latest_requests()) == 0
+        assert next(clients).userid == 12345
+        assert len(httpretty.latest_requests()) == 1
+        assert [client.userid for client in clients] == [12346, 12457, 12345]
+        assert len(httpretty.latest_requests()) == 2
+        assert httpretty.latest_requests()[0].querystring == {
+            "search[userid]": ["123"], "page": ["1"], "per_page": ["3"]
+        }
+        assert httpretty.latest_requests()[1].querystring == {
+            "search[userid]": ["123"], "page": ["2"], "per_page": ["3"]
+        }
+        assert paginator.page() == 1
+
+    @httpretty.activate
+    def test_iter_all_clients__stream(self):
+        url = "{}/accounting/account/{}/users/clients".format(API_BASE_URL, self.account_id)
+        page_1 = get_fixture("list_clients_response")
+        page_1["response"]["result"].update({"page": 1, "pages": 2, "per_page": 3, "total": 4})
+        page_2 = get_fixture("list_clients_response")
+        page_2["response"]["result"].update({"page": 2, "pages": 2, "per_page": 3, "total": 4})
+        page_2["response"]["result"]["clients"] = page_2["response"]["result"]["clients"][:1]
+        httpretty.register_uri(
+            httpretty.GET,
+            url,
+            responses=[
+                httpretty.Response(body=json.dumps(page_1), status=200),
+                httpretty.Response(body=json.dumps(page_2), status=200),
+            ]
+        )
+
+        clients = self.freshBooksClient.clients.iter_all(
+            self.account_id, builders=[PaginateBuilder(1, 3)], stream=True
+        )
+
+        assert len(httpretty.latest_requests()) == 0
+        assert next(clients).userid == 12345
+        assert len(httpretty.latest_requests()) == 1
+        assert [client.userid for client in clients] == [12346, 12457, 12345]
+        assert len(httpretty.latest_requests()) == 2
+        assert httpretty.latest_requests()[1].querystring == {"page": ["2"], "per_page": ["3"]}
+
+    @httpretty.activate
+    def test_iter_all_clients__stream_typed_models(self):
+        freshBooksClient = FreshBooksClient(client_id="some_client", access_token="some_token", typed_models=True)
+        url = "{}/accounting/account/{}/users/clients".format(API_BASE_URL, self.account_id)
+        httpretty.register_uri(httpretty.GET, url, body=json.dumps(get_fixture("list_clients_response")), status=200)
+
+        clients = list(freshBooksClient.clients.iter_all(self.account_id, stream=True))
+
+        assert [type(client) for client in clients] == [typed_models.Client] * 3
+
+    @httpretty.activate
+    def test_iter_all_clients__stream_error(self):
+        url = "{}/accounting/account/{}/users/clients".format(API_BASE_URL, self.account_id)
+        httpretty.register_uri(
+            httpretty.GET, url, body=json.dumps(get_fixture("get_client_response__not_found")), status=404
+        )
+
+        with pytest.raises(FreshBooksError, match="Client not found.") as error:
+            list(self.freshBooksClient.clients.iter_all(self.account_id, stream=True))
+        assert error.value.status_code == 404
+        assert error.value.error_code == 1012
+
+    @httpretty.activate
+    def test_iter_all_clients__stream_invalid_response(self):
+        url = "{}/accounting/account/{}/users/clients".format(API_BASE_URL, self.account_id)
+        body = json.dumps(get_fixture("list_clients_response"))
+        httpretty.register_uri(httpretty.GET, url, body=body[:-100], status=200)
+
+        clients = self.freshBooksClient.clients.iter_all(self.account_id, stream=True)
+
+        assert next(clients).userid == 12345
+        with pytest.raises(FreshBooksError, match="Failed to parse response") as error:
+            list(clients)
+        assert error.value.status_code == 200
+
+    @httpretty.activate
+    def test_iter_all_clients__stream_invalid_element(self):
+        url = "{}/accounting/account/{}/users/clients".format(API_BASE_URL, self.account_id)
+        httpretty.register_uri(
+            httpretty.GET, url, body='{"response": {"result": {"clients": [{"id": 1} {"id": 2}]}}}', status=200
+        )
+
+        with pytest.raises(FreshBooksError, match="Failed to parse response"):
+            list(self.freshBooksClient.clients.iter_all(self.account_id, stream=True))
+
+    def test_iter_all_clients__stream_prefetch(self):
+        with pytest.raises(ValueError):
+            next(self.freshBooksClient.clients.iter_all(self.account_id, prefetch=2, stream=True))
+
+    @httpretty.activate
+    def test_iter_all_clients__default_page_size(self):
+        url = "{}/accounting/account/{}/users/clients".format(API_BASE_URL, self.account_id)
+        httpretty.register_uri(
+            httpretty.GET,
+            url,
+            body=json.dumps(get_fixture("list_clients_response")),
+            status=200
+        )
+
+        clients = list(self.freshBooksClient.clients.iter_all(self.account_id))
+
+        assert len(clients) == 3
+        assert len(httpretty.latest_requests()) == 1
+        assert httpretty.last_request().querystring == {"page": ["1"], "per_page": ["100"]}
+
+    def _register_client_pages(self, pages, error_page=None):
+        url = "{}/accounting/account/{}/users/clients".format(API_BASE_URL, self.account_id)
+
+        def page_callback(request, uri, response_headers):
+            page = int(request.querystring["page"][0])
+            if page == error_page:
+                return [404, response_headers, json.dumps(get_fixture("get_client_response__not_found"))]
+            response = get_fixture("list_clients_response")
+            response["response"]["result"].update({"page": page, "pages": pages, "per_page": 3, "total": pages * 3})
+            for index, client in enumerate(response["response"]["result"]["clients"]):
+                client["userid"] = page * 100 + index
+            return [200, response_headers, json.dumps(response)]
+
+        httpretty.register_uri(httpretty.GET, url, body=page_callback)
+
+    @httpretty.activate
+    def test_iter_all_clients__prefetch(self):
+        self._register_client_pages(pages=5)
+
+        clients = self.freshBooksClient.clients.iter_all(self.account_id, builders=[PaginateBuilder(1, 3)], prefetch=2)
+        first_page = [next(clients) for _ in range(3)]
+
+        assert [client.userid for client in first_page] == [100, 101, 102]
+        assert len(httpretty.latest_requests()) <= 3
+        assert [client.userid for client in clients] == [
+            page * 100 + index for page in range(2, 6) for index in range(3)
+        ]
+        assert sorted(int(request.querystring["page"][0]) for request in httpretty.latest_requests()) == [
+            1, 2, 3, 4, 5
+        ]
+
+    @httpretty.activate
+    def test_list_all_clients(self):
+        self._register_client_pages(pages=5)
+        filter = FilterBuilder().equals("userid", 123)
+
+        clients = list(self.freshBooksClient.clients.list_all(
+            self.account_id, builders=[filter, PaginateBuilder(1, 3)], max_workers=2
+        ))
+
+        assert [client.userid for client in clients] == [
+            page * 100 + index for page in range(1, 6) for index in range(3)
+        ]
+        requests = httpretty.latest_requests()
+        assert requests[0].querystring == {"search[userid]": ["123"], "page": ["1"], "per_page": ["3"]}
+        assert sorted(int(request.querystring["page"][0]) for request in requests) == [1, 2, 3, 4, 5]
+        assert all(request.querystring["search[userid]"] == ["123"] for request in requests)
+
+    @httpretty.activate
+    def test_list_all_clients__unordered(self):
+        self._register_client_pages(pages=4)
+
+        clients = list(self.freshBooksClient.clients.list_all(self.account_id, max_workers=3, ordered=False))
+
+        assert clients[0].userid == 100
+        assert sorted(client.userid for client in clients) == [
+            page * 100 + index for page in range(1, 5) for index in range(3)
+        ]
+        assert httpretty.latest_requests()[0].querystring == {"page": ["1"], "per_page": ["100"]}
+
+    @httpretty.activate
+    def test_list_all_clients__single_page(self):
+        self._register_client_pages(pages=1)
+
+        clients = list(self.freshBooksClient.clients.list_all(self.account_id))
+
+        assert len(clients) == 3
+        assert len(httpretty.latest_requests()) == 1
+
+    @httpretty.activate
+    def test_list_all_clients__error(self):
+        self._register_client_pages(pages=6, error_page=3)
+
+        with pytest.raises(FreshBooksError) as e:
+            list(self.freshBooksClient.clients.list_all(self.account_id, max_workers=2))
+
+        assert str(e.value) == "Client not found."
+
+    def _register_clients_by_id(self):
+        """Clients with the requested `userids`, 3 per page, as well as a client with id 0 and one without an id
+        on every first page."""
+        url = "{}/accounting/account/{}/users/clients".format(API_BASE_URL, self.account_id)
+
+        def page_callback(request, uri, response_headers):
+            page = int(request.querystring["page"][0])
+            userids = [int(userid) for userid in request.querystring["search[userids][]"]]
+            pages = -(-len(userids) // 3)
+            response = get_fixture("list_clients_response")
+            client = response["response"]["result"]["clients"][0]
+            clients = [dict(client, id=userid, userid=userid) for userid in userids[(page - 1) * 3:page * 3]]
+            if page == 1:
+                clients.append(dict(client, id=0, userid=0))
+                clients.append({key: value for key, value in client.items() if key != "id"})
+            response["response"]["result"].update(
+                {"clients": clients, "page": page, "pages": pages, "per_page": 3, "total": len(userids)}
+            )
+            return [200, response_headers, json.dumps(response)]
+
+        httpretty.register_uri(httpretty.GET, url, body=page_callback)
+
+    @httpretty.activate
+    def test_list_all_clients__chunked(self):
+        self._register_clients_by_id()
+        self.freshBooksClient.clients.MAX_QUERY_LENGTH = 200
+        filter = FilterBuilder().equals("vis_state", 0).in_list("userids", list(range(1, 31)))
+
+        clients = list(self.freshBooksClient.clients.list_all(
+            self.account_id, builders=[filter, PaginateBuilder(1, 3)], max_workers=3
+        ))
+
+        assert sorted(client.userid for client in clients if "id" in client.data) == list(range(31))
+        assert len([client for client in clients if "id" not in client.data]) == 6
+        requests = httpretty.latest_requests()
+        assert all(len(request.path.split("?")[1]) <= 200 for request in requests)
+        assert all(request.querystring["search[vis_state]"] == ["0"] for request in requests)
+        chunks = {request.querystring["search[userids][]"][0] for request in requests}
+        assert len(chunks) == 6
+        assert [int(request.querystring["page"][0]) for request in requests[:6]] == [1] * 6
+        assert len(requests) == 12
+
+    @httpretty.activate
+    def test_iter_all_clients__chunked(self):
+        self._register_clients_by_id()
+        self.freshBooksClient.clients.MAX_QUERY_LENGTH = 200
+        filter = FilterBuilder().in_list("userids", list(range(1, 31))).freeze()
+
+        clients = [
+            client.id for client in self.freshBooksClient.clients.iter_all(self.account_id, [filter]) if client.id
+        ]
+        streamed = [
+            client.id for client in self.freshBooksClient.clients.iter_all(self.account_id, [filter], stream=True)
+            if client.id
+        ]
+
+        assert sorted(clients) == list(range(1, 31))
+        assert sorted(streamed) == list(range(1, 31))
+        assert streamed[:3] == [1, 2, 3]
+
+    def test_list_all_clients__not_chunkable(self):
+        self.freshBooksClient.clients.MAX_QUERY_LENGTH = 100
+        filter = FilterBuilder().equals("organization", "A" * 100)
+
+        with pytest.raises(ValueError):
+            next(self.freshBooksClient.clients.list_all(self.account_id, builders=[filter]))
+        with pytest.raises(ValueError):
+            next(self.freshBooksClient.clients.list_all(
+                self.account_id, builders=[filter.in_list("userids", [1, 2])]
+            ))
+
+    @httpretty.activate
+    def test_list_partitions_clients(self):
+        url = "{}/accounting/account/{}/users/clients".format(API_BASE_URL, self.account_id)
+
+        def partition_callback(request, uri, response_headers):
+            page = int(request.querystring["page"][0])
+            day = int(request.querystring["search[updated_min]"][0][-2:])
+            response = get_fixture("list_clients_response")
+            client = response["response"]["result"]["clients"][0]
+            clients = [dict(client, id=day * 100 + page * 10 + index) for index in range(2)]
+            clients.append(dict(client, id=1))
+            response["response"]["result"].update({"clients": clients, "page": page, "pages": 2, "per_page": 3})
+            return [200, response_headers, json.dumps(response)]
+
+        httpretty.register_uri(httpretty.GET, url, body=partition_callback)
+        partitions = FilterBuilder().equals("vis_state", 0).partition("updated", "2020-11-01", "2020-11-30", 3)
+
+        clients = list(self.freshBooksClient.clients.list_partitions(
+            self.account_id, partitions, builders=[IncludesBuilder().include("last_activity")], max_workers=2
+        ))
+
+        assert [client.id for client in clients] == [
+            110, 111, 1, 1110, 1111, 2110, 2111, 120, 121, 1120, 1121, 2120, 2121
+        ]
+        requests = httpretty.latest_requests()
+        assert sorted(request.querystring["search[updated_max]"][0] for request in requests) == [
+            "2020-11-10", "2020-11-10", "2020-11-20", "2020-11-20", "2020-11-30", "2020-11-30"
+        ]
+        assert all(request.querystring["include[]"] == ["last_activity"] for request in requests)
+        assert len(requests) == 6
+
+    def test_list_partitions__none(self):
+        with pytest.raises(ValueError):
+            next(self.freshBooksClient.clients.list_partitions(self.account_id, []))
+
     @httpretty.activate
     def test_list_clients__filtered(self):
         url = ("{}/accounting/account/{}/users/clients?search[userids][]=1&search[userids][]=2"
@@ -0,0 +1,887 @@
+import asyncio
+import json
+import time
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+from freshbooks import AsyncClient, FilterBuilder, FreshBooksError, IncludesBuilder, PaginateBuilder, typed_models
+from freshbooks.api.async_resources import (
+    AsyncAccountingBusinessResource, AsyncAccountingResource, AsyncCommentsSubResource, AsyncEventsResource,
+    AsyncProjectsResource, AsyncTimetrackingResource, AsyncUploadsResource
+)
+from freshbooks.api.pagination import _afetch_concurrently
+from freshbooks.client import API_BASE_URL
+from freshbooks.decoders import OrjsonDecoder
+from freshbooks.errors import FreshBooksIdempotencyError, FreshBooksNotImplementedError
+from freshbooks.http_cache import HTTPCache, HTTPCacheStats
+from freshbooks.idempotency import IdempotencyJournal
+from freshbooks.cache import ResponseCache
+from freshbooks.concurrency import AdaptiveConcurrencyLimiter
+from freshbooks.ratelimit import RateLimiter
+from freshbooks.retry import RetryPolicy
+from freshbooks.singleflight import SingleFlight
+from tests import get_fixture
+
+httpx = pytest.importorskip("httpx")
+
+
+class TestAsyncClient:
+    def setup_method(self, method):
+        self.account_id = "ACM123"
+        self.business_id = 98765
+        self.requests = []
+        self.responses = {}
+        self.freshBooksClient = AsyncClient(client_id="some_client", access_token="some_token")
+        self.freshBooksClient._session = httpx.AsyncClient(transport=httpx.MockTransport(self._handler))
+
+    def _handler(self, request):
+        self.requests.append(request)
+        responses = self.responses[(request.method, str(request.url))]
+        status, body = responses.pop(0) if len(responses) > 1 else responses[0]
+        return httpx.Response(status, content=body if isinstance(body, str) else json.dumps(body))
+
+    def _register(self, method, url, body, status=200):
+        self.responses.setdefault((method, url), []).append((status, body))
+
+    def _run(self, coroutine):
+        return asyncio.run(coroutine)
+
+    def test_resource_types(self):
+        assert isinstance(self.freshBooksClient.invoices, AsyncAccountingResource)
+        assert isinstance(self.freshBooksClient.callbacks, AsyncEventsResource)
+        assert isinstance(self.freshBooksClient.ledger_accounts, AsyncAccountingBusinessResource)
+        assert isinstance(self.freshBooksClient.projects, AsyncProjectsResource)
+        assert isinstance(self.freshBooksClient.time_entries, AsyncTimetrackingResource)
+        assert isinstance(self.freshBooksClient.service_rates, AsyncCommentsSubResource)
+        assert isinstance(self.freshBooksClient.images, AsyncUploadsResource)
+        assert self.freshBooksClient.invoices.session is self.freshBooksClient.projects.session
+
+    def test_session_configuration(self):
+        freshBooksClient = AsyncClient(client_id="some_client", access_token="some_token", pool_maxsize=25)
+
+        session = freshBooksClient.clients.session
+
+        assert isinstance(session, httpx.AsyncClient)
+        assert session._transport._pool._max_connections == 25
+        self._run(freshBooksClient.aclose())
+        assert freshBooksClient._session is None
+        self._run(freshBooksClient.aclose())
+        with pytest.raises(RuntimeError):
+            freshBooksClient.close()
+
+    def test_context_manager(self):
+        async def run():
+            async with self.freshBooksClient as freshBooksClient:
+                freshBooksClient.clients
+            return freshBooksClient
+
+        assert self._run(run())._session is None
+
+    def test_get_client(self):
+        client_id = 12345
+        url = "{}/accounting/account/{}/users/clients/{}".format(API_BASE_URL, self.account_id, client_id)
+        self._register("GET", url, get_fixture("get_client_response"))
+
+        client = self._run(self.freshBooksClient.clients.get(self.account_id, client_id))
+
+        assert str(client) == "Result(client)"
+        assert client.userid == client_id
+        assert self.requests[0].headers["Authorization"] == "Bearer some_token"
+        assert "Content-Type" not in self.requests[0].headers
+
+    def test_typed_models(self):
+        freshBooksClient = AsyncClient(client_id="some_client", access_token="some_token", typed_models=True)
+        freshBooksClient._session = self.freshBooksClient._session
+        url = "{}/accounting/account/{}/users/clients".format(API_BASE_URL, self.account_id)
+        self._register("GET", f"{url}/12345", get_fixture("get_client_response"))
+        self._register("GET", url, get_fixture("list_clients_response"))
+        project_url = "{}/projects/business/{}/project/654321".format(API_BASE_URL, self.business_id)
+        self._register("GET", project_url, get_fixture("get_project_response"))
+
+        client = self._run(freshBooksClient.clients.get(self.account_id, 12345))
+        clients = self._run(freshBooksClient.clients.list(self.account_id))
+        project = self._run(freshBooksClient.projects.get(self.business_id, 654321))
+
+        assert isinstance(client, typed_models.Client)
+        assert all(isinstance(client, typed_models.Client) for client in clients)
+        assert isinstance(project, typed_models.Project)
+
+    def test_orjson_decoder(self):
+        freshBooksClient = AsyncClient(
+            client_id="some_client", access_token="some_token", json_decoder=OrjsonDecoder()
+        )
+        freshBooksClient._session = self.freshBooksClient._session
+        url = "{}/projects/business/{}/project/654321".format(API_BASE_URL, self.business_id)
+        self._register("GET", url, get_fixture("get_project_response"))
+
+        project = self._run(freshBooksClient.projects.get(self.business_id, 654321))
+
+        assert project.title == "Awesome Project"
+
+    def test_get_client__not_found_error(self):
+        client_id = 12345
+        url = "{}/accounting/account/{}/users/clients/{}".format(API_BASE_URL, self.account_id, client_id)
+        self._register("GET", url, get_fixture("get_client_response__not_found"), status=404)
+
+        with pytest.raises(FreshBooksError) as e:
+            self._run(self.freshBooksClient.clients.get(self.account_id, client_id))
+
+        assert str(e.value) == "Client not found."
+        assert e.value.status_code == 404
+        assert e.value.error_code == 1012
+
+    def test_list_clients(self):
+        url = "{}/accounting/account/{}/users/clients?search[userids][]=1&search[userids][]=2".format(
+            API_BASE_URL, self.account_id
+        )
+        self._register("GET", url, get_fixture("list_clients_response"))
+
+        clients = self._run(self.freshBooksClient.clients.list(
+            self.account_id, builders=[FilterBuilder().in_list("userids", [1, 2])]
+        ))
+
+        assert str(clients) == "ListResult(clients)"
+        assert len(clients) == 3
+        assert clients.pages.total == 3
+
+    def test_iter_all_clients(self):
+        url = "{}/accounting/account/{}/users/clients".format(API_BASE_URL, self.account_id)
+        page_1 = get_fixture("list_clients_response")
+        page_1["response"]["result"].update({"page": 1, "pages": 2})
+        page_2 = get_fixture("list_clients_response")
+        page_2["response"]["result"].update({"page": 2, "pages": 2})
+        self._register("GET", f"{url}?page=1&per_page=100", page_1)
+        self._register("GET", f"{url}?page=2&per_page=100", page_2)
+
+        async def run():
+            return [client.userid async for client in self.freshBooksClient.clients.iter_all(self.account_id)]
+
+        assert self._run(run()) == [12345, 12346, 12457] * 2
+
+    def test_iter_all_projects(self):
+        url = "{}/projects/business/{}/projects?page=1&per_page=100".format(API_BASE_URL, self.business_id)
+        self._register("GET", url, get_fixture("list_projects_response"))
+
+        async def run():
+            return [project async for project in self.freshBooksClient.projects.iter_all(self.business_id)]
+
+        assert len(self._run(run())) == 3
+
+    def test_iter_all_clients__stream(self):
+        url = "{}/accounting/account/{}/users/clients".format(API_BASE_URL, self.account_id)
+        page_1 = get_fixture("list_clients_response")
+        page_1["response"]["result"].update({"page": 1, "pages": 2})
+        page_2 = get_fixture("list_clients_response")
+        page_2["response"]["result"].update({"page": 2, "pages": 2})
+        self._register("GET", f"{url}?page=1&per_page=100", page_1)
+        self._register("GET", f"{url}?page=2&per_page=100", page_2)
+
+        async def run():
+            clients = self.freshBooksClient.clients.iter_all(self.account_id, stream=True)
+            return [client.userid async for client in clients]
+
+        assert self._run(run()) == [12345, 12346, 12457] * 2
+
+    def test_iter_all_projects__stream(self):
+        url = "{}/projects/business/{}/projects?page=1&per_page=100".format(API_BASE_URL, self.business_id)
+        self._register("GET", url, get_fixture("list_projects_response"))
+
+        async def run():
+            projects = self.freshBooksClient.projects.iter_all(self.business_id, stream=True)
+            return [project.id async for project in projects]
+
+        assert len(self._run(run())) == 3
+
+    def test_iter_all_clients__stream_error(self):
+        url = "{}/accounting/account/{}/users/clients?page=1&per_page=100".format(API_BASE_URL, self.account_id)
+        self._register("GET", url, get_fixture("get_client_response__not_found"), status=404)
+
+        async def run():
+            return [client async for client in self.freshBooksClient.clients.iter_all(self.account_id, stream=True)]
+
+        with pytest.raises(FreshBooksError, match="Client not found.") as e:
+            self._run(run())
+        assert e.value.error_code == 1012
+
+    def test_iter_all__stream_prefetch(self):
+        async def run():
+            projects = self.freshBooksClient.projects.iter_all(self.business_id, prefetch=2, stream=True)
+            return [project async for project in projects]
+
+        async def run_accounting():
+            clients = self.freshBooksClient.clients.iter_all(self.account_id, prefetch=2, stream=True)
+            return [client async for client in clients]
+
+        with pytest.raises(ValueError):
+            self._run(run())
+        with pytest.raises(ValueError):
+            self._run(run_accounting())
+
+    @patch("freshbooks.api.async_resources.asyncio.sleep")
+    def test_iter_all_clients__stream_retry(self, mock_sleep):
+        url = "{}/accounting/account/{}/users/clients?page=1&per_page=100".format(API_BASE_URL, self.account_id)
+        self._register("GET", url, {}, status=503)
+        self._register("GET", url, get_fixture("list_clients_response"))
+
+        async def sleep(delay):
+            pass
+
+        mock_sleep.side_effect = sleep
+
+        async def run():
+            return [client async for client in self.freshBooksClient.clients.iter_all(self.account_id, stream=True)]
+
+        assert len(self._run(run())) == 3
+        assert len(self.requests) == 2
+
+    def test_iter_all_clients__prefetch(self):
+        url = "{}/accounting/account/{}/users/clients".format(API_BASE_URL, self.account_id)
+        for page in range(1, 4):
+            response = get_fixture("list_clients_response")
+            response["response"]["result"].update({"page": page, "pages": 3})
+            response["response"]["result"]["clients"] = response["response"]["result"]["clients"][:1]
+            response["response"]["result"]["clients"][0]["userid"] = page
+            self._register("GET", f"{url}?page={page}&per_page=100", response)
+
+        async def run():
+            return [
+                client.userid async for client in self.freshBooksClient.clients.iter_all(self.account_id, prefetch=1)
+            ]
+
+        assert self._run(run()) == [1, 2, 3]
+
+    def test_list_all_clients(self):
+        url = "{}/accounting/account/{}/users/clients".format(API_BASE_URL, self.account_id)
+        for page in range(1, 5):
+            response = get_fixture("list_clients_response")
+            response["response"]["result"].update({"page": page, "pages": 4})
+            response["response"]["result"]["clients"][0]["userid"] = page
+            self._register("GET", f"{url}?page={page}&per_page=100", response)
+
+        async def run(ordered):
+            return [
+                client.userid async for client in self.freshBooksClient.clients.list_all(
+                    self.account_id, max_workers=2, ordered=ordered
+                )
+            ]
+
+        assert self._run(run(ordered=True)) == [1, 12346, 12457, 2, 12346, 12457, 3, 12346, 12457, 4, 12346, 12457]
+        assert sorted(self._run(run(ordered=False))) == [1, 2, 3, 4] + [12346] * 4 + [12457] * 4
+
+    def test_list_all_clients__error(self):
+        url = "{}/accounting/account/{}/users/clients".format(API_BASE_URL, self.account_id)
+        response = get_fixture("list_clients_response")
+        response["response"]["result"].update({"page": 1, "pages": 5})
+        self._register("GET", f"{url}?page=1&per_page=100", response)
+        self._register("GET", f"{url}?page=2&per_page=100", get_fixture("get_client_response__not_found"), status=404)
+        for page in range(3, 6):
+            self._register("GET", f"{url}?page={page}&per_page=100", response)
+
+        async def run():
+            return [client async for client in self.freshBooksClient.clients.list_all(self.account_id, max_workers=3)]
+
+        with pytest.raises(FreshBooksError) as e:
+            self._run(run())
+
+        assert str(e.value) == "Client not found."
+
+    @pytest.mark.parametrize("ordered", [True, False])
+    def test_fetch_concurrently__error_waits_for_cancelled(self, ordered):
+        cancelled = []
+
+        async def fetch(page):
+            if page == 1:
+                raise FreshBooksError(404, "Client not found.")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(page)
+                raise
+
+        async def run():
+            with pytest.raises(FreshBooksError):
+                async for _ in _afetch_concurrently(fetch, [1, 2, 3], 3, ordered):
+                    pass  # pragma: no cover
+            return list(cancelled)
+
+        assert self._run(run()) == [2, 3]
+
+    def test_list_all_projects(self):
+        url = "{}/projects/business/{}/projects?page=1&per_page=100".format(API_BASE_URL, self.business_id)
+        self._register("GET", url, get_fixture("list_projects_response"))
+
+        async def run():
+            return [project async for project in self.freshBooksClient.projects.list_all(self.business_id)]
+
+        assert len(self._run(run())) == 3
+
+    def _chunk_handler(self, request):
+        """Resources with the requested ids, 3 per page, as well as a resource with id 0 on every page."""
+        self.requests.append(request)
+        page = int(request.url.params["page"])
+        if "/projects/" in request.url.path:
+            response = get_fixture("list_projects_response")
+            project = response["projects"][0]
+            ids = [int(id) for id in request.url.params.get_list("search[client_ids][]")]
+            response["projects"] = [dict(project, id=id) for id in ids[(page - 1) * 3:page * 3] + [0]]
+            response["meta"].update({"page": page, "pages": -(-len(ids) // 3), "per_page": 3, "total": len(ids)})
+        else:
+            response = get_fixture("list_clients_response")
+            client = response["response"]["result"]["clients"][0]
+            ids = [int(id) for id in request.url.params.get_list("search[userids][]")]
+            response["response"]["result"]["clients"] = [
+                dict(client, id=id, userid=id) for id in ids[(page - 1) * 3:page * 3] + [0]
+            ]
+            response["response"]["result"].update(
+                {"page": page, "pages": -(-len(ids) // 3), "per_page": 3, "total": len(ids)}
+            )
+        return httpx.Response(200, content=json.dumps(response))
+
+    def test_list_all__chunked(self):
+        self.freshBooksClient._session = httpx.AsyncClient(transport=httpx.MockTransport(self._chunk_handler))
+        self.freshBooksClient.clients.MAX_QUERY_LENGTH = 200
+        self.freshBooksClient.projects.MAX_QUERY_LENGTH = 200
+        clients_filter = FilterBuilder().in_list("userids", list(range(1, 31)))
+        projects_filter = FilterBuilder().in_list("client_ids", list(range(1, 31)))
+        builders = [clients_filter, PaginateBuilder(1, 3)]
+        project_builders = [projects_filter, PaginateBuilder(1, 3)]
+
+        async def run():
+            clients = self.freshBooksClient.clients
+            projects = self.freshBooksClient.projects
+            return (
+                [client.userid async for client in clients.list_all(self.account_id, builders)],
+                [client.userid async for client in clients.iter_all(self.account_id, builders)],
+                [client.userid async for client in clients.iter_all(self.account_id, builders, stream=True)],
+                [project.id async for project in projects.list_all(self.business_id, project_builders)],
+                [project.id async for project in projects.iter_all(self.business_id, project_builders)],
+                [project.id async for project in projects.iter_all(self.business_id, project_builders, stream=True)],
+            )
+
+        for results in self._run(run()):
+            assert sorted(results) == list(range(31))
+            assert results[:2] == [1, 2]
+        assert len(self.requests) > 6
+        assert all(len(request.url.query) <= 200 for request in self.requests)
+
+    def test_list_partitions(self):
+        clients_url = "{}/accounting/account/{}/users/clients".format(API_BASE_URL, self.account_id)
+        projects_url = "{}/projects/business/{}/projects".format(API_BASE_URL, self.business_id)
+        for day in ("01", "16"):
+            clients = get_fixture("list_clients_response")
+            clients["response"]["result"]["clients"][0]["id"] = int(day)
+            self._register(
+                "GET",
+                f"{clients_url}?search[updated_min]=2020-11-{day}&search[updated_max]=2020-11-{int(day) + 14}"
+                "&page=1&per_page=100",
+                clients
+            )
+        self._register("GET", f"{projects_url}?updated_min=2020-11-01&page=1&per_page=100",
+                       get_fixture("list_projects_response"))
+
+        async def run():
+            partitions = FilterBuilder().partition("updated", "2020-11-01", "2020-11-30", 2)
+            clients = self.freshBooksClient.clients.list_partitions(self.account_id, partitions, max_workers=2)
+            project_partitions = [FilterBuilder().equals("updated_min", "2020-11-01")]
+            projects = self.freshBooksClient.projects.list_partitions(self.business_id, project_partitions)
+            return [client.id async for client in clients], [project.id async for project in projects]
+
+        clients, projects = self._run(run())
+
+        assert clients == [1, 12346, 12457, 16]
+        assert len(projects) == 3
+
+    def test_create_update_delete_client(self):
+        url = "{}/accounting/account/{}/users/clients".format(API_BASE_URL, self.account_id)
+        self._register("POST", url, get_fixture("create_client_response"))
+        self._register("PUT", f"{url}/12345", get_fixture("get_client_response"))
+
+        async def run():
+            created = await self.freshBooksClient.clients.create(self.account_id, {"email": "john.doe@abcorp.com"})
+            updated = await self.freshBooksClient.clients.update(self.account_id, 12345, {"organization": "A"})
+            deleted = await self.freshBooksClient.clients.delete(self.account_id, 12345)
+            return created, updated, deleted
+
+        created, updated, deleted = self._run(run())
+
+        assert created.userid == 56789
+        assert updated.userid == 12345
+        assert json.loads(self.requests[0].content) == {"client": {"email": "john.doe@abcorp.com"}}
+        assert self.requests[0].headers["Content-Type"] == "application/json"
+        assert json.loads(self.requests[2].content) == {"client": {"vis_state": 1}}
+
+    def test_client_includes(self):
+        url = "{}/accounting/account/{}/users/clients".format(API_BASE_URL, self.account_id)
+        includes = IncludesBuilder().include("late_reminders")
+        self._register("GET", f"{url}/12345?include[]=late_reminders", get_fixture("get_client_response"))
+        self._register("POST", f"{url}?include[]=late_reminders", get_fixture("get_client_response"))
+        self._register("PUT", f"{url}/12345?include[]=late_reminders", get_fixture("get_client_response"))
+
+        async def run():
+            await self.freshBooksClient.clients.get(self.account_id, 12345, includes=includes)
+            await self.freshBooksClient.clients.create(self.account_id, {}, includes=includes)
+            await self.freshBooksClient.clients.update(self.account_id, 12345, {}, includes=includes)
+
+        self._run(run())
+
+        assert [request.method for request in self.requests] == ["GET", "POST", "PUT"]
+
+    def test_delete_invoice(self):
+        url = "{}/accounting/account/{}/invoices/invoices/12345".format(API_BASE_URL, self.account_id)
+        self._register("DELETE", url, {"response": {"result": {"invoice": {"id": 12345, "vis_state": 1}}}})
+
+        invoice = self._run(self.freshBooksClient.invoices.delete(self.account_id, 12345))
+
+        assert invoice.id == 12345
+
+    def test_missing_endpoint(self):
+        with pytest.raises(FreshBooksNotImplementedError):
+            self._run(self.freshBooksClient.systems.list(self.account_id))
+
+    def test_callbacks(self):
+        callback_id = 123
+        url = "{}/events/account/{}/events/callbacks/{}".format(API_BASE_URL, self.account_id, callback_id)
+        self._register("PUT", url, get_fixture("get_callback_response"))
+
+        async def run():
+            verified = await self.freshBooksClient.callbacks.verify(self.account_id, callback_id, "some_verifier")
+            resent = await self.freshBooksClient.callbacks.resend_verification(self.account_id, callback_id)
+            return verified, resent
+
+        verified, resent = self._run(run())
+
+        assert verified.callbackid == callback_id
+        assert resent.callbackid == callback_id
+        assert json.loads(self.requests[0].content) == {"callback": {"verifier": "some_verifier"}}
+        assert json.loads(self.requests[1].content) == {"callback": {"resend": True}}
+
+    def test_ledger_accounts(self):
+        business_uuid = "bus_uuid"
+        url = "{}/accounting/businesses/{}/ledger_accounts/accounts".format(API_BASE_URL, business_uuid)
+        self._register("GET", url, get_fixture("list_ledger_accounts_response"))
+        self._register("GET", f"{url}/acc_uuid", get_fixture("get_ledger_account_response"))
+        self._register("POST", url, get_fixture("get_ledger_account_response"))
+        self._register("PUT", f"{url}/acc_uuid", get_fixture("get_ledger_account_response"))
+
+        async def run():
+            accounts = await self.freshBooksClient.ledger_accounts.list(business_uuid)
+            account = await self.freshBooksClient.ledger_accounts.get(business_uuid, "acc_uuid")
+            await self.freshBooksClient.ledger_accounts.create(business_uuid, {})
+            await self.freshBooksClient.ledger_accounts.update(business_uuid, "acc_uuid", {})
+            return accounts, account
+
+        accounts, account = self._run(run())
+
+        assert str(accounts) == "ListResult(accounts)"
+        assert str(account) == "Result(accounts)"
+        assert [request.method for request in self.requests] == ["GET", "GET", "POST", "PUT"]
+
+    def test_ledger_account_delete(self):
+        business_uuid = "bus_uuid"
+        url = "{}/accounting/businesses/{}/ledger_accounts/accounts/acc_uuid".format(API_BASE_URL, business_uuid)
+        self._register("DELETE", url, "", status=204)
+        resource = AsyncAccountingBusinessResource(
+            self.freshBooksClient._client_resource_config(), "ledger_accounts/accounts", "accounts"
+        )
+
+        account = self._run(resource.delete(business_uuid, "acc_uuid"))
+
+        assert account.data == {}
+
+    def test_projects(self):
+        project_id = 654321
+        base_url = "{}/projects/business/{}".format(API_BASE_URL, self.business_id)
+        self._register("GET", f"{base_url}/project/{project_id}?include_overdue_fees=true",
+                       get_fixture("get_project_response"))
+        self._register("GET", f"{base_url}/project/{project_id}", get_fixture("get_project_response"))
+        self._register("GET", f"{base_url}/projects", get_fixture("list_projects_response"))
+        self._register("POST", f"{base_url}/project", get_fixture("create_project_response"))
+        self._register("PUT", f"{base_url}/project/{project_id}", get_fixture("get_project_response"))
+        self._register("DELETE", f"{base_url}/project/{project_id}", "", status=204)
+
+        async def run():
+            includes = IncludesBuilder().include("include_overdue_fees")
+            project = await self.freshBooksClient.projects.get(self.business_id, project_id, includes=includes)
+            await self.freshBooksClient.projects.get(self.business_id, project_id)
+            projects = await self.freshBooksClient.projects.list(self.business_id)
+            await self.freshBooksClient.projects.create(self.business_id, {"title": "A project"})
+            await self.freshBooksClient.projects.update(self.business_id, project_id, {"title": "A project"})
+            deleted = await self.freshBooksClient.projects.delete(self.business_id, project_id)
+            return project, projects, deleted
+
+        project, projects, deleted = self._run(run())
+
+        assert project.id == project_id
+        assert str(projects) == "ListResult(projects)"
+        assert deleted.data == {}
+
+    def test_project_error(self):
+        url = "{}/projects/business/{}/project".format(API_BASE_URL, self.business_id)
+        self._register("POST", url, get_fixture("create_project__validation_errors"), status=422)
+
+        with pytest.raises(FreshBooksError) as e:
+            self._run(self.freshBooksClient.projects.create(self.business_id, {}))
+
+        assert e.value.status_code == 422
+
+    def test_service_rates(self):
+        base_url = "{}/comments/business/{}".format(API_BASE_URL, self.business_id)
+        rate = '{"service_rate": {"rate": 10.00, "service_id": 1}}'
+        self._register("GET", f"{base_url}/service/1/rate", rate)
+        self._register("POST", f"{base_url}/service/1/rate", rate)
+        self._register("PUT", f"{base_url}/service/1/rate", rate)
+        self._register("GET", f"{base_url}/service_rates", {"service_rates": [], "meta": {}})
+
+        async def run():
+            rate = await self.freshBooksClient.service_rates.get(self.business_id, 1)
+            await self.freshBooksClient.service_rates.create(self.business_id, 1, {"rate": "10.00"})
+            await self.freshBooksClient.service_rates.update(self.business_id, 1, {"rate": "10.00"})
+            rates = await self.freshBooksClient.service_rates.list(self.business_id)
+            return rate, rates
+
+        rate, rates = self._run(run())
+
+        assert rate.rate == Decimal("10.00")
+        assert len(rates) == 0
+
+    def test_payment_options(self):
+        base_url = "{}/payments/account/{}".format(API_BASE_URL, self.account_id)
+        options = {"payment_options": {"gateway_name": "fbpay"}}
+        self._register("GET", f"{base_url}/payment_options?entity_type=invoice", options)
+        self._register("GET", f"{base_url}/invoice/1/payment_options", options)
+        self._register("POST", f"{base_url}/invoice/1/payment_options", options)
+
+        async def run():
+            defaults = await self.freshBooksClient.invoice_payment_options.defaults(self.account_id)
+            options = await self.freshBooksClient.invoice_payment_options.get(self.account_id, 1)
+            await self.freshBooksClient.invoice_payment_options.create(self.account_id, 1, {"gateway_name": "fbpay"})
+            return defaults, options
+
+        defaults, options = self._run(run())
+
+        assert defaults.gateway_name == "fbpay"
+        assert options.gateway_name == "fbpay"
+
+    def test_uploads(self):
+        self._register("GET", "{}/uploads/images/some_jwt".format(API_BASE_URL), "some bytes")
+        self._register("POST", "{}/uploads/account/{}/images".format(API_BASE_URL, self.account_id),
+                       get_fixture("upload_image_response"))
+
+        async def run():
+            response = await self.freshBooksClient.images.get("some_jwt")
+            uploaded = await self.freshBooksClient.images.upload(self.account_id, file_stream=b"some bytes")
+            return response, uploaded
+
+        response, uploaded = self._run(run())
+
+        assert response.content == b"some bytes"
+        assert uploaded.jwt
+        assert b"some bytes" in self.requests[1].content
+
+    def test_current_user(self):
+        self._register("GET", "{}/auth/api/v1/users/me".format(API_BASE_URL), get_fixture("auth_me_response"))
+
+        identity = self._run(self.freshBooksClient.current_user())
+
+        assert identity.identity_id == 12345
+
+    @patch("freshbooks.api.async_resources.asyncio.sleep")
+    def test_retry(self, mock_sleep):
+        client_id = 12345
+        url = "{}/accounting/account/{}/users/clients/{}".format(API_BASE_URL, self.account_id, client_id)
+        self._register("GET", url, {}, status=503)
+        self._register("GET", url, {}, status=503)
+        self._register("GET", url, get_fixture("get_client_response"))
+
+        async def sleep(delay):
+            pass
+
+        mock_sleep.side_effect = sleep
+        freshBooksClient = AsyncClient(
+            client_id="some_client", access_token="some_token", retry_policy=RetryPolicy(jitter=False)
+        )
+        freshBooksClient._session = self.freshBooksClient._session
+
+        client = self._run(freshBooksClient.clients.get(self.account_id, client_id))
+
+        assert client.userid == client_id
+        assert len(self.requests) == 3
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [0.3, 0.6]
+
+    def test_retry__connection_error(self):
+        url = "{}/accounting/account/{}/users/clients/12345".format(API_BASE_URL, self.account_id)
+        self._register("GET", url, get_fixture("get_client_response"))
+        failures = []
+
+        def handler(request):
+            if len(failures) < 2:
+                failures.append(request)
+                raise httpx.ConnectError("Connection refused", request=request)
+            return self._handler(request)
+
+        async def sleep(delay):
+            pass
+
+        self.freshBooksClient._session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with patch("freshbooks.api.async_resources.asyncio.sleep", side_effect=sleep):
+            client = self._run(self.freshBooksClient.clients.get(self.account_id, 12345))
+
+        assert client.userid == 12345
+        assert len(failures) == 2
+
+        freshBooksClient = AsyncClient(client_id="some_client", access_token="some_token", auto_retry=False)
+        freshBooksClient._session = self.freshBooksClient._session
+        failures.clear()
+        with pytest.raises(httpx.ConnectError):
+            self._run(freshBooksClient.clients.get(self.account_id, 12345))
+
+    def test_retry__exhausted(self):
+        client_id = 12345
+        url = "{}/accounting/account/{}/users/clients/{}".format(API_BASE_URL, self.account_id, client_id)
+        self._register("GET", url, {}, status=429)
+
+        async def sleep(delay):
+            pass
+
+        with patch("freshbooks.api.async_resources.asyncio.sleep", side_effect=sleep):
+            with pytest.raises(FreshBooksError) as e:
+                self._run(self.freshBooksClient.clients.get(self.account_id, client_id))
+
+        assert e.value.status_code == 429
+        assert len(self.requests) == 4
+
+    def _idempotent_client(self, outcomes):
+        """A client with an idempotency journal, whose calls have the next outcome for their method."""
+        freshBooksClient = AsyncClient(
+            client_id="some_client", access_token="some_token", idempotency_journal=IdempotencyJournal(),
+            retry_policy=RetryPolicy(jitter=False)
+        )
+
+        def handler(request):
+            self.requests.append(request)
+            outcome = outcomes[request.method].pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            status, body = outcome
+            return httpx.Response(status, content=json.dumps(body))
+
+        freshBooksClient._session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return freshBooksClient
+
+    @patch("freshbooks.api.async_resources.asyncio.sleep")
+    def test_idempotent_create(self, mock_sleep):
+        created = get_fixture("create_client_response")
+        found = get_fixture("list_clients_response")
+        found["response"]["result"]["clients"] = [created["response"]["result"]["client"]]
+        not_found = get_fixture("list_clients_response")
+        not_found["response"]["result"]["clients"] = []
+        freshBooksClient = self._idempotent_client({
+            "POST": [httpx.ReadTimeout("Timed out"), (503, {})],
+            "GET": [(200, not_found), (200, found)],
+        })
+        lookup = [FilterBuilder().equals("email", "john.doe@abcorp.com")]
+
+        async def sleep(delay):
+            pass
+
+        mock_sleep.side_effect = sleep
+
+        async def create(key, **kwargs):
+            return await freshBooksClient.clients.create(
+                self.account_id, {"email": "john.doe@abcorp.com"}, idempotency_key=key, **kwargs
+            )
+
+        assert self._run(create("key", lookup=lookup)).userid == 56789
+        assert [request.method for request in self.requests] == ["POST", "GET", "POST", "GET"]
+        assert self._run(create("key")).userid == 56789
+        assert len(self.requests) == 4
+
+    @patch("freshbooks.api.async_resources.asyncio.sleep")
+    def test_idempotent_create__failures(self, mock_sleep):
+        error = {"response": {"errors": [{"errno": 1001, "field": "email", "message": "Invalid email"}]}}
+        freshBooksClient = self._idempotent_client({
+            "POST": [(422, error), httpx.ConnectError("Connection refused"), (503, {})],
+        })
+
+        async def sleep(delay):
+            pass
+
+        mock_sleep.side_effect = sleep
+
+        async def create(key):
+            return await freshBooksClient.clients.create(self.account_id, {}, idempotency_key=key)
+
+        with pytest.raises(FreshBooksError) as e:
+            self._run(create("invalid"))
+        assert e.value.status_code == 422
+        with pytest.raises(httpx.ConnectError):
+            self._run(create("refused"))
+        with pytest.raises(FreshBooksError) as e:
+            self._run(create("unavailable"))
+        assert e.value.status_code == 503
+        assert freshBooksClient.idempotency_journal.pending() == ["refused", "unavailable"]
+        with pytest.raises(FreshBooksIdempotencyError):
+            self._run(create("refused"))
+
+    @patch("freshbooks.api.async_resources.asyncio.sleep")
+    def test_idempotent_update(self, mock_sleep):
+        payment = {"payment_options": {"gateway_name": "stripe", "has_credit_card": True}}
+        projects = get_fixture("list_projects_response")
+        freshBooksClient = self._idempotent_client({
+            "PUT": [(503, {}), (200, get_fixture("get_client_response")), (200, get_fixture("get_project_response"))],
+            "POST": [
+                httpx.ReadTimeout("Timed out"), (200, payment), (502, {}),
+                (200, get_fixture("create_project_response"))
+            ],
+            "GET": [(200, dict(projects, projects=[]))],
+        })
+
+        async def sleep(delay):
+            pass
+
+        mock_sleep.side_effect = sleep
+
+        async def run():
+            client = await freshBooksClient.clients.update(self.account_id, 12345, {}, idempotency_key="client")
+            options = await freshBooksClient.invoice_payment_options.create(
+                self.account_id, 12345, {"gateway_name": "stripe"}, idempotency_key="payment"
+            )
+            project = await freshBooksClient.projects.update(self.business_id, 654321, {}, idempotency_key="project")
+            created = await freshBooksClient.projects.create(
+                self.business_id, {"title": "A project"}, idempotency_key="new",
+                lookup=[FilterBuilder().equals("title", "A project")]
+            )
+            return client, options, project, created
+
+        client, options, project, created = self._run(run())
+
+        assert client.userid == 12345
+        assert options.gateway_name == "stripe"
+        assert project.id == 654321
+        assert created.id == 12345
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [0.3, 0.3, 0.3]
+
+    def test_retry__retry_after(self):
+        url = "{}/accounting/account/{}/users/clients/12345".format(API_BASE_URL, self.account_id)
+        response = httpx.Response(429, headers={"Retry-After": "2"}, request=httpx.Request("GET", url))
+
+        delay = self.freshBooksClient.clients._retry_delay("GET", 429, response.headers, 1, time.monotonic())
+
+        assert delay == 2
+
+    def test_rate_limiter(self):
+        rate_limiter = RateLimiter(rate=1, capacity=1)
+        freshBooksClient = AsyncClient(client_id="some_client", access_token="some_token", rate_limiter=rate_limiter)
+        freshBooksClient._session = self.freshBooksClient._session
+        url = "{}/accounting/account/{}/users/clients/12345".format(API_BASE_URL, self.account_id)
+        self._register("GET", url, {}, status=429)
+        self._register("GET", url, get_fixture("get_client_response"))
+        delays = []
+
+        async def sleep(delay):
+            delays.append(delay)
+
+        with patch("freshbooks.api.async_resources.asyncio.sleep", side_effect=sleep):
+            client = self._run(freshBooksClient.clients.get(self.account_id, 12345))
+
+        assert client.userid == 12345
+        assert delays[0] == 0
+        assert delays[2] == pytest.approx(RateLimiter.DEFAULT_RETRY_AFTER + 1, abs=0.1)
+        metrics = rate_limiter.metrics()[self.account_id]
+        assert metrics.requests == 2
+        assert metrics.throttled == 1
+
+    def test_concurrency_limiter(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, latency_tolerance=1000)
+        freshBooksClient = AsyncClient(
+            client_id="some_client", access_token="some_token", auto_retry=False, concurrency_limiter=limiter
+        )
+        freshBooksClient._session = self.freshBooksClient._session
+        url = "{}/accounting/account/{}/users/clients/12345".format(API_BASE_URL, self.account_id)
+        self._register("GET", url, get_fixture("get_client_response"))
+
+        async def run():
+            return await asyncio.gather(*(freshBooksClient.clients.get(self.account_id, 12345) for _ in range(5)))
+
+        assert [client.userid for client in self._run(run())] == [12345] * 5
+        metrics = limiter.metrics()
+        assert metrics.in_flight == 0
+        assert metrics.increases == 5
+
+    def test_response_cache(self):
+        cache = ResponseCache()
+        freshBooksClient = AsyncClient(client_id="some_client", access_token="some_token", response_cache=cache)
+        freshBooksClient._session = self.freshBooksClient._session
+        url = "{}/accounting/account/{}/users/clients".format(API_BASE_URL, self.account_id)
+        self._register("GET", f"{url}/12345", get_fixture("get_client_response"))
+        self._register("PUT", f"{url}/12345", get_fixture("get_client_response"))
+
+        async def run():
+            await freshBooksClient.clients.get(self.account_id, 12345)
+            await freshBooksClient.clients.get(self.account_id, 12345)
+            await freshBooksClient.clients.delete(self.account_id, 12345)
+            return await freshBooksClient.clients.get(self.account_id, 12345)
+
+        assert self._run(run()).userid == 12345
+        assert [request.method for request in self.requests] == ["GET", "PUT", "GET"]
+        assert cache.stats().hits == 1
+
+    def test_single_flight(self):
+        single_flight = SingleFlight()
+        freshBooksClient = AsyncClient(client_id="some_client", access_token="some_token", single_flight=single_flight)
+
+        async def slow_handler(request):
+            await asyncio.sleep(0.01)
+            return self._handler(request)
+
+        freshBooksClient._session = httpx.AsyncClient(transport=httpx.MockTransport(slow_handler))
+        url = "{}/accounting/account/{}/users/clients/12345".format(API_BASE_URL, self.account_id)
+        self._register("GET", url, get_fixture("get_client_response"))
+
+        async def run():
+            return await asyncio.gather(*(freshBooksClient.clients.get(self.account_id, 12345) for _ in range(3)))
+
+        assert [client.userid for client in self._run(run())] == [12345] * 3
+        assert len(self.requests) == 1
+        assert single_flight.stats().coalesced == 2
+
+    def test_http_cache(self):
+        now = [1700000000.0]
+        http_cache = HTTPCache(":memory:", validated_ttl=60, clock=lambda: now[0])
+        freshBooksClient = AsyncClient(client_id="some_client", access_token="some_token", http_cache=http_cache)
+
+        def handler(request):
+            self.requests.append(request)
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json=get_fixture("get_client_response"), headers={"ETag": '"v1"'})
+
+        freshBooksClient._session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        async def run():
+            await freshBooksClient.clients.get(self.account_id, 12345)
+            await freshBooksClient.clients.get(self.account_id, 12345)
+            now[0] += 60
+            return await freshBooksClient.clients.get(self.account_id, 12345)
+
+        assert self._run(run()).userid == 12345
+        assert len(self.requests) == 2
+        assert http_cache.stats() == HTTPCacheStats(hits=1, revalidated=1, misses=1, entries=1)
+
+    def test_no_retry(self):
+        url = "{}/accounting/account/{}/users/clients".format(API_BASE_URL, self.account_id)
+        self._register("POST", url, {}, status=503)
+
+        with pytest.raises(FreshBooksError):
+            self._run(self.freshBooksClient.clients.create(self.account_id, {}))
+        assert len(self.requests) == 1
+
+        freshBooksClient = AsyncClient(client_id="some_client", access_token="some_token", auto_retry=False)
+        freshBooksClient._session = self.freshBooksClient._session
+        self._register("GET", f"{url}/1", {}, status=503)
+
+        with pytest.raises(FreshBooksError):
+            self._run(freshBooksClient.clients.get(self.account_id, 1))
+        assert len(self.requests) == 2
@@ -1,5 +1,9 @@
-from datetime import date, datetime
-from freshbooks import PaginateBuilder, FilterBuilder, IncludesBuilder, SortBuilder
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from freshbooks import Client, PaginateBuilder, FilterBuilder, IncludesBuilder, SortBuilder
+from freshbooks.builders.frozen import FrozenBuilder
 
 
 class TestPaginateBuilder:
@@ -142,6 +146,121 @@ class TestFilter:
 
         assert filter.build() == "&updated_since=2020-10-17T13:14:07"
 
+    def test_values_escaped(self):
+        filter = FilterBuilder()
+        filter.equals("invoice_number", "A&B #1").in_list("emails", ["a+b@example.com", "c=d"])
+        filter.date_time("updated_since", datetime(2020, 10, 17, 13, 14, 7, tzinfo=timezone(timedelta(hours=-5))))
+
+        assert filter.build() == (
+            "&search[invoice_number]=A%26B%20%231&search[emails][]=a%2Bb@example.com&search[emails][]=c%3Dd"
+            "&updated_since=2020-10-17T13:14:07-05:00"
+        )
+        assert FilterBuilder().equals("title", "Café").build("ProjectsResource") == "&title=Caf%C3%A9"
+
+    def test_build_remembered_until_changed(self):
+        filter = FilterBuilder()
+        userids = [1, 2]
+        filter.in_list("userids", userids)
+
+        built = filter.build("AccountingResource")
+        assert filter.build() is built
+        assert filter.build("ProjectsResource") == "&search[userids][]=1&search[userids][]=2"
+
+        userids.append(3)
+        assert filter.build() is built
+
+        filter.equals("vis_state", 0)
+        assert filter.build() == "&search[userids][]=1&search[userids][]=2&search[vis_state]=0"
+        assert filter.build("ProjectsResource") == "&search[userids][]=1&search[userids][]=2&vis_state=0"
+
+    def test_build__linear(self):
+        filter = FilterBuilder().in_list("userids", list(range(10000)))
+
+        query_string = filter.build()
+
+        assert query_string.count("&") == 10000
+        assert query_string.endswith("&search[userids][]=9999")
+
+    def test_split__short_enough(self):
+        filter = FilterBuilder().in_list("userids", [1, 2])
+
+        assert filter.split(100) == [filter]
+
+    def test_split(self):
+        filter = FilterBuilder().equals("vis_state", 0).in_list("userids", list(range(1000, 1010)))
+
+        builders = filter.split(140)
+
+        assert [builder.build() for builder in builders] == [
+            "&search[vis_state]=0&search[userids][]=1000&search[userids][]=1001&search[userids][]=1002",
+            "&search[vis_state]=0&search[userids][]=1003&search[userids][]=1004&search[userids][]=1005",
+            "&search[vis_state]=0&search[userids][]=1006&search[userids][]=1007&search[userids][]=1008",
+            "&search[vis_state]=0&search[userids][]=1009",
+        ]
+        assert all(len(builder.build().replace("[", "%5B").replace("]", "%5D")) <= 140 for builder in builders)
+        assert filter.split(140, "ProjectsResource")[0].build("ProjectsResource") == (
+            "&vis_state=0&search[userids][]=1000&search[userids][]=1001&search[userids][]=1002&search[userids][]=1003"
+        )
+
+    def test_split__several_lists(self):
+        filter = FilterBuilder().in_list("userids", list(range(100, 140))).in_list("clientids", list(range(100, 140)))
+
+        builders = filter.split(500)
+
+        assert all(len(builder.build()) <= 500 for builder in builders)
+        assert sorted(
+            (userid, clientid)
+            for builder in builders
+            for userid in builder._filters[0][2]
+            for clientid in builder._filters[1][2]
+        ) == [(userid, clientid) for userid in range(100, 140) for clientid in range(100, 140)]
+
+    def test_split__not_splittable(self):
+        with pytest.raises(ValueError):
+            FilterBuilder().equals("organization", "A" * 100).in_list("userids", [1, 2]).split(100)
+        with pytest.raises(ValueError):
+            FilterBuilder().in_list("userids", [1]).split(10)
+
+    def test_partition__dates(self):
+        filter = FilterBuilder().equals("vis_state", 0)
+
+        partitions = filter.partition("date", date(2020, 1, 1), "2020-01-10", 3)
+
+        assert [partition.build() for partition in partitions] == [
+            "&search[vis_state]=0&search[date_min]=2020-01-01&search[date_max]=2020-01-03",
+            "&search[vis_state]=0&search[date_min]=2020-01-04&search[date_max]=2020-01-06",
+            "&search[vis_state]=0&search[date_min]=2020-01-07&search[date_max]=2020-01-10",
+        ]
+        assert filter.build() == "&search[vis_state]=0"
+        assert len(filter.partition("date", datetime(2020, 1, 1, 12), date(2020, 1, 2), 5)) == 2
+        assert filter.partition("date", "2020-01-01", "2020-01-01", 5)[0].build() == (
+            "&search[vis_state]=0&search[date_min]=2020-01-01&search[date_max]=2020-01-01"
+        )
+
+    def test_partition__date_times(self):
+        partitions = FilterBuilder().partition(
+            "started_from", date(2020, 1, 1), "2020-01-01T00:00:03", 2, until_field="started_to"
+        )
+
+        assert [partition.build() for partition in partitions] == [
+            "&started_from=2020-01-01T00:00:00&started_to=2020-01-01T00:00:01",
+            "&started_from=2020-01-01T00:00:01&started_to=2020-01-01T00:00:03",
+        ]
+        start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        partitions = FilterBuilder().partition("updated_since", start, start + timedelta(seconds=2), 4, "updated_to")
+        assert [partition.build() for partition in partitions] == [
+            "&updated_since=2020-01-01T00:00:00%2B00:00&updated_to=2020-01-01T00:00:01%2B00:00",
+            "&updated_since=2020-01-01T00:00:01%2B00:00&updated_to=2020-01-01T00:00:02%2B00:00",
+        ]
+
+    def test_partition__empty(self):
+        with pytest.raises(ValueError):
+            FilterBuilder().partition("date", "2020-01-02", "2020-01-01", 2)
+        with pytest.raises(ValueError):
+            FilterBuilder().partition("date", "2020-01-01", "2020-01-02", 0)
+        with pytest.raises(ValueError):
+            FilterBuilder().partition("started_from", "2020-01-01", "2020-01-01", 2, until_field="started_to")
+
 
 class TestInclude:
 
@@ -158,6 +277,15 @@ class TestInclude:
 
         assert includes.build("ProjectResource") == "&include_overdue_fees=true"
 
+    def test_include__remembered_until_changed(self):
+        includes = IncludesBuilder().include("lines")
+        built = includes.build()
+
+        assert includes.build("AccountingResource") is built
+        includes.include("late reminders")
+        assert includes.build() == "&include[]=lines&include[]=late%20reminders"
+        assert includes.build("ProjectResource") == "&lines=true&late%20reminders=true"
+
 
 class TestSort:
 
@@ -217,3 +345,39 @@ class TestSort:
         sort = SortBuilder()
 
         assert sort.build() == ""
+
+    def test_sort__escaped(self):
+        assert SortBuilder().asc("date&x").build() == "&sort=date%26x_asc"
+
+
+class TestFrozen:
+
+    def test_freeze(self):
+        filter = FilterBuilder().equals("vis_state", 0)
+        frozen = filter.freeze()
+
+        filter.equals("userid", 1)
+
+        assert isinstance(frozen, FrozenBuilder)
+        assert frozen.build() == "&search[vis_state]=0"
+        assert frozen.build("AccountingResource") is frozen.build("AccountingResource")
+        assert frozen.build("ProjectsResource") == "&vis_state=0"
+        assert frozen.freeze() is frozen
+        assert str(frozen) == "FrozenBuilder(FilterBuilder(&search[vis_state]=0))"
+        assert not hasattr(frozen, "__dict__")
+        with pytest.raises(AttributeError):
+            frozen.other = 1
+
+    def test_freeze__paginator(self):
+        with pytest.raises(ValueError):
+            PaginateBuilder(1, 10).freeze()
+
+    def test_query_string(self):
+        clients = Client(client_id="some_client", access_token="some_token").clients
+        includes = IncludesBuilder().include("lines").freeze()
+
+        assert clients._build_query_string([FilterBuilder().equals("userid", 1), includes]) == (
+            "?search[userid]=1&include[]=lines"
+        )
+        assert clients._build_query_string([FilterBuilder()]) == ""
+        assert clients._build_query_string(None) == ""
@@ -0,0 +1,135 @@
+from decimal import Decimal
+from types import SimpleNamespace
+
+from freshbooks.cache import CachedResponse, CacheStats, ResponseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def response(content=b'{"id": 1}', status_code=200):
+    return SimpleNamespace(status_code=status_code, content=content, headers={"Content-Type": "application/json"})
+
+
+class TestResponseCache:
+    def setup_method(self, method):
+        self.clock = FakeClock()
+        self.cache = ResponseCache(ttl=10, ttls={"taxes": 100, "invoices": 0}, clock=self.clock)
+
+    def test_cached_response(self):
+        cached = CachedResponse.from_response(response(b'{"amount": 1.50}'))
+
+        assert cached.status_code == 200
+        assert cached.text == '{"amount": 1.50}'
+        assert cached.json(parse_float=Decimal) == {"amount": Decimal("1.50")}
+        assert cached.headers == {"Content-Type": "application/json"}
+
+    def test_key(self):
+        key = ResponseCache.key("https://api.freshbooks.com/a", "some_token", "2023-02-20")
+
+        assert key == ResponseCache.key("https://api.freshbooks.com/a", "some_token", "2023-02-20")
+        assert key != ResponseCache.key("https://api.freshbooks.com/a", "other_token", "2023-02-20")
+        assert key != ResponseCache.key("https://api.freshbooks.com/a", "some_token")
+        assert key != ResponseCache.key("https://api.freshbooks.com/b", "some_token", "2023-02-20")
+        assert "some_token" not in key
+
+    def test_get_set(self):
+        key = ResponseCache.key("url", "token")
+
+        assert self.cache.get(key) is None
+        self.cache.set(key, response(), "clients", "ACM123")
+
+        assert self.cache.get(key).json() == {"id": 1}
+        assert self.cache.stats() == CacheStats(hits=1, misses=1, evictions=0, invalidations=0, entries=1, bytes=9)
+
+    def test_set_replaces(self):
+        key = ResponseCache.key("url", "token")
+        self.cache.set(key, response(), "clients", "ACM123")
+
+        self.cache.set(key, response(b'{"id": 22}'), "clients", "ACM123")
+
+        assert self.cache.get(key).json() == {"id": 22}
+        assert self.cache.stats().bytes == 10
+
+    def test_unsuccessful_not_cached(self):
+        key = ResponseCache.key("url", "token")
+
+        self.cache.set(key, response(status_code=404), "clients", "ACM123")
+
+        assert self.cache.get(key) is None
+
+    def test_ttl(self):
+        key = ResponseCache.key("url", "token")
+        self.cache.set(key, response(), "clients", "ACM123")
+
+        self.clock.now += 9.9
+        assert self.cache.get(key) is not None
+        self.clock.now += 0.1
+        assert self.cache.get(key) is None
+        assert self.cache.stats().entries == 0
+
+    def test_per_resource_ttl(self):
+        taxes_key = ResponseCache.key("taxes", "token")
+        invoices_key = ResponseCache.key("invoices", "token")
+        self.cache.set(taxes_key, response(), "taxes", "ACM123")
+        self.cache.set(invoices_key, response(), "invoices", "ACM123")
+
+        self.clock.now += 99
+
+        assert self.cache.get(taxes_key) is not None
+        assert self.cache.get(invoices_key) is None
+        assert self.cache.ttl_for("items") == 10
+
+    def test_lru_eviction_by_entries(self):
+        cache = ResponseCache(max_entries=2, clock=self.clock)
+        keys = [ResponseCache.key(f"url{index}", "token") for index in range(3)]
+        cache.set(keys[0], response(), "clients", "ACM123")
+        cache.set(keys[1], response(), "clients", "ACM123")
+        cache.get(keys[0])
+
+        cache.set(keys[2], response(), "clients", "ACM123")
+
+        assert cache.get(keys[0]) is not None
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[2]) is not None
+        assert cache.stats().evictions == 1
+
+    def test_lru_eviction_by_bytes(self):
+        cache = ResponseCache(max_bytes=20, clock=self.clock)
+        keys = [ResponseCache.key(f"url{index}", "token") for index in range(3)]
+        for key in keys:
+            cache.set(key, response(), "clients", "ACM123")
+
+        assert cache.get(keys[0]) is None
+        assert cache.stats().bytes == 18
+
+        cache.set(ResponseCache.key("big", "token"), response(b"x" * 21), "clients", "ACM123")
+
+        assert cache.stats().entries == 2
+
+    def test_invalidate(self):
+        keys = [ResponseCache.key(f"url{index}", "token") for index in range(4)]
+        self.cache.set(keys[0], response(), "clients", "ACM123")
+        self.cache.set(keys[1], response(), "clients", "ACM123")
+        self.cache.set(keys[2], response(), "clients", "OTHER")
+        self.cache.set(keys[3], response(), "taxes", "ACM123")
+
+        self.cache.invalidate("clients", "ACM123")
+        self.cache.invalidate("items", "ACM123")
+
+        assert [self.cache.get(key) is not None for key in keys] == [False, False, True, True]
+        assert self.cache.stats().invalidations == 2
+
+    def test_clear(self):
+        self.cache.set(ResponseCache.key("url", "token"), response(), "clients", "ACM123")
+
+        self.cache.clear()
+
+        assert self.cache.stats().entries == 0
+        assert self.cache.stats().bytes == 0
+        assert self.cache.get(ResponseCache.key("url", "token")) is None
@@ -1,11 +1,15 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 import json
+import threading
+import time
 from unittest.mock import patch
 import httpretty
 import pytest
+import requests
 
 from freshbooks import Client as FreshBooksClient
-from freshbooks import FreshBooksError
+from freshbooks import FreshBooksError, PaginateBuilder
 from freshbooks.api.accounting import AccountingResource
 from freshbooks.api.accounting_business import AccountingBusinessResource
 from freshbooks.api.comments import CommentsResource, CommentsSubResource
@@ -14,6 +18,11 @@ from freshbooks.api.resource import HttpVerbs
 from freshbooks.api.timetracking import TimetrackingResource
 from freshbooks.client import API_BASE_URL
 from freshbooks.errors import FreshBooksNotImplementedError, FreshBooksClientConfigError
+from freshbooks.http_cache import HTTPCache
+from freshbooks.cache import ResponseCache
+from freshbooks.concurrency import AdaptiveConcurrencyLimiter
+from freshbooks.ratelimit import RateLimiter
+from freshbooks.singleflight import SingleFlight
 from tests import get_fixture
 
 
@@ -483,3 +492,397 @@ class TestClientResources:
 
             with pytest.raises(FreshBooksNotImplementedError):
                 resource_.delete(business_id, resource_id)
+
+
+class TestClientSession:
+    def setup_method(self, method):
+        self.freshBooksClient = FreshBooksClient(client_id="some_client", access_token="some_token")
+
+    def test_resources_share_session(self):
+        session = self.freshBooksClient.clients.session
+
+        assert self.freshBooksClient.invoices.session is session
+        assert self.freshBooksClient.projects.session is session
+        assert self.freshBooksClient.time_entries.session is session
+        assert self.freshBooksClient.ledger_accounts.session is session
+
+    def test_session_pool_configuration(self):
+        freshBooksClient = FreshBooksClient(
+            client_id="some_client", access_token="some_token", pool_connections=4, pool_maxsize=32
+        )
+        adapter = freshBooksClient.clients.session.get_adapter("https://api.freshbooks.com")
+
+        assert adapter._pool_connections == 4
+        assert adapter._pool_maxsize == 32
+        assert adapter.max_retries.total == 0
+        assert freshBooksClient.clients.retry_policy.attempts == 3
+
+    def test_session_no_retry(self):
+        freshBooksClient = FreshBooksClient(client_id="some_client", access_token="some_token", auto_retry=False)
+        adapter = freshBooksClient.clients.session.get_adapter("https://api.freshbooks.com")
+
+        assert adapter.max_retries.total == 0
+        assert freshBooksClient.clients.retry_policy is None
+
+    def test_close(self):
+        with self.freshBooksClient as freshBooksClient:
+            session = freshBooksClient.clients.session
+
+        assert freshBooksClient._session is None
+        assert freshBooksClient.clients.session is not session
+        freshBooksClient.close()
+        freshBooksClient.close()
+
+    @httpretty.activate
+    def test_exhausted_retries_do_not_modify_session(self):
+        url = "{}/accounting/account/ACM123/users/clients/12345".format(API_BASE_URL)
+        httpretty.register_uri(httpretty.GET, url, body=json.dumps({}), status=503)
+        session = self.freshBooksClient.clients.session
+        adapter = session.get_adapter(url)
+
+        with patch("freshbooks.api.resource.time.sleep") as mock_sleep:
+            with pytest.raises(FreshBooksError):
+                self.freshBooksClient.clients.get("ACM123", 12345)
+
+        assert len(httpretty.latest_requests()) == 4
+        assert mock_sleep.call_count == 3
+        assert session.get_adapter(url) is adapter
+        assert adapter.max_retries.total == 0
+
+
+class TestClientResourceCache:
+    def setup_method(self, method):
+        self.freshBooksClient = FreshBooksClient(client_id="some_client", access_token="some_token")
+
+    def test_resources_are_cached(self):
+        invoices = self.freshBooksClient.invoices
+
+        assert self.freshBooksClient.invoices is invoices
+        assert self.freshBooksClient.clients is not invoices
+        assert self.freshBooksClient.clients is self.freshBooksClient.clients
+
+    @pytest.mark.parametrize(
+        "attribute, value",
+        [
+            ("access_token", "new_token"),
+            ("timeout", 5),
+            ("api_version", "2023-02-20"),
+        ]
+    )
+    def test_resources_invalidated_on_config_change(self, attribute, value):
+        invoices = self.freshBooksClient.invoices
+
+        setattr(self.freshBooksClient, attribute, value)
+
+        assert self.freshBooksClient.invoices is not invoices
+        assert getattr(self.freshBooksClient.invoices, attribute) == value
+        assert self.freshBooksClient.invoices.session is invoices.session
+
+    @httpretty.activate
+    def test_resources_invalidated_on_token_refresh(self):
+        freshBooksClient = FreshBooksClient(
+            client_id="some_client", client_secret="some_secret", redirect_uri="https://example.com",
+            access_token="an_old_token", refresh_token="an_old_refresh_token"
+        )
+        httpretty.register_uri(
+            httpretty.POST,
+            "{}/auth/oauth/token".format(API_BASE_URL),
+            body=json.dumps(get_fixture("auth_token_response")),
+            status=200
+        )
+        assert freshBooksClient.clients.access_token == "an_old_token"
+
+        freshBooksClient.refresh_access_token()
+
+        assert freshBooksClient.clients.access_token == "my_access_token"
+
+    def test_resources_invalidated_on_close(self):
+        invoices = self.freshBooksClient.invoices
+
+        self.freshBooksClient.close()
+
+        assert self.freshBooksClient.invoices is not invoices
+
+
+class TestClientRateLimiter:
+    def setup_method(self, method):
+        self.rate_limiter = RateLimiter(rate=1, capacity=2)
+        self.freshBooksClient = FreshBooksClient(
+            client_id="some_client", access_token="some_token", auto_retry=False, rate_limiter=self.rate_limiter
+        )
+
+    def test_resources_share_rate_limiter(self):
+        assert self.freshBooksClient.clients.rate_limiter is self.rate_limiter
+        assert self.freshBooksClient.projects.rate_limiter is self.rate_limiter
+        assert FreshBooksClient(client_id="some_client", access_token="some_token").clients.rate_limiter is None
+
+    @httpretty.activate
+    def test_calls_paced_by_account(self):
+        url = "{}/accounting/account/ACM123/users/clients/12345".format(API_BASE_URL)
+        httpretty.register_uri(httpretty.GET, url, body=json.dumps(get_fixture("get_client_response")), status=200)
+        httpretty.register_uri(
+            httpretty.GET,
+            "{}/projects/business/98765/project/654321".format(API_BASE_URL),
+            body=json.dumps(get_fixture("get_project_response")),
+            status=200
+        )
+
+        with patch.object(self.rate_limiter, "_sleep") as mock_sleep:
+            for _ in range(3):
+                self.freshBooksClient.clients.get("ACM123", 12345)
+            self.freshBooksClient.projects.get(98765, 654321)
+
+        assert mock_sleep.call_count == 1
+        assert mock_sleep.call_args.args[0] == pytest.approx(1, abs=0.1)
+        metrics = self.rate_limiter.metrics()
+        assert metrics["ACM123"].requests == 3
+        assert metrics["98765"].requests == 1
+
+    @httpretty.activate
+    def test_429_pauses_account(self):
+        url = "{}/accounting/account/ACM123/users/clients/12345".format(API_BASE_URL)
+        httpretty.register_uri(
+            httpretty.GET, url, body=json.dumps({}), status=429, adding_headers={"Retry-After": "30"}
+        )
+
+        with pytest.raises(FreshBooksError):
+            self.freshBooksClient.clients.get("ACM123", 12345)
+
+        metrics = self.rate_limiter.metrics()["ACM123"]
+        assert metrics.throttled == 1
+        assert metrics.paused_for == pytest.approx(30, abs=1)
+
+
+class TestClientConcurrencyLimiter:
+    def setup_method(self, method):
+        self.limiter = AdaptiveConcurrencyLimiter(initial_limit=4)
+        self.freshBooksClient = FreshBooksClient(
+            client_id="some_client", access_token="some_token", auto_retry=False, concurrency_limiter=self.limiter
+        )
+
+    @httpretty.activate
+    def test_calls_adjust_limit(self):
+        url = "{}/accounting/account/ACM123/users/clients/12345".format(API_BASE_URL)
+        httpretty.register_uri(httpretty.GET, url, body=json.dumps(get_fixture("get_client_response")), status=200)
+
+        self.freshBooksClient.clients.get("ACM123", 12345)
+
+        metrics = self.limiter.metrics()
+        assert metrics.in_flight == 0
+        assert metrics.increases == 1
+
+        httpretty.register_uri(httpretty.GET, url, body=json.dumps({}), status=503)
+
+        with pytest.raises(FreshBooksError):
+            self.freshBooksClient.clients.get("ACM123", 12345)
+
+        assert self.limiter.limit == 2
+
+    def test_connection_error_releases(self):
+        with patch.object(self.freshBooksClient.clients.session, "get", side_effect=requests.ConnectionError):
+            with pytest.raises(requests.ConnectionError):
+                self.freshBooksClient.clients.get("ACM123", 12345)
+
+        metrics = self.limiter.metrics()
+        assert metrics.in_flight == 0
+        assert metrics.decreases == 1
+
+
+class TestClientResponseCache:
+    def setup_method(self, method):
+        self.cache = ResponseCache(ttls={"invoices": 0})
+        self.freshBooksClient = FreshBooksClient(
+            client_id="some_client", access_token="some_token", response_cache=self.cache
+        )
+        self.url = "{}/accounting/account/ACM123/users/clients".format(API_BASE_URL)
+
+    @httpretty.activate
+    def test_get_and_list_cached(self):
+        httpretty.register_uri(
+            httpretty.GET, f"{self.url}/12345", body=json.dumps(get_fixture("get_client_response")), status=200
+        )
+        httpretty.register_uri(
+            httpretty.GET, self.url, body=json.dumps(get_fixture("list_clients_response")), status=200
+        )
+
+        client = self.freshBooksClient.clients.get("ACM123", 12345)
+        client.data["organization"] = "Modified"
+
+        assert self.freshBooksClient.clients.get("ACM123", 12345).organization == "American Cyanamid"
+        assert len(self.freshBooksClient.clients.list("ACM123")) == 3
+        assert len(self.freshBooksClient.clients.list("ACM123")) == 3
+        assert len(self.freshBooksClient.clients.list("ACM123", builders=[PaginateBuilder(2)])) == 3
+        assert len(httpretty.latest_requests()) == 3
+        assert self.cache.stats().hits == 2
+        assert self.cache.stats().misses == 3
+
+    @httpretty.activate
+    def test_cache_per_token(self):
+        httpretty.register_uri(
+            httpretty.GET, f"{self.url}/12345", body=json.dumps(get_fixture("get_client_response")), status=200
+        )
+
+        self.freshBooksClient.clients.get("ACM123", 12345)
+        self.freshBooksClient.access_token = "other_token"
+        self.freshBooksClient.clients.get("ACM123", 12345)
+        other_client = FreshBooksClient(client_id="some_client", access_token="some_token", response_cache=self.cache)
+        other_client.clients.get("ACM123", 12345)
+
+        assert len(httpretty.latest_requests()) == 2
+
+    @httpretty.activate
+    def test_resource_ttl_disabled(self):
+        url = "{}/accounting/account/ACM123/invoices/invoices/987654".format(API_BASE_URL)
+        httpretty.register_uri(
+            httpretty.GET, url, body=json.dumps({"response": {"result": {"invoice": {"id": 987654}}}}), status=200
+        )
+
+        self.freshBooksClient.invoices.get("ACM123", 987654)
+        self.freshBooksClient.invoices.get("ACM123", 987654)
+
+        assert len(httpretty.latest_requests()) == 2
+
+    @httpretty.activate
+    def test_errors_not_cached(self):
+        httpretty.register_uri(
+            httpretty.GET, f"{self.url}/12345", body=json.dumps(get_fixture("get_client_response__not_found")),
+            status=404
+        )
+
+        for _ in range(2):
+            with pytest.raises(FreshBooksError):
+                self.freshBooksClient.clients.get("ACM123", 12345)
+
+        assert len(httpretty.latest_requests()) == 2
+
+    @httpretty.activate
+    def test_invalidated_on_write(self):
+        httpretty.register_uri(
+            httpretty.GET, f"{self.url}/12345", body=json.dumps(get_fixture("get_client_response")), status=200
+        )
+        httpretty.register_uri(
+            httpretty.PUT, f"{self.url}/12345", body=json.dumps(get_fixture("get_client_response")), status=200
+        )
+        self.freshBooksClient.clients.get("ACM123", 12345)
+
+        self.freshBooksClient.clients.update("ACM123", 12345, {"organization": "New Org"})
+        self.freshBooksClient.clients.get("ACM123", 12345)
+
+        assert [request.method for request in httpretty.latest_requests()].count("GET") == 2
+        assert self.cache.stats().invalidations == 1
+
+    def test_resources_without_name_not_cached(self):
+        config = self.freshBooksClient._client_resource_config()
+
+        resource = AccountingResource(config, "users/clients", "client", "clients")
+
+        assert resource._cached_response("url", HttpVerbs.GET) is None
+        resource._update_cache("url", HttpVerbs.GET, None)
+        assert self.cache.stats().entries == 0
+
+
+class TestClientSingleFlight:
+    def setup_method(self, method):
+        self.single_flight = SingleFlight()
+        self.freshBooksClient = FreshBooksClient(
+            client_id="some_client", access_token="some_token", single_flight=self.single_flight
+        )
+
+    @httpretty.activate
+    def test_concurrent_gets_coalesced(self):
+        url = "{}/accounting/account/ACM123/users/clients/12345".format(API_BASE_URL)
+        release = threading.Event()
+
+        def callback(request, uri, response_headers):
+            release.wait(2)
+            return [200, response_headers, json.dumps(get_fixture("get_client_response"))]
+
+        httpretty.register_uri(httpretty.GET, url, body=callback)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(self.freshBooksClient.clients.get, "ACM123", 12345) for _ in range(4)]
+            deadline = time.monotonic() + 2
+            while self.single_flight.stats().coalesced < 3 and time.monotonic() < deadline:
+                time.sleep(0.001)
+            release.set()
+            clients = [future.result() for future in futures]
+
+        assert [client.userid for client in clients] == [12345] * 4
+        assert clients[0].data is not clients[1].data
+        assert len(httpretty.latest_requests()) == 1
+        assert self.single_flight.stats().coalesced == 3
+
+    @httpretty.activate
+    def test_writes_not_coalesced(self):
+        url = "{}/accounting/account/ACM123/users/clients".format(API_BASE_URL)
+        httpretty.register_uri(httpretty.POST, url, body=json.dumps(get_fixture("get_client_response")), status=200)
+
+        self.freshBooksClient.clients.create("ACM123", {})
+
+        assert self.single_flight.stats().calls == 0
+
+
+class TestClientHTTPCache:
+    def setup_method(self, method):
+        self.http_cache = HTTPCache(":memory:", ttl=60)
+        self.freshBooksClient = FreshBooksClient(
+            client_id="some_client", access_token="some_token", http_cache=self.http_cache
+        )
+        self.url = "{}/accounting/account/ACM123/users/clients/12345".format(API_BASE_URL)
+
+    @httpretty.activate
+    def test_revalidated_with_etag(self):
+        httpretty.register_uri(
+            httpretty.GET,
+            self.url,
+            responses=[
+                httpretty.Response(
+                    body=json.dumps(get_fixture("get_client_response")), status=200, adding_headers={"ETag": '"v1"'}
+                ),
+                httpretty.Response(body="", status=304),
+            ]
+        )
+
+        self.freshBooksClient.clients.get("ACM123", 12345)
+        client = self.freshBooksClient.clients.get("ACM123", 12345)
+
+        assert client.organization == "American Cyanamid"
+        assert httpretty.last_request().headers["If-None-Match"] == '"v1"'
+        assert self.http_cache.stats().revalidated == 1
+
+    @httpretty.activate
+    def test_ttl_without_validators(self):
+        httpretty.register_uri(
+            httpretty.GET, self.url, body=json.dumps(get_fixture("get_client_response")), status=200
+        )
+
+        self.freshBooksClient.clients.get("ACM123", 12345)
+        client = self.freshBooksClient.clients.get("ACM123", 12345)
+
+        assert client.userid == 12345
+        assert len(httpretty.latest_requests()) == 1
+        assert self.http_cache.stats().hits == 1
+
+    @httpretty.activate
+    def test_invalidated_on_write(self):
+        httpretty.register_uri(
+            httpretty.GET, self.url, body=json.dumps(get_fixture("get_client_response")), status=200
+        )
+        httpretty.register_uri(
+            httpretty.PUT, self.url, body=json.dumps(get_fixture("get_client_response")), status=200
+        )
+        self.freshBooksClient.clients.get("ACM123", 12345)
+
+        self.freshBooksClient.clients.update("ACM123", 12345, {})
+
+        assert self.http_cache.stats().entries == 0
+
+    @httpretty.activate
+    def test_uploads_not_cached(self):
+        url = "{}/uploads/images/some_jwt".format(API_BASE_URL)
+        httpretty.register_uri(httpretty.GET, url, body=b"image", status=200, content_type="image/png")
+
+        response = self.freshBooksClient.images.get("some_jwt")
+
+        assert response.content == b"image"
+        assert self.http_cache.stats().entries == 0
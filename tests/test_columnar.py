@@ -0,0 +1,152 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from freshbooks.columnar import DATE, EASTERN_DATETIME, UTC_DATETIME, columns
+from freshbooks.models import ListResult
+from tests import get_fixture
+
+pandas = pytest.importorskip("pandas")
+pyarrow = pytest.importorskip("pyarrow")
+
+
+def invoices():
+    return ListResult("invoices", "invoice", {"invoices": [
+        {
+            "id": 1,
+            "create_date": "2021-06-28",
+            "updated": "2021-11-07 01:30:00",
+            "amount": {"amount": "100.00", "code": "CAD"},
+        },
+        {
+            "id": 2,
+            "create_date": "0000-00-00",
+            "updated": "2021-06-28 14:05:15",
+            "amount": {"amount": "12.5", "code": "USD"},
+            "lines": [],
+        },
+        {"id": 3, "amount": None, "lines": [], "notes": "Thanks"},
+        {"id": 4, "amount": {"amount": Decimal("1.5"), "code": "CAD"}},
+        {"id": 5, "amount": {"amount": "n/a", "code": "CAD"}},
+    ]}, include_pages=False)
+
+
+class TestColumns:
+
+    def test_columns(self):
+        data, kinds = columns(invoices())
+
+        assert list(data) == ["id", "create_date", "updated", "amount", "amount_code", "lines", "notes"]
+        assert data["amount"] == [Decimal("100.00"), Decimal("12.5"), None, Decimal("1.5"), None]
+        assert data["amount_code"] == ["CAD", "USD", None, "CAD", "CAD"]
+        assert data["lines"] == [None, [], [], None, None]
+        assert data["notes"] == [None, None, "Thanks", None, None]
+        assert kinds == {"create_date": DATE, "updated": EASTERN_DATETIME}
+
+    def test_columns__fields(self):
+        data, _ = columns(invoices(), fields=["updated", "id", "missing"])
+
+        assert list(data) == ["updated", "id", "missing"]
+        assert data["missing"] == [None] * 5
+
+    def test_utc_kinds(self):
+        clients = ListResult("clients", "client", {"clients": [{"signup_date": "2020-10-31 15:25:34"}]})
+        projects = ListResult("projects", "project", {"projects": [{"updated_at": "2020-09-13T03:10:13Z"}]})
+
+        assert columns(clients)[1] == {"signup_date": UTC_DATETIME}
+        assert columns(projects)[1] == {"updated_at": UTC_DATETIME}
+
+    def test_mixed_kinds(self):
+        notes = ListResult("invoices", "invoice", {"invoices": [
+            {"notes": "2024-01-01", "updated": "2024-01-01 10:00:00", "paid": "2024-01-01"},
+            {"notes": "call back friday", "updated": "2024-01-02", "paid": 5},
+        ]})
+
+        _, kinds = columns(notes)
+
+        assert kinds == {}
+        assert notes.to_pandas()["notes"].tolist() == ["2024-01-01", "call back friday"]
+        assert notes.to_arrow(["notes"])["notes"].to_pylist() == ["2024-01-01", "call back friday"]
+
+    def test_same_as_result(self):
+        clients = ListResult("clients", "client", get_fixture("list_clients_response")["response"]["result"])
+
+        frame = clients.to_pandas(["updated", "signup_date"])
+        table = clients.to_arrow(["updated", "signup_date"])
+
+        for index, client in enumerate(clients):
+            assert frame["updated"][index].to_pydatetime() == client.updated
+            assert table["updated"][index].as_py() == client.updated
+            if isinstance(client.signup_date, datetime):
+                assert frame["signup_date"][index].to_pydatetime() == client.signup_date
+                assert table["signup_date"][index].as_py() == client.signup_date
+
+    def test_same_as_result__dst(self):
+        updated = ["2021-03-14 02:30:00", "2021-11-07 01:30:00", "2021-03-14 01:30:00", "2021-03-14 03:00:00"]
+        results = ListResult("invoices", "invoice", {"invoices": [{"updated": value} for value in updated]})
+
+        frame = results.to_pandas()
+        table = results.to_arrow()
+
+        assert [result.updated for result in results][0] == datetime(2021, 3, 14, 7, 30, tzinfo=timezone.utc)
+        for index, result in enumerate(results):
+            assert frame["updated"][index].to_pydatetime() == result.updated
+            assert table["updated"][index].as_py() == result.updated
+
+
+class TestPandas:
+
+    def test_to_pandas(self):
+        frame = invoices().to_pandas()
+
+        assert list(frame["id"]) == [1, 2, 3, 4, 5]
+        assert frame["create_date"][0] == pandas.Timestamp(2021, 6, 28)
+        assert pandas.isna(frame["create_date"][1])
+        assert str(frame["updated"].dtype) == "datetime64[us, UTC]"
+        assert frame["updated"][0].to_pydatetime() == datetime(2021, 11, 7, 5, 30, tzinfo=timezone.utc)
+        assert frame["updated"][1].to_pydatetime() == datetime(2021, 6, 28, 18, 5, 15, tzinfo=timezone.utc)
+        assert list(frame["amount"][:2]) == [Decimal("100.00"), Decimal("12.5")]
+        assert list(frame["amount_code"][:2]) == ["CAD", "USD"]
+
+    def test_to_pandas__utc(self):
+        projects = ListResult("projects", "project", {"projects": [
+            {"id": 1, "updated_at": "2020-09-13T03:10:13Z"}, {"id": 2, "updated_at": "2020-09-13T03:10:13.123"},
+        ]})
+
+        frame = projects.to_pandas()
+
+        assert list(frame["updated_at"]) == [pandas.Timestamp("2020-09-13 03:10:13", tz="UTC")] * 2
+
+    def test_to_records(self):
+        records = invoices().to_records(["id", "amount"])
+
+        assert records.dtype.names == ("id", "amount", "amount_code")
+        assert records[1]["id"] == 2
+        assert records[1]["amount"] == Decimal("12.5")
+
+
+class TestArrow:
+
+    def test_to_arrow(self):
+        table = invoices().to_arrow(["id", "create_date", "updated", "amount"])
+
+        assert table.column_names == ["id", "create_date", "updated", "amount", "amount_code"]
+        assert table.schema.field("create_date").type == pyarrow.date32()
+        assert table.schema.field("updated").type == pyarrow.timestamp("s", tz="UTC")
+        assert pyarrow.types.is_decimal(table.schema.field("amount").type)
+        assert table["create_date"].to_pylist() == [date(2021, 6, 28), None, None, None, None]
+        assert table["updated"].to_pylist()[:3] == [
+            datetime(2021, 11, 7, 5, 30, tzinfo=timezone.utc),
+            datetime(2021, 6, 28, 18, 5, 15, tzinfo=timezone.utc),
+            None,
+        ]
+        assert table["amount"].to_pylist()[:4] == [Decimal("100.00"), Decimal("12.50"), None, Decimal("1.50")]
+        assert table["amount_code"].to_pylist()[:3] == ["CAD", "USD", None]
+
+    def test_to_arrow__utc(self):
+        clients = ListResult("clients", "client", {"clients": [{"signup_date": "2020-10-31 15:25:34"}]})
+
+        table = clients.to_arrow()
+
+        assert table["signup_date"].to_pylist() == [datetime(2020, 10, 31, 15, 25, 34, tzinfo=timezone.utc)]
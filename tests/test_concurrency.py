@@ -0,0 +1,205 @@
+import asyncio
+import threading
+
+import pytest
+
+from freshbooks.concurrency import AdaptiveConcurrencyLimiter, ConcurrencyMetrics
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestAdaptiveConcurrencyLimiter:
+    def setup_method(self, method):
+        self.clock = FakeClock()
+        self.limiter = AdaptiveConcurrencyLimiter(initial_limit=4, min_limit=1, max_limit=8, clock=self.clock)
+
+    def _call(self, status_code=200, latency=0.1):
+        assert self.limiter.try_acquire()
+        self.clock.now += latency
+        self.limiter.release(status_code, latency)
+
+    def test_initial_limit_bounded(self):
+        assert AdaptiveConcurrencyLimiter(initial_limit=100, max_limit=10).limit == 10
+        assert AdaptiveConcurrencyLimiter(initial_limit=0, min_limit=2).limit == 2
+
+    def test_limits_in_flight(self):
+        assert all(self.limiter.try_acquire() for _ in range(4))
+        assert not self.limiter.try_acquire()
+
+        self.limiter.release(200, 0.1)
+
+        assert self.limiter.try_acquire()
+        assert self.limiter.metrics().in_flight == 4
+
+    def test_additive_increase(self):
+        calls = 0
+        while self.limiter.limit == 4:
+            self._call()
+            calls += 1
+
+        assert calls == 5
+        assert self.limiter.limit == 5
+        assert self.limiter.metrics().increases == 5
+
+    def test_increase_capped_at_max(self):
+        for _ in range(200):
+            self._call()
+
+        metrics = self.limiter.metrics()
+        assert metrics.limit == 8
+        assert self.limiter.limit == 8
+
+    def test_no_increase_when_slow(self):
+        self._call(latency=0.1)
+        limit = self.limiter.metrics().limit
+
+        self._call(latency=0.5)
+
+        assert self.limiter.metrics().limit == limit
+
+    def test_min_latency_window(self):
+        self._call(latency=0.01)
+        self._call(latency=0.5)
+        assert self.limiter.metrics().min_latency == 0.01
+
+        self.clock.now += 60
+        self._call(latency=0.5)
+        assert self.limiter.metrics().min_latency == 0.01
+
+        self.clock.now += 60
+        limit = self.limiter.metrics().limit
+        self._call(latency=0.5)
+        assert self.limiter.metrics().min_latency == 0.5
+        assert self.limiter.metrics().limit > limit
+
+        self.clock.now += 150
+        assert self.limiter.metrics().min_latency is None
+
+    @pytest.mark.parametrize("status_code", [429, 500, 503, None])
+    def test_multiplicative_decrease(self, status_code):
+        self._call(status_code=status_code)
+
+        assert self.limiter.limit == 2
+        assert self.limiter.metrics().decreases == 1
+
+    def test_decrease_bounded_by_min(self):
+        for _ in range(10):
+            self._call(status_code=429)
+
+        assert self.limiter.limit == 1
+
+    def test_client_error_does_not_adjust(self):
+        self._call(status_code=404)
+
+        assert self.limiter.metrics() == ConcurrencyMetrics(
+            limit=4, in_flight=0, increases=0, decreases=0, min_latency=None
+        )
+
+    def test_concurrent_failures_decrease_once(self):
+        for _ in range(4):
+            self.limiter.try_acquire()
+        self.clock.now += 1
+
+        for _ in range(4):
+            self.limiter.release(429, 1)
+
+        assert self.limiter.limit == 2
+        assert self.limiter.metrics().decreases == 1
+
+        self._call(status_code=429)
+        assert self.limiter.limit == 1
+
+    def test_acquire_waits_for_release(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+        limiter.acquire()
+        acquired = threading.Event()
+
+        def acquire():
+            limiter.acquire()
+            acquired.set()
+
+        thread = threading.Thread(target=acquire)
+        thread.start()
+        assert not acquired.wait(0.05)
+
+        limiter.release(200, 0.1)
+
+        assert acquired.wait(1)
+        thread.join()
+
+    def test_acquire_async_waits_for_release(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+        limiter.acquire()
+
+        async def run():
+            task = asyncio.ensure_future(limiter.acquire_async())
+            await asyncio.sleep(0.02)
+            assert not task.done()
+            limiter.release(200, 0.1)
+            await asyncio.wait_for(task, 1)
+
+        asyncio.run(run())
+
+        assert limiter.metrics().in_flight == 1
+
+    def test_acquire_async_in_order(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+        limiter.acquire()
+        order = []
+
+        async def acquire(name):
+            await limiter.acquire_async()
+            order.append(name)
+
+        async def run():
+            tasks = [asyncio.ensure_future(acquire(name)) for name in ("first", "second")]
+            await asyncio.sleep(0)
+            assert not limiter.try_acquire()
+            limiter.release(404, 0.1)
+            await asyncio.wait_for(tasks[0], 1)
+            assert not tasks[1].done()
+            limiter.release(404, 0.1)
+            await asyncio.wait_for(tasks[1], 1)
+
+        asyncio.run(run())
+
+        assert order == ["first", "second"]
+        assert limiter.metrics().in_flight == 1
+
+    def test_acquire_async_cancelled(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+        limiter.acquire()
+
+        async def run():
+            waiting = asyncio.ensure_future(limiter.acquire_async())
+            granted = asyncio.ensure_future(limiter.acquire_async())
+            next_ = asyncio.ensure_future(limiter.acquire_async())
+            await asyncio.sleep(0)
+            # Cancelled while waiting
+            waiting.cancel()
+            await asyncio.sleep(0)
+            # Cancelled after being given the slot, before waking
+            limiter.release(404, 0.1)
+            granted.cancel()
+            await asyncio.wait_for(next_, 1)
+            assert waiting.cancelled() and granted.cancelled()
+            # Cancelled after waking with the slot, before resuming
+            last = asyncio.ensure_future(limiter.acquire_async())
+            await asyncio.sleep(0)
+            limiter.release(404, 0.1)
+            await asyncio.sleep(0)
+            last.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await last
+            assert limiter.metrics().in_flight == 0
+            await limiter.acquire_async()
+
+        asyncio.run(run())
+
+        assert limiter.metrics().in_flight == 1
@@ -0,0 +1,38 @@
+from decimal import Decimal
+
+import pytest
+
+from freshbooks.decoders import JSONDecoder, OrjsonDecoder
+from freshbooks.models import Result
+
+orjson = pytest.importorskip("orjson")
+
+PAYLOAD = b'{"invoice": {"id": 1, "amount": {"amount": "100.00", "code": "CAD"}, "rate": 1.50, "notes": "1.50"}}'
+
+
+class TestDecoders:
+
+    def test_json_decoder(self):
+        data = JSONDecoder().decode(PAYLOAD)
+
+        assert data["invoice"]["rate"] == Decimal("1.50")
+        assert str(data["invoice"]["rate"]) == "1.50"
+        with pytest.raises(ValueError):
+            JSONDecoder().decode(b"not json")
+
+    def test_orjson_decoder(self):
+        data = OrjsonDecoder().decode(PAYLOAD)
+
+        assert data == {
+            "invoice": {"id": 1, "amount": {"amount": "100.00", "code": "CAD"}, "rate": 1.5, "notes": "1.50"}
+        }
+        with pytest.raises(ValueError):
+            OrjsonDecoder().decode(b"not json")
+
+    def test_orjson_floats_read_as_decimal(self):
+        invoice = Result("invoice", OrjsonDecoder().decode(PAYLOAD))
+
+        assert invoice.rate == Decimal("1.5")
+        assert isinstance(invoice.data["rate"], float)
+        assert invoice.amount.amount == "100.00"
+        assert Result("tax", {"tax": {"amount": 0.1}}).amount == Decimal("0.1")
@@ -0,0 +1,45 @@
+import json
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from freshbooks.encoders import dumps
+
+
+class TestDumps:
+
+    def test_same_as_json(self):
+        value = {"b": [1, None, True, "x", 2.5], "a": {1: "one"}}
+
+        assert dumps(value) == json.dumps(value)
+        assert dumps(value, sort_keys=True) == json.dumps(value, sort_keys=True)
+        assert dumps({1: Decimal("1.5"), None: True}) == '{"1": 1.5, "null": true}'
+
+    def test_decimals(self):
+        value = {"b": [Decimal("100.00"), 1, None, "x"], "a": {"total": Decimal("12345678901234567.89"), "count": 2.5},
+                 "c": (Decimal("1E+2"),)}
+
+        encoded = dumps(value, sort_keys=True)
+
+        assert encoded == (
+            '{"a": {"count": 2.5, "total": 12345678901234567.89}, "b": [100.00, 1, null, "x"], "c": [1E+2]}'
+        )
+        decoded = json.loads(encoded, parse_float=Decimal)
+        assert str(decoded["a"]["total"]) == "12345678901234567.89"
+        assert str(decoded["b"][0]) == "100.00"
+        assert decoded["c"] == [Decimal("1E+2")]
+
+    def test_default(self):
+        assert dumps({"date": date(2024, 5, 1), "amount": Decimal("1.50")}, default=date.isoformat) == (
+            '{"date": "2024-05-01", "amount": 1.50}'
+        )
+        assert dumps([date(2024, 5, 1)], default=date.isoformat) == '["2024-05-01"]'
+
+    def test_unserializable(self):
+        with pytest.raises(TypeError):
+            dumps({"amount": Decimal("1.50"), "other": object()})
+        with pytest.raises(TypeError):
+            dumps(object())
+        with pytest.raises(ValueError):
+            dumps([Decimal("NaN")])
@@ -0,0 +1,126 @@
+from types import SimpleNamespace
+
+from freshbooks.cache import ResponseCache
+from freshbooks.http_cache import HTTPCache, HTTPCacheStats
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1700000000.0
+
+    def __call__(self):
+        return self.now
+
+
+def response(status_code=200, content=b'{"id": 1}', **headers):
+    return SimpleNamespace(status_code=status_code, content=content, headers=headers)
+
+
+class TestHTTPCache:
+    def setup_method(self, method):
+        self.clock = FakeClock()
+        self.http_cache = HTTPCache(":memory:", ttl=60, clock=self.clock)
+        self.request_key = ResponseCache.key("https://api.freshbooks.com/taxes", "some_token")
+
+    def test_miss(self):
+        lookup = self.http_cache.lookup(self.request_key)
+
+        assert lookup.response is None
+        assert not lookup.fresh
+        assert lookup.conditional_headers() == {}
+
+    def test_ttl_without_validators(self):
+        lookup = self.http_cache.lookup(self.request_key)
+        assert self.http_cache.update(lookup, response(), "taxes", "ACM123").content == b'{"id": 1}'
+
+        lookup = self.http_cache.lookup(self.request_key)
+
+        assert lookup.fresh
+        assert lookup.response.json() == {"id": 1}
+        self.clock.now += 60
+        assert not self.http_cache.lookup(self.request_key).fresh
+        assert self.http_cache.stats() == HTTPCacheStats(hits=1, revalidated=0, misses=1, entries=1)
+
+    def test_no_ttl_without_validators(self):
+        http_cache = HTTPCache(":memory:", ttl=0, clock=self.clock)
+
+        http_cache.update(http_cache.lookup(self.request_key), response(), "taxes", "ACM123")
+
+        assert http_cache.stats().entries == 0
+
+    def test_unsuccessful_not_stored(self):
+        self.http_cache.update(self.http_cache.lookup(self.request_key), response(404), "taxes", "ACM123")
+
+        assert self.http_cache.stats().entries == 0
+
+    def test_revalidate_etag(self):
+        self.http_cache.update(
+            self.http_cache.lookup(self.request_key), response(ETag='"v1"', **{"Content-Type": "application/json"}),
+            "taxes", "ACM123"
+        )
+
+        lookup = self.http_cache.lookup(self.request_key)
+        assert not lookup.fresh
+        assert lookup.conditional_headers() == {"If-None-Match": '"v1"'}
+
+        revalidated = self.http_cache.update(lookup, response(304, b""), "taxes", "ACM123")
+
+        assert revalidated.status_code == 200
+        assert revalidated.json() == {"id": 1}
+        assert revalidated.headers == {"ETag": '"v1"', "Content-Type": "application/json"}
+        assert self.http_cache.stats() == HTTPCacheStats(hits=0, revalidated=1, misses=1, entries=1)
+
+    def test_revalidate_changed(self):
+        self.http_cache.update(self.http_cache.lookup(self.request_key), response(ETag='"v1"'), "taxes", "ACM123")
+        lookup = self.http_cache.lookup(self.request_key)
+
+        changed = self.http_cache.update(lookup, response(content=b'{"id": 2}', ETag='"v2"'), "taxes", "ACM123")
+
+        assert changed.content == b'{"id": 2}'
+        lookup = self.http_cache.lookup(self.request_key)
+        assert lookup.response.json() == {"id": 2}
+        assert lookup.conditional_headers() == {"If-None-Match": '"v2"'}
+
+    def test_revalidate_last_modified(self):
+        last_modified = "Wed, 21 Oct 2015 07:28:00 GMT"
+        http_cache = HTTPCache(":memory:", validated_ttl=30, clock=self.clock)
+        http_cache.update(
+            http_cache.lookup(self.request_key), response(**{"Last-Modified": last_modified}), "taxes", "ACM123"
+        )
+
+        assert http_cache.lookup(self.request_key).fresh
+        self.clock.now += 30
+        lookup = http_cache.lookup(self.request_key)
+        assert lookup.conditional_headers() == {"If-Modified-Since": last_modified}
+
+        http_cache.update(lookup, response(304, b""), "taxes", "ACM123")
+
+        assert http_cache.lookup(self.request_key).fresh
+
+    def test_persists(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite")
+        http_cache = HTTPCache(path, clock=self.clock)
+        http_cache.update(http_cache.lookup(self.request_key), response(ETag='"v1"'), "taxes", "ACM123")
+        http_cache.close()
+
+        lookup = HTTPCache(path, clock=self.clock).lookup(self.request_key)
+
+        assert lookup.response.json() == {"id": 1}
+        assert lookup.etag == '"v1"'
+
+    def test_invalidate(self):
+        other_key = ResponseCache.key("https://api.freshbooks.com/items", "some_token")
+        self.http_cache.update(self.http_cache.lookup(self.request_key), response(), "taxes", "ACM123")
+        self.http_cache.update(self.http_cache.lookup(other_key), response(), "items", "ACM123")
+
+        self.http_cache.invalidate("taxes", "ACM123")
+
+        assert self.http_cache.lookup(self.request_key).response is None
+        assert self.http_cache.lookup(other_key).response is not None
+
+    def test_clear(self):
+        self.http_cache.update(self.http_cache.lookup(self.request_key), response(), "taxes", "ACM123")
+
+        self.http_cache.clear()
+
+        assert self.http_cache.stats().entries == 0
@@ -0,0 +1,371 @@
+import json
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from freshbooks import Client as FreshBooksClient
+from freshbooks import FilterBuilder, FreshBooksError, IdempotencyJournal, ResponseCache, RetryPolicy
+from freshbooks.api.accounting import AccountingResource
+from freshbooks.client import API_BASE_URL
+from freshbooks.errors import FreshBooksClientConfigError, FreshBooksIdempotencyError
+from freshbooks.http_cache import HTTPCache
+from tests import get_fixture
+
+
+def response(body, status=200):
+    res = requests.Response()
+    res.status_code = status
+    res._content = json.dumps(body).encode()
+    return res
+
+
+def list_clients(*clients):
+    data = get_fixture("list_clients_response")
+    data["response"]["result"]["clients"] = list(clients)
+    return data
+
+
+class TestIdempotencyJournal:
+    def test_write__completed(self):
+        journal = IdempotencyJournal()
+
+        with journal.write("key", "POST", "some_url", {"amount": Decimal("1.50")}) as write:
+            assert write.response is None
+            assert not write.resumed
+            assert journal.pending() == ["key"]
+            write.complete({"payment": {"amount": Decimal("1.50")}})
+
+        with journal.write("key", "POST", "some_url", {"amount": Decimal("1.50")}) as write:
+            assert write.response == {"payment": {"amount": Decimal("1.50")}}
+        assert journal.pending() == []
+
+    def test_write__completed_exactly(self, tmp_path):
+        journal = IdempotencyJournal(str(tmp_path / "journal.sqlite"))
+        response = {"invoice": {"amount": Decimal("100.00"), "total": Decimal("12345678901234567.89"), "id": 1}}
+
+        with journal.write("key", "POST", "some_url", {}) as write:
+            write.complete(response)
+        with journal.write("key", "POST", "some_url", {}) as write:
+            recorded = write.response
+
+        assert recorded == response
+        assert str(recorded["invoice"]["amount"]) == "100.00"
+        assert str(recorded["invoice"]["total"]) == "12345678901234567.89"
+
+    def test_write__resumed(self):
+        journal = IdempotencyJournal()
+
+        with pytest.raises(requests.ConnectionError):
+            with journal.write("key", "POST", "some_url", {}):
+                raise requests.ConnectionError
+
+        with journal.write("key", "POST", "some_url", {}) as write:
+            assert write.resumed
+            assert write.response is None
+            write.discard()
+        assert journal.pending() == []
+
+    def test_write__different_write(self):
+        journal = IdempotencyJournal()
+        with journal.write("key", "POST", "some_url", {"amount": 1}):
+            pass
+
+        with pytest.raises(FreshBooksIdempotencyError, match="different write"):
+            with journal.write("key", "POST", "some_url", {"amount": 2}):
+                pass  # pragma: no cover
+
+    def test_write__in_flight(self):
+        journal = IdempotencyJournal()
+
+        with journal.write("key", "POST", "some_url", {}):
+            with pytest.raises(FreshBooksIdempotencyError, match="in use"):
+                with journal.write("key", "POST", "some_url", {}):
+                    pass  # pragma: no cover
+
+    def test_write__claimed_by_another_process(self, tmp_path):
+        path = str(tmp_path / "journal.sqlite")
+        now = [1000.0]
+        first = IdempotencyJournal(path, lease=60, clock=lambda: now[0])
+        second = IdempotencyJournal(path, lease=60, clock=lambda: now[0])
+
+        with first.write("key", "POST", "some_url", {}):
+            with pytest.raises(FreshBooksIdempotencyError, match="in use"):
+                with second.write("key", "POST", "some_url", {}):
+                    pass  # pragma: no cover
+        with second.write("key", "POST", "some_url", {}) as write:
+            assert write.resumed
+            with pytest.raises(FreshBooksIdempotencyError, match="in use"):
+                with first.write("key", "POST", "some_url", {}):
+                    pass  # pragma: no cover
+            write.complete({"client": {"userid": 1}})
+        with first.write("key", "POST", "some_url", {}) as write:
+            assert write.response == {"client": {"userid": 1}}
+
+    def test_write__lease_expired(self, tmp_path):
+        path = str(tmp_path / "journal.sqlite")
+        now = [1000.0]
+        first = IdempotencyJournal(path, lease=60, clock=lambda: now[0])
+        second = IdempotencyJournal(path, lease=60, clock=lambda: now[0])
+
+        with first.write("key", "POST", "some_url", {}):
+            now[0] += 61
+            with second.write("key", "POST", "some_url", {}) as write:
+                assert write.resumed
+                write.complete({})
+        with second.write("key", "POST", "some_url", {}) as write:
+            assert write.response == {}
+
+    def test_persisted(self, tmp_path):
+        path = str(tmp_path / "journal.sqlite")
+        journal = IdempotencyJournal(path)
+        with journal.write("made", "POST", "some_url", {}) as write:
+            write.complete({"client": {"userid": 1}})
+        with journal.write("unknown", "POST", "some_url", {}):
+            pass
+        journal.close()
+
+        journal = IdempotencyJournal(path)
+
+        assert journal.pending() == ["unknown"]
+        with journal.write("made", "POST", "some_url", {}) as write:
+            assert write.response == {"client": {"userid": 1}}
+        journal.close()
+
+    def test_prune(self):
+        now = [1000.0]
+        journal = IdempotencyJournal(clock=lambda: now[0])
+        with journal.write("old", "POST", "some_url", {}) as write:
+            write.complete({})
+        with journal.write("pending", "POST", "some_url", {}):
+            pass
+        now[0] += 100
+        with journal.write("new", "POST", "some_url", {}) as write:
+            write.complete({})
+
+        journal.prune(older_than=50)
+
+        with journal.write("old", "POST", "some_url", {"changed": True}) as write:
+            assert write.response is None
+        with pytest.raises(FreshBooksIdempotencyError):
+            with journal.write("new", "POST", "some_url", {"changed": True}):
+                pass  # pragma: no cover
+        assert "pending" in journal.pending()
+
+    def test_unserializable_data(self):
+        with pytest.raises(TypeError):
+            IdempotencyJournal.digest("POST", "some_url", {"data": object()})
+
+
+class TestIdempotentWrites:
+    def setup_method(self, method):
+        self.account_id = "ACM123"
+        self.journal = IdempotencyJournal()
+        self.freshBooksClient = FreshBooksClient(
+            client_id="some_client", access_token="some_token", idempotency_journal=self.journal,
+            retry_policy=RetryPolicy(jitter=False)
+        )
+        self.lookup = [FilterBuilder().equals("email", "test@example.com")]
+
+    def _create(self, **kwargs):
+        return self.freshBooksClient.clients.create(self.account_id, {"email": "test@example.com"}, **kwargs)
+
+    def _patch(self, method, *side_effect):
+        return patch.object(self.freshBooksClient.clients.session, method, side_effect=list(side_effect))
+
+    def test_no_journal(self):
+        freshBooksClient = FreshBooksClient(client_id="some_client", access_token="some_token")
+
+        with pytest.raises(FreshBooksClientConfigError):
+            freshBooksClient.clients.create(self.account_id, {}, idempotency_key="key")
+
+    def test_create__recorded(self):
+        with self._patch("post", response(get_fixture("create_client_response"))) as mock_post:
+            client = self._create(idempotency_key="key")
+            again = self._create(idempotency_key="key")
+
+        assert client.userid == again.userid == 56789
+        assert mock_post.call_count == 1
+        assert self.journal.pending() == []
+
+    def test_create__timeout_not_made(self):
+        with self._patch("post", requests.ReadTimeout, response(get_fixture("create_client_response"))) as mock_post:
+            with self._patch("get", response(list_clients())) as mock_get:
+                with patch("freshbooks.api.resource.time.sleep") as mock_sleep:
+                    client = self._create(idempotency_key="key", lookup=self.lookup)
+
+        assert client.userid == 56789
+        assert mock_post.call_count == 2
+        assert mock_get.call_count == 1
+        assert "search[email]=test@example.com" in mock_get.call_args.args[0]
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [0.3]
+
+    def test_create__timeout_made(self):
+        created = get_fixture("create_client_response")["response"]["result"]["client"]
+        with self._patch("post", requests.ReadTimeout) as mock_post:
+            with self._patch("get", response(list_clients(created))):
+                with patch("freshbooks.api.resource.time.sleep"):
+                    client = self._create(idempotency_key="key", lookup=self.lookup)
+
+        assert client.userid == 56789
+        assert mock_post.call_count == 1
+        assert self.journal.pending() == []
+
+    def test_create__server_error_without_lookup(self):
+        with self._patch("post", response({}, status=503)) as mock_post:
+            with pytest.raises(FreshBooksError) as e:
+                self._create(idempotency_key="key")
+
+        assert e.value.status_code == 503
+        assert mock_post.call_count == 1
+        assert self.journal.pending() == ["key"]
+
+        with pytest.raises(FreshBooksIdempotencyError, match="can't be looked up"):
+            self._create(idempotency_key="key")
+
+        created = get_fixture("create_client_response")["response"]["result"]["client"]
+        with self._patch("get", response(list_clients(created))):
+            client = self._create(idempotency_key="key", lookup=self.lookup)
+
+        assert client.userid == 56789
+        assert mock_post.call_count == 1
+
+    def test_create__connection_error_exhausted(self):
+        freshBooksClient = FreshBooksClient(
+            client_id="some_client", access_token="some_token", idempotency_journal=self.journal,
+            retry_policy=RetryPolicy(attempts=1)
+        )
+
+        with patch.object(freshBooksClient.clients.session, "post", side_effect=requests.ConnectionError) as mock_post:
+            with patch.object(freshBooksClient.clients.session, "get", return_value=response(list_clients())):
+                with patch("freshbooks.api.resource.time.sleep"):
+                    with pytest.raises(requests.ConnectionError):
+                        freshBooksClient.clients.create(
+                            self.account_id, {"email": "test@example.com"}, idempotency_key="key", lookup=self.lookup
+                        )
+
+        assert mock_post.call_count == 2
+        assert self.journal.pending() == ["key"]
+
+    def test_create__rate_limited(self):
+        with self._patch(
+            "post", response({}, status=429), response(get_fixture("create_client_response"))
+        ) as mock_post:
+            with self._patch("get") as mock_get:
+                with patch("freshbooks.api.resource.time.sleep"):
+                    client = self._create(idempotency_key="key", lookup=self.lookup)
+
+        assert client.userid == 56789
+        assert mock_post.call_count == 2
+        assert mock_get.call_count == 0
+
+    def test_create__validation_error(self):
+        error = {"response": {"errors": [{"errno": 1001, "field": "email", "message": "Invalid email"}]}}
+        with self._patch("post", response(error, status=422)):
+            with pytest.raises(FreshBooksError) as e:
+                self._create(idempotency_key="key", lookup=self.lookup)
+
+        assert e.value.status_code == 422
+        assert self.journal.pending() == []
+
+    def test_create__bad_request(self):
+        error = {"response": {"errors": [{"errno": 1001, "field": "email", "message": "Invalid email"}]}}
+        with self._patch("post", response(error, status=400)) as post:
+            with pytest.raises(FreshBooksError) as e:
+                self._create(idempotency_key="key", lookup=self.lookup)
+
+        assert e.value.status_code == 400
+        assert post.call_count == 1
+        assert self.journal.pending() == []
+
+    def test_create__lookup_ambiguous(self):
+        clients = get_fixture("list_clients_response")
+        with self._patch("post", requests.ReadTimeout):
+            with self._patch("get", response(clients)):
+                with patch("freshbooks.api.resource.time.sleep"):
+                    with pytest.raises(FreshBooksIdempotencyError, match="matched 3"):
+                        self._create(idempotency_key="key", lookup=self.lookup)
+
+    def test_create__invalidates_cache(self):
+        freshBooksClient = FreshBooksClient(
+            client_id="some_client", access_token="some_token", idempotency_journal=self.journal,
+            response_cache=ResponseCache(), http_cache=HTTPCache(":memory:", ttl=60)
+        )
+        created = get_fixture("create_client_response")["response"]["result"]["client"]
+        session = freshBooksClient.clients.session
+        with patch.object(session, "get", side_effect=[response(list_clients()), response(list_clients(created))]):
+            freshBooksClient.clients.list(self.account_id, builders=self.lookup)
+            with patch.object(session, "post", side_effect=requests.ReadTimeout):
+                with patch("freshbooks.api.resource.time.sleep"):
+                    client = freshBooksClient.clients.create(
+                        self.account_id, {"email": "test@example.com"}, idempotency_key="key", lookup=self.lookup
+                    )
+
+        assert client.userid == 56789
+
+    def test_update__retried(self):
+        url = "{}/accounting/account/{}/users/clients/56789".format(API_BASE_URL, self.account_id)
+        with self._patch(
+            "put", response({}, status=503), requests.ConnectionError, response(get_fixture("create_client_response"))
+        ) as mock_put:
+            with patch("freshbooks.api.resource.time.sleep") as mock_sleep:
+                client = self.freshBooksClient.clients.update(
+                    self.account_id, 56789, {"email": "test@example.com"}, idempotency_key="key"
+                )
+
+        assert client.userid == 56789
+        assert mock_put.call_count == 3
+        assert mock_put.call_args.args[0] == url
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [0.3, 0.6]
+
+    def test_payments_create(self):
+        payment = {"payment_options": {"gateway_name": "stripe", "has_credit_card": True}}
+        with patch.object(
+            self.freshBooksClient.invoice_payment_options.session, "post",
+            side_effect=[requests.ReadTimeout, response(payment)]
+        ) as mock_post:
+            with patch("freshbooks.api.resource.time.sleep"):
+                options = self.freshBooksClient.invoice_payment_options.create(
+                    self.account_id, 12345, {"gateway_name": "stripe"}, idempotency_key="key"
+                )
+
+        assert options.gateway_name == "stripe"
+        assert mock_post.call_count == 2
+
+    def test_projects_create(self):
+        business_id = 98765
+        projects = get_fixture("list_projects_response")
+        projects["projects"] = []
+        session = self.freshBooksClient.projects.session
+        with patch.object(
+            session, "post", side_effect=[response({}, status=502), response(get_fixture("create_project_response"))]
+        ) as mock_post:
+            with patch.object(session, "get", return_value=response(projects)):
+                with patch("freshbooks.api.resource.time.sleep"):
+                    project = self.freshBooksClient.projects.create(
+                        business_id, {"title": "Project"}, idempotency_key="key",
+                        lookup=[FilterBuilder().equals("title", "Project")]
+                    )
+
+        assert project.id == 12345
+        assert mock_post.call_count == 2
+
+    def test_create__resource_without_cache_name(self):
+        config = self.freshBooksClient._client_resource_config()
+        clients = AccountingResource(config, "users/clients", "client", "clients")
+        created = get_fixture("create_client_response")["response"]["result"]["client"]
+
+        with patch.object(clients.session, "post", side_effect=requests.ReadTimeout):
+            with patch.object(clients.session, "get", return_value=response(list_clients(created))):
+                with patch("freshbooks.api.resource.time.sleep"):
+                    client = clients.create(self.account_id, {}, idempotency_key="key", lookup=self.lookup)
+
+        assert client.userid == 56789
+
+    def test_projects_update(self):
+        project = response(get_fixture("create_project_response"))
+        with patch.object(self.freshBooksClient.projects.session, "put", return_value=project):
+            project = self.freshBooksClient.projects.update(98765, 12345, {"title": "Project"}, idempotency_key="key")
+
+        assert project.id == 12345
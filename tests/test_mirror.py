@@ -0,0 +1,252 @@
+import asyncio
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import httpretty
+import pytest
+
+from freshbooks import AsyncClient, Client as FreshBooksClient
+from freshbooks import FilterBuilder, FreshBooksError, IncludesBuilder, Mirror, PaginateBuilder, SortBuilder
+from freshbooks.builders.frozen import FrozenBuilder
+from freshbooks.client import API_BASE_URL
+from freshbooks.sync import WatermarkStore
+from freshbooks.typed_models import Invoice
+from tests import get_fixture
+
+
+def _invoice(id, customerid, status, create_date, amount, updated="2020-11-01 10:00:00", **fields):
+    return {
+        "id": id, "invoiceid": id, "customerid": customerid, "v3_status": status, "create_date": create_date,
+        "amount": {"amount": amount, "code": "CAD"}, "updated": updated, "vis_state": 0, **fields
+    }
+
+
+INVOICES = [
+    _invoice(1, 12345, "paid", "2020-09-15", "100.00", organization="American Cyanamid", po_number="1001"),
+    _invoice(2, 12345, "draft", "2020-10-01", "50.50", organization="American Cyanamid"),
+    _invoice(3, 12346, "sent", "2020-10-20", "1200.00", organization="100%_Alien"),
+    _invoice(4, 12457, "paid", "2020-11-05", "20.00", organization="US Air Force"),
+]
+
+
+class TestMirror:
+    def setup_method(self, method):
+        self.account_id = "ACM123"
+        self.freshBooksClient = FreshBooksClient(client_id="some_client", access_token="some_token")
+        self.mirror = Mirror(self.freshBooksClient, batch_size=2)
+
+    def _register_invoices(self, invoices=INVOICES):
+        url = "{}/accounting/account/{}/invoices/invoices".format(API_BASE_URL, self.account_id)
+        body = {"response": {"result": {
+            "invoices": invoices, "page": 1, "pages": 1, "per_page": 100, "total": len(invoices)
+        }}}
+        httpretty.register_uri(httpretty.GET, url, body=json.dumps(body))
+
+    def _ids(self, builders=None):
+        return [invoice.id for invoice in self.mirror.invoices.list(self.account_id, builders=builders)]
+
+    @httpretty.activate
+    def test_refresh(self):
+        self._register_invoices()
+
+        run = self.mirror.refresh("invoices", self.account_id)
+        self._register_invoices([_invoice(2, 12345, "sent", "2020-10-01", "50.50")])
+        second = self.mirror.refresh("invoices", self.account_id, builders=[IncludesBuilder().include("lines")])
+
+        assert (run.synced, second.synced) == (4, 1)
+        assert self.mirror.engine.store.get(self.account_id, "invoices") == second.watermark
+        assert "search[updated_min]" in httpretty.last_request().querystring
+        assert httpretty.last_request().querystring["include[]"] == ["lines"]
+        invoice = self.mirror.get("invoices", self.account_id, 2)
+        assert invoice.v3_status == "sent"
+        assert invoice.amount.amount == "50.50"
+        assert self._ids() == [1, 2, 3, 4]
+
+    @httpretty.activate
+    def test_refresh__persisted(self, tmp_path):
+        self._register_invoices()
+        path = str(tmp_path / "mirror.sqlite")
+        mirror = Mirror(self.freshBooksClient, path)
+        mirror.refresh("invoices", self.account_id)
+        mirror.close()
+
+        reopened = Mirror(self.freshBooksClient, path)
+
+        assert reopened.invoices.get(self.account_id, 3).organization == "100%_Alien"
+        assert reopened.engine.store.get(self.account_id, "invoices") is not None
+
+    @httpretty.activate
+    def test_refresh__projects(self):
+        business_id = 98765
+        url = "{}/timetracking/business/{}/time_entries".format(API_BASE_URL, business_id)
+        httpretty.register_uri(httpretty.GET, url, body=json.dumps(get_fixture("list_time_entries_response")))
+        self.mirror.refresh("time_entries", business_id)
+
+        time_entries = self.mirror.time_entries.list(
+            business_id, builders=[FilterBuilder().date_time("started_since", "2020-10-01T00:00:00Z")]
+        )
+
+        assert time_entries.pages.total == len(time_entries)
+        assert time_entries.pages.page == 1
+
+    @httpretty.activate
+    def test_refresh__no_id(self):
+        self._register_invoices([{"invoiceid": 1}])
+
+        with pytest.raises(ValueError):
+            self.mirror.refresh("invoices", self.account_id)
+
+        assert self.mirror.engine.store.get(self.account_id, "invoices") is None
+
+    def test_refresh_async(self):
+        httpx = pytest.importorskip("httpx")
+        freshBooksClient = AsyncClient(client_id="some_client", access_token="some_token")
+        freshBooksClient._session = httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, content=json.dumps(get_fixture("list_clients_response")))
+        ))
+        mirror = Mirror(freshBooksClient)
+
+        run = asyncio.run(mirror.refresh_async("clients", self.account_id))
+
+        assert run.synced == 3
+        filter = FilterBuilder().like("email_like", "americancyanamid")
+        clients = mirror.clients.list(self.account_id, builders=[filter])
+        assert [client.userid for client in clients] == [12345, 12346]
+
+    @httpretty.activate
+    def test_list__filters(self):
+        self._register_invoices()
+        self.mirror.refresh("invoices", self.account_id)
+
+        assert self._ids([FilterBuilder().equals("customerid", 12345)]) == [1, 2]
+        assert self._ids([FilterBuilder().in_list("customerid", [12346, 12457])]) == [3, 4]
+        assert self._ids([FilterBuilder().in_list("v3_statuses", ["paid", "sent"])]) == [1, 3, 4]
+        assert self._ids([FilterBuilder().boolean("vis_state", False)]) == [1, 2, 3, 4]
+        assert self._ids([FilterBuilder().like("organization", "%_A")]) == [3]
+        assert self._ids([FilterBuilder().like("organization_like", "cyanamid")]) == [1, 2]
+        assert self._ids([FilterBuilder().between("amount", 50, Decimal("100"))]) == [1, 2]
+        assert self._ids([FilterBuilder().between("amount", min=1000)]) == [3]
+        assert self._ids([FilterBuilder().between("create_date_min", min=date(2020, 10, 1))]) == [2, 3, 4]
+        assert self._ids([
+            FilterBuilder().between("create_date_min", min="2020-10-01").between("create_date_max", max="2020-10-31")
+        ]) == [2, 3]
+        assert self._ids([FilterBuilder().between("create_date", "2020-11-05")]) == [4]
+        assert self._ids([FilterBuilder().equals("create_date", date(2020, 10, 20))]) == [3]
+        assert self._ids([FilterBuilder().date_time("updated_since", "2020-11-01 10:00:00")]) == [1, 2, 3, 4]
+        assert self._ids([FilterBuilder().date_time("updated", "2020-11-01 09:00:00")]) == []
+        assert self._ids([FilterBuilder().date_time("updated_since", datetime(2020, 11, 1, 9))]) == [1, 2, 3, 4]
+        assert self._ids([FilterBuilder().date_time("updated_since", datetime(2020, 11, 1, 11))]) == []
+        assert self._ids([
+            FilterBuilder().date_time("updated", datetime(2020, 11, 1, 10, tzinfo=timezone.utc))
+        ]) == [1, 2, 3, 4]
+        assert self._ids([FilterBuilder().in_list("v3_status", ["draft"])]) == [2]
+        assert self._ids([FilterBuilder().equals("customerid", "12345")]) == [1, 2]
+        assert self._ids([FilterBuilder().in_list("customerids", ["12346", 12457])]) == [3, 4]
+        assert self._ids([FilterBuilder().equals("po_number", 1001)]) == [1]
+        assert self._ids([FilterBuilder().equals("po_number", "1001.0")]) == []
+        assert self._ids([
+            FrozenBuilder(FilterBuilder().equals("v3_status", "paid")), FilterBuilder().equals("customerid", 12457)
+        ]) == [4]
+
+    @httpretty.activate
+    def test_list__sort_and_paginate(self):
+        self._register_invoices()
+        self.mirror.refresh("invoices", self.account_id)
+
+        first = self.mirror.list(
+            "invoices", self.account_id, builders=[SortBuilder().descending("create_date"), PaginateBuilder(1, 3)]
+        )
+        second = self.mirror.invoices.list(
+            self.account_id, builders=[SortBuilder().ascending("v3_status"), PaginateBuilder(2, 3), IncludesBuilder()]
+        )
+
+        assert [invoice.id for invoice in first] == [4, 3, 2]
+        assert (first.pages.page, first.pages.pages, first.pages.per_page, first.pages.total) == (1, 2, 3, 4)
+        assert [invoice.id for invoice in second] == [3]
+        assert self._ids([SortBuilder(), PaginateBuilder()]) == [1, 2, 3, 4]
+
+    def test_list__empty(self):
+        invoices = self.mirror.invoices.list(self.account_id)
+
+        assert list(invoices) == []
+        assert (invoices.pages.page, invoices.pages.pages, invoices.pages.total) == (1, 0, 0)
+
+    def test_list__invalid(self):
+        with pytest.raises(ValueError):
+            self.mirror.invoices.list(self.account_id, builders=[FilterBuilder().equals("amount') OR (1", 1)])
+        with pytest.raises(ValueError):
+            self.mirror.invoices.list(self.account_id, builders=[object()])
+
+    @httpretty.activate
+    def test_typed_models(self):
+        self._register_invoices()
+        freshBooksClient = FreshBooksClient(client_id="some_client", access_token="some_token", typed_models=True)
+        mirror = Mirror(freshBooksClient)
+        mirror.refresh("invoices", self.account_id)
+
+        invoice = mirror.invoices.get(self.account_id, 1)
+        invoices = mirror.invoices.list(self.account_id)
+
+        assert isinstance(invoice, Invoice)
+        assert all(isinstance(invoice, Invoice) for invoice in invoices)
+
+    def test_get__not_found(self):
+        with pytest.raises(FreshBooksError) as e:
+            self.mirror.get("invoices", self.account_id, 1)
+
+        assert e.value.status_code == 404
+
+    @httpretty.activate
+    def test_clear(self):
+        self._register_invoices()
+        store = WatermarkStore()
+        mirror = Mirror(self.freshBooksClient, store=store)
+        mirror.refresh("invoices", self.account_id)
+
+        mirror.clear("invoices", self.account_id)
+
+        assert list(mirror.invoices.list(self.account_id)) == []
+        assert store.get(self.account_id, "invoices") is None
+
+    def test_not_a_resource(self):
+        with pytest.raises(AttributeError):
+            self.mirror.nothing
+        with pytest.raises(AttributeError):
+            self.mirror._nothing
+        with pytest.raises(ValueError):
+            self.mirror.list("base_url", self.account_id)
+
+    def test_stored_values(self):
+        self.mirror._store("invoices", self.account_id, [
+            self.freshBooksClient.invoices._result("invoice", {"invoice": {"id": 10}}),
+            self.freshBooksClient.invoices._result("invoice", {"invoice": {
+                "id": 5, "amount": Decimal("10.25"), "updated": datetime(2020, 11, 1, tzinfo=timezone.utc)
+            }}),
+        ])
+
+        invoice = self.mirror.invoices.get(self.account_id, 5)
+
+        assert invoice.amount == Decimal("10.25")
+        assert invoice.updated == datetime(2020, 11, 1, tzinfo=timezone.utc)
+        assert invoice.data["updated"] == "2020-11-01T00:00:00+00:00"
+        assert self._ids() == [5, 10]
+
+    def test_stored_values__exact(self):
+        self.mirror._store("invoices", self.account_id, [
+            self.freshBooksClient.invoices._result("invoice", {"invoice": {
+                "id": 5, "amount": {"amount": Decimal("100.00")}, "total": Decimal("12345678901234567.89")
+            }}),
+        ])
+
+        invoice = self.mirror.invoices.get(self.account_id, 5)
+        invoices = self.mirror.invoices.list(self.account_id)
+
+        assert str(invoice.amount.amount) == "100.00"
+        assert str(invoice.total) == "12345678901234567.89"
+        assert str(invoices[0].total) == "12345678901234567.89"
+        assert self._ids([FilterBuilder().between("amount", 100, 100)]) == [5]
+        with pytest.raises(TypeError):
+            self.mirror._store("invoices", self.account_id, [
+                self.freshBooksClient.invoices._result("invoice", {"invoice": {"id": 6, "total": object()}})
+            ])
@@ -1,6 +1,8 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from unittest.mock import patch
 import pytest
-from freshbooks.models import ListResult, Result
+from freshbooks.models import Identity, ListResult, Result
 from tests import get_fixture
 
 
@@ -28,6 +30,94 @@ class TestListResult:
         assert full_results[5].id == 12457
         assert full_results.pages.page == 2
 
+    def _pages(self, count):
+        pages = []
+        for page in range(1, count + 1):
+            data = get_fixture("list_clients_response")["response"]["result"]
+            data["page"] = page
+            data["pages"] = count
+            pages.append(ListResult("clients", "client", data))
+        return pages
+
+    def test_adding_list_results__does_not_copy(self):
+        page_1, page_2 = self._pages(2)
+
+        full_results = page_1 + page_2
+
+        assert full_results.data["clients"][0] is page_1.data["clients"][0]
+        assert full_results.data["clients"][3] is page_2.data["clients"][0]
+        assert full_results.data["clients"] is not page_1.data["clients"]
+
+    def test_extend(self):
+        page_1, page_2, page_3 = self._pages(3)
+        records = page_1.data["clients"]
+
+        page_1.extend(page_3)
+        page_1 += page_2
+
+        assert len(page_1) == 9
+        assert page_1.data["clients"] is records
+        assert page_1.data["clients"][3] is page_3.data["clients"][0]
+        assert page_1.pages.page == 3
+        assert len(page_2) == 3
+        with pytest.raises(TypeError):
+            page_1 += ListResult("projects", "project", {"projects": []})
+
+    def test_extend__without_pages(self):
+        results = ListResult("clients", "client", {}, include_pages=False)
+
+        results.extend(self._pages(1)[0])
+
+        assert len(results) == 3
+        assert results.pages.page == 1
+
+    def test_merge(self):
+        pages = self._pages(4)
+
+        merged = ListResult.merge(iter(pages))
+
+        assert len(merged) == 12
+        assert [client.id for client in merged][:4] == [12345, 12346, 12457, 12345]
+        assert merged.pages.page == 4
+        assert merged.data["clients"][11] is pages[3].data["clients"][2]
+        assert all(len(page) == 3 for page in pages)
+        assert pages[0].pages.page == 1
+
+    def test_merge__invalid(self):
+        with pytest.raises(ValueError):
+            ListResult.merge([])
+        with pytest.raises(TypeError):
+            ListResult.merge([self._pages(1)[0], ListResult("projects", "project", {"projects": []})])
+
+    def test_iteration_views_list_entries(self):
+        data = get_fixture("list_clients_response")["response"]["result"]
+        clients = ListResult("clients", "client", data)
+
+        assert clients[1].data is data["clients"][1]
+        for client, entry in zip(clients, data["clients"]):
+            assert client.data is entry
+        clients[0].data["organization"] = "Changed"
+        assert data["clients"][0]["organization"] == "Changed"
+        assert str(clients[0]) == "Result(client)"
+
+    def test_nested_iteration(self):
+        clients = ListResult("clients", "client", get_fixture("list_clients_response")["response"]["result"])
+
+        pairs = [(outer.id, inner.id) for outer in clients for inner in clients]
+
+        assert len(pairs) == 9
+        assert pairs[:3] == [(12345, 12345), (12345, 12346), (12345, 12457)]
+        assert [client.id for client in clients] == [12345, 12346, 12457]
+
+    def test_concurrent_iteration(self):
+        data = {"clients": [{"id": index} for index in range(1000)]}
+        clients = ListResult("clients", "client", data, include_pages=False)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            totals = list(executor.map(lambda _: sum(client.id for client in clients), range(8)))
+
+        assert totals == [sum(range(1000))] * 8
+
     def test_adding_list_results__takes_largest_page(self):
         data_1 = get_fixture("list_clients_response")["response"]["result"]
         data_1["page"] = 3
@@ -91,3 +181,42 @@ class TestListResult:
         result = Result(model_name, {model_name: {field_name: value}})
 
         assert getattr(result, field_name) == expected, f"{model_name}.{field_name} should equal {expected}"
+
+
+class TestResult:
+
+    def test_parsed_fields_memoized(self):
+        data = get_fixture("get_client_response")["response"]["result"]
+        client = Result("client", data)
+
+        updated = client.updated
+        with patch("freshbooks.models.datetime") as mock_datetime:
+            assert client.updated is updated
+            assert client.outstanding_balance is client.outstanding_balance
+            assert mock_datetime.fromisoformat.call_count == 0
+
+    def test_replaced_fields_parsed_again(self):
+        client = Result("client", {"client": {"updated": "2021-06-28 14:05:15", "organization": "Old"}})
+        assert client.updated == datetime(2021, 6, 28, 18, 5, 15, tzinfo=timezone.utc)
+        assert client.organization == "Old"
+
+        client.data["updated"] = "2021-06-29 14:05:15"
+        client.data["organization"] = "New"
+
+        assert client.updated == datetime(2021, 6, 29, 18, 5, 15, tzinfo=timezone.utc)
+        assert client.organization == "New"
+
+    def test_nested_results_reflect_changes(self):
+        client = Result("client", {"client": {"amount": {"amount": "1.00", "code": "CAD"}}})
+        amount = client.amount
+
+        client.data["amount"]["code"] = "USD"
+
+        assert client.amount is amount
+        assert client.amount.code == "USD"
+
+    def test_identity_fields_memoized(self):
+        identity = Identity(get_fixture("auth_me_response")["response"])
+
+        assert identity.business_memberships is identity.business_memberships
+        assert identity.identity_id == 12345
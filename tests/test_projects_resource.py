@@ -2,8 +2,9 @@ import json
 from datetime import date, datetime, timezone
 
 import httpretty
+import pytest
 from freshbooks import Client as FreshBooksClient
-from freshbooks import FilterBuilder, FreshBooksError, IncludesBuilder, PaginateBuilder
+from freshbooks import FilterBuilder, FreshBooksError, IncludesBuilder, PaginateBuilder, typed_models
 from freshbooks.client import API_BASE_URL
 
 from tests import get_fixture
@@ -43,6 +44,24 @@ class TestProjectsResources:
             assert service.billable is True
         assert httpretty.last_request().headers["Authorization"] == "Bearer some_token"
 
+    @httpretty.activate
+    def test_get_project__typed_model(self):
+        freshBooksClient = FreshBooksClient(client_id="some_client", access_token="some_token", typed_models=True)
+        url = "{}/projects/business/{}".format(API_BASE_URL, self.business_id)
+        httpretty.register_uri(
+            httpretty.GET, f"{url}/projects", body=json.dumps(get_fixture("list_projects_response")), status=200
+        )
+        httpretty.register_uri(
+            httpretty.GET, f"{url}/project/654321", body=json.dumps(get_fixture("get_project_response")), status=200
+        )
+
+        project = freshBooksClient.projects.get(self.business_id, 654321)
+        projects = freshBooksClient.projects.list(self.business_id)
+
+        assert isinstance(project, typed_models.Project)
+        assert project.updated_at == datetime(2020, 9, 13, 3, 10, 13, tzinfo=timezone.utc)
+        assert all(isinstance(project, typed_models.Project) for project in projects)
+
     @httpretty.activate
     def test_get_project__includes(self):
         project_id = 654321
@@ -162,6 +181,120 @@ class TestProjectsResources:
         expected_params = {"page": ["2"], "per_page": ["1"]}
         assert httpretty.last_request().querystring == expected_params
 
+    @httpretty.activate
+    def test_iter_all_projects(self):
+        url = "{}/projects/business/{}/projects".format(API_BASE_URL, self.business_id)
+        page_1 = get_fixture("list_projects_response")
+        page_1["meta"].update({"page": 1, "pages": 2, "per_page": 2, "total": 3})
+        page_1["projects"] = page_1["projects"][:2]
+        page_2 = get_fixture("list_projects_response")
+        page_2["meta"].update({"page": 2, "pages": 2, "per_page": 2, "total": 3})
+        page_2["projects"] = page_2["projects"][2:]
+        httpretty.register_uri(
+            httpretty.GET,
+            url,
+            responses=[
+                httpretty.Response(body=json.dumps(page_1), status=200),
+                httpretty.Response(body=json.dumps(page_2), status=200),
+            ]
+        )
+
+        projects = list(self.freshBooksClient.projects.iter_all(
+            self.business_id, builders=[PaginateBuilder(per_page=2)]
+        ))
+
+        assert [project.id for project in projects] == [
+            project["id"] for project in get_fixture("list_projects_response")["projects"]
+        ]
+        assert httpretty.latest_requests()[0].querystring == {"page": ["1"], "per_page": ["2"]}
+        assert httpretty.latest_requests()[1].querystring == {"page": ["2"], "per_page": ["2"]}
+
+    @httpretty.activate
+    def test_iter_all_projects__stream(self):
+        url = "{}/projects/business/{}/projects".format(API_BASE_URL, self.business_id)
+        page_1 = get_fixture("list_projects_response")
+        page_1["meta"].update({"page": 1, "pages": 2, "per_page": 2, "total": 3})
+        page_1["projects"] = page_1["projects"][:2]
+        page_2 = get_fixture("list_projects_response")
+        page_2["meta"].update({"page": 2, "pages": 2, "per_page": 2, "total": 3})
+        page_2["projects"] = page_2["projects"][2:]
+        httpretty.register_uri(
+            httpretty.GET,
+            url,
+            responses=[
+                httpretty.Response(body=json.dumps(page_1), status=200),
+                httpretty.Response(body=json.dumps(page_2), status=200),
+            ]
+        )
+
+        projects = list(self.freshBooksClient.projects.iter_all(
+            self.business_id, builders=[PaginateBuilder(per_page=2)], stream=True
+        ))
+
+        assert [project.id for project in projects] == [
+            project["id"] for project in get_fixture("list_projects_response")["projects"]
+        ]
+        assert httpretty.latest_requests()[1].querystring == {"page": ["2"], "per_page": ["2"]}
+
+    @httpretty.activate
+    def test_iter_all_projects__stream_error(self):
+        url = "{}/projects/business/{}/projects".format(API_BASE_URL, self.business_id)
+        httpretty.register_uri(
+            httpretty.GET, url, body=json.dumps({"error": "Requested resource could not be found."}), status=404
+        )
+
+        with pytest.raises(FreshBooksError, match="Requested resource could not be found.") as error:
+            list(self.freshBooksClient.projects.iter_all(self.business_id, stream=True))
+        assert error.value.status_code == 404
+
+    def test_iter_all_projects__stream_prefetch(self):
+        with pytest.raises(ValueError):
+            next(self.freshBooksClient.projects.iter_all(self.business_id, prefetch=2, stream=True))
+
+    @httpretty.activate
+    def test_list_all_projects(self):
+        url = "{}/projects/business/{}/projects".format(API_BASE_URL, self.business_id)
+
+        def page_callback(request, uri, response_headers):
+            page = int(request.querystring["page"][0])
+            response = get_fixture("list_projects_response")
+            response["meta"].update({"page": page, "pages": 3, "per_page": 3, "total": 9})
+            for index, project in enumerate(response["projects"]):
+                project["id"] = page * 100 + index
+            return [200, response_headers, json.dumps(response)]
+
+        httpretty.register_uri(httpretty.GET, url, body=page_callback)
+
+        projects = list(self.freshBooksClient.projects.list_all(self.business_id, max_workers=8))
+
+        assert [project.id for project in projects] == [
+            page * 100 + index for page in range(1, 4) for index in range(3)
+        ]
+        assert len(httpretty.latest_requests()) == 3
+
+    @httpretty.activate
+    def test_iter_all_projects__chunked(self):
+        url = "{}/projects/business/{}/projects".format(API_BASE_URL, self.business_id)
+
+        def chunk_callback(request, uri, response_headers):
+            response = get_fixture("list_projects_response")
+            project = response["projects"][0]
+            response["projects"] = [
+                dict(project, id=int(client_id)) for client_id in request.querystring["search[client_ids][]"]
+            ]
+            response["meta"].update({"page": 1, "pages": 1, "per_page": 100, "total": len(response["projects"])})
+            return [200, response_headers, json.dumps(response)]
+
+        httpretty.register_uri(httpretty.GET, url, body=chunk_callback)
+        self.freshBooksClient.projects.MAX_QUERY_LENGTH = 200
+        filter = FilterBuilder().equals("complete", False).in_list("client_ids", list(range(1, 21)))
+
+        projects = list(self.freshBooksClient.projects.iter_all(self.business_id, builders=[filter], prefetch=2))
+
+        assert [project.id for project in projects] == list(range(1, 21))
+        assert len(httpretty.latest_requests()) > 1
+        assert all(request.querystring["complete"] == ["False"] for request in httpretty.latest_requests())
+
     @httpretty.activate
     def test_list_projects__filtered(self):
         url = "{}/projects/business/{}/projects?page=2&per_page=1".format(API_BASE_URL, self.business_id)
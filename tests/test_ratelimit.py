@@ -0,0 +1,140 @@
+import time
+from email.utils import formatdate
+
+import pytest
+
+from freshbooks.ratelimit import RateLimiter, RateLimitMetrics, rate_limit_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestRateLimiter:
+    def setup_method(self, method):
+        self.clock = FakeClock()
+        self.rate_limiter = RateLimiter(rate=2, capacity=3, clock=self.clock, sleep=self.clock.sleep)
+
+    @pytest.mark.parametrize(
+        "url, key",
+        [
+            ("https://api.freshbooks.com/accounting/account/ACM123/users/clients/1", "ACM123"),
+            ("https://api.freshbooks.com/accounting/account/ACM123/invoices/invoices?page=1", "ACM123"),
+            ("https://api.freshbooks.com/projects/business/98765/projects", "98765"),
+            ("https://api.freshbooks.com/timetracking/business/98765/time_entries?page=2", "98765"),
+            ("https://api.freshbooks.com/accounting/businesses/98765/ledger_accounts/accounts", "98765"),
+            ("https://api.freshbooks.com/auth/api/v1/users/me", ""),
+        ]
+    )
+    def test_rate_limit_key(self, url, key):
+        assert rate_limit_key(url) == key
+
+    def test_defaults(self):
+        rate_limiter = RateLimiter()
+
+        assert rate_limiter.rate == 5
+        assert rate_limiter.capacity == 5
+        assert RateLimiter(rate=0.5).capacity == 1
+
+    def test_burst_then_paced(self):
+        assert [self.rate_limiter.reserve("ACM123") for _ in range(3)] == [0, 0, 0]
+        assert self.rate_limiter.reserve("ACM123") == 0.5
+        assert self.rate_limiter.reserve("ACM123") == 1.0
+
+        self.clock.now += 1.0
+
+        assert self.rate_limiter.reserve("ACM123") == 0.5
+
+    def test_keys_have_separate_buckets(self):
+        for _ in range(3):
+            self.rate_limiter.reserve("ACM123")
+
+        assert self.rate_limiter.reserve("ACM123") == 0.5
+        assert self.rate_limiter.reserve("98765") == 0
+
+    def test_refill_capped_at_capacity(self):
+        for _ in range(3):
+            self.rate_limiter.reserve("ACM123")
+
+        self.clock.now += 60
+
+        assert self.rate_limiter.metrics()["ACM123"].tokens == 3
+
+    def test_acquire_waits(self):
+        for _ in range(3):
+            assert self.rate_limiter.acquire("ACM123") == 0
+
+        assert self.rate_limiter.acquire("ACM123") == 0.5
+        assert self.clock.now == 100.5
+
+    def test_429_pauses_key(self):
+        self.rate_limiter.reserve("ACM123")
+        self.rate_limiter.update("ACM123", 429, {"Retry-After": "10"})
+
+        assert self.rate_limiter.reserve("ACM123") == 10.5
+        assert self.rate_limiter.reserve("98765") == 0
+
+        self.clock.now += 10
+
+        assert self.rate_limiter.reserve("ACM123") == 1.0
+
+    def test_429_without_retry_after(self):
+        self.rate_limiter.update("ACM123", 429, {})
+
+        assert self.rate_limiter.metrics()["ACM123"].paused_for == RateLimiter.DEFAULT_RETRY_AFTER
+
+    @pytest.mark.parametrize("usegmt", [True, False])
+    def test_429_retry_after_date(self, usegmt):
+        retry_at = formatdate(time.time() + 30, usegmt=usegmt)
+
+        self.rate_limiter.update("ACM123", 429, {"Retry-After": retry_at})
+
+        assert 28 < self.rate_limiter.metrics()["ACM123"].paused_for <= 30
+
+    def test_429_retry_after_invalid(self):
+        self.rate_limiter.update("ACM123", 429, {"Retry-After": "soon"})
+
+        assert self.rate_limiter.metrics()["ACM123"].paused_for == RateLimiter.DEFAULT_RETRY_AFTER
+
+    def test_remaining_header_limits_budget(self):
+        self.rate_limiter.update("ACM123", 200, {"X-RateLimit-Remaining": "1"})
+
+        assert self.rate_limiter.reserve("ACM123") == 0
+        assert self.rate_limiter.reserve("ACM123") == 0.5
+
+    def test_remaining_header_exhausted_pauses_until_reset(self):
+        self.rate_limiter.update("ACM123", 200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "5"})
+
+        assert self.rate_limiter.metrics()["ACM123"].paused_for == 5
+
+    def test_remaining_header_exhausted_pauses_until_reset_timestamp(self):
+        headers = {"RateLimit-Remaining": "0", "RateLimit-Reset": str(int(time.time()) + 20)}
+
+        self.rate_limiter.update("ACM123", 200, headers)
+
+        assert 18 < self.rate_limiter.metrics()["ACM123"].paused_for <= 20
+
+    def test_invalid_headers_ignored(self):
+        self.rate_limiter.update("ACM123", 200, {"X-RateLimit-Remaining": "lots", "RateLimit-Remaining": "0"})
+
+        metrics = self.rate_limiter.metrics()["ACM123"]
+        assert metrics.tokens == 0
+        assert metrics.paused_for == 0
+
+    def test_metrics(self):
+        for _ in range(4):
+            self.rate_limiter.reserve("ACM123")
+        self.rate_limiter.update("ACM123", 429, {"Retry-After": "2"})
+
+        assert self.rate_limiter.metrics() == {
+            "ACM123": RateLimitMetrics(
+                tokens=-1, capacity=3, rate=2, paused_for=2, requests=4, throttled=1, waited=0.5
+            )
+        }
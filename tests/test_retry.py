@@ -0,0 +1,175 @@
+import json
+from unittest.mock import patch
+
+import httpretty
+import pytest
+import requests
+
+from freshbooks import Client as FreshBooksClient
+from freshbooks import FreshBooksError, RetryPolicy
+from freshbooks.client import API_BASE_URL
+from tests import get_fixture
+
+
+class TestRetryPolicy:
+    def test_backoff__full_jitter(self):
+        bounds = []
+
+        def uniform(low, high):
+            bounds.append((low, high))
+            return high
+
+        policy = RetryPolicy(backoff_factor=0.5, max_backoff=3, uniform=uniform)
+
+        delays = [policy.backoff(retry) for retry in range(1, 6)]
+
+        assert delays == [0.5, 1, 2, 3, 3]
+        assert bounds == [(0, 0.5), (0, 1), (0, 2), (0, 3), (0, 3)]
+        assert 0 <= RetryPolicy().backoff(3) <= 1.2
+
+    def test_backoff__no_jitter(self):
+        policy = RetryPolicy(jitter=False)
+
+        assert [policy.backoff(retry) for retry in range(1, 4)] == [0.3, 0.6, 1.2]
+
+    def test_delay__attempts(self):
+        policy = RetryPolicy(attempts=2, jitter=False)
+
+        assert policy.delay("GET", 503, {}, 1, 0) == 0.3
+        assert policy.delay("GET", 503, {}, 2, 0) == 0.6
+        assert policy.delay("GET", 503, {}, 3, 0) is None
+
+    def test_delay__methods_and_statuses(self):
+        policy = RetryPolicy(jitter=False)
+
+        assert policy.delay("POST", 503, {}, 1, 0) is None
+        assert policy.delay("GET", 404, {}, 1, 0) is None
+        assert policy.delay("GET", None, None, 1, 0) == 0.3
+        assert policy.delay("POST", None, None, 1, 0) is None
+
+    def test_delay__status_methods(self):
+        policy = RetryPolicy(
+            jitter=False, statuses=[503], status_methods={429: RetryPolicy.ALL_METHODS, 503: ["GET"]}
+        )
+
+        assert policy.delay("POST", 429, {}, 1, 0) == 0.3
+        assert policy.delay("GET", 503, {}, 1, 0) == 0.3
+        assert policy.delay("PUT", 503, {}, 1, 0) is None
+        assert policy.delay("GET", 500, {}, 1, 0) is None
+
+    def test_delay__idempotent(self):
+        policy = RetryPolicy(jitter=False, statuses=[503], status_methods={429: ["GET"]})
+
+        assert policy.delay("POST", 503, {}, 1, 0, idempotent=True) == 0.3
+        assert policy.delay("POST", 429, {}, 1, 0, idempotent=True) == 0.3
+        assert policy.delay("POST", None, None, 1, 0, idempotent=True) == 0.3
+        assert policy.delay("POST", 500, {}, 1, 0, idempotent=True) is None
+        assert policy.delay("POST", 503, {}, 1, 0) is None
+
+    def test_delay__idempotent_client_errors(self):
+        policy = RetryPolicy(jitter=False, statuses=[400, 404, 408, 429])
+
+        assert policy.delay("POST", 400, {}, 1, 0, idempotent=True) is None
+        assert policy.delay("POST", 404, {}, 1, 0, idempotent=True) is None
+        assert policy.delay("POST", 408, {}, 1, 0, idempotent=True) == 0.3
+        assert policy.delay("POST", 429, {}, 1, 0, idempotent=True) == 0.3
+        assert policy.delay("GET", 400, {}, 1, 0) == 0.3
+
+    def test_delay__retry_after(self):
+        assert RetryPolicy().delay("GET", 429, {"Retry-After": "4"}, 1, 0) == 4
+        policy = RetryPolicy(respect_retry_after=False, jitter=False)
+        assert policy.delay("GET", 429, {"Retry-After": "4"}, 1, 0) == 0.3
+        assert RetryPolicy(jitter=False).delay("GET", 429, {"Retry-After": "soon"}, 1, 0) == 0.3
+
+    def test_delay__max_time(self):
+        policy = RetryPolicy(jitter=False, max_time=5)
+
+        assert policy.delay("GET", 503, {}, 1, 4.5) == 0.3
+        assert policy.delay("GET", 503, {}, 1, 4.8) is None
+        assert policy.delay("GET", 429, {"Retry-After": "10"}, 1, 0) is None
+
+
+class TestClientRetries:
+    def setup_method(self, method):
+        self.url = "{}/accounting/account/ACM123/users/clients".format(API_BASE_URL)
+
+    def _client(self, **kwargs):
+        return FreshBooksClient(client_id="some_client", access_token="some_token", **kwargs)
+
+    @httpretty.activate
+    def test_retry(self):
+        httpretty.register_uri(
+            httpretty.GET,
+            f"{self.url}/12345",
+            responses=[
+                httpretty.Response(body=json.dumps({}), status=503),
+                httpretty.Response(body=json.dumps({}), status=429, adding_headers={"Retry-After": "2"}),
+                httpretty.Response(body=json.dumps(get_fixture("get_client_response")), status=200),
+            ]
+        )
+        freshBooksClient = self._client(retry_policy=RetryPolicy(jitter=False))
+
+        with patch("freshbooks.api.resource.time.sleep") as mock_sleep:
+            client = freshBooksClient.clients.get("ACM123", 12345)
+
+        assert client.userid == 12345
+        assert len(httpretty.latest_requests()) == 3
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [0.3, 2]
+
+    @httpretty.activate
+    def test_no_retry_of_post(self):
+        httpretty.register_uri(httpretty.POST, self.url, body=json.dumps({}), status=503)
+
+        with patch("freshbooks.api.resource.time.sleep") as mock_sleep:
+            with pytest.raises(FreshBooksError):
+                self._client().clients.create("ACM123", {})
+
+        assert mock_sleep.call_count == 0
+
+    @httpretty.activate
+    def test_retry_of_post_by_status(self):
+        httpretty.register_uri(
+            httpretty.POST,
+            self.url,
+            responses=[
+                httpretty.Response(body=json.dumps({}), status=429),
+                httpretty.Response(body=json.dumps(get_fixture("create_client_response")), status=200),
+            ]
+        )
+        freshBooksClient = self._client(retry_policy=RetryPolicy(status_methods={429: RetryPolicy.ALL_METHODS}))
+
+        with patch("freshbooks.api.resource.time.sleep") as mock_sleep:
+            client = freshBooksClient.clients.create("ACM123", {})
+
+        assert client.userid == 56789
+        assert mock_sleep.call_count == 1
+
+    @httpretty.activate
+    def test_max_time(self):
+        httpretty.register_uri(httpretty.GET, f"{self.url}/12345", body=json.dumps({}), status=503)
+        freshBooksClient = self._client(retry_policy=RetryPolicy(jitter=False, max_time=0.5))
+
+        with patch("freshbooks.api.resource.time.sleep") as mock_sleep:
+            with pytest.raises(FreshBooksError):
+                freshBooksClient.clients.get("ACM123", 12345)
+
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [0.3]
+
+    def test_connection_error(self):
+        freshBooksClient = self._client(retry_policy=RetryPolicy(attempts=2))
+
+        with patch.object(freshBooksClient.clients.session, "get", side_effect=requests.ConnectionError) as mock_get:
+            with patch("freshbooks.api.resource.time.sleep") as mock_sleep:
+                with pytest.raises(requests.ConnectionError):
+                    freshBooksClient.clients.get("ACM123", 12345)
+
+        assert mock_get.call_count == 3
+        assert mock_sleep.call_count == 2
+
+    def test_policy_shared_by_resources(self):
+        retry_policy = RetryPolicy()
+        freshBooksClient = self._client(retry_policy=retry_policy)
+
+        assert freshBooksClient.clients.retry_policy is retry_policy
+        assert freshBooksClient.projects.retry_policy is retry_policy
+        assert self._client(retry_policy=retry_policy, auto_retry=False).clients.retry_policy is None
@@ -0,0 +1,159 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from freshbooks.singleflight import SingleFlight, SingleFlightStats
+
+
+def wait_until(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+class TestSingleFlight:
+    def setup_method(self, method):
+        self.single_flight = SingleFlight()
+
+    def _run_threads(self, fn, count=4):
+        results = [None] * count
+        errors = [None] * count
+
+        def run(index):
+            try:
+                results[index] = self.single_flight.do("key", fn)
+            except Exception as error:
+                errors[index] = error
+
+        threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+        for thread in threads:
+            thread.start()
+        return threads, results, errors
+
+    def test_concurrent_calls_coalesced(self):
+        release = threading.Event()
+        calls = []
+
+        def fn():
+            calls.append(1)
+            release.wait(2)
+            return object()
+
+        threads, results, _ = self._run_threads(fn)
+        wait_until(lambda: self.single_flight.stats().coalesced == 3)
+        assert self.single_flight.stats().in_flight == 1
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+        assert self.single_flight.stats() == SingleFlightStats(calls=1, coalesced=3, in_flight=0)
+
+    def test_error_shared(self):
+        release = threading.Event()
+
+        def fn():
+            release.wait(2)
+            raise ValueError("failed")
+
+        threads, results, errors = self._run_threads(fn)
+        wait_until(lambda: self.single_flight.stats().coalesced == 3)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert all(isinstance(error, ValueError) for error in errors)
+        assert results == [None] * 4
+
+    def test_sequential_calls_not_coalesced(self):
+        assert self.single_flight.do("key", lambda: 1) == 1
+        assert self.single_flight.do("key", lambda: 2) == 2
+        assert self.single_flight.do("other", lambda: 3) == 3
+
+        assert self.single_flight.stats() == SingleFlightStats(calls=3, coalesced=0, in_flight=0)
+
+    def test_async_calls_coalesced(self):
+        calls = []
+
+        async def fn():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return object()
+
+        async def run():
+            return await asyncio.gather(*(self.single_flight.do_async("key", fn) for _ in range(4)))
+
+        results = asyncio.run(run())
+
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+        assert self.single_flight.stats() == SingleFlightStats(calls=1, coalesced=3, in_flight=0)
+
+    def test_async_error_shared(self):
+        async def fn():
+            await asyncio.sleep(0.01)
+            raise ValueError("failed")
+
+        async def run():
+            return await asyncio.gather(
+                *(self.single_flight.do_async("key", fn) for _ in range(3)), return_exceptions=True
+            )
+
+        errors = asyncio.run(run())
+
+        assert all(isinstance(error, ValueError) for error in errors)
+
+        with pytest.raises(ValueError):
+            asyncio.run(self.single_flight.do_async("key", fn))
+
+    def test_async_leader_cancelled(self):
+        calls = []
+
+        async def fn():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "result"
+
+        async def run():
+            leader = asyncio.ensure_future(self.single_flight.do_async("key", fn))
+            await asyncio.sleep(0)
+            waiter = asyncio.ensure_future(self.single_flight.do_async("key", fn))
+            await asyncio.sleep(0)
+            leader.cancel()
+            return await asyncio.gather(leader, waiter, return_exceptions=True)
+
+        leader, waiter = asyncio.run(run())
+
+        assert isinstance(leader, asyncio.CancelledError)
+        assert waiter == "result"
+        assert len(calls) == 1
+        assert self.single_flight.stats().in_flight == 0
+
+    def test_async_all_cancelled(self):
+        cancelled = []
+
+        async def fn():
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(1)
+                raise
+
+        async def run():
+            callers = [asyncio.ensure_future(self.single_flight.do_async("key", fn)) for _ in range(2)]
+            await asyncio.sleep(0.01)
+            for caller in callers:
+                caller.cancel()
+            results = await asyncio.gather(*callers, return_exceptions=True)
+            await asyncio.sleep(0)
+            return results
+
+        results = asyncio.run(run())
+
+        assert all(isinstance(result, asyncio.CancelledError) for result in results)
+        assert cancelled == [1]
+        assert self.single_flight.stats() == SingleFlightStats(calls=1, coalesced=1, in_flight=0)
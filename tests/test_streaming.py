@@ -0,0 +1,90 @@
+import json
+from decimal import Decimal
+
+import pytest
+
+from freshbooks.streaming import ListStreamParser
+
+PATH = ("response", "result", "invoices")
+
+
+def _response(invoices, **result):
+    return {"response": {"result": dict(result, invoices=invoices)}}
+
+
+def _parse(body, path=PATH, chunk_size=1):
+    parser = ListStreamParser(path)
+    elements = []
+    content = body.encode("utf-8")
+    for start in range(0, len(content), chunk_size):
+        elements.extend(parser.feed(content[start:start + chunk_size]))
+    return elements, parser.close()
+
+
+class TestListStreamParser:
+    invoices = [
+        {"id": 1, "amount": {"amount": "10.00", "code": "CAD"}, "lines": [{"qty": 1.5}], "notes": "a \"quoted\" ]"},
+        {"id": 2, "amount": {"amount": "20.00", "code": "CAD"}, "lines": [], "notes": "Café ☕"},
+    ]
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64, 4096])
+    def test_feed(self, chunk_size):
+        body = json.dumps(_response(self.invoices, page=1, pages=2, per_page=2, total=4), ensure_ascii=False)
+
+        elements, rest = _parse(body, chunk_size=chunk_size)
+
+        assert elements == json.loads(body, parse_float=Decimal)["response"]["result"]["invoices"]
+        assert elements[0]["lines"][0]["qty"] == Decimal("1.5")
+        assert rest == _response([], page=1, pages=2, per_page=2, total=4)
+
+    def test_feed__elements_as_they_arrive(self):
+        body = json.dumps(_response(self.invoices)).encode("utf-8")
+        second = body.index(b'{"id": 2')
+        parser = ListStreamParser(PATH)
+
+        assert parser.feed(body[:second - 5]) == []
+        assert parser.feed(body[second - 5:second + 5]) == [self.invoices[0]]
+        assert parser.feed(body[second + 5:]) == [self.invoices[1]]
+        assert parser.close() == _response([])
+
+    def test_feed__other_lists_and_keys_before_list(self):
+        body = json.dumps({
+            "response": {"errors": [], "result": {"per_page": 2, "ids": [1, [2]], "k\\\"ey": {"invoices": [1]},
+                                                  "invoices": self.invoices}},
+        })
+
+        elements, rest = _parse(body)
+
+        assert elements == self.invoices
+        assert rest["response"]["result"]["ids"] == [1, [2]]
+        assert rest["response"]["result"]["invoices"] == []
+
+    def test_feed__numbers(self):
+        elements, rest = _parse('{"ids": [1, 22, 3.25]}', path=("ids",), chunk_size=2)
+
+        assert elements == [1, 22, Decimal("3.25")]
+        assert rest == {"ids": []}
+
+    def test_feed__empty_list(self):
+        assert _parse(json.dumps(_response([], page=1))) == ([], _response([], page=1))
+
+    def test_feed__no_list(self):
+        body = json.dumps({"response": {"errors": [{"message": "Not found", "errno": 1012}]}})
+
+        assert _parse(body) == ([], json.loads(body))
+
+    def test_close__unterminated_list(self):
+        with pytest.raises(ValueError):
+            _parse(json.dumps(_response(self.invoices))[:-30])
+
+    def test_close__unterminated_after_element(self):
+        with pytest.raises(ValueError, match="Unterminated list"):
+            _parse('{"response": {"result": {"invoices": [{"id": 1}')
+
+    def test_feed__missing_delimiter(self):
+        with pytest.raises(ValueError, match="Expecting ','"):
+            _parse('{"response": {"result": {"invoices": [{"id": 1} {"id": 2}]}}}')
+
+    def test_close__invalid_element(self):
+        with pytest.raises(ValueError):
+            _parse('{"response": {"result": {"invoices": [{"id": 1}, {"id": ]}}}')
@@ -0,0 +1,205 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+
+import httpretty
+import pytest
+
+from freshbooks import AsyncClient, Client as FreshBooksClient
+from freshbooks import FilterBuilder, FreshBooksError, IncludesBuilder, SyncEngine
+from freshbooks.client import API_BASE_URL
+from freshbooks.sync import FileWatermarkStore, SQLiteWatermarkStore, SyncRun, WatermarkStore, changed_since
+from tests import get_fixture
+
+START = datetime(2020, 11, 21, 15, 30, tzinfo=timezone.utc).timestamp()
+
+
+class Clock:
+    def __init__(self, now=START):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestWatermarkStores:
+
+    @pytest.mark.parametrize("store", [WatermarkStore, SQLiteWatermarkStore])
+    def test_store(self, store):
+        store = store()
+        watermark = datetime(2020, 11, 21, 15, 30, tzinfo=timezone.utc)
+
+        assert store.get("ACM123", "invoices") is None
+        store.set("ACM123", "invoices", watermark)
+        store.set(98765, "projects", watermark)
+
+        assert store.get("ACM123", "invoices") == watermark
+        assert store.get("98765", "projects") == watermark
+        assert store.get("ACM123", "clients") is None
+
+        store.delete("ACM123", "invoices")
+        assert store.get("ACM123", "invoices") is None
+        assert store.get(98765, "projects") == watermark
+
+    def test_file_store(self, tmp_path):
+        path = str(tmp_path / "watermarks.json")
+        watermark = datetime(2020, 11, 21, 15, 30, tzinfo=timezone.utc)
+        store = FileWatermarkStore(path)
+        store.set("ACM123", "invoices", watermark)
+        store.set(98765, "time_entries", watermark)
+        store.delete(98765, "time_entries")
+
+        reopened = FileWatermarkStore(path)
+
+        assert reopened.get("ACM123", "invoices") == watermark
+        assert reopened.get(98765, "time_entries") is None
+        with open(path) as file:
+            assert json.load(file) == {"ACM123/invoices": "2020-11-21T15:30:00+00:00"}
+        assert [entry.name for entry in tmp_path.iterdir()] == ["watermarks.json"]
+
+    def test_sqlite_store__persisted(self, tmp_path):
+        path = str(tmp_path / "watermarks.sqlite")
+        watermark = datetime(2020, 11, 21, 15, 30, tzinfo=timezone.utc)
+        store = SQLiteWatermarkStore(path)
+        store.set("ACM123", "invoices", watermark)
+        store.close()
+
+        assert SQLiteWatermarkStore(path).get("ACM123", "invoices") == watermark
+
+
+class TestSyncEngine:
+    def setup_method(self, method):
+        self.account_id = "ACM123"
+        self.business_id = 98765
+        self.clock = Clock()
+        self.freshBooksClient = FreshBooksClient(client_id="some_client", access_token="some_token")
+        self.engine = SyncEngine(self.freshBooksClient, clock=self.clock, batch_size=2)
+        self.batches = []
+
+    def _register_clients(self, status=200):
+        url = "{}/accounting/account/{}/users/clients".format(API_BASE_URL, self.account_id)
+        httpretty.register_uri(
+            httpretty.GET, url, body=json.dumps(get_fixture("list_clients_response")), status=status
+        )
+
+    @httpretty.activate
+    def test_sync__accounting(self):
+        self._register_clients()
+
+        first = self.engine.sync("clients", self.account_id, self.batches.append)
+        self.clock.now += 900
+        second = self.engine.sync(
+            "clients", self.account_id, self.batches.append, builders=[IncludesBuilder().include("last_activity")]
+        )
+
+        assert first == SyncRun("clients", self.account_id, None, datetime.fromtimestamp(START, timezone.utc), 3)
+        assert second.since == datetime(2020, 11, 21, 15, 25, tzinfo=timezone.utc)
+        assert second.watermark == datetime(2020, 11, 21, 15, 45, tzinfo=timezone.utc)
+        assert second.synced == 3
+        assert [[client.userid for client in batch] for batch in self.batches] == [[12345, 12346], [12457]] * 2
+        requests = httpretty.latest_requests()
+        assert requests[0].querystring == {"page": ["1"], "per_page": ["100"]}
+        assert requests[1].querystring == {
+            "search[updated_min]": ["2020-11-20"], "include[]": ["last_activity"], "page": ["1"], "per_page": ["100"]
+        }
+        assert self.engine.store.get(self.account_id, "clients") == second.watermark
+
+    @httpretty.activate
+    def test_sync__projects(self):
+        url = "{}/timetracking/business/{}/time_entries".format(API_BASE_URL, self.business_id)
+        httpretty.register_uri(httpretty.GET, url, body=json.dumps(get_fixture("list_time_entries_response")))
+        watermark = datetime(2020, 11, 21, 10, 30, 15, 500, tzinfo=timezone.utc)
+        self.engine.store.set(self.business_id, "time_entries", watermark)
+
+        run = self.engine.sync("time_entries", self.business_id, self.batches.append)
+
+        assert run.synced == 2
+        assert httpretty.last_request().querystring == {
+            "updated_since": ["2020-11-21T10:25:15Z"], "page": ["1"], "per_page": ["100"]
+        }
+
+    @httpretty.activate
+    def test_sync__filter(self):
+        self._register_clients()
+        self.engine.store.set(self.account_id, "clients", datetime(2020, 11, 21, tzinfo=timezone.utc))
+
+        run = self.engine.sync(
+            "clients", self.account_id, self.batches.append,
+            filter=lambda since: FilterBuilder().equals("updated_min", since.strftime("%Y-%m-%d %H:%M:%S"))
+        )
+
+        assert run.since == datetime(2020, 11, 20, 23, 55, tzinfo=timezone.utc)
+        assert httpretty.last_request().querystring["search[updated_min]"] == ["2020-11-20 23:55:00"]
+
+    @httpretty.activate
+    def test_sync__error(self):
+        self._register_clients(status=500)
+        watermark = datetime(2020, 11, 21, tzinfo=timezone.utc)
+        self.engine.store.set(self.account_id, "clients", watermark)
+        self.freshBooksClient.clients.retry_policy = None
+
+        with pytest.raises(FreshBooksError):
+            self.engine.sync("clients", self.account_id, self.batches.append)
+
+        assert self.engine.store.get(self.account_id, "clients") == watermark
+
+    @httpretty.activate
+    def test_sync__sink_error(self):
+        self._register_clients()
+
+        def sink(batch):
+            raise RuntimeError("Database is down")
+
+        with pytest.raises(RuntimeError):
+            self.engine.sync("clients", self.account_id, sink)
+
+        assert self.engine.store.get(self.account_id, "clients") is None
+
+    def test_sync__not_a_resource(self):
+        with pytest.raises(ValueError):
+            self.engine.sync("nothing", self.account_id, self.batches.append)
+        with pytest.raises(ValueError):
+            self.engine.sync("base_url", self.account_id, self.batches.append)
+
+    def test_changed_since(self):
+        since = datetime(2020, 11, 21, 2, 30, 15, tzinfo=timezone.utc)
+
+        assert changed_since(self.freshBooksClient.invoices, since).build() == "&search[updated_min]=2020-11-20"
+        assert changed_since(self.freshBooksClient.projects, since).build("ProjectsResource") == (
+            "&updated_since=2020-11-21T02:30:15Z"
+        )
+
+
+class TestAsyncSyncEngine:
+    def setup_method(self, method):
+        self.httpx = pytest.importorskip("httpx")
+        self.account_id = "ACM123"
+        self.requests = []
+        self.freshBooksClient = AsyncClient(client_id="some_client", access_token="some_token")
+        self.freshBooksClient._session = self.httpx.AsyncClient(transport=self.httpx.MockTransport(self._handler))
+        self.clock = Clock()
+
+    def _handler(self, request):
+        self.requests.append(request)
+        return self.httpx.Response(200, content=json.dumps(get_fixture("list_clients_response")))
+
+    def test_sync_async(self):
+        engine = SyncEngine(self.freshBooksClient, clock=self.clock, batch_size=3)
+        batches = []
+
+        async def sink(batch):
+            batches.append([client.userid for client in batch])
+
+        async def run():
+            first = await engine.sync_async("clients", self.account_id, sink)
+            self.clock.now += 900
+            engine.batch_size = 2
+            second = await engine.sync_async("clients", self.account_id, lambda batch: batches.append(len(batch)))
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        assert (first.since, first.synced) == (None, 3)
+        assert (second.since, second.synced) == (datetime(2020, 11, 21, 15, 25, tzinfo=timezone.utc), 3)
+        assert batches == [[12345, 12346, 12457], 2, 1]
+        assert self.requests[1].url.params["search[updated_min]"] == "2020-11-20"
@@ -3,6 +3,7 @@ from datetime import datetime, timezone
 
 import httpretty
 from freshbooks import Client as FreshBooksClient
+from freshbooks import FilterBuilder
 from freshbooks.client import API_BASE_URL
 
 from tests import get_fixture
@@ -86,3 +87,24 @@ class TestTimetrackingResources:
         assert time_entry.duration == 3600
         assert httpretty.last_request().headers["Authorization"] == "Bearer some_token"
         assert httpretty.last_request().headers["Content-Type"] == "application/json"
+
+    @httpretty.activate
+    def test_list_partitions_time_entries(self):
+        url = "{}/timetracking/business/{}/time_entries".format(API_BASE_URL, self.business_id)
+
+        def partition_callback(request, uri, response_headers):
+            response = get_fixture("list_time_entries_response")
+            started_from, started_to = request.querystring["started_from"][0], request.querystring["started_to"][0]
+            response["time_entries"][0]["id"] = int(started_from[11:13])
+            response["time_entries"][1]["id"] = int(started_to[11:13])
+            return [200, response_headers, json.dumps(response)]
+
+        httpretty.register_uri(httpretty.GET, url, body=partition_callback)
+        partitions = FilterBuilder().partition(
+            "started_from", "2020-10-17T00:00:00", "2020-10-17T12:00:00", 3, until_field="started_to"
+        )
+
+        time_entries = list(self.freshBooksClient.time_entries.list_partitions(self.business_id, partitions))
+
+        assert [time_entry.id for time_entry in time_entries] == [0, 4, 8, 12]
+        assert len(httpretty.latest_requests()) == 3
@@ -0,0 +1,102 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from freshbooks.models import VisState
+from freshbooks.typed_models import (
+    ACCOUNTING_DATETIME, DATE, LIST, MODELS, Balance, Bill, Client, Invoice, InvoiceLine, Money, Project, TimeEntry,
+    TypedResult, typed_model
+)
+from tests import get_fixture
+
+
+class TestTypedModels:
+
+    def test_client(self):
+        data = get_fixture("get_client_response")["response"]["result"]["client"]
+        client = Client(data)
+
+        assert str(client) == "Client(12345)"
+        assert client.data is data
+        assert client.organization == "American Cyanamid"
+        assert client.signup_date == datetime(2020, 10, 31, 15, 25, 34, tzinfo=timezone.utc)
+        assert client.updated == datetime(2020, 11, 1, 18, 11, 10, tzinfo=timezone.utc)
+        assert client.last_login is None
+        assert [balance.amount.amount for balance in client.outstanding_balance] == [Decimal("10"), Decimal("11")]
+        assert isinstance(client.outstanding_balance[0], Balance)
+        assert client.grand_total_balance == []
+        assert client.test_amount == {"amount": 10, "code": "CAD"}
+        assert client.vis_state == VisState.ACTIVE
+        assert client.missing is None
+
+    def test_converted_once(self):
+        client = Client({"updated": "2020-11-01 13:11:10"})
+
+        updated = client.updated
+        client.data["updated"] = "2021-01-01 00:00:00"
+
+        assert client.updated is updated
+
+    def test_slots(self):
+        invoice = Invoice({"id": 1})
+
+        assert not hasattr(invoice, "__dict__")
+        with pytest.raises(AttributeError):
+            invoice.__something__
+
+    def test_invoice(self):
+        invoice = Invoice({
+            "id": 1,
+            "create_date": "2021-06-28",
+            "amount": {"amount": "100.00", "code": "CAD"},
+            "lines": [{"lineid": 1, "unit_cost": {"amount": Decimal("50.00"), "code": "CAD"}, "qty": "2"}],
+            "vis_state": 5,
+        })
+
+        assert invoice.create_date == date(2021, 6, 28)
+        assert isinstance(invoice.amount, Money)
+        assert invoice.amount.amount == Decimal("100.00")
+        assert invoice.amount.code == "CAD"
+        assert isinstance(invoice.lines[0], InvoiceLine)
+        assert invoice.lines[0].unit_cost.amount == Decimal("50.00")
+        assert invoice.lines[0].qty == Decimal("2")
+        assert invoice.vis_state is None
+
+    def test_unexpected_values_returned_as_is(self):
+        invoice = Invoice({"date_paid": "0000-00-00", "due_date": 5})
+
+        assert invoice.date_paid == "0000-00-00"
+        assert invoice.due_date == 5
+
+    def test_accounting_utc_date_fields(self):
+        bill = Bill({"created_at": "2021-06-28 14:05:15", "issue_date": "2021-06-28"})
+        invoice = Invoice({"created_at": "2021-06-28 14:05:15"})
+
+        assert bill.created_at == datetime(2021, 6, 28, 14, 5, 15, tzinfo=timezone.utc)
+        assert bill.issue_date == date(2021, 6, 28)
+        assert invoice.created_at == datetime(2021, 6, 28, 18, 5, 15, tzinfo=timezone.utc)
+
+    def test_projects(self):
+        project = Project(get_fixture("get_project_response")["project"])
+        time_entry = TimeEntry(get_fixture("get_time_entry_response")["time_entry"])
+
+        assert project.due_date == date(2021, 1, 2)
+        assert project.created_at == datetime(2020, 9, 13, 1, 7, 51, tzinfo=timezone.utc)
+        assert project.billed_amount == Decimal("0.00")
+        assert project.budget is None
+        assert time_entry.started_at == datetime(2020, 10, 17, 5, 0, 0, tzinfo=timezone.utc)
+
+    def test_custom_model(self):
+        Widget = typed_model("Widget", "widget", {
+            "made": DATE, "updated": ACCOUNTING_DATETIME, "parts": (LIST, Money), "count": int
+        }, register=False)
+
+        widget = Widget({"made": "2021-01-02", "parts": [{"amount": "1"}], "count": "3"})
+
+        assert issubclass(Widget, TypedResult)
+        assert "widget" not in MODELS
+        assert widget.made == date(2021, 1, 2)
+        assert widget.parts[0].amount == Decimal("1")
+        assert widget.count == 3
+        assert MODELS["invoice"] is Invoice